@@ -12,5 +12,11 @@ class CoreConfig(AppConfig):
         from apps.core.admin_config import customize_admin_site
         customize_admin_site()
 
+        # Drop the cached page text of deleted PDFs
+        from django.db.models.signals import post_delete
+        from apps.core.models import DataFile
+        from apps.core.processors.page_cache import remove_cached_pages
+        post_delete.connect(remove_cached_pages, sender=DataFile, dispatch_uid='remove_cached_pages')
+
         # Import signals or perform other initialization if needed
         # import apps.core.signals
\ No newline at end of file
@@ -0,0 +1,18 @@
+# Generated by Django 5.1.7 on 2026-10-17 09:12
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('core', '0003_alter_dataset_options'),
+    ]
+
+    operations = [
+        migrations.AlterField(
+            model_name='datafile',
+            name='md5_hash',
+            field=models.CharField(blank=True, db_index=True, max_length=32, null=True),
+        ),
+    ]
@@ -1,13 +1,22 @@
+from django.conf import settings
 from django.db import models
 import uuid
 import os
 
 
 def file_upload_path(instance, filename):
-    """Generate a unique path for uploaded files"""
+    """
+    Generate a unique path for uploaded files.
+
+    With the UPLOAD_FANOUT setting, files are fanned out over 256
+    subdirectories per dataset by the first two hex digits of their random
+    name, so large datasets don't end up in a single huge directory.
+    """
     ext = filename.split('.')[-1]
-    filename = f"{uuid.uuid4()}.{ext}"
-    return os.path.join('uploads', str(instance.dataset.id), filename)
+    name = str(uuid.uuid4())
+    if getattr(settings, 'UPLOAD_FANOUT', False):
+        return os.path.join('uploads', str(instance.dataset.id), name[:2], f"{name}.{ext}")
+    return os.path.join('uploads', str(instance.dataset.id), f"{name}.{ext}")
 
 
 class DataFile(models.Model):
@@ -38,7 +47,7 @@ class DataFile(models.Model):
     file_name = models.CharField(max_length=255)
     status = models.CharField(max_length=20, choices=STATUS_CHOICES, default='pending')
     size_bytes = models.BigIntegerField(default=0)
-    md5_hash = models.CharField(max_length=32, blank=True, null=True)
+    md5_hash = models.CharField(max_length=32, blank=True, null=True, db_index=True)
     created_at = models.DateTimeField(auto_now_add=True)
     updated_at = models.DateTimeField(auto_now=True)
     metadata = models.JSONField(default=dict, blank=True)
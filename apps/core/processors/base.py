@@ -1,20 +1,59 @@
 # apps/core/processors/base.py
 from abc import ABC, abstractmethod
+import hashlib
 import logging
-from typing import Dict, Any, Optional
+import multiprocessing
+import os
+from concurrent.futures import Executor, ProcessPoolExecutor, ThreadPoolExecutor
+from contextlib import contextmanager
+from typing import Dict, Any, Iterator, Optional
+
+from .context import ProcessingContext
 
 logger = logging.getLogger(__name__)
 
 
-class BaseProcessor(ABC):
-    """Base class for all file processors."""
+def worker_pool(tasks: int, max_workers: Optional[int] = None) -> Executor:
+    """
+    Process pool sized for tasks, or threads where processes can't be forked.
+
+    Args:
+        tasks: Number of tasks to run
+        max_workers: Upper bound on the pool size (None = number of CPUs)
+    """
+    workers = max(1, min(tasks, max_workers or os.cpu_count() or 1))
+    # Daemonic processes (e.g. Celery prefork workers) can't have children;
+    # the readers release the GIL while decoding, so threads still help there
+    if workers == 1 or multiprocessing.current_process().daemon:
+        return ThreadPoolExecutor(max_workers=workers)
+    return ProcessPoolExecutor(max_workers=workers)
 
-    def process(self, datafile) -> bool:
+
+class BaseProcessor(ABC):
+    """
+    Base class for all file processors.
+
+    The stages of a run (validate, extract_metadata, _process_file) share a
+    ProcessingContext so that the file is parsed once per run. Each stage
+    can also be called on its own, in which case it uses a context of its
+    own that is released when it returns.
+    """
+
+    # Copy the metadata of an already processed file with the same content instead
+    # of processing (off by default: the copy gets no export or statistics of its own)
+    skip_duplicates = False
+    # Bumped when a change alters the results; those of other versions are not reused
+    processor_version = 1
+    # Size of the worker pool of processors that parallelize (None = number of CPUs)
+    max_workers: Optional[int] = None
+
+    def process(self, datafile, force: bool = False) -> bool:
         """
         Process the file and update the datafile record.
 
         Args:
             datafile: The datafile object to process
+            force: Process the file even if a processed duplicate exists
 
         Returns:
             bool: True if processing was successful, False otherwise
@@ -23,20 +62,26 @@ class BaseProcessor(ABC):
             # Set status to processing
             self._update_status(datafile, 'processing')
 
-            # Validate file
-            validation_result = self.validate(datafile)
-            if not validation_result['is_valid']:
-                self._update_status(datafile, 'failed')
-                logger.error(f"Validation failed for file {datafile.id}: {validation_result['message']}")
-                return False
+            if self.skip_duplicates and not force and self._reuse_duplicate(datafile):
+                self._update_status(datafile, 'processed')
+                return True
+
+            with ProcessingContext(datafile) as context:
+                # Validate file
+                validation_result = self.validate(datafile, context=context)
+                if not validation_result['is_valid']:
+                    self._update_status(datafile, 'failed')
+                    logger.error(f"Validation failed for file {datafile.id}: {validation_result['message']}")
+                    return False
 
-            # Extract metadata
-            metadata = self.extract_metadata(datafile)
-            if metadata:
-                self._update_metadata(datafile, metadata)
+                # Extract metadata
+                metadata = self.extract_metadata(datafile, context=context)
+                if metadata:
+                    metadata['processor'] = self._processor_info()
+                    self._update_metadata(datafile, metadata)
 
-            # Process file
-            self._process_file(datafile)
+                # Process file
+                self._process_file(datafile, context=context)
 
             # Update status
             self._update_status(datafile, 'processed')
@@ -47,6 +92,67 @@ class BaseProcessor(ABC):
             self._update_status(datafile, 'failed')
             return False
 
+    def _reuse_duplicate(self, datafile) -> bool:
+        """
+        Copy the metadata of a processed file with identical content.
+
+        Only files processed by this processor at the same
+        processor_version are candidates. Files are matched on their size,
+        then on their MD5 hash, which is computed and stored first if the
+        upload did not record it and a candidate of the same size exists.
+        The copied metadata names the file it comes from as duplicate_of.
+
+        Only the metadata is reused: the file gets no CSV or text export and
+        no statistics, so this is for processors (or deployments) where the
+        metadata is all that is needed, see skip_duplicates.
+
+        Returns:
+            True if a duplicate was found and its results reused
+        """
+        info = self._processor_info()
+        candidates = (
+            type(datafile).objects
+            .filter(file_type=datafile.file_type, status='processed', size_bytes=datafile.size_bytes,
+                    metadata__processor__name=info['name'], metadata__processor__version=info['version'])
+            .exclude(pk=datafile.pk)
+        )
+        if not candidates.exists():
+            return False
+
+        if not datafile.md5_hash:
+            md5 = hashlib.md5()
+            with datafile.file.open('rb') as f:
+                for chunk in f.chunks():
+                    md5.update(chunk)
+            datafile.md5_hash = md5.hexdigest()
+            datafile.save(update_fields=['md5_hash'])
+
+        duplicate = candidates.filter(md5_hash=datafile.md5_hash).order_by('-updated_at').first()
+        if duplicate is None:
+            return False
+
+        logger.info(f"File {datafile.id} has the same content as file {duplicate.id}, reusing its results")
+        self._update_metadata(datafile, {**duplicate.metadata, 'duplicate_of': duplicate.pk})
+        return True
+
+    def _processor_info(self) -> Dict[str, Any]:
+        """Processor and version recorded in the metadata of the files it processes."""
+        return {'name': type(self).__name__, 'version': self.processor_version}
+
+    @staticmethod
+    @contextmanager
+    def _context(datafile, context: Optional[ProcessingContext]) -> Iterator[ProcessingContext]:
+        """Yield the run's context, or a temporary one for a stage called on its own."""
+        if context is not None:
+            yield context
+            return
+        with ProcessingContext(datafile) as own_context:
+            yield own_context
+
+    def _executor(self, tasks: int) -> Executor:
+        """Worker pool for the tasks of a run, see worker_pool."""
+        return worker_pool(tasks, self.max_workers)
+
     def _update_status(self, datafile, status: str) -> None:
         """Update the status of the datafile."""
         datafile.status = status
@@ -58,12 +164,12 @@ class BaseProcessor(ABC):
         datafile.save(update_fields=['metadata'])
 
     @abstractmethod
-    def _process_file(self, datafile) -> None:
+    def _process_file(self, datafile, context: Optional[ProcessingContext] = None) -> None:
         """Implement file processing logic."""
         pass
 
     @abstractmethod
-    def validate(self, datafile) -> Dict[str, Any]:
+    def validate(self, datafile, context: Optional[ProcessingContext] = None) -> Dict[str, Any]:
         """
         Validate the file.
 
@@ -73,7 +179,7 @@ class BaseProcessor(ABC):
         pass
 
     @abstractmethod
-    def extract_metadata(self, datafile) -> Optional[Dict[str, Any]]:
+    def extract_metadata(self, datafile, context: Optional[ProcessingContext] = None) -> Optional[Dict[str, Any]]:
         """
         Extract metadata from the file.
 
@@ -0,0 +1,65 @@
+# apps/core/processors/context.py
+import logging
+import threading
+from typing import Any, Callable, Dict, Hashable
+
+logger = logging.getLogger(__name__)
+
+
+class ProcessingContext:
+    """
+    Parsed content of a file shared by the stages of one processing run.
+
+    validate, extract_metadata and _process_file ask the context for what
+    they need (a DataFrame, a workbook sheet, a PDF reader...) and each
+    item is loaded on first use only, so a file is parsed once per run
+    instead of once per stage. release() drops everything and closes the
+    items that have a close() method; BaseProcessor.process calls it when
+    the run ends.
+    """
+
+    def __init__(self, datafile):
+        """
+        Args:
+            datafile: The datafile being processed
+        """
+        self.datafile = datafile
+        self._items: Dict[Hashable, Any] = {}
+        self._lock = threading.RLock()
+
+    def get(self, key: Hashable, loader: Callable[[], Any]) -> Any:
+        """
+        Return the item stored under key, loading it first if needed.
+
+        Args:
+            key: Item name, e.g. 'frame' or ('sheet', 'Sheet1')
+            loader: Called without arguments to load a missing item
+
+        Returns:
+            The cached or freshly loaded item
+        """
+        with self._lock:
+            if key not in self._items:
+                self._items[key] = loader()
+            return self._items[key]
+
+    def __contains__(self, key: Hashable) -> bool:
+        return key in self._items
+
+    def release(self) -> None:
+        """Drop all items, closing those that can be closed."""
+        with self._lock:
+            items, self._items = self._items, {}
+        for key, item in items.items():
+            close = getattr(item, 'close', None)
+            if callable(close):
+                try:
+                    close()
+                except Exception as e:
+                    logger.warning(f"Error closing {key} of file {getattr(self.datafile, 'id', None)}: {str(e)}")
+
+    def __enter__(self) -> 'ProcessingContext':
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback) -> None:
+        self.release()
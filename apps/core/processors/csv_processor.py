@@ -4,21 +4,59 @@ import os
 from typing import Dict, Any, Optional
 
 from .base import BaseProcessor
+from .context import ProcessingContext
+from .streaming_stats import StreamingStatistics
 
 logger = logging.getLogger(__name__)
 
 
 class CSVProcessor(BaseProcessor):
-    """Processor for CSV files."""
-
-    def _process_file(self, datafile) -> None:
+    """
+    Processor for CSV files.
+
+    Files larger than streaming_threshold are never loaded whole: they are
+    read in chunks of chunk_rows rows into mergeable StreamingStatistics
+    that produce the same statistics and metadata with bounded memory
+    (quantiles are then approximate).
+    """
+
+    # Files larger than this (bytes) are processed in streaming mode
+    streaming_threshold = 512 * 1024 * 1024
+    # Rows per chunk in streaming mode
+    chunk_rows = 100_000
+
+    def _read(self, datafile, context: ProcessingContext) -> pd.DataFrame:
+        """Parse the CSV file once per processing run."""
+        return context.get('frame', lambda: pd.read_csv(datafile.file.path))
+
+    def _is_streaming(self, datafile) -> bool:
+        size = getattr(datafile, 'size_bytes', 0) or os.path.getsize(datafile.file.path)
+        return size > self.streaming_threshold
+
+    def _streaming_statistics(self, datafile, context: ProcessingContext) -> StreamingStatistics:
+        """Summarize the CSV file chunk by chunk, once per processing run."""
+        def load() -> StreamingStatistics:
+            statistics = StreamingStatistics()
+            for chunk in pd.read_csv(datafile.file.path, chunksize=self.chunk_rows):
+                statistics.update(chunk)
+            return statistics
+        return context.get('streaming_statistics', load)
+
+    def _process_file(self, datafile, context: Optional[ProcessingContext] = None) -> None:
         """Process a CSV file."""
         file_path = datafile.file.path
         logger.info(f"Processing CSV file: {file_path}")
 
         try:
+            if self._is_streaming(datafile):
+                with self._context(datafile, context) as context:
+                    datafile.statistics = self._streaming_statistics(datafile, context).describe()
+                datafile.save(update_fields=['statistics'])
+                return
+
             # Example processing - read the CSV file
-            df = pd.read_csv(file_path)
+            with self._context(datafile, context) as context:
+                df = self._read(datafile, context)
 
             # Perform any processing you need
             # For example, data cleaning, transformation, etc.
@@ -38,7 +76,7 @@ class CSVProcessor(BaseProcessor):
             logger.exception(f"Error processing CSV file {file_path}")
             raise
 
-    def validate(self, datafile) -> Dict[str, Any]:
+    def validate(self, datafile, context: Optional[ProcessingContext] = None) -> Dict[str, Any]:
         """Validate that the file is a valid CSV."""
         try:
             # Check file extension
@@ -46,26 +84,34 @@ class CSVProcessor(BaseProcessor):
                 return {'is_valid': False, 'message': 'File is not a CSV'}
 
             # Try to read with pandas
-            df = pd.read_csv(datafile.file.path)
+            with self._context(datafile, context) as context:
+                if self._is_streaming(datafile):
+                    is_empty = self._streaming_statistics(datafile, context).row_count == 0
+                else:
+                    is_empty = self._read(datafile, context).empty
 
             # Check if file has data
-            if df.empty:
+            if is_empty:
                 return {'is_valid': False, 'message': 'CSV file is empty'}
 
             return {'is_valid': True, 'message': 'Valid CSV file'}
         except Exception as e:
             return {'is_valid': False, 'message': f'Invalid CSV file: {str(e)}'}
 
-    def extract_metadata(self, datafile) -> Optional[Dict[str, Any]]:
+    def extract_metadata(self, datafile, context: Optional[ProcessingContext] = None) -> Optional[Dict[str, Any]]:
         """Extract metadata from the CSV file."""
         try:
-            df = pd.read_csv(datafile.file.path)
+            with self._context(datafile, context) as context:
+                if self._is_streaming(datafile):
+                    return self._streaming_statistics(datafile, context).metadata()
+                df = self._read(datafile, context)
             metadata = {
                 'row_count': len(df),
                 'column_count': len(df.columns),
                 'columns': list(df.columns),
                 'memory_usage': df.memory_usage(deep=True).sum(),
-                'dtypes': {col: str(dtype) for col, dtype in df.dtypes.items()}
+                'dtypes': {col: str(dtype) for col, dtype in df.dtypes.items()},
+                'null_counts': {col: int(count) for col, count in df.isna().sum().items()}
             }
 
             # Add sample data (first 5 rows)
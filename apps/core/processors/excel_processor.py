@@ -1,36 +1,161 @@
 import logging
+import openpyxl
 import pandas as pd
 import os
-from typing import Dict, Any, Optional
+from typing import Dict, Any, List, Optional, Tuple
 
 from .base import BaseProcessor
+from .context import ProcessingContext
+from .excel_workbook import excel_engine, iter_sheet_chunks, open_read_only, sheet_dimensions, sheet_shape
+from .streaming_stats import StreamingStatistics
 
 logger = logging.getLogger(__name__)
 
 
 class ExcelProcessor(BaseProcessor):
-    """Processor for Excel files (XLS, XLSX)."""
-
-    def _process_file(self, datafile) -> None:
+    """
+    Processor for Excel files (XLS, XLSX).
+
+    The workbook is opened once per run, with the pandas engine set by
+    engine (python-calamine, when installed with pandas >= 2.2, by
+    default; requirements/base.txt pins pandas 2.1.1, which uses the
+    openpyxl/xlrd default). The counts of sheets_info come from the sheet dimension
+    records where the file has them, and the sheets without one are parsed
+    in parallel on the worker pool. A first sheet larger than
+    streaming_cells is streamed from openpyxl's read-only reader in chunks
+    of chunk_rows rows into StreamingStatistics (quantiles are then
+    approximate); _process_file writes the CSV export in the same way,
+    in the pass that computes the statistics when no earlier stage of
+    the run needed them.
+    """
+
+    # First sheets with more cells than this (by dimension record) are streamed
+    streaming_cells = 10_000_000
+    # Rows per chunk in streaming mode
+    chunk_rows = 50_000
+    # Take the counts of sheets_info from the dimension records instead of parsing the sheets
+    use_dimensions = True
+    # pandas reader engine ('calamine', 'openpyxl', ...; None = excel_engine(), the fastest available)
+    engine: Optional[str] = None
+
+    def _engine(self) -> Optional[str]:
+        return self.engine if self.engine is not None else excel_engine()
+
+    def _workbook(self, datafile, context: ProcessingContext) -> pd.ExcelFile:
+        """Open the workbook once per processing run."""
+        return context.get('workbook', lambda: pd.ExcelFile(datafile.file.path, engine=self._engine()))
+
+    def _sheet(self, datafile, context: ProcessingContext, sheet_name=0) -> pd.DataFrame:
+        """Parse a sheet (the first one by default) once per processing run."""
+        workbook = self._workbook(datafile, context)
+        if isinstance(sheet_name, int):
+            sheet_name = workbook.sheet_names[sheet_name]
+        return context.get(('sheet', sheet_name), lambda: workbook.parse(sheet_name))
+
+    def _read_only_book(self, datafile, context: ProcessingContext) -> Optional[openpyxl.Workbook]:
+        """The openpyxl read-only workbook (pandas' own one with the openpyxl engine), None for .xls."""
+        book = self._workbook(datafile, context).book
+        if isinstance(book, openpyxl.Workbook) and book.read_only:
+            return book
+        return context.get('read_only_book', lambda: open_read_only(datafile.file.path))
+
+    def _dimensions(self, datafile, context: ProcessingContext) -> Dict[str, Tuple[int, int]]:
+        return context.get('dimensions', lambda: sheet_dimensions(self._read_only_book(datafile, context)))
+
+    def _is_streaming(self, datafile, context: ProcessingContext, sheet_name: str) -> bool:
+        shape = self._dimensions(datafile, context).get(sheet_name)
+        return shape is not None and (shape[0] + 1) * shape[1] > self.streaming_cells
+
+    def _processed_path(self, datafile) -> str:
+        return f"{os.path.splitext(datafile.file.path)[0]}.csv"
+
+    def _streaming_statistics(self, datafile, context: ProcessingContext, sheet_name: str) -> StreamingStatistics:
+        """Summarize a sheet chunk by chunk, once per processing run."""
+        def load() -> StreamingStatistics:
+            statistics = StreamingStatistics()
+            for chunk in iter_sheet_chunks(self._read_only_book(datafile, context), sheet_name, self.chunk_rows):
+                statistics.update(chunk)
+            return statistics
+        return context.get(('streaming_statistics', sheet_name), load)
+
+    def _export_streaming(self, datafile, context: ProcessingContext, sheet_name: str) -> StreamingStatistics:
+        """
+        Write the CSV export of a sheet chunk by chunk.
+
+        The statistics are computed in the same pass unless an earlier
+        stage of the run already has them.
+        """
+        statistics = None if ('streaming_statistics', sheet_name) in context else StreamingStatistics()
+        book = self._read_only_book(datafile, context)
+        with open(self._processed_path(datafile), 'w', newline='', encoding='utf-8') as f:
+            for i, chunk in enumerate(iter_sheet_chunks(book, sheet_name, self.chunk_rows)):
+                if statistics is not None:
+                    statistics.update(chunk)
+                chunk.to_csv(f, index=False, header=i == 0)
+        return context.get(('streaming_statistics', sheet_name), lambda: statistics)
+
+    def _has_rows(self, datafile, context: ProcessingContext, sheet_name: str) -> bool:
+        """Whether a streamed sheet has a row below its header, reading no further than that row."""
+        if ('streaming_statistics', sheet_name) in context:
+            return self._streaming_statistics(datafile, context, sheet_name).row_count > 0
+        first = next(iter_sheet_chunks(self._read_only_book(datafile, context), sheet_name, 1), None)
+        return first is not None and not first.empty
+
+    def _sheet_shapes(self, datafile, context: ProcessingContext, sheet_names: List[str]) -> Dict[str, Dict[str, int]]:
+        """Row and column counts of the sheets, parsing only those that aren't known yet."""
+        dimensions = self._dimensions(datafile, context) if self.use_dimensions else {}
+        shapes: Dict[str, Tuple[int, int]] = {}
+        pending = []
+        for sheet in sheet_names:
+            if ('sheet', sheet) in context:
+                shapes[sheet] = self._sheet(datafile, context, sheet).shape
+            elif ('streaming_statistics', sheet) in context:
+                statistics = self._streaming_statistics(datafile, context, sheet)
+                shapes[sheet] = (statistics.row_count, len(statistics.columns))
+            elif sheet in dimensions:
+                shapes[sheet] = dimensions[sheet]
+            else:
+                pending.append(sheet)
+
+        if len(pending) == 1:
+            shapes[pending[0]] = self._sheet(datafile, context, pending[0]).shape
+        elif pending:
+            # Each worker opens the file itself and parses one sheet
+            with self._executor(len(pending)) as executor:
+                futures = {sheet: executor.submit(sheet_shape, datafile.file.path, sheet, self._engine())
+                           for sheet in pending}
+                for sheet, future in futures.items():
+                    shapes[sheet] = future.result()
+
+        return {sheet: {'row_count': int(shapes[sheet][0]), 'column_count': int(shapes[sheet][1])}
+                for sheet in sheet_names}
+
+    def _process_file(self, datafile, context: Optional[ProcessingContext] = None) -> None:
         """Process an Excel file."""
         file_path = datafile.file.path
         logger.info(f"Processing Excel file: {file_path}")
 
         try:
-            # Example processing - read the Excel file
-            df = pd.read_excel(file_path)
-
-            # Perform any processing you need
-            # For example, data cleaning, transformation, etc.
+            processed_path = self._processed_path(datafile)
+            with self._context(datafile, context) as context:
+                sheet_name = self._workbook(datafile, context).sheet_names[0]
+                if self._is_streaming(datafile, context, sheet_name):
+                    stats = self._export_streaming(datafile, context, sheet_name).describe()
+                else:
+                    # Example processing - read the first sheet of the Excel file
+                    df = self._sheet(datafile, context, sheet_name)
+
+                    # Perform any processing you need
+                    # For example, data cleaning, transformation, etc.
+
+                    # You might want to save processed data to a new file format like CSV
+                    df.to_csv(processed_path, index=False)
+                    stats = df.describe().to_dict()
 
-            # You might want to save processed data to a new file format like CSV
-            processed_path = f"{os.path.splitext(file_path)[0]}.csv"
-            df.to_csv(processed_path, index=False)
             datafile.processed_file = processed_path
             datafile.save(update_fields=['processed_file'])
 
             # Example: Store summary statistics
-            stats = df.describe().to_dict()
             datafile.statistics = stats
             datafile.save(update_fields=['statistics'])
 
@@ -38,7 +163,7 @@ class ExcelProcessor(BaseProcessor):
             logger.exception(f"Error processing Excel file {file_path}")
             raise
 
-    def validate(self, datafile) -> Dict[str, Any]:
+    def validate(self, datafile, context: Optional[ProcessingContext] = None) -> Dict[str, Any]:
         """Validate that the file is a valid Excel file."""
         try:
             # Check file extension
@@ -46,49 +171,50 @@ class ExcelProcessor(BaseProcessor):
                 return {'is_valid': False, 'message': 'File is not an Excel file'}
 
             # Try to read with pandas
-            df = pd.read_excel(datafile.file.path)
+            with self._context(datafile, context) as context:
+                sheet_name = self._workbook(datafile, context).sheet_names[0]
+                if self._is_streaming(datafile, context, sheet_name):
+                    is_empty = not self._has_rows(datafile, context, sheet_name)
+                else:
+                    is_empty = self._sheet(datafile, context, sheet_name).empty
 
             # Check if file has data
-            if df.empty:
+            if is_empty:
                 return {'is_valid': False, 'message': 'Excel file is empty'}
 
             return {'is_valid': True, 'message': 'Valid Excel file'}
         except Exception as e:
             return {'is_valid': False, 'message': f'Invalid Excel file: {str(e)}'}
 
-    def extract_metadata(self, datafile) -> Optional[Dict[str, Any]]:
+    def extract_metadata(self, datafile, context: Optional[ProcessingContext] = None) -> Optional[Dict[str, Any]]:
         """Extract metadata from the Excel file."""
         try:
-            # Get sheet names
-            excel_file = pd.ExcelFile(datafile.file.path)
-            sheet_names = excel_file.sheet_names
-
-            # Read first sheet for basic metadata
-            df = pd.read_excel(datafile.file.path, sheet_name=sheet_names[0])
-
-            metadata = {
-                'sheet_count': len(sheet_names),
-                'sheet_names': sheet_names,
-                'row_count': len(df),
-                'column_count': len(df.columns),
-                'columns': list(df.columns),
-                'memory_usage': df.memory_usage(deep=True).sum(),
-                'dtypes': {col: str(dtype) for col, dtype in df.dtypes.items()}
-            }
-
-            # Add sample data (first 5 rows of first sheet)
-            metadata['sample'] = df.head(5).to_dict('records')
-
-            # Add basic info about other sheets
-            metadata['sheets_info'] = {}
-            for sheet in sheet_names:
-                sheet_df = pd.read_excel(datafile.file.path, sheet_name=sheet)
-                metadata['sheets_info'][sheet] = {
-                    'row_count': len(sheet_df),
-                    'column_count': len(sheet_df.columns)
-                }
+            with self._context(datafile, context) as context:
+                # Get sheet names
+                sheet_names = self._workbook(datafile, context).sheet_names
+
+                # Read first sheet for basic metadata
+                if self._is_streaming(datafile, context, sheet_names[0]):
+                    metadata = self._streaming_statistics(datafile, context, sheet_names[0]).metadata()
+                else:
+                    df = self._sheet(datafile, context, sheet_names[0])
+                    metadata = {
+                        'row_count': len(df),
+                        'column_count': len(df.columns),
+                        'columns': list(df.columns),
+                        'memory_usage': df.memory_usage(deep=True).sum(),
+                        'dtypes': {col: str(dtype) for col, dtype in df.dtypes.items()},
+                        'null_counts': {col: int(count) for col, count in df.isna().sum().items()}
+                    }
+
+                    # Add sample data (first 5 rows of first sheet)
+                    metadata['sample'] = df.head(5).to_dict('records')
+                metadata = {'sheet_count': len(sheet_names), 'sheet_names': sheet_names, **metadata}
+
+                # Add basic info about other sheets (dimension records are upper bounds)
+                metadata['sheets_info'] = self._sheet_shapes(datafile, context, sheet_names)
 
             return metadata
         except Exception as e:
             logger.error(f"Error extracting metadata from Excel: {str(e)}")
-            return None
\ No newline at end of file
+            return None
@@ -0,0 +1,132 @@
+# apps/core/processors/excel_workbook.py
+import zipfile
+from typing import Dict, Iterator, List, Optional, Tuple
+
+import openpyxl
+import pandas as pd
+
+
+def excel_engine() -> Optional[str]:
+    """
+    Fastest reader engine available to pandas.
+
+    Returns:
+        'calamine' when python-calamine is installed and pandas (>= 2.2)
+        supports it, else None for the pandas default (openpyxl/xlrd)
+    """
+    try:
+        import python_calamine  # noqa: F401
+    except ImportError:
+        return None
+    major, minor = (int(part) for part in pd.__version__.split('.')[:2])
+    return 'calamine' if (major, minor) >= (2, 2) else None
+
+
+def open_read_only(path: str) -> Optional[openpyxl.Workbook]:
+    """
+    Open an OOXML workbook in openpyxl's streaming read-only mode.
+
+    Returns:
+        The workbook, or None for legacy .xls files (whatever their extension)
+    """
+    if not zipfile.is_zipfile(path):
+        return None
+    return openpyxl.load_workbook(path, read_only=True, data_only=True, keep_links=False)
+
+
+def sheet_dimensions(workbook: Optional[openpyxl.Workbook]) -> Dict[str, Tuple[int, int]]:
+    """
+    Shape of each sheet from its dimension record, without reading cells.
+
+    The record is an upper bound: formatted but empty trailing cells count.
+    Sheets written without a record are left out, and so are those whose
+    record is the single cell "A1", which some writers emit whatever the
+    sheet holds.
+
+    Returns:
+        Sheet name -> (rows below the header row, columns)
+    """
+    if workbook is None:
+        return {}
+    dimensions = {}
+    for sheet in workbook.worksheets:
+        if not sheet.max_row or not sheet.max_column:
+            continue
+        if sheet.max_row == sheet.min_row and sheet.max_column == sheet.min_column:
+            continue
+        dimensions[sheet.title] = (sheet.max_row - sheet.min_row, sheet.max_column - sheet.min_column + 1)
+    return dimensions
+
+
+def iter_sheet_chunks(workbook: openpyxl.Workbook, sheet_name: str, chunk_rows: int) -> Iterator[pd.DataFrame]:
+    """
+    Stream a sheet as DataFrames of up to chunk_rows rows.
+
+    The frames are those of read_excel: the first row is the header,
+    empty rows are kept except at the end, columns without a header name
+    are "Unnamed: n" and duplicate names are numbered ('a', 'a.1', ...).
+    Only one chunk of rows is held in memory, so a row wider than all the
+    rows of earlier chunks adds its columns from its own chunk on.
+    """
+    names: Optional[List] = None
+    header: List = []
+    rows = []
+    blank = 0
+    yielded = False
+    for row in workbook[sheet_name].iter_rows(values_only=True):
+        width = len(row)
+        while width and row[width - 1] is None:
+            width -= 1
+        if names is None:
+            names = list(row[:width])
+            header = _column_names(names, width)
+            continue
+        if not width:
+            # Kept only if a non-empty row follows
+            blank += 1
+            continue
+        if width > len(header):
+            header = _column_names(names, width)
+        rows.extend([()] * blank)
+        blank = 0
+        rows.append(row[:width])
+        while len(rows) >= chunk_rows:
+            yield _frame(rows[:chunk_rows], header)
+            rows = rows[chunk_rows:]
+            yielded = True
+    # An empty last chunk only to carry the columns of a header-only sheet
+    if names is not None and (rows or not yielded):
+        yield _frame(rows, header)
+
+
+def _frame(rows: List[tuple], header: List) -> pd.DataFrame:
+    return pd.DataFrame([row + (None,) * (len(header) - len(row)) for row in rows], columns=header)
+
+
+def _column_names(names: List, width: int) -> List:
+    """
+    Column names of a header row, as the read_excel parser makes them.
+
+    Missing names are "Unnamed: n", and duplicates get the first free
+    suffix '.1', '.2', ..., given names being numbered before unnamed ones.
+    """
+    columns = [names[i] if i < len(names) and names[i] is not None else f"Unnamed: {i}" for i in range(width)]
+    unnamed = [i for i in range(width) if i >= len(names) or names[i] is None]
+    counts: Dict = {}
+    for i in [i for i in range(width) if i not in unnamed] + unnamed:
+        column = original = columns[i]
+        count = counts.get(column, 0)
+        while count:
+            counts[original] = count + 1
+            column = f"{original}.{count}"
+            count = count + 1 if column in columns else counts.get(column, 0)
+        columns[i] = column
+        counts[column] = count + 1
+    return columns
+
+
+def sheet_shape(path: str, sheet_name: str, engine: Optional[str]) -> Tuple[int, int]:
+    """Parse one sheet and return its (rows, columns) (runs in a worker process)."""
+    with pd.ExcelFile(path, engine=engine) as workbook:
+        df = workbook.parse(sheet_name)
+    return df.shape
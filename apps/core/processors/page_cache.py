@@ -0,0 +1,204 @@
+# apps/core/processors/page_cache.py
+import hashlib
+import os
+import sqlite3
+import threading
+import time
+from contextlib import contextmanager
+from typing import Dict, Iterable, Iterator, Optional, Set
+
+from django.conf import settings
+
+_shared_caches: Dict[str, 'PageTextCache'] = {}
+_shared_lock = threading.Lock()
+
+# Default of settings.PDF_PAGE_CACHE_MAX_AGE: entries are dropped 30 days after they were cached
+DEFAULT_MAX_AGE = 30 * 24 * 60 * 60
+# Seconds between two sweeps of the expired entries
+PRUNE_INTERVAL = 60 * 60
+
+
+class PageTextCache:
+    """
+    SQLite cache of extracted PDF page text.
+
+    Pages are keyed by the MD5 of the file content and the page index, so
+    the text of a page is extracted once and reused by every later stage,
+    run or handler that reads a file with the same content.
+
+    Entries are dropped max_age seconds after they were cached, by sweeps
+    run from the writes at most every PRUNE_INTERVAL seconds, and remove()
+    drops those of a deleted file. Every process opens its own connection,
+    so an instance can be inherited across a fork.
+    """
+
+    def __init__(self, db_path: str, max_age: Optional[float] = DEFAULT_MAX_AGE):
+        """
+        Open (and create if needed) the cache.
+
+        Args:
+            db_path: Path to the SQLite database file
+            max_age: Seconds an entry is kept (None = forever)
+        """
+        if os.path.dirname(db_path):
+            os.makedirs(os.path.dirname(db_path), exist_ok=True)
+        self.db_path = db_path
+        self.max_age = max_age
+        self._pid = None
+        self._pruned_at = 0.0
+        # Create the tables now, so that a bad path fails here
+        with self._db():
+            pass
+
+    def _open(self) -> sqlite3.Connection:
+        conn = sqlite3.connect(self.db_path, check_same_thread=False, isolation_level=None)
+        conn.execute('PRAGMA journal_mode=WAL')
+        conn.execute('PRAGMA synchronous=NORMAL')
+        columns = [row[1] for row in conn.execute('PRAGMA table_info(page_text)')]
+        if columns and 'cached_at' not in columns:
+            # Written before entries expired: start over
+            conn.execute('DROP TABLE page_text')
+            conn.execute('DROP TABLE IF EXISTS documents')
+        conn.execute(
+            'CREATE TABLE IF NOT EXISTS page_text '
+            '(file_hash TEXT NOT NULL, page INTEGER NOT NULL, text TEXT NOT NULL, cached_at REAL NOT NULL, '
+            'PRIMARY KEY (file_hash, page)) WITHOUT ROWID'
+        )
+        conn.execute(
+            'CREATE TABLE IF NOT EXISTS documents '
+            '(file_hash TEXT PRIMARY KEY, page_count INTEGER NOT NULL, cached_at REAL NOT NULL) WITHOUT ROWID'
+        )
+        return conn
+
+    @contextmanager
+    def _db(self) -> Iterator[sqlite3.Connection]:
+        """The connection of this process, used under the lock."""
+        if self._pid != os.getpid():
+            # New instance, or forked: the parent's connection and lock are not ours
+            self._lock = threading.Lock()
+            self._conn = self._open()
+            self._pid = os.getpid()
+        with self._lock:
+            yield self._conn
+
+    def _prune(self, conn: sqlite3.Connection) -> None:
+        """Drop the expired entries, at most every PRUNE_INTERVAL seconds. Must hold the lock."""
+        now = time.time()
+        if self.max_age is None or now - self._pruned_at < PRUNE_INTERVAL:
+            return
+        self._pruned_at = now
+        conn.execute('DELETE FROM page_text WHERE cached_at < ?', (now - self.max_age,))
+        conn.execute('DELETE FROM documents WHERE cached_at < ?', (now - self.max_age,))
+
+    def get(self, file_hash: str, page: int) -> Optional[str]:
+        with self._db() as conn:
+            row = conn.execute(
+                'SELECT text FROM page_text WHERE file_hash = ? AND page = ?', (file_hash, page)
+            ).fetchone()
+        return row[0] if row is not None else None
+
+    def get_range(self, file_hash: str, start: int, stop: int) -> Dict[int, str]:
+        """Return the cached pages in [start, stop), by page index."""
+        with self._db() as conn:
+            rows = conn.execute(
+                'SELECT page, text FROM page_text WHERE file_hash = ? AND page >= ? AND page < ?',
+                (file_hash, start, stop)
+            ).fetchall()
+        return dict(rows)
+
+    def cached_pages(self, file_hash: str) -> Set[int]:
+        with self._db() as conn:
+            rows = conn.execute('SELECT page FROM page_text WHERE file_hash = ?', (file_hash,)).fetchall()
+        return {row[0] for row in rows}
+
+    def put(self, file_hash: str, page: int, text: str) -> None:
+        with self._db() as conn:
+            self._prune(conn)
+            conn.execute(
+                'INSERT OR REPLACE INTO page_text (file_hash, page, text, cached_at) VALUES (?, ?, ?, ?)',
+                (file_hash, page, text, time.time())
+            )
+
+    def put_many(self, file_hash: str, start: int, texts: Iterable[str]) -> None:
+        """Store the texts of consecutive pages, the first one being page start."""
+        with self._db() as conn:
+            self._prune(conn)
+            cached_at = time.time()
+            conn.execute('BEGIN IMMEDIATE')
+            try:
+                conn.executemany(
+                    'INSERT OR REPLACE INTO page_text (file_hash, page, text, cached_at) VALUES (?, ?, ?, ?)',
+                    ((file_hash, start + i, text, cached_at) for i, text in enumerate(texts))
+                )
+                conn.execute('COMMIT')
+            except BaseException:
+                conn.execute('ROLLBACK')
+                raise
+
+    def page_count(self, file_hash: str) -> Optional[int]:
+        with self._db() as conn:
+            row = conn.execute(
+                'SELECT page_count FROM documents WHERE file_hash = ?', (file_hash,)
+            ).fetchone()
+        return row[0] if row is not None else None
+
+    def set_page_count(self, file_hash: str, page_count: int) -> None:
+        with self._db() as conn:
+            self._prune(conn)
+            conn.execute(
+                'INSERT OR REPLACE INTO documents (file_hash, page_count, cached_at) VALUES (?, ?, ?)',
+                (file_hash, page_count, time.time())
+            )
+
+    def remove(self, file_hash: str) -> None:
+        """Drop everything cached for a file."""
+        with self._db() as conn:
+            conn.execute('DELETE FROM page_text WHERE file_hash = ?', (file_hash,))
+            conn.execute('DELETE FROM documents WHERE file_hash = ?', (file_hash,))
+
+    def close(self) -> None:
+        if self._pid == os.getpid():
+            with self._lock:
+                self._conn.close()
+            self._pid = None
+
+
+def file_md5(file_path: str, chunk_size: int = 1024 * 1024) -> str:
+    """MD5 of a file's content, the key of its pages in the cache."""
+    md5 = hashlib.md5()
+    with open(file_path, 'rb') as f:
+        for chunk in iter(lambda: f.read(chunk_size), b''):
+            md5.update(chunk)
+    return md5.hexdigest()
+
+
+def get_page_cache() -> Optional[PageTextCache]:
+    """
+    The page text cache at settings.PDF_PAGE_CACHE_PATH, shared in the process.
+
+    Returns:
+        The cache, or None when no path is configured (caching disabled)
+    """
+    db_path = getattr(settings, 'PDF_PAGE_CACHE_PATH', None) if settings.configured else None
+    if not db_path:
+        return None
+    with _shared_lock:
+        cache = _shared_caches.get(db_path)
+        if cache is None:
+            max_age = getattr(settings, 'PDF_PAGE_CACHE_MAX_AGE', DEFAULT_MAX_AGE)
+            cache = _shared_caches[db_path] = PageTextCache(db_path, max_age=max_age)
+        return cache
+
+
+def remove_cached_pages(sender, instance, **kwargs) -> None:
+    """
+    post_delete receiver of DataFile: drop the cached pages of a deleted PDF.
+
+    They are kept while another DataFile has the same content.
+    """
+    if instance.file_type != 'pdf' or not instance.md5_hash:
+        return
+    cache = get_page_cache()
+    if cache is None or sender.objects.filter(md5_hash=instance.md5_hash).exists():
+        return
+    cache.remove(instance.md5_hash)
@@ -0,0 +1,117 @@
+# apps/core/processors/parquet_metadata.py
+import base64
+import datetime
+import decimal
+from typing import Dict, Any, List
+
+import pyarrow.parquet as pq
+
+
+def _json_value(value: Any) -> Any:
+    """Convert a statistics value to something a JSONField can store."""
+    if value is None or isinstance(value, (bool, int, float, str)):
+        return value
+    if isinstance(value, bytes):
+        try:
+            return value.decode('utf-8')
+        except UnicodeDecodeError:
+            return base64.b64encode(value).decode('ascii')
+    if isinstance(value, (datetime.date, datetime.time)):
+        return value.isoformat()
+    if isinstance(value, decimal.Decimal):
+        return str(value)
+    return str(value)
+
+
+def _column_statistics(metadata: pq.FileMetaData) -> Dict[str, Dict[str, Any]]:
+    """Merge the column chunk statistics of all row groups, per leaf column."""
+    columns: Dict[str, Dict[str, Any]] = {}
+    for rg in range(metadata.num_row_groups):
+        row_group = metadata.row_group(rg)
+        for i in range(row_group.num_columns):
+            chunk = row_group.column(i)
+            column = columns.setdefault(chunk.path_in_schema, {
+                'physical_type': chunk.physical_type,
+                'compression': chunk.compression,
+                'compressed_size': 0,
+                'uncompressed_size': 0,
+                'null_count': 0,
+                'min': None,
+                'max': None,
+                '_complete': True,
+            })
+            column['compressed_size'] += chunk.total_compressed_size
+            column['uncompressed_size'] += chunk.total_uncompressed_size
+
+            stats = chunk.statistics
+            if stats is None:
+                column['_complete'] = False
+                continue
+            if stats.has_null_count and column['null_count'] is not None:
+                column['null_count'] += stats.null_count
+            else:
+                column['null_count'] = None
+            if stats.has_min_max:
+                column['min'] = stats.min if column['min'] is None else min(column['min'], stats.min)
+                column['max'] = stats.max if column['max'] is None else max(column['max'], stats.max)
+            elif stats.num_values:
+                # A chunk with values but no min/max makes the file-level range unknown
+                column['_complete'] = False
+
+    for column in columns.values():
+        complete = column.pop('_complete')
+        if not complete:
+            column['min'] = column['max'] = None
+            column['null_count'] = None
+        column['min'] = _json_value(column['min'])
+        column['max'] = _json_value(column['max'])
+    return columns
+
+
+def footer_metadata(parquet_file: pq.ParquetFile) -> Dict[str, Any]:
+    """
+    Describe a Parquet file from its footer, without reading row data.
+
+    Args:
+        parquet_file: Open ParquetFile
+
+    Returns:
+        Row count, columns and pandas dtypes, row-group layout, compressed
+        and uncompressed sizes and per-column min/max/null_count
+    """
+    metadata = parquet_file.metadata
+    # Columns and dtypes exactly as read_parquet would return them (index columns excluded)
+    empty = parquet_file.schema_arrow.empty_table().to_pandas()
+
+    row_groups: List[Dict[str, Any]] = []
+    for rg in range(metadata.num_row_groups):
+        row_group = metadata.row_group(rg)
+        row_groups.append({
+            'num_rows': row_group.num_rows,
+            'compressed_size': sum(row_group.column(i).total_compressed_size for i in range(row_group.num_columns)),
+            'uncompressed_size': row_group.total_byte_size,
+        })
+
+    return {
+        'row_count': metadata.num_rows,
+        'column_count': len(empty.columns),
+        'columns': [str(column) for column in empty.columns],
+        'dtypes': {str(column): str(dtype) for column, dtype in empty.dtypes.items()},
+        'num_row_groups': metadata.num_row_groups,
+        'row_groups': row_groups,
+        'compressed_size': sum(row_group['compressed_size'] for row_group in row_groups),
+        'uncompressed_size': sum(row_group['uncompressed_size'] for row_group in row_groups),
+        'column_statistics': _column_statistics(metadata),
+        'created_by': metadata.created_by,
+        'format_version': metadata.format_version,
+    }
+
+
+def sample_rows(parquet_file: pq.ParquetFile, count: int = 5) -> List[Dict[str, Any]]:
+    """Return the first rows, reading only the start of the first non-empty row group."""
+    metadata = parquet_file.metadata
+    for rg in range(metadata.num_row_groups):
+        if metadata.row_group(rg).num_rows:
+            batch = next(parquet_file.iter_batches(batch_size=count, row_groups=[rg]))
+            return batch.to_pandas().head(count).to_dict('records')
+    return []
@@ -1,77 +1,132 @@
 import logging
 import pandas as pd
+import pyarrow.parquet as pq
 import os
-from typing import Dict, Any, Optional
+from typing import Dict, Any, List, Optional
 
 from .base import BaseProcessor
+from .context import ProcessingContext
+from .parquet_metadata import footer_metadata, sample_rows
+from .streaming_stats import StreamingStatistics, is_numeric_dtype
 
 logger = logging.getLogger(__name__)
 
 
-class ParquetProcessor(BaseProcessor):
-    """Processor for Parquet files."""
+def _row_group_statistics(file_path: str, row_group: int, columns: List[str],
+                          exact_items: int = 0) -> StreamingStatistics:
+    """Summarize the given columns of one row group (runs in a worker process)."""
+    statistics = StreamingStatistics(sample_size=0, exact_items=exact_items)
+    with pq.ParquetFile(file_path) as parquet_file:
+        statistics.update(parquet_file.read_row_group(row_group, columns=columns).to_pandas())
+    return statistics
+
 
-    def _process_file(self, datafile) -> None:
+class ParquetProcessor(BaseProcessor):
+    """
+    Processor for Parquet files.
+
+    Statistics are computed per row group on a process pool, reading only
+    the columns DataFrame.describe() summarizes (numbers, datetimes), and
+    the partial aggregates are merged in file order; quantiles are exact
+    for files of up to exact_quantile_rows rows. The optional CSV export
+    is written one row group at a time, so memory stays proportional to a
+    row group whatever the file size.
+    """
+
+    # Write a CSV copy of the file next to it
+    export_csv = True
+    # Files with at most this many rows get exact quantiles (the values of
+    # the summarized columns are then held in memory), larger ones sketched
+    exact_quantile_rows = 100_000
+
+    def _parquet_file(self, datafile, context: ProcessingContext) -> pq.ParquetFile:
+        """Open the Parquet file (and parse its footer) once per processing run."""
+        return context.get('parquet_file', lambda: pq.ParquetFile(datafile.file.path))
+
+    def _process_file(self, datafile, context: Optional[ProcessingContext] = None) -> None:
         """Process a Parquet file."""
         file_path = datafile.file.path
         logger.info(f"Processing Parquet file: {file_path}")
 
         try:
-            # Example processing - read the Parquet file
-            df = pd.read_parquet(file_path)
-
-            # Perform any processing you need
-            # For example, data cleaning, transformation, etc.
-
-            # Example: Convert to CSV for easier access if needed
-            csv_path = f"{os.path.splitext(file_path)[0]}.csv"
-            df.to_csv(csv_path, index=False)
-
-            # Update datafile with processed file path
-            datafile.processed_file = csv_path
-            datafile.save(update_fields=['processed_file'])
-
-            # Example: Store summary statistics
-            stats = df.describe().to_dict()
-            datafile.statistics = stats
+            with self._context(datafile, context) as context:
+                parquet_file = self._parquet_file(datafile, context)
+                row_groups = range(parquet_file.metadata.num_row_groups)
+                # Statistics only need the numeric and datetime columns
+                dtypes = parquet_file.schema_arrow.empty_table().to_pandas().dtypes
+                numeric_columns = [str(column) for column, dtype in dtypes.items() if is_numeric_dtype(dtype)]
+                num_rows = parquet_file.metadata.num_rows
+                exact_items = num_rows if num_rows <= self.exact_quantile_rows else 0
+
+                with self._executor(len(row_groups)) as executor:
+                    futures = [executor.submit(_row_group_statistics, file_path, rg, numeric_columns, exact_items)
+                               for rg in row_groups]
+
+                    # Export while the pool computes the statistics
+                    if self.export_csv:
+                        csv_path = f"{os.path.splitext(file_path)[0]}.csv"
+                        self._export_csv(parquet_file, csv_path)
+
+                        # Update datafile with processed file path
+                        datafile.processed_file = csv_path
+                        datafile.save(update_fields=['processed_file'])
+
+                    statistics = StreamingStatistics(sample_size=0, exact_items=exact_items)
+                    for future in futures:
+                        statistics.merge(future.result())
+
+            # Store summary statistics
+            datafile.statistics = statistics.describe()
             datafile.save(update_fields=['statistics'])
 
         except Exception as e:
             logger.exception(f"Error processing Parquet file {file_path}")
             raise
 
-    def validate(self, datafile) -> Dict[str, Any]:
+    def _export_csv(self, parquet_file: pq.ParquetFile, csv_path: str) -> None:
+        """Write the file as CSV one row group at a time."""
+        with open(csv_path, 'w', newline='', encoding='utf-8') as f:
+            for rg in range(parquet_file.metadata.num_row_groups):
+                df = parquet_file.read_row_group(rg, use_pandas_metadata=True).to_pandas()
+                df.to_csv(f, index=False, header=rg == 0)
+            if parquet_file.metadata.num_row_groups == 0:
+                parquet_file.schema_arrow.empty_table().to_pandas().to_csv(f, index=False)
+
+    def validate(self, datafile, context: Optional[ProcessingContext] = None) -> Dict[str, Any]:
         """Validate that the file is a valid Parquet file."""
         try:
             # Check file extension
             if not datafile.file.name.lower().endswith('.parquet'):
                 return {'is_valid': False, 'message': 'File is not a Parquet file'}
 
-            # Try to read with pandas
-            df = pd.read_parquet(datafile.file.path)
+            # Parse the footer, the row data is not read
+            with self._context(datafile, context) as context:
+                parquet_file = self._parquet_file(datafile, context)
+                is_empty = parquet_file.metadata.num_rows == 0 or not parquet_file.schema_arrow.names
 
             # Check if file has data
-            if df.empty:
+            if is_empty:
                 return {'is_valid': False, 'message': 'Parquet file is empty'}
 
             return {'is_valid': True, 'message': 'Valid Parquet file'}
         except Exception as e:
             return {'is_valid': False, 'message': f'Invalid Parquet file: {str(e)}'}
 
-    def extract_metadata(self, datafile) -> Optional[Dict[str, Any]]:
-        """Extract metadata from the Parquet file."""
+    def extract_metadata(self, datafile, context: Optional[ProcessingContext] = None) -> Optional[Dict[str, Any]]:
+        """
+        Extract metadata from the Parquet file footer.
+
+        Row count, schema, row-group layout, sizes and column statistics
+        come from the footer; only the sample reads rows, from the first
+        row group.
+        """
         try:
-            df = pd.read_parquet(datafile.file.path)
-            metadata = {
-                'row_count': len(df),
-                'column_count': len(df.columns),
-                'columns': list(df.columns),
-                'memory_usage': df.memory_usage(deep=True).sum(),
-                'dtypes': {col: str(dtype) for col, dtype in df.dtypes.items()}
-            }
-
-            # Add sample data (first 5 rows)
-            metadata['sample'] = df.head(5).to_dict('records')
+            with self._context(datafile, context) as context:
+                parquet_file = self._parquet_file(datafile, context)
+                metadata = footer_metadata(parquet_file)
+
+                # Add sample data (first 5 rows)
+                metadata['sample'] = sample_rows(parquet_file, 5)
 
             return metadata
         except Exception as e:
@@ -1,29 +1,104 @@
 import logging
+import multiprocessing
 import PyPDF2
 import os
-from typing import Dict, Any, Optional
+from collections import deque
+from typing import Dict, Any, Iterator, List, Optional, Tuple
 
 from .base import BaseProcessor
+from .context import ProcessingContext
+from .page_cache import PageTextCache, file_md5, get_page_cache
 
 logger = logging.getLogger(__name__)
 
 
-class PDFProcessor(BaseProcessor):
-    """Processor for PDF files."""
+def _extract_pages(file_path: str, start: int, stop: int) -> List[str]:
+    """Extract the text of pages [start, stop) (runs in a worker process)."""
+    with open(file_path, 'rb') as f:
+        reader = PyPDF2.PdfReader(f)
+        return [reader.pages[page_num].extract_text() for page_num in range(start, stop)]
+
+
+def _segments(page_count: int, cached: set, size: int) -> List[Tuple[int, int, bool]]:
+    """Split the pages into runs of at most size pages that are all cached or all missing."""
+    segments = []
+    start = 0
+    for page_num in range(1, page_count + 1):
+        if page_num == page_count or page_num - start == size or (page_num in cached) != (start in cached):
+            segments.append((start, page_num, start in cached))
+            start = page_num
+    return segments
 
-    def _process_file(self, datafile) -> None:
+
+class PDFProcessor(BaseProcessor):
+    """
+    Processor for PDF files.
+
+    Page text is extracted by ranges of pages_per_task pages on the worker
+    pool and written to the .txt export in page order as the ranges
+    complete, with at most two ranges per worker in flight, so memory does
+    not grow with the page count. Extracted pages are kept in the page text
+    cache (settings.PDF_PAGE_CACHE_PATH, keyed by file MD5 and page index)
+    that validate, extract_metadata and PdfHandler.read_data also use.
+    """
+
+    # Pages extracted per worker task
+    pages_per_task = 16
+    # Page text cache (None = the shared cache of settings.PDF_PAGE_CACHE_PATH, if set)
+    page_cache: Optional[PageTextCache] = None
+
+    def _reader(self, datafile, context: ProcessingContext) -> PyPDF2.PdfReader:
+        """Open and parse the PDF once per processing run."""
+        file = context.get('file', lambda: open(datafile.file.path, 'rb'))
+        return context.get('reader', lambda: PyPDF2.PdfReader(file))
+
+    def _cache(self) -> Optional[PageTextCache]:
+        return self.page_cache if self.page_cache is not None else get_page_cache()
+
+    def _file_hash(self, datafile, context: ProcessingContext) -> str:
+        """Key of the file in the cache: the recorded md5_hash, else the MD5 of the file as read now."""
+        return context.get('file_hash', lambda: getattr(datafile, 'md5_hash', None) or file_md5(datafile.file.path))
+
+    def _page_count(self, datafile, context: ProcessingContext, use_cache: bool = True) -> int:
+        """Number of pages, from the cache when the file was read before (and use_cache is set)."""
+        def load() -> int:
+            cache = self._cache()
+            page_count = cache.page_count(self._file_hash(datafile, context)) if cache and use_cache else None
+            if page_count is None:
+                page_count = len(self._reader(datafile, context).pages)
+                if cache:
+                    cache.set_page_count(self._file_hash(datafile, context), page_count)
+            return page_count
+        return context.get('page_count', load)
+
+    def _load_page_text(self, datafile, context: ProcessingContext, page_num: int) -> str:
+        """Text of a page from the cache, extracting and caching it on a miss."""
+        cache = self._cache()
+        text = cache.get(self._file_hash(datafile, context), page_num) if cache else None
+        if text is None:
+            text = self._reader(datafile, context).pages[page_num].extract_text()
+            if cache:
+                cache.put(self._file_hash(datafile, context), page_num, text)
+        return text
+
+    def _page_text(self, datafile, context: ProcessingContext, page_num: int) -> str:
+        """Extract the text of a page once per processing run."""
+        return context.get(('page_text', page_num), lambda: self._load_page_text(datafile, context, page_num))
+
+    def _process_file(self, datafile, context: Optional[ProcessingContext] = None) -> None:
         """Process a PDF file."""
         file_path = datafile.file.path
         logger.info(f"Processing PDF file: {file_path}")
 
         try:
-            # Extract text from PDF
-            text_content = self._extract_text(file_path)
-
-            # Save extracted text to a new file
+            # Extract text from PDF and save it to a new file, page by page
             text_path = f"{os.path.splitext(file_path)[0]}.txt"
-            with open(text_path, 'w', encoding='utf-8') as f:
-                f.write(text_content)
+            with self._context(datafile, context) as context:
+                with open(text_path, 'w', encoding='utf-8') as f:
+                    for page_num, text in enumerate(self._iter_text(datafile, context)):
+                        if page_num:
+                            f.write("\n")
+                        f.write(text)
 
             # Update datafile with text path
             datafile.processed_file = text_path
@@ -33,40 +108,83 @@ class PDFProcessor(BaseProcessor):
             logger.exception(f"Error processing PDF file {file_path}")
             raise
 
-    def _extract_text(self, file_path: str) -> str:
-        """Extract text content from a PDF file."""
-        text = []
-        with open(file_path, 'rb') as file:
-            pdf_reader = PyPDF2.PdfReader(file)
-            for page_num in range(len(pdf_reader.pages)):
-                page = pdf_reader.pages[page_num]
-                text.append(page.extract_text())
-        return "\n".join(text)
-
-    def validate(self, datafile) -> Dict[str, Any]:
+    def _iter_text(self, datafile, context: ProcessingContext) -> Iterator[str]:
+        """Yield the text of every page in order, extracting the missing pages in parallel."""
+        cache = self._cache()
+        file_hash = self._file_hash(datafile, context)
+        page_count = self._page_count(datafile, context)
+        cached = cache.cached_pages(file_hash) if cache else set()
+        # Pages this run already extracted count as cached
+        cached |= {page_num for page_num in range(page_count) if ('page_text', page_num) in context}
+        segments = _segments(page_count, cached, self.pages_per_task)
+        tasks = sum(1 for segment in segments if not segment[2])
+
+        # PyPDF2 is pure Python: without worker processes, extract in this one
+        if tasks <= 1 or multiprocessing.current_process().daemon:
+            for page_num in range(page_count):
+                if ('page_text', page_num) in context:
+                    yield self._page_text(datafile, context, page_num)
+                else:
+                    yield self._load_page_text(datafile, context, page_num)
+            return
+
+        in_flight = 2 * max(1, min(tasks, self.max_workers or os.cpu_count() or 1))
+        with self._executor(tasks) as executor:
+            pending = deque()
+            remaining = iter(segments)
+
+            def submit_next() -> None:
+                for start, stop, is_cached in remaining:
+                    future = None if is_cached else executor.submit(_extract_pages, datafile.file.path, start, stop)
+                    pending.append((start, stop, future))
+                    return
+
+            for _ in range(in_flight):
+                submit_next()
+            while pending:
+                start, stop, future = pending.popleft()
+                submit_next()
+                if future is not None:
+                    texts = future.result()
+                    if cache:
+                        cache.put_many(file_hash, start, texts)
+                    yield from texts
+                    continue
+                stored = cache.get_range(file_hash, start, stop) if cache else {}
+                for page_num in range(start, stop):
+                    if ('page_text', page_num) in context:
+                        yield self._page_text(datafile, context, page_num)
+                    elif page_num in stored:
+                        yield stored[page_num]
+                    else:
+                        yield self._load_page_text(datafile, context, page_num)
+
+    def validate(self, datafile, context: Optional[ProcessingContext] = None) -> Dict[str, Any]:
         """Validate that the file is a valid PDF."""
         try:
             # Check file extension
             if not datafile.file.name.lower().endswith('.pdf'):
                 return {'is_valid': False, 'message': 'File is not a PDF'}
 
-            # Try to open with PyPDF2
-            with open(datafile.file.path, 'rb') as file:
-                pdf_reader = PyPDF2.PdfReader(file)
+            # Try to open with PyPDF2, or find the file in the page text cache
+            # when its key was hashed from the bytes on disk in this run: a
+            # recorded md5_hash doesn't prove the file is still that PDF
+            with self._context(datafile, context) as context:
+                hashed_now = not getattr(datafile, 'md5_hash', None)
                 # Check if PDF has pages
-                if len(pdf_reader.pages) == 0:
+                if self._page_count(datafile, context, use_cache=hashed_now) == 0:
                     return {'is_valid': False, 'message': 'PDF has no pages'}
 
             return {'is_valid': True, 'message': 'Valid PDF file'}
         except Exception as e:
             return {'is_valid': False, 'message': f'Invalid PDF file: {str(e)}'}
 
-    def extract_metadata(self, datafile) -> Optional[Dict[str, Any]]:
+    def extract_metadata(self, datafile, context: Optional[ProcessingContext] = None) -> Optional[Dict[str, Any]]:
         """Extract metadata from the PDF file."""
         try:
             metadata = {}
-            with open(datafile.file.path, 'rb') as file:
-                pdf = PyPDF2.PdfReader(file)
+            with self._context(datafile, context) as context:
+                pdf = self._reader(datafile, context)
                 metadata['page_count'] = len(pdf.pages)
 
                 # Extract document info if available
@@ -79,7 +197,7 @@ class PDFProcessor(BaseProcessor):
 
                 # Extract first page text as sample
                 if len(pdf.pages) > 0:
-                    sample_text = pdf.pages[0].extract_text()
+                    sample_text = self._page_text(datafile, context, 0)
                     # Limit sample text to first 500 characters
                     metadata['sample_text'] = sample_text[:500] + ('...' if len(sample_text) > 500 else '')
 
@@ -0,0 +1,544 @@
+# apps/core/processors/pdf_tables.py
+import math
+import re
+from typing import Any, Dict, List, Optional, Sequence, Tuple
+
+import numpy as np
+import pandas as pd
+import PyPDF2
+from PyPDF2.generic import ContentStream
+
+from .base import worker_pool
+
+IDENTITY = [1.0, 0.0, 0.0, 1.0, 0.0, 0.0]
+# Glyph width (1/1000 em) of fonts without a width table, e.g. the standard 14 fonts
+DEFAULT_GLYPH_WIDTH = 500
+# Cell values that mean "no data" in statistical tables
+PLACEHOLDERS = ('', '.', '..', '...', '…', '-', '–', '—', 'x', 'n.a.', 'n/a')
+# Python codecs of the base encodings of simple fonts (StandardEncoding differs
+# from Latin-1 only in rarely used punctuation)
+BASE_ENCODINGS = {
+    '/WinAnsiEncoding': 'cp1252',
+    '/MacRomanEncoding': 'mac_roman',
+    '/StandardEncoding': 'latin-1',
+    '/PDFDocEncoding': 'latin-1',
+}
+# Glyph names of /Differences arrays that are not a character, uniXXXX or uXXXX
+GLYPH_NAMES = {
+    'space': ' ', 'exclam': '!', 'quotedbl': '"', 'numbersign': '#', 'dollar': '$', 'percent': '%',
+    'ampersand': '&', 'quotesingle': "'", 'parenleft': '(', 'parenright': ')', 'asterisk': '*',
+    'plus': '+', 'comma': ',', 'hyphen': '-', 'period': '.', 'slash': '/', 'zero': '0', 'one': '1',
+    'two': '2', 'three': '3', 'four': '4', 'five': '5', 'six': '6', 'seven': '7', 'eight': '8',
+    'nine': '9', 'colon': ':', 'semicolon': ';', 'less': '<', 'equal': '=', 'greater': '>',
+    'question': '?', 'at': '@', 'bracketleft': '[', 'backslash': '\\', 'bracketright': ']',
+    'asciicircum': '^', 'underscore': '_', 'grave': '`', 'braceleft': '{', 'bar': '|',
+    'braceright': '}', 'asciitilde': '~', 'nbspace': '\u00a0', 'degree': '°', 'minus': '−',
+    'endash': '–', 'emdash': '—', 'bullet': '•', 'ellipsis': '…', 'quoteleft': '‘',
+    'quoteright': '’', 'quotedblleft': '“', 'quotedblright': '”', 'guillemotleft': '«',
+    'guillemotright': '»', 'periodcentered': '·', 'multiply': '×', 'divide': '÷', 'Euro': '€',
+}
+
+
+def _multiply(m: Sequence[float], n: Sequence[float]) -> List[float]:
+    """Product of two PDF matrices [a b c d e f] (m applied first)."""
+    return [
+        m[0] * n[0] + m[1] * n[2], m[0] * n[1] + m[1] * n[3],
+        m[2] * n[0] + m[3] * n[2], m[2] * n[1] + m[3] * n[3],
+        m[4] * n[0] + m[5] * n[2] + n[4], m[4] * n[1] + m[5] * n[3] + n[5],
+    ]
+
+
+def _resolve(obj: Any) -> Any:
+    """Follow an indirect object reference."""
+    return obj.get_object() if hasattr(obj, 'get_object') else obj
+
+
+def _utf16(hex_digits: bytes) -> str:
+    return bytes.fromhex(hex_digits.decode('ascii')).decode('utf-16-be', 'surrogatepass')
+
+
+def parse_to_unicode(data: bytes) -> Dict[int, str]:
+    """Character code -> text of a ToUnicode CMap (its bfchar and bfrange sections)."""
+    cmap = {}
+    for section in re.findall(rb'beginbfchar(.*?)endbfchar', data, re.S):
+        digits = re.findall(rb'<([0-9A-Fa-f]*)>', section)
+        for code, text in zip(digits[0::2], digits[1::2]):
+            cmap[int(code, 16)] = _utf16(text)
+    for section in re.findall(rb'beginbfrange(.*?)endbfrange', data, re.S):
+        for low, high, target in re.findall(
+                rb'<([0-9A-Fa-f]+)>\s*<([0-9A-Fa-f]+)>\s*(<[0-9A-Fa-f]*>|\[[^\]]*\])', section):
+            low, high = int(low, 16), int(high, 16)
+            if target.startswith(b'['):
+                for i, text in enumerate(re.findall(rb'<([0-9A-Fa-f]*)>', target)):
+                    cmap[low + i] = _utf16(text)
+            else:
+                # The last byte of the target is incremented along the range
+                first = bytes.fromhex(target[1:-1].decode('ascii'))
+                for i in range(high - low + 1):
+                    cmap[low + i] = (first[:-1] + bytes([(first[-1] + i) % 256])).decode('utf-16-be', 'surrogatepass')
+    return cmap
+
+
+def glyph_text(name: str) -> Optional[str]:
+    """Text of a glyph name, None when it isn't one of the names known here."""
+    name = name.lstrip('/').split('.')[0]
+    if len(name) == 1:
+        return name
+    for prefix, digits in (('uni', (4,)), ('u', (4, 5, 6))):
+        hex_digits = name[len(prefix):]
+        if name.startswith(prefix) and len(hex_digits) in digits:
+            try:
+                return chr(int(hex_digits, 16))
+            except ValueError:
+                return None
+    return GLYPH_NAMES.get(name)
+
+
+class _Font:
+    """
+    Decoding and glyph widths of a page font.
+
+    Codes are decoded with the font's ToUnicode CMap, else (simple fonts)
+    with its base encoding and /Differences. Glyph names of /Differences
+    are read as characters, uniXXXX / uXXXX and the names of GLYPH_NAMES;
+    other names keep the base encoding's character.
+    """
+
+    def __init__(self, name: str, page: PyPDF2.PageObject):
+        fonts = _resolve(_resolve(page.get('/Resources', {})).get('/Font', {}))
+        font = _resolve(fonts[name]) if name in fonts else {}
+        self.two_byte = font.get('/Subtype') == '/Type0'
+        # Type 3 glyph widths are in glyph space, scaled to text space by the font matrix
+        self.scale = float(_resolve(font['/FontMatrix'])[0]) * 1000 if '/FontMatrix' in font else 1.0
+        self.widths: Dict[int, float] = {}
+        self.default_width = float(DEFAULT_GLYPH_WIDTH)
+
+        if self.two_byte:
+            descendant = _resolve(_resolve(font['/DescendantFonts'])[0])
+            self.default_width = float(descendant.get('/DW', 1000))
+            w = [_resolve(item) for item in _resolve(descendant.get('/W', []))]
+            i = 0
+            while i < len(w):
+                first = int(w[i])
+                if isinstance(w[i + 1], list):
+                    for j, width in enumerate(_resolve(w[i + 1])):
+                        self.widths[first + j] = float(width)
+                    i += 2
+                else:
+                    for code in range(first, int(w[i + 1]) + 1):
+                        self.widths[code] = float(w[i + 2])
+                    i += 3
+        elif '/Widths' in font:
+            first = int(font.get('/FirstChar', 0))
+            self.widths = {first + j: float(_resolve(width)) for j, width in enumerate(_resolve(font['/Widths']))}
+            descriptor = font.get('/FontDescriptor')
+            self.default_width = float(_resolve(descriptor).get('/MissingWidth', 0)) if descriptor else 0.0
+
+        self.to_unicode = parse_to_unicode(_resolve(font['/ToUnicode']).get_data()) if '/ToUnicode' in font else {}
+        self.encoding: List[str] = []
+        if not self.two_byte:
+            encoding = _resolve(font.get('/Encoding', '/StandardEncoding'))
+            base = encoding if isinstance(encoding, str) else encoding.get('/BaseEncoding', '/StandardEncoding')
+            codec = BASE_ENCODINGS.get(base, 'latin-1')
+            # Bytes the codec leaves undefined read as Latin-1
+            self.encoding = [bytes([code]).decode(codec, 'ignore') or chr(code) for code in range(256)]
+            code = 0
+            for item in (_resolve(encoding.get('/Differences', [])) if not isinstance(encoding, str) else []):
+                item = _resolve(item)
+                if isinstance(item, str):
+                    if code < 256:
+                        self.encoding[code] = glyph_text(item) or self.encoding[code]
+                    code += 1
+                else:
+                    code = int(item)
+
+    def codes(self, data: bytes) -> List[int]:
+        if self.two_byte:
+            return [int.from_bytes(data[i:i + 2], 'big') for i in range(0, len(data) - 1, 2)]
+        return list(data)
+
+    def decode(self, data: bytes) -> str:
+        """Text of a string operand."""
+        return ''.join(
+            self.to_unicode[code] if code in self.to_unicode
+            else self.encoding[code] if not self.two_byte else chr(code)
+            for code in self.codes(data)
+        )
+
+
+class _TextRuns:
+    """
+    Positioned text runs of a page content stream.
+
+    Follows the graphics and text state (cm, q/Q, Tm/Td/TD/T*, Tc, Tw, Tz,
+    TL, Tf) and the glyph advances from the font widths, and starts a new run
+    at every positioning operator and at TJ adjustments of at least
+    split_gap em, which is how table cells are separated within a line
+    (tightly set tables leave less than one em between cells).
+    Form XObjects are not entered.
+    """
+
+    def __init__(self, page: PyPDF2.PageObject, split_gap: float):
+        self.page = page
+        self.split_gap = split_gap
+        self.fonts: Dict[str, _Font] = {}
+        self.runs: List[Tuple[float, float, float, float, float, str]] = []
+
+        self.cm = list(IDENTITY)
+        self.tm = list(IDENTITY)
+        self.tlm = list(IDENTITY)
+        self.font: Optional[_Font] = None
+        self.size = 0.0
+        self.char_spacing = 0.0
+        self.word_spacing = 0.0
+        self.scaling = 1.0
+        self.leading = 0.0
+        self.stack: List[Tuple[Any, ...]] = []
+
+    def _move(self, tx: float, ty: float) -> None:
+        self.tlm = _multiply([1.0, 0.0, 0.0, 1.0, tx, ty], self.tlm)
+        self.tm = list(self.tlm)
+
+    def _advance(self, tx: float) -> None:
+        # [1 0 0 1 tx 0] x Tm, only the translation changes
+        self.tm[4] += tx * self.tm[0]
+        self.tm[5] += tx * self.tm[1]
+
+    def _string_width(self, data: bytes) -> float:
+        codes = self.font.codes(data)
+        widths = sum(self.font.widths.get(code, self.font.default_width) for code in codes) * self.font.scale
+        spaces = 0 if self.font.two_byte else codes.count(32)
+        return (widths / 1000 * self.size + self.char_spacing * len(codes) + self.word_spacing * spaces) * self.scaling
+
+    def _show(self, parts: Sequence[Any]) -> None:
+        """Emit the runs of a Tj (one string) or TJ (strings and adjustments) operand."""
+        if self.font is None:
+            return
+        start, text = None, []
+        for part in list(parts) + [None]:
+            if isinstance(part, (bytes, str)):
+                # PyPDF2 decodes text strings with PDFDocEncoding: the font decodes the bytes instead
+                data = part if isinstance(part, bytes) else part.get_original_bytes()
+                if start is None:
+                    start = _multiply(self.tm, self.cm)
+                text.append(self.font.decode(data))
+                self._advance(self._string_width(data))
+                continue
+
+            gap = -float(part) / 1000 if part is not None else math.inf
+            if gap >= self.split_gap and start is not None:
+                end = _multiply(self.tm, self.cm)
+                self.runs.append((start[4], start[5], end[4], end[5],
+                                  self.size * math.hypot(start[2], start[3]), ''.join(text)))
+                start, text = None, []
+            if part is not None:
+                self._advance(gap * self.size * self.scaling)
+
+    def extract(self) -> List[Tuple[float, float, float, float, float, str]]:
+        """Return the runs as (x0, y0, x1, y1, font size, text) in user space."""
+        contents = self.page.get_contents()
+        if contents is None:
+            return []
+        for operands, operator in ContentStream(contents, self.page.pdf).operations:
+            if operator == b'q':
+                self.stack.append((self.cm, self.font, self.size, self.char_spacing,
+                                   self.word_spacing, self.scaling, self.leading))
+            elif operator == b'Q' and self.stack:
+                (self.cm, self.font, self.size, self.char_spacing,
+                 self.word_spacing, self.scaling, self.leading) = self.stack.pop()
+            elif operator == b'cm':
+                self.cm = _multiply([float(x) for x in operands], self.cm)
+            elif operator == b'BT':
+                self.tm, self.tlm = list(IDENTITY), list(IDENTITY)
+            elif operator == b'Tf':
+                if operands[0] not in self.fonts:
+                    self.fonts[operands[0]] = _Font(operands[0], self.page)
+                self.font, self.size = self.fonts[operands[0]], float(operands[1])
+            elif operator == b'Tc':
+                self.char_spacing = float(operands[0])
+            elif operator == b'Tw':
+                self.word_spacing = float(operands[0])
+            elif operator == b'Tz':
+                self.scaling = float(operands[0]) / 100
+            elif operator == b'TL':
+                self.leading = float(operands[0])
+            elif operator == b'Td':
+                self._move(float(operands[0]), float(operands[1]))
+            elif operator == b'TD':
+                self.leading = -float(operands[1])
+                self._move(float(operands[0]), float(operands[1]))
+            elif operator == b'Tm':
+                self.tlm = [float(x) for x in operands]
+                self.tm = list(self.tlm)
+            elif operator == b'T*':
+                self._move(0.0, -self.leading)
+            elif operator == b'Tj':
+                self._show(operands)
+            elif operator == b'TJ':
+                self._show(operands[0])
+            elif operator == b"'":
+                self._move(0.0, -self.leading)
+                self._show(operands)
+            elif operator == b'"':
+                self.word_spacing, self.char_spacing = float(operands[0]), float(operands[1])
+                self._move(0.0, -self.leading)
+                self._show(operands[2:])
+        return self.runs
+
+
+def text_runs(page: PyPDF2.PageObject, split_gap: float = 0.5) -> pd.DataFrame:
+    """
+    Positioned text runs of a page in reading orientation.
+
+    Args:
+        page: PyPDF2 page
+        split_gap: TJ adjustment (em) that separates two runs of one line,
+            the column_gap of layout_tables by default
+
+    Returns:
+        DataFrame of left, right, top (growing downwards), size and text,
+        with the page /Rotate applied so that lines run left to right
+    """
+    runs = _TextRuns(page, split_gap).extract()
+    x0, y0, x1, y1, size = (np.array([run[i] for run in runs], dtype=float).reshape(-1) for i in range(5))
+    text = pd.Series([run[5] for run in runs], dtype=object)
+
+    rotation = int(page.get('/Rotate', 0) or 0) % 360
+    if rotation == 90:
+        left, right, top = y0, y1, x0
+    elif rotation == 180:
+        left, right, top = -x0, -x1, y0
+    elif rotation == 270:
+        left, right, top = -y0, -y1, -x0
+    else:
+        left, right, top = x0, x1, -y0
+
+    runs = pd.DataFrame({
+        'left': np.minimum(left, right),
+        'right': np.maximum(left, right),
+        'top': top,
+        'size': size,
+        'text': text.str.strip(),
+    })
+    return runs[runs['text'] != ''].reset_index(drop=True)
+
+
+def _breaks(values: np.ndarray, gap: float) -> np.ndarray:
+    """Cluster ids of sorted values, a new cluster starting after every gap larger than gap."""
+    return np.concatenate([[0], np.cumsum(np.diff(values) > gap)]).astype(int)
+
+
+def layout_tables(runs: pd.DataFrame, min_size_ratio: float = 0.8, row_tolerance: float = 0.5,
+                  column_gap: float = 0.5, column_rows: float = 0.5, word_gap: float = 0.15,
+                  table_gap: float = 2.5, min_rows: int = 2) -> List[pd.DataFrame]:
+    """
+    Group text runs into tables by their layout.
+
+    Rows are runs whose tops lie within row_tolerance font sizes. Columns
+    are separated by the gaps in the horizontal coverage of the runs of the
+    body rows (those with at least column_rows times the largest number of
+    runs in a row, so that titles and header cells spanning several
+    columns don't join them), and every run falls in the column it
+    overlaps most, or the nearest one. Tables are runs of rows no further apart than table_gap
+    times the median line spacing, trimmed to their first and last rows
+    with two or more cells.
+
+    Args:
+        runs: Output of text_runs
+        min_size_ratio: Runs smaller than this fraction of the median font size
+            (footnote markers) are left out
+        row_tolerance: Row clustering distance, in median font sizes
+        column_gap: Minimal gap between columns, in median font sizes
+        column_rows: Share of the largest row run count that makes a body row
+        word_gap: Gap between two runs of a cell that is a space, in median font sizes
+        table_gap: Spacing that ends a table, in median line spacings
+        min_rows: Tables with fewer rows are dropped
+
+    Returns:
+        One DataFrame of cell text per table, with integer column labels
+    """
+    if runs.empty:
+        return []
+    runs = runs[runs['size'] >= min_size_ratio * runs['size'].median()]
+    font_size = float(runs['size'].median())
+    left, right, top = runs['left'].to_numpy(), runs['right'].to_numpy(), runs['top'].to_numpy()
+
+    # Rows
+    order = np.argsort(top, kind='stable')
+    row = np.empty(len(runs), dtype=int)
+    row[order] = _breaks(top[order], row_tolerance * font_size)
+    runs_per_row = np.bincount(row)
+
+    # Columns, from the coverage of the rows with the most runs (body rows:
+    # header cells spanning several columns would join them)
+    body = runs_per_row[row] >= max(2, column_rows * runs_per_row.max())
+    if not body.any():
+        return []
+    order = np.argsort(left[body], kind='stable')
+    starts, ends = left[body][order], np.maximum.accumulate(right[body][order])
+    new_column = np.concatenate([[True], starts[1:] > ends[:-1] + column_gap * font_size])
+    column_left = starts[new_column]
+    column_right = ends[np.append(np.flatnonzero(new_column)[1:] - 1, len(ends) - 1)]
+    # Every run goes to the column it overlaps most, or the nearest one
+    # (negative overlap) when it falls between columns, so header cells
+    # centred over right-aligned numbers land in the column of the numbers
+    overlap = np.minimum(right[:, None], column_right) - np.maximum(left[:, None], column_left)
+    column = overlap.argmax(axis=1)
+
+    # Some writers set placeholders ('.', '-') apart from the numbers of
+    # their column: a column whose body cells are all placeholders joins
+    # the nearest neighbour it never shares a row with
+    n_columns = len(column_left)
+    only_placeholders = np.bincount(column[body], weights=~runs['text'][body].isin(PLACEHOLDERS).to_numpy(),
+                                    minlength=n_columns) == 0
+    if only_placeholders.any() and n_columns > 1:
+        occupied = np.zeros((n_columns, row.max() + 1), dtype=bool)
+        occupied[column, row] = True
+        target = np.arange(n_columns)
+        for c in np.flatnonzero(only_placeholders):
+            neighbours = [(column_left[c] - column_right[n] if n < c else column_left[n] - column_right[c], n)
+                          for n in (c - 1, c + 1)
+                          if 0 <= n < n_columns and not only_placeholders[n]
+                          and not (occupied[c] & occupied[target[n]]).any()]
+            if neighbours:
+                target[c] = target[min(neighbours)[1]]
+                occupied[target[c]] |= occupied[c]
+        column = np.unique(target, return_inverse=True)[1][column]
+
+    # Cells per row and tables
+    row_top = np.bincount(row, weights=top) / runs_per_row
+    cells_per_row = np.bincount(np.unique(row * (column.max() + 1) + column) // (column.max() + 1),
+                                minlength=len(runs_per_row))
+    spacing = np.diff(row_top)
+    line_spacing = float(np.median(spacing)) if len(spacing) else font_size
+    table = _breaks(row_top, table_gap * max(line_spacing, font_size))
+
+    cells = pd.DataFrame({'table': table[row], 'row': row, 'column': column,
+                          'left': left, 'right': right, 'text': runs['text'].to_numpy()})
+    cells = cells.sort_values(['row', 'column', 'left'], kind='stable')
+    # Runs of a cell are joined with a space only where the layout has one
+    previous_right = cells.groupby(['row', 'column'])['right'].shift()
+    spaced = (cells['left'] - previous_right).to_numpy() > word_gap * font_size
+    cells['text'] = np.where(spaced, ' ', '') + cells['text']
+    grid = cells.groupby(['table', 'row', 'column'], sort=True)['text'].agg(''.join).unstack('column')
+
+    tables = []
+    for table_id, frame in grid.groupby(level='table', sort=True):
+        tabular = cells_per_row[frame.index.get_level_values('row')] >= 2
+        if not tabular.any():
+            continue
+        first, last = np.flatnonzero(tabular)[[0, -1]]
+        frame = frame.iloc[first:last + 1].dropna(axis=1, how='all')
+        if len(frame) < min_rows:
+            continue
+        frame = frame.reset_index(drop=True)
+        frame.columns = range(len(frame.columns))
+        tables.append(frame)
+    return tables
+
+
+def _numbers(frame: pd.DataFrame) -> pd.DataFrame:
+    """Cells parsed as numbers (thousands spaces and '- 3.1' signs allowed), NaN elsewhere."""
+    text = frame.apply(lambda column: column.str.replace('−', '-', regex=False)
+                       .str.replace(r'(?<=\d)[  ](?=\d{3}(?!\d))', '', regex=True)
+                       .str.replace(r'^([-+])\s+(?=\d)', r'\1', regex=True))
+    return text.apply(pd.to_numeric, errors='coerce')
+
+
+def typed_table(frame: pd.DataFrame) -> pd.DataFrame:
+    """
+    Turn a grid of cell text into a table as read_excel would return it.
+
+    The rows above the body become the column labels (joined with a space
+    when there are several); the body starts at the first row label when
+    the first column is a stub of labels, else at the first row of mostly
+    numbers. Columns whose body cells are all numbers or placeholders
+    ('.', '-', ...) become numeric.
+    """
+    numbers = _numbers(frame)
+    filled = frame.notna() & ~frame.isin(PLACEHOLDERS)
+    if filled[0].any() and numbers[0].notna().sum() < 0.5 * filled[0].sum():
+        # A stub column of row labels: the body starts at the first label
+        data_rows = np.flatnonzero(filled[0].to_numpy())
+    else:
+        numeric_share = numbers.notna().sum(axis=1) / filled.sum(axis=1).clip(lower=1)
+        data_rows = np.flatnonzero(numeric_share.to_numpy() > 0.5)
+    header_rows = int(data_rows[0]) if len(data_rows) else 0
+
+    header = frame.iloc[:header_rows].fillna('')
+    body = frame.iloc[header_rows:].reset_index(drop=True)
+    numbers, filled = numbers.iloc[header_rows:].reset_index(drop=True), filled.iloc[header_rows:].reset_index(drop=True)
+
+    numeric_columns = (numbers.notna() | ~filled).all() & numbers.notna().any()
+    body = body.astype(object)
+    body.loc[:, numeric_columns] = numbers.loc[:, numeric_columns]
+    body = body.infer_objects()
+
+    if header_rows:
+        labels = header.apply(lambda column: ' '.join(value for value in column if value)).tolist()
+        body.columns = [label or f"Unnamed: {i}" for i, label in enumerate(labels)]
+    return body
+
+
+def page_tables(page: PyPDF2.PageObject, typed: bool = True, **options) -> List[pd.DataFrame]:
+    """
+    Extract the tables of a page.
+
+    Args:
+        page: PyPDF2 page
+        typed: Detect header rows and numeric columns (see typed_table)
+        **options: split_gap for text_runs, others for layout_tables
+
+    Returns:
+        The tables of the page, top to bottom
+    """
+    split_gap = options.pop('split_gap', 0.5)
+    tables = layout_tables(text_runs(page, split_gap), **options)
+    return [typed_table(table) for table in tables] if typed else tables
+
+
+def _extract_range(file_path: str, start: int, stop: int, options: Dict[str, Any]) -> List[Tuple[int, pd.DataFrame]]:
+    """Tables of pages [start, stop) as (page index, table) (runs in a worker process)."""
+    with open(file_path, 'rb') as f:
+        reader = PyPDF2.PdfReader(f)
+        return [(page_num, table)
+                for page_num in range(start, stop)
+                for table in page_tables(reader.pages[page_num], **options)]
+
+
+def extract_tables(file_path: str, pages: Optional[Sequence[int]] = None, max_workers: Optional[int] = None,
+                   pages_per_task: int = 4, **options) -> List[pd.DataFrame]:
+    """
+    Extract the tables of a PDF, pages being processed in parallel.
+
+    Args:
+        file_path: Path to the PDF
+        pages: Page indexes to read (default: all, repeated indexes are read once)
+        max_workers: Size of the worker pool (None = number of CPUs)
+        pages_per_task: Consecutive pages handled by one worker task
+        **options: Passed to page_tables
+
+    Returns:
+        The tables in page order; table.attrs['page'] is the 1-based page number
+    """
+    if pages is None:
+        with open(file_path, 'rb') as f:
+            pages = range(len(PyPDF2.PdfReader(f).pages))
+    pages = sorted(set(pages))
+    # Runs of consecutive pages, at most pages_per_task long
+    ranges = []
+    for page_num in pages:
+        if ranges and ranges[-1][1] == page_num and ranges[-1][1] - ranges[-1][0] < pages_per_task:
+            ranges[-1][1] += 1
+        else:
+            ranges.append([page_num, page_num + 1])
+
+    with worker_pool(len(ranges), max_workers) as executor:
+        futures = [executor.submit(_extract_range, file_path, start, stop, options) for start, stop in ranges]
+        results = [item for future in futures for item in future.result()]
+
+    tables = []
+    for page_num, table in results:
+        table.attrs['page'] = page_num + 1
+        tables.append(table)
+    return tables
@@ -0,0 +1,298 @@
+# apps/core/processors/streaming_stats.py
+import math
+from typing import Dict, Any, List, Optional
+
+import numpy as np
+import pandas as pd
+
+# Percentiles reported by describe(), as in DataFrame.describe()
+DESCRIBE_PERCENTILES = (0.25, 0.5, 0.75)
+
+
+class KLLSketch:
+    """
+    KLL quantile sketch.
+
+    Keeps a hierarchy of compactors: level h holds items of weight 2**h and
+    is halved into level h + 1 (keeping every other sorted item from a
+    random offset) when it exceeds its capacity. Memory is O(k) items
+    whatever the stream length, the rank error is about 1.7 / k, and two
+    sketches merge by concatenating their levels. While nothing has been
+    compacted, quantiles are exact.
+    """
+
+    def __init__(self, k: int = 200, seed: int = 0, exact_items: int = 0):
+        """
+        Args:
+            k: Capacity of the top level (accuracy/memory trade-off)
+            seed: Seed of the compaction offsets, for reproducible results
+            exact_items: Number of items kept as they are (quantiles exact)
+                before the first compaction, when more than k
+        """
+        self.k = k
+        self.exact_items = exact_items
+        self.levels: List[np.ndarray] = [np.empty(0)]
+        self.count = 0
+        self._rng = np.random.default_rng(seed)
+
+    def _capacity(self, level: int) -> int:
+        depth = len(self.levels) - level - 1
+        return max(2, int(math.ceil(self.k * (2 / 3) ** depth)))
+
+    def _compress(self) -> None:
+        if self.count <= self.exact_items:
+            return
+        level = 0
+        while level < len(self.levels):
+            items = self.levels[level]
+            if len(items) > self._capacity(level):
+                if level + 1 == len(self.levels):
+                    self.levels.append(np.empty(0))
+                items = np.sort(items)
+                # An odd item out stays at this level
+                keep = items[:len(items) % 2]
+                pairs = items[len(keep):]
+                promoted = pairs[self._rng.integers(2)::2]
+                self.levels[level] = keep
+                self.levels[level + 1] = np.concatenate([self.levels[level + 1], promoted])
+            level += 1
+
+    def update(self, values: np.ndarray) -> None:
+        """Add values (NaN must be removed beforehand)."""
+        values = np.asarray(values, dtype=float)
+        if not len(values):
+            return
+        self.levels[0] = np.concatenate([self.levels[0], values])
+        self.count += len(values)
+        self._compress()
+
+    def merge(self, other: 'KLLSketch') -> None:
+        """Add the items of another sketch."""
+        while len(self.levels) < len(other.levels):
+            self.levels.append(np.empty(0))
+        for level, items in enumerate(other.levels):
+            self.levels[level] = np.concatenate([self.levels[level], items])
+        self.count += other.count
+        self._compress()
+
+    def quantile(self, q: float) -> Optional[float]:
+        """Estimate the q-quantile (0 <= q <= 1)."""
+        if not self.count:
+            return None
+        if all(not len(items) for items in self.levels[1:]):
+            # Nothing compacted: exact, with the interpolation of DataFrame.describe()
+            return float(np.quantile(self.levels[0], q))
+
+        values = np.concatenate(self.levels)
+        weights = np.concatenate([np.full(len(items), 2 ** level) for level, items in enumerate(self.levels)])
+        order = np.argsort(values)
+        cumulative = np.cumsum(weights[order])
+        index = np.searchsorted(cumulative, q * cumulative[-1], side='left')
+        return float(values[order][min(index, len(values) - 1)])
+
+
+class ColumnAccumulator:
+    """
+    Mergeable summary of a numeric column.
+
+    Count, mean and variance are combined chunk by chunk with the parallel
+    form of Welford's algorithm, so they are numerically stable and two
+    accumulators of different parts of a file can be merged. Datetime and
+    timedelta columns are summarized as nanosecond counts.
+    """
+
+    def __init__(self, k: int = 200, exact_items: int = 0):
+        self.count = 0
+        self.mean = 0.0
+        self.m2 = 0.0
+        self.min: Optional[float] = None
+        self.max: Optional[float] = None
+        self.sketch = KLLSketch(k, exact_items=exact_items)
+
+    def update(self, series: pd.Series) -> None:
+        kind = _time_kind(series.dtype)
+        if kind is not None:
+            values = series.to_numpy(dtype=f"{kind}8[ns]")
+            present = values[~np.isnat(values)].astype(np.int64).astype(float)
+        else:
+            values = series.to_numpy(dtype=float, na_value=np.nan)
+            present = values[~np.isnan(values)]
+        if not len(present):
+            return
+
+        mean = float(present.mean())
+        self._combine(len(present), mean, float(((present - mean) ** 2).sum()),
+                      float(present.min()), float(present.max()))
+        self.sketch.update(present)
+
+    def _combine(self, count: int, mean: float, m2: float, minimum: float, maximum: float) -> None:
+        """Chan et al. combination of two (count, mean, M2) summaries."""
+        total = self.count + count
+        delta = mean - self.mean
+        self.mean += delta * count / total
+        self.m2 += m2 + delta * delta * self.count * count / total
+        self.count = total
+        self.min = minimum if self.min is None else min(self.min, minimum)
+        self.max = maximum if self.max is None else max(self.max, maximum)
+
+    def merge(self, other: 'ColumnAccumulator') -> None:
+        """Add the summary of another part of the column."""
+        if other.count:
+            self._combine(other.count, other.mean, other.m2, other.min, other.max)
+        self.sketch.merge(other.sketch)
+
+    def describe(self) -> Dict[str, Optional[float]]:
+        """Summary in the layout of DataFrame.describe() (sample std)."""
+        std = math.sqrt(self.m2 / (self.count - 1)) if self.count > 1 else float('nan')
+        summary = {
+            'count': float(self.count),
+            'mean': self.mean if self.count else float('nan'),
+            'std': std,
+            'min': self.min if self.min is not None else float('nan'),
+        }
+        for q in DESCRIBE_PERCENTILES:
+            value = self.sketch.quantile(q)
+            summary[f"{q * 100:g}%"] = value if value is not None else float('nan')
+        summary['max'] = self.max if self.max is not None else float('nan')
+        return summary
+
+
+class StreamingStatistics:
+    """
+    Statistics and metadata of a table read in chunks.
+
+    Produces the statistics of DataFrame.describe() for numeric columns
+    and the metadata of the CSV processor (counts, columns, dtypes, null
+    counts, memory usage, sample) with memory bounded by the chunk size, and merges with
+    the statistics of other parts of the same table.
+    """
+
+    def __init__(self, k: int = 200, sample_size: int = 5, exact_items: int = 0):
+        """
+        Args:
+            k: Accuracy parameter of the quantile sketches
+            sample_size: Number of leading rows kept as sample
+            exact_items: Values per column up to which quantiles are exact
+                (all of them are then held in memory)
+        """
+        self.k = k
+        self.exact_items = exact_items
+        self.sample_size = sample_size
+        self.row_count = 0
+        self.memory_usage = 0
+        self.columns: List[str] = []
+        self.dtypes: Dict[str, np.dtype] = {}
+        self.nulls: Dict[str, int] = {}
+        self.accumulators: Dict[str, ColumnAccumulator] = {}
+        self.sample: Optional[pd.DataFrame] = None
+
+    def update(self, chunk: pd.DataFrame) -> None:
+        """Add a chunk of rows (columns not seen before are added after the others)."""
+        self._add_columns(chunk.columns)
+        nulls = chunk.isna().sum()
+        for column in self.columns:
+            self.nulls[column] += int(nulls.get(column, len(chunk)))
+        if self.sample is None or len(self.sample) < self.sample_size:
+            head = chunk.head(self.sample_size)
+            self.sample = head if self.sample is None else pd.concat([self.sample, head]).head(self.sample_size)
+        self.row_count += len(chunk)
+        self.memory_usage += int(chunk.memory_usage(deep=True).sum())
+
+        for column, dtype in chunk.dtypes.items():
+            self.dtypes[column] = _common_dtype(self.dtypes.get(column), dtype)
+            if not is_numeric_dtype(self.dtypes[column]):
+                # Not (or no longer) numeric: no statistics, as in describe()
+                self.accumulators.pop(column, None)
+                continue
+            accumulator = self.accumulators.get(column)
+            if accumulator is None:
+                accumulator = self.accumulators[column] = ColumnAccumulator(self.k, self.exact_items)
+            accumulator.update(chunk[column])
+
+    def merge(self, other: 'StreamingStatistics') -> None:
+        """Add the statistics of the rows that follow in the same table."""
+        self._add_columns(other.columns)
+        for column in self.columns:
+            # Columns the other part doesn't have are null in all its rows
+            self.nulls[column] += other.nulls.get(column, other.row_count)
+        if other.sample is not None and (self.sample is None or len(self.sample) < self.sample_size):
+            self.sample = other.sample if self.sample is None else \
+                pd.concat([self.sample, other.sample]).head(self.sample_size)
+        self.row_count += other.row_count
+        self.memory_usage += other.memory_usage
+
+        for column, dtype in other.dtypes.items():
+            self.dtypes[column] = _common_dtype(self.dtypes.get(column), dtype)
+            if not is_numeric_dtype(self.dtypes[column]):
+                self.accumulators.pop(column, None)
+            elif column in other.accumulators:
+                self.accumulators.setdefault(column, ColumnAccumulator(self.k, self.exact_items)).merge(
+                    other.accumulators[column])
+
+    def describe(self) -> Dict[str, Dict[str, Optional[float]]]:
+        """Statistics in the layout of DataFrame.describe().to_dict()."""
+        return {column: _typed_summary(self.accumulators[column].describe(), self.dtypes[column])
+                for column in self.columns if column in self.accumulators}
+
+    def _add_columns(self, columns) -> None:
+        for column in columns:
+            if column not in self.nulls:
+                # Null in all the rows before its first chunk
+                self.columns.append(column)
+                self.nulls[column] = self.row_count
+
+    def null_counts(self) -> Dict[str, int]:
+        """Missing values per column, as DataFrame.isna().sum()."""
+        return {column: self.nulls[column] for column in self.columns}
+
+    def metadata(self) -> Dict[str, Any]:
+        """Metadata in the layout of CSVProcessor.extract_metadata()."""
+        return {
+            'row_count': self.row_count,
+            'column_count': len(self.columns),
+            'columns': list(self.columns),
+            'memory_usage': self.memory_usage,
+            'dtypes': {column: str(self.dtypes[column]) for column in self.columns},
+            'null_counts': self.null_counts(),
+            'sample': self.sample.to_dict('records') if self.sample is not None else [],
+        }
+
+
+def is_numeric_dtype(dtype) -> bool:
+    """Whether DataFrame.describe() summarizes columns of this dtype (numbers, naive datetimes, timedeltas)."""
+    if pd.api.types.is_bool_dtype(dtype):
+        return False
+    # Timezone-aware datetimes (an extension dtype) are left out, as in describe()
+    return pd.api.types.is_numeric_dtype(dtype) or _time_kind(dtype) is not None
+
+
+def _time_kind(dtype) -> Optional[str]:
+    """'M' for naive numpy datetimes, 'm' for timedeltas, else None."""
+    return dtype.kind if isinstance(dtype, np.dtype) and dtype.kind in 'mM' else None
+
+
+def _typed_summary(summary: Dict[str, Any], dtype) -> Dict[str, Any]:
+    """Summary of a datetime or timedelta column in its own type, as DataFrame.describe() reports it."""
+    kind = _time_kind(dtype)
+    if kind is None:
+        return summary
+    convert = pd.Timestamp if kind == 'M' else pd.Timedelta
+    # Nanosecond counts back to the unit of the column
+    typed = {key: convert(np.array(int(value), dtype=f"{kind}8[ns]").astype(dtype)[()]) if not math.isnan(value)
+             else convert('NaT') for key, value in summary.items() if key != 'count'}
+    if kind == 'M':
+        # No standard deviation of points in time
+        typed['std'] = float('nan')
+    return {'count': int(summary['count']), **typed}
+
+
+def _common_dtype(current, dtype):
+    """dtype of a column seen with dtype current in earlier chunks and dtype now."""
+    if current is None or current == dtype:
+        return dtype
+    kinds = {_time_kind(current), _time_kind(dtype)}
+    if kinds == {'m'} or kinds == {'M'}:
+        return np.dtype(f"{kinds.pop()}8[ns]")
+    if is_numeric_dtype(current) and is_numeric_dtype(dtype) and kinds == {None}:
+        return np.result_type(current, dtype)
+    return np.dtype(object)
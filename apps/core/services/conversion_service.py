@@ -8,8 +8,9 @@ class ConversionService:
     """Service for handling file conversions with storage."""
 
     def __init__(self, source_storage_type='local', target_storage_type='local'):
-        self.source_storage = StorageFactory.get_storage(source_storage_type)
-        self.target_storage = StorageFactory.get_storage(target_storage_type)
+        # Storage stacks are shared by every service of the process
+        self.source_storage = StorageFactory.get_shared_storage(source_storage_type)
+        self.target_storage = StorageFactory.get_shared_storage(target_storage_type)
 
     def convert_file(self, source_path: str, target_format: str) -> Optional[str]:
         """
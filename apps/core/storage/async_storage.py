@@ -1,32 +1,249 @@
 # apps/core/storage/async_storage.py
 import asyncio
-from typing import BinaryIO, Optional, Callable
-from concurrent.futures import ThreadPoolExecutor
-from .base import StorageInterface
+from concurrent.futures import ThreadPoolExecutor, Future
+from typing import BinaryIO, Optional, Callable, Any, AsyncIterator, Union
+from .base import StorageInterface, StreamWriter, FileStat
 
 
-class AsyncStorageWrapper:
-    """Async wrapper for synchronous storage implementations."""
+class AsyncStreamWriter:
+    """
+    Async counterpart of StreamWriter.
 
-    def __init__(self, storage: StorageInterface, max_workers: int = 5):
+    Every write is a short executor hop, so no thread is held between
+    chunks. Used as an async context manager the file is committed on a
+    clean exit and aborted on errors and on task cancellation, which
+    removes the partially written file.
+    """
+
+    def __init__(self, async_storage: 'AsyncStorage', writer: StreamWriter):
+        self._async_storage = async_storage
+        self._writer = writer
+        self._pending: Optional[Future] = None
+
+    @property
+    def bytes_written(self) -> int:
+        return self._writer.bytes_written
+
+    @property
+    def result(self) -> Optional[str]:
+        """Path reported by the storage once the file is committed."""
+        return getattr(self._writer, 'result', None)
+
+    async def _run(self, func: Callable, *args) -> Any:
+        self._pending = self._async_storage.executor.submit(func, *args)
+        return await asyncio.wrap_future(self._pending)
+
+    async def write(self, data: bytes) -> int:
+        """Write a chunk."""
+        return await self._run(self._writer.write, data)
+
+    async def close(self) -> None:
+        """Commit the written data to storage."""
+        await self._run(self._writer.close)
+
+    async def abort(self) -> None:
+        """
+        Discard the written data.
+
+        Waits for a write that may still be running in the executor (for
+        example after cancellation) so the cleanup cannot race with it.
+        """
+        pending = self._pending
+
+        def abort_after_pending() -> None:
+            if pending is not None:
+                try:
+                    pending.result()
+                except BaseException:
+                    pass
+            self._writer.abort()
+
+        # Shielded so that the cleanup completes even if cancelled again
+        cleanup = asyncio.wrap_future(self._async_storage.executor.submit(abort_after_pending))
+        await asyncio.shield(cleanup)
+
+    async def __aenter__(self) -> 'AsyncStreamWriter':
+        return self
+
+    async def __aexit__(self, exc_type, exc_value, traceback) -> None:
+        if exc_type is None:
+            await self.close()
+        else:
+            await self.abort()
+
+
+class AsyncStorage:
+    """
+    Native asyncio interface over a StorageInterface stack.
+
+    Reads and writes are chunked: each chunk is one short hop to a thread
+    pool instead of running a whole-file call on a thread for its entire
+    duration, so many transfers can share the event loop. A semaphore
+    bounds the number of concurrent transfers, reads are prefetched into
+    a bounded queue that applies backpressure when the consumer is slower
+    than storage, and cancelled writes remove their partial files.
+    """
+
+    def __init__(self, storage: StorageInterface, max_concurrency: int = 16,
+                 max_workers: Optional[int] = None, prefetch: int = 4,
+                 chunk_size: Optional[int] = None):
+        """
+        Initialize async storage.
+
+        Args:
+            storage: Storage implementation to wrap
+            max_concurrency: Maximum number of transfers running at once
+            max_workers: Size of the thread pool executing chunk I/O
+                (defaults to max_concurrency)
+            prefetch: Number of chunks read ahead of the consumer
+            chunk_size: Size of the chunks (defaults to storage.chunk_size)
+        """
         self.storage = storage
-        self.executor = ThreadPoolExecutor(max_workers=max_workers)
+        self.max_concurrency = max_concurrency
+        self.prefetch = prefetch
+        self.chunk_size = chunk_size or storage.chunk_size
+        self.executor = ThreadPoolExecutor(
+            max_workers=max_workers or max_concurrency,
+            thread_name_prefix='async-storage'
+        )
+        self._semaphore = asyncio.Semaphore(max_concurrency)
+
+    async def _run(self, func: Callable, *args) -> Any:
+        """Run a short blocking call on the executor."""
+        return await asyncio.get_running_loop().run_in_executor(self.executor, func, *args)
+
+    async def iter_chunks(self, file_path: str, chunk_size: Optional[int] = None) -> AsyncIterator[bytes]:
+        """
+        Iterate over the content of a file in chunks.
+
+        Args:
+            file_path: Path to the file
+            chunk_size: Size of the chunks (defaults to self.chunk_size)
+
+        Yields:
+            Chunks of bytes
+
+        Raises:
+            FileNotFoundError: If the file doesn't exist
+        """
+        chunk_size = chunk_size or self.chunk_size
+
+        async with self._semaphore:
+            stream = await self._run(self.storage.open_read, file_path)
+            if stream is None:
+                raise FileNotFoundError(file_path)
+
+            queue: asyncio.Queue = asyncio.Queue(maxsize=self.prefetch)
+
+            async def produce() -> None:
+                try:
+                    while True:
+                        chunk = await self._run(stream.read, chunk_size)
+                        # Blocks while the consumer is prefetch chunks behind
+                        await queue.put(chunk)
+                        if not chunk:
+                            return
+                except Exception as e:
+                    await queue.put(e)
+
+            producer = asyncio.ensure_future(produce())
+            try:
+                while True:
+                    item = await queue.get()
+                    if isinstance(item, Exception):
+                        raise item
+                    if not item:
+                        return
+                    yield item
+            finally:
+                producer.cancel()
+                try:
+                    await producer
+                except asyncio.CancelledError:
+                    pass
+                await self._run(stream.close)
+
+    async def read(self, file_path: str) -> Optional[bytes]:
+        """Read a whole file, or None if it doesn't exist."""
+        try:
+            return b''.join([chunk async for chunk in self.iter_chunks(file_path)])
+        except FileNotFoundError:
+            return None
+
+    async def open_write(self, file_path: str) -> AsyncStreamWriter:
+        """
+        Open a file for streaming writes.
+
+        Args:
+            file_path: Path where to save the file
+
+        Returns:
+            AsyncStreamWriter that commits the file on close()
+        """
+        writer = await self._run(self.storage.open_write, file_path)
+        return AsyncStreamWriter(self, writer)
+
+    async def save(self, source: Union[bytes, BinaryIO, Any], file_path: str) -> str:
+        """
+        Save a file from bytes, an async iterable of chunks, an object with
+        an async read() (e.g. a FastAPI UploadFile) or a sync file object.
+
+        Args:
+            source: Content to save
+            file_path: Path where to save the file
+
+        Returns:
+            Path to the saved file
+        """
+        async with self._semaphore:
+            writer = await self.open_write(file_path)
+            async with writer:
+                async for chunk in self._iter_source(source):
+                    await writer.write(chunk)
+            return writer.result or file_path
+
+    async def _iter_source(self, source: Any) -> AsyncIterator[bytes]:
+        """Iterate over any supported upload source in chunks."""
+        if isinstance(source, (bytes, bytearray, memoryview)):
+            for start in range(0, len(source), self.chunk_size):
+                yield bytes(source[start:start + self.chunk_size])
+        elif hasattr(source, '__aiter__'):
+            async for chunk in source:
+                yield chunk
+        elif asyncio.iscoroutinefunction(getattr(source, 'read', None)):
+            while True:
+                chunk = await source.read(self.chunk_size)
+                if not chunk:
+                    break
+                yield chunk
+        else:
+            while True:
+                chunk = await self._run(source.read, self.chunk_size)
+                if not chunk:
+                    break
+                yield chunk
 
     async def get(self, file_path: str) -> Optional[BinaryIO]:
         """Async version of get."""
-        return await asyncio.get_event_loop().run_in_executor(
-            self.executor, self.storage.get, file_path
-        )
-
-    async def save(self, file_obj: BinaryIO, file_path: str) -> str:
-        """Async version of save."""
-        return await asyncio.get_event_loop().run_in_executor(
-            self.executor,
-            lambda: self.storage.save(file_obj, file_path)
-        )
+        return await self._run(self.storage.get, file_path)
 
     async def delete(self, file_path: str) -> bool:
         """Async version of delete."""
-        return await asyncio.get_event_loop().run_in_executor(
-            self.executor, self.storage.delete, file_path
-        )
\ No newline at end of file
+        async with self._semaphore:
+            return await self._run(self.storage.delete, file_path)
+
+    async def exists(self, file_path: str) -> bool:
+        """Async version of exists."""
+        return await self._run(self.storage.exists, file_path)
+
+    async def stat(self, file_path: str) -> Optional[FileStat]:
+        """Async version of stat."""
+        return await self._run(self.storage.stat, file_path)
+
+    def close(self) -> None:
+        """Shut down the executor."""
+        self.executor.shutdown(wait=False)
+
+
+# Kept for code written against the original executor wrapper
+AsyncStorageWrapper = AsyncStorage
@@ -1,14 +1,337 @@
 # apps/core/storage/base.py
+import logging
+import tempfile
+import time
 from abc import ABC, abstractmethod
-from typing import BinaryIO, Optional, Any
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass
+from functools import wraps
+from typing import BinaryIO, Optional, Any, Iterator, Iterable, List, Tuple, Callable
+
+from .metrics import registry
+
+logger = logging.getLogger(__name__)
+
+# Default size of the chunks moved between storage layers
+DEFAULT_CHUNK_SIZE = 64 * 1024
+
+# Writes smaller than this stay in memory before spilling to a temp file
+DEFAULT_SPOOL_SIZE = 8 * 1024 * 1024
+
+# Default number of threads used by the batch operations
+DEFAULT_BATCH_WORKERS = 8
+
+
+def iter_file_obj(file_obj: BinaryIO, chunk_size: int = DEFAULT_CHUNK_SIZE) -> Iterator[bytes]:
+    """
+    Iterate over a file-like object in chunks.
+
+    Django's UploadedFile/File objects expose chunks(), plain file objects
+    are read with read(chunk_size) until exhausted.
+
+    Args:
+        file_obj: File-like object to read
+        chunk_size: Maximum size of every yielded chunk
+
+    Yields:
+        Chunks of bytes
+    """
+    if hasattr(file_obj, 'chunks'):
+        yield from file_obj.chunks(chunk_size)
+        return
+
+    while True:
+        chunk = file_obj.read(chunk_size)
+        if not chunk:
+            break
+        yield chunk
+
+
+@dataclass
+class FileStat:
+    """Size and version information about a stored file."""
+    path: str
+    size: int
+    modified: Optional[float] = None
+    etag: Optional[str] = None
+
+
+@dataclass
+class BatchResult:
+    """Outcome of one item of a batch storage operation."""
+    path: str
+    success: bool
+    value: Any = None
+    error: Optional[str] = None
+
+
+def run_batch(func: Callable[..., Any], items: List[tuple], paths: List[str],
+              max_workers: int = DEFAULT_BATCH_WORKERS,
+              is_success: Callable[[Any], bool] = lambda value: True) -> List[BatchResult]:
+    """
+    Run func(*item) for every item on a bounded thread pool.
+
+    Args:
+        func: Function to call for every item
+        items: Argument tuples, one per item
+        paths: Storage path of every item, used to label the results
+        max_workers: Maximum number of concurrent calls
+        is_success: Predicate deciding whether a returned value is a success
+
+    Returns:
+        One BatchResult per item, in input order. Exceptions are reported
+        per item instead of aborting the batch.
+    """
+    def call(args: tuple, path: str) -> BatchResult:
+        try:
+            value = func(*args)
+        except Exception as e:
+            return BatchResult(path=path, success=False, error=str(e))
+        return BatchResult(path=path, success=is_success(value), value=value)
+
+    if len(items) <= 1 or max_workers <= 1:
+        return [call(args, path) for args, path in zip(items, paths)]
+
+    with ThreadPoolExecutor(max_workers=min(max_workers, len(items))) as executor:
+        return list(executor.map(call, items, paths))
+
+
+class StreamWriter:
+    """
+    Writable file-like object returned by StorageInterface.open_write.
+
+    Data written to the writer becomes visible in storage when the writer
+    is closed. Used as a context manager, the write is committed on a
+    clean exit and aborted if the block raises.
+    """
+
+    def __init__(self):
+        self.closed = False
+        self.bytes_written = 0
+        # Path reported by the storage once committed, if it differs from the requested one
+        self.result: Optional[str] = None
+
+    def writable(self) -> bool:
+        return True
+
+    def write(self, data: bytes) -> int:
+        if self.closed:
+            raise ValueError("write to closed storage writer")
+        written = self._write(data)
+        self.bytes_written += len(data)
+        return written if written is not None else len(data)
+
+    def close(self) -> None:
+        """Commit the written data to storage."""
+        if self.closed:
+            return
+        self.closed = True
+        self._commit()
+
+    def abort(self) -> None:
+        """Discard the written data without committing it."""
+        if self.closed:
+            return
+        self.closed = True
+        self._discard()
+
+    def __enter__(self) -> 'StreamWriter':
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback) -> None:
+        if exc_type is None:
+            self.close()
+        else:
+            self.abort()
+
+    def _write(self, data: bytes) -> Optional[int]:
+        raise NotImplementedError
+
+    def _commit(self) -> None:
+        raise NotImplementedError
+
+    def _discard(self) -> None:
+        raise NotImplementedError
+
+
+class SpooledStreamWriter(StreamWriter):
+    """
+    Generic writer for backends without a native streaming upload.
+
+    Data is spooled in memory up to spool_size bytes and to a temporary
+    file beyond that, then handed to storage.save() in a single call on
+    close, so memory stays bounded whatever the file size.
+    """
+
+    def __init__(self, storage: 'StorageInterface', file_path: str,
+                 spool_size: int = DEFAULT_SPOOL_SIZE):
+        super().__init__()
+        self.storage = storage
+        self.file_path = file_path
+        self._spool = tempfile.SpooledTemporaryFile(max_size=spool_size)
+
+    def _write(self, data: bytes) -> Optional[int]:
+        return self._spool.write(data)
+
+    def _commit(self) -> None:
+        try:
+            self._spool.seek(0)
+            self.result = self.storage.save(self._spool, self.file_path)
+        finally:
+            self._spool.close()
+
+    def _discard(self) -> None:
+        self._spool.close()
+
+
+class MeteredStream:
+    """
+    Proxy counting the bytes moved through a stream for the metrics registry.
+
+    Everything except the reading methods is delegated to the wrapped
+    stream, so it can stand in for the stream anywhere.
+    """
+
+    def __init__(self, stream: BinaryIO, backend: str, operation: str, written: bool = False):
+        self._stream = stream
+        self._backend = backend
+        self._operation = operation
+        self._written = written
+
+    def _count(self, size: int) -> None:
+        if size:
+            if self._written:
+                registry.add_bytes(self._backend, self._operation, written=size)
+            else:
+                registry.add_bytes(self._backend, self._operation, read=size)
+
+    def read(self, *args) -> bytes:
+        data = self._stream.read(*args)
+        self._count(len(data) if data else 0)
+        return data
+
+    def readinto(self, buffer) -> Optional[int]:
+        size = self._stream.readinto(buffer)
+        self._count(size or 0)
+        return size
+
+    def _metered_chunks(self, *args, **kwargs) -> Iterator[bytes]:
+        for chunk in self._stream.chunks(*args, **kwargs):
+            self._count(len(chunk))
+            yield chunk
+
+    def __getattr__(self, name: str) -> Any:
+        if name == 'chunks' and hasattr(self._stream, 'chunks'):
+            return self._metered_chunks
+        return getattr(self._stream, name)
+
+    def __iter__(self) -> Iterator[bytes]:
+        for line in self._stream:
+            self._count(len(line))
+            yield line
+
+    def __enter__(self) -> 'MeteredStream':
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback) -> None:
+        self._stream.close()
+
+
+class MeteredWriter:
+    """Proxy counting the bytes written to a StreamWriter."""
+
+    def __init__(self, writer: 'StreamWriter', backend: str, operation: str):
+        self._writer = writer
+        self._backend = backend
+        self._operation = operation
+
+    def write(self, data: bytes) -> int:
+        written = self._writer.write(data)
+        registry.add_bytes(self._backend, self._operation, written=len(data))
+        return written
+
+    def __getattr__(self, name: str) -> Any:
+        return getattr(self._writer, name)
+
+    def __enter__(self) -> 'MeteredWriter':
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback) -> None:
+        self._writer.__exit__(exc_type, exc_value, traceback)
+
+
+def storage_operation(method):
+    """
+    Decorator instrumenting a storage operation.
+
+    Records the latency and the errors (by exception type) of every call
+    in the metrics registry, labelled by the storage class and operation
+    name. Streams returned by reads and passed to or returned by writes
+    are wrapped to count the bytes transferred. Errors are logged and
+    re-raised.
+    """
+    operation = method.__name__
+
+    @wraps(method)
+    def wrapper(self, *args, **kwargs):
+        backend = type(self).__name__
+        if operation == 'save' and args:
+            args = (MeteredStream(args[0], backend, operation, written=True),) + args[1:]
+
+        start = time.perf_counter()
+        try:
+            result = method(self, *args, **kwargs)
+        except Exception as e:
+            registry.record(backend, operation, time.perf_counter() - start, error=e)
+            logger.error(f"Storage operation {backend}.{operation} failed: {str(e)}")
+            raise
+        registry.record(backend, operation, time.perf_counter() - start)
+
+        if result is None:
+            return result
+        if operation in ('get', 'open_read'):
+            # get() usually returns a stream its own open_read() already wraps
+            if not (isinstance(result, MeteredStream) and result._backend == backend):
+                result = MeteredStream(result, backend, operation)
+        elif operation == 'open_write':
+            result = MeteredWriter(result, backend, operation)
+        elif operation == 'read_range':
+            registry.add_bytes(backend, operation, read=len(result))
+        return result
+
+    wrapper._storage_operation = True
+    return wrapper
+
+
+# Operations instrumented on every StorageInterface subclass
+INSTRUMENTED_OPERATIONS = (
+    'get', 'open_read', 'save', 'delete', 'open_write', 'read_range', 'stat', 'exists',
+    'save_many', 'get_many', 'delete_many', 'exists_many',
+)
 
 
 class StorageInterface(ABC):
     """
     Abstract interface for storage backends.
     All storage implementations must implement these methods.
+
+    Besides the whole-file get/save/delete methods, every storage exposes
+    a streaming contract (open_read/iter_chunks/open_write) so that files
+    can be moved between layers in chunk_size pieces without ever being
+    held in memory as a whole.
     """
 
+    chunk_size: int = DEFAULT_CHUNK_SIZE
+
+    def __init_subclass__(cls, **kwargs):
+        """Apply storage_operation to the operations a backend or decorator defines."""
+        super().__init_subclass__(**kwargs)
+        for name in INSTRUMENTED_OPERATIONS:
+            method = cls.__dict__.get(name)
+            if (callable(method) and not getattr(method, '__isabstractmethod__', False)
+                    and not getattr(method, '_storage_operation', False)):
+                setattr(cls, name, storage_operation(method))
+
     @abstractmethod
     def get(self, file_path: str) -> Optional[BinaryIO]:
         """
@@ -49,20 +372,208 @@ class StorageInterface(ABC):
         """
         pass
 
-# apps/core/storage/base.py (addition)
-import logging
-from functools import wraps
+    @storage_operation
+    def open_read(self, file_path: str) -> Optional[BinaryIO]:
+        """
+        Open a file for streaming reads.
 
-logger = logging.getLogger(__name__)
+        Backends should return a stream that reads lazily from the
+        underlying medium. The caller is responsible for closing it.
+
+        Args:
+            file_path: Path to the file
+
+        Returns:
+            Readable file-like object or None if file doesn't exist
+        """
+        return self.get(file_path)
+
+    def iter_chunks(self, file_path: str, chunk_size: Optional[int] = None) -> Iterator[bytes]:
+        """
+        Iterate over the content of a file in chunks.
+
+        Args:
+            file_path: Path to the file
+            chunk_size: Size of the chunks (defaults to self.chunk_size)
+
+        Yields:
+            Chunks of bytes
+
+        Raises:
+            FileNotFoundError: If the file doesn't exist
+        """
+        stream = self.open_read(file_path)
+        if stream is None:
+            raise FileNotFoundError(file_path)
 
-def storage_operation(method):
-    """Decorator for storage operations with error handling."""
-    @wraps(method)
-    def wrapper(self, *args, **kwargs):
         try:
-            return method(self, *args, **kwargs)
-        except Exception as e:
-            logger.error(f"Storage operation {method.__name__} failed: {str(e)}")
-            # You could also add metrics collection here
-            raise
-    return wrapper
\ No newline at end of file
+            yield from iter_file_obj(stream, chunk_size or self.chunk_size)
+        finally:
+            stream.close()
+
+    @storage_operation
+    def open_write(self, file_path: str) -> StreamWriter:
+        """
+        Open a file for streaming writes.
+
+        Args:
+            file_path: Path where to save the file
+
+        Returns:
+            StreamWriter that commits the file on close()
+        """
+        return SpooledStreamWriter(self, file_path)
+
+    @storage_operation
+    def read_range(self, file_path: str, offset: int, length: int) -> Optional[bytes]:
+        """
+        Read a byte range of a file.
+
+        The default implementation seeks when the stream allows it and
+        skips forward otherwise. Backends with native range requests
+        should override it.
+
+        Args:
+            file_path: Path to the file
+            offset: Position of the first byte to read
+            length: Maximum number of bytes to read
+
+        Returns:
+            The bytes read (shorter than length at the end of the file)
+            or None if file doesn't exist
+        """
+        stream = self.open_read(file_path)
+        if stream is None:
+            return None
+
+        try:
+            if getattr(stream, 'seekable', lambda: False)():
+                stream.seek(offset)
+            else:
+                remaining = offset
+                while remaining > 0:
+                    skipped = stream.read(min(remaining, self.chunk_size))
+                    if not skipped:
+                        return b''
+                    remaining -= len(skipped)
+
+            parts = []
+            while length > 0:
+                data = stream.read(length)
+                if not data:
+                    break
+                parts.append(data)
+                length -= len(data)
+            return b''.join(parts)
+        finally:
+            stream.close()
+
+    @storage_operation
+    def exists(self, file_path: str) -> bool:
+        """
+        Check whether a file exists.
+
+        Args:
+            file_path: Path to the file
+
+        Returns:
+            True if the file exists
+        """
+        stream = self.open_read(file_path)
+        if stream is None:
+            return False
+        stream.close()
+        return True
+
+    @storage_operation
+    def save_many(self, items: Iterable[Tuple[BinaryIO, str]],
+                  max_workers: int = DEFAULT_BATCH_WORKERS) -> List[BatchResult]:
+        """
+        Save several files concurrently.
+
+        Args:
+            items: (file_obj, file_path) pairs
+            max_workers: Maximum number of concurrent saves
+
+        Returns:
+            One BatchResult per file with the saved path as value
+        """
+        items = list(items)
+        return run_batch(self.save, items, [path for _, path in items], max_workers)
+
+    @storage_operation
+    def get_many(self, file_paths: Iterable[str],
+                 max_workers: int = DEFAULT_BATCH_WORKERS) -> List[BatchResult]:
+        """
+        Retrieve several files concurrently.
+
+        Args:
+            file_paths: Paths to the files
+            max_workers: Maximum number of concurrent reads
+
+        Returns:
+            One BatchResult per file with the file-like object as value,
+            unsuccessful if the file doesn't exist
+        """
+        file_paths = list(file_paths)
+        return run_batch(self.get, [(path,) for path in file_paths], file_paths, max_workers,
+                         is_success=lambda value: value is not None)
+
+    @storage_operation
+    def delete_many(self, file_paths: Iterable[str],
+                    max_workers: int = DEFAULT_BATCH_WORKERS) -> List[BatchResult]:
+        """
+        Delete several files concurrently.
+
+        Backends with a native bulk delete should override this method.
+
+        Args:
+            file_paths: Paths to the files to delete
+            max_workers: Maximum number of concurrent deletions
+
+        Returns:
+            One BatchResult per file, successful if the file was deleted
+        """
+        file_paths = list(file_paths)
+        return run_batch(self.delete, [(path,) for path in file_paths], file_paths, max_workers,
+                         is_success=bool)
+
+    @storage_operation
+    def exists_many(self, file_paths: Iterable[str],
+                    max_workers: int = DEFAULT_BATCH_WORKERS) -> List[BatchResult]:
+        """
+        Check concurrently whether several files exist.
+
+        Args:
+            file_paths: Paths to the files
+            max_workers: Maximum number of concurrent checks
+
+        Returns:
+            One BatchResult per file with True/False as value
+        """
+        file_paths = list(file_paths)
+        return run_batch(self.exists, [(path,) for path in file_paths], file_paths, max_workers)
+
+    @storage_operation
+    def stat(self, file_path: str) -> Optional[FileStat]:
+        """
+        Get size and version information about a file.
+
+        The default implementation streams the file to count its bytes,
+        backends should override it with a metadata-only lookup.
+
+        Args:
+            file_path: Path to the file
+
+        Returns:
+            FileStat or None if file doesn't exist
+        """
+        stream = self.open_read(file_path)
+        if stream is None:
+            return None
+
+        try:
+            size = sum(len(chunk) for chunk in iter_file_obj(stream, self.chunk_size))
+        finally:
+            stream.close()
+        return FileStat(path=file_path, size=size)
@@ -1,61 +1,306 @@
 # apps/core/storage/cached_storage.py
-from typing import BinaryIO, Optional, Dict
+import threading
+import time
+from collections import OrderedDict
+from typing import BinaryIO, Optional, Dict, Callable, Any, Tuple, Iterable, List
 from io import BytesIO
-from .base import StorageInterface
+from .base import StorageInterface, StreamWriter, FileStat, BatchResult, DEFAULT_BATCH_WORKERS
+from .metrics import registry
+
+
+class CachingReader:
+    """
+    Pass-through reader that keeps a copy of small files for the cache.
+
+    The wrapped stream is consumed lazily. Once it is read to the end the
+    collected content is handed to on_complete. Files larger than max_size,
+    or streams that are seeked, are passed through without being kept.
+    """
+
+    def __init__(self, stream: BinaryIO, on_complete: Callable[[bytes], None], max_size: int):
+        self._stream = stream
+        self._on_complete = on_complete
+        self._max_size = max_size
+        self._buffer: Optional[bytearray] = bytearray()
+
+    def read(self, size: int = -1) -> bytes:
+        data = self._stream.read(size)
+        if self._buffer is None:
+            return data
+
+        if data:
+            self._buffer += data
+            if len(self._buffer) > self._max_size:
+                self._buffer = None
+            elif size is None or size < 0:
+                self._finish()
+        elif size != 0:
+            self._finish()
+        return data
+
+    def _finish(self) -> None:
+        content = bytes(self._buffer)
+        self._buffer = None
+        self._on_complete(content)
+
+    def readable(self) -> bool:
+        return True
+
+    def seekable(self) -> bool:
+        return hasattr(self._stream, 'seek') and getattr(self._stream, 'seekable', lambda: True)()
+
+    def seek(self, offset: int, whence: int = 0) -> int:
+        # Random access breaks the sequential copy, stop collecting
+        self._buffer = None
+        return self._stream.seek(offset, whence)
+
+    def tell(self) -> int:
+        return self._stream.tell()
+
+    def close(self) -> None:
+        self._stream.close()
+
+    @property
+    def closed(self) -> bool:
+        return getattr(self._stream, 'closed', False)
+
+    def __enter__(self) -> 'CachingReader':
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback) -> None:
+        self.close()
+
+
+class LRUCache:
+    """
+    Thread-safe LRU cache of file contents bounded by total bytes.
+
+    Entries are evicted least recently used first whenever the byte budget
+    (or the optional entry limit) is exceeded. Objects larger than
+    max_object_size are never admitted, and entries older than ttl seconds
+    are treated as misses. Hit, miss, eviction and expiration counters are
+    kept for monitoring.
+    """
+
+    def __init__(self, max_bytes: int, max_object_size: Optional[int] = None,
+                 max_entries: Optional[int] = None, ttl: Optional[float] = None):
+        self.max_bytes = max_bytes
+        self.max_object_size = max_bytes if max_object_size is None else min(max_object_size, max_bytes)
+        self.max_entries = max_entries
+        self.ttl = ttl
+        self.current_bytes = 0
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self.expirations = 0
+        self.rejections = 0
+        # Incremented on every invalidation, see CachedStorage.open_read
+        self.epoch = 0
+        self._entries: 'OrderedDict[str, Tuple[bytes, float]]' = OrderedDict()
+        self._lock = threading.Lock()
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def __contains__(self, key: str) -> bool:
+        with self._lock:
+            entry = self._entries.get(key)
+            return entry is not None and not self._is_expired(entry)
+
+    def _is_expired(self, entry: Tuple[bytes, float]) -> bool:
+        return self.ttl is not None and time.monotonic() - entry[1] > self.ttl
+
+    def _remove(self, key: str) -> None:
+        content, _ = self._entries.pop(key)
+        self.current_bytes -= len(content)
+
+    def get(self, key: str) -> Optional[bytes]:
+        """Return cached content and mark it as most recently used."""
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None and self._is_expired(entry):
+                self._remove(key)
+                self.expirations += 1
+                entry = None
+
+            if entry is None:
+                self.misses += 1
+                return None
+
+            self._entries.move_to_end(key)
+            self.hits += 1
+            return entry[0]
+
+    def peek(self, key: str) -> Optional[bytes]:
+        """Return cached content without touching recency or counters."""
+        with self._lock:
+            entry = self._entries.get(key)
+            return entry[0] if entry is not None else None
+
+    def put(self, key: str, content: bytes, epoch: Optional[int] = None) -> bool:
+        """
+        Add content to the cache, evicting old entries to make room.
+
+        Args:
+            key: Cache key
+            content: Content to cache
+            epoch: Epoch observed when the content was fetched. The content
+                is dropped if the cache was invalidated in the meantime.
+
+        Returns:
+            True if the content was cached
+        """
+        size = len(content)
+        with self._lock:
+            if epoch is not None and epoch != self.epoch:
+                return False
+            if size > self.max_object_size:
+                self.rejections += 1
+                return False
+
+            if key in self._entries:
+                self._remove(key)
+
+            while self._entries and (
+                self.current_bytes + size > self.max_bytes
+                or (self.max_entries is not None and len(self._entries) >= self.max_entries)
+            ):
+                oldest = next(iter(self._entries))
+                self._remove(oldest)
+                self.evictions += 1
+
+            self._entries[key] = (content, time.monotonic())
+            self.current_bytes += size
+            return True
+
+    def invalidate(self, key: str) -> None:
+        """Remove an entry and discard fills that are still in flight."""
+        with self._lock:
+            self.epoch += 1
+            if key in self._entries:
+                self._remove(key)
+
+    def clear(self) -> None:
+        """Remove all entries."""
+        with self._lock:
+            self.epoch += 1
+            self._entries.clear()
+            self.current_bytes = 0
+
+    def stats(self) -> Dict[str, Any]:
+        """Return cache counters and occupancy."""
+        with self._lock:
+            lookups = self.hits + self.misses
+            return {
+                'hits': self.hits,
+                'misses': self.misses,
+                'hit_ratio': self.hits / lookups if lookups else 0.0,
+                'evictions': self.evictions,
+                'expirations': self.expirations,
+                'rejections': self.rejections,
+                'entries': len(self._entries),
+                'bytes': self.current_bytes,
+                'max_bytes': self.max_bytes,
+            }
 
 
 class CachedStorage(StorageInterface):
     """Storage decorator that adds caching."""
 
-    def __init__(self, storage: StorageInterface, cache_size: int = 100):
+    def __init__(self, storage: StorageInterface, cache_size: Optional[int] = None,
+                 max_bytes: int = 256 * 1024 * 1024,
+                 max_object_size: int = 10 * 1024 * 1024,
+                 ttl: Optional[float] = None):
         """
         Initialize cached storage.
 
         Args:
             storage: Base storage implementation
-            cache_size: Maximum number of files to cache
+            cache_size: Optional maximum number of files to cache
+            max_bytes: Memory budget for cached content in bytes
+            max_object_size: Files larger than this are streamed without caching
+            ttl: Seconds after which cached content is refetched (None = no expiry)
         """
         self.storage = storage
         self.cache_size = cache_size
-        self.cache: Dict[str, bytes] = {}
+        self.max_object_size = max_object_size
+        self.chunk_size = storage.chunk_size
+        self.cache = LRUCache(
+            max_bytes=max_bytes,
+            max_object_size=max_object_size,
+            max_entries=cache_size,
+            ttl=ttl
+        )
+        self.metrics_label = registry.register_cache(self)
+
+    def stats(self) -> Dict[str, Any]:
+        """Return cache hit/miss/eviction statistics."""
+        return self.cache.stats()
 
     def get(self, file_path: str) -> Optional[BinaryIO]:
         """Get file with caching."""
+        return self.open_read(file_path)
+
+    def open_read(self, file_path: str) -> Optional[BinaryIO]:
+        """Open file for streaming reads, served from cache when possible."""
         # Check cache first
-        if file_path in self.cache:
-            return BytesIO(self.cache[file_path])
+        content = self.cache.get(file_path)
+        if content is not None:
+            return BytesIO(content)
 
-        # Not in cache, get from storage
-        file_obj = self.storage.get(file_path)
-        if not file_obj:
+        # Not in cache, stream from storage and cache it once fully read
+        epoch = self.cache.epoch
+        stream = self.storage.open_read(file_path)
+        if stream is None:
             return None
 
-        # Add to cache if not too big
-        content = file_obj.read()
-        if len(self.cache) < self.cache_size:
-            self.cache[file_path] = content
+        return CachingReader(
+            stream,
+            lambda data: self.cache.put(file_path, data, epoch=epoch),
+            self.max_object_size
+        )
+
+    def stat(self, file_path: str) -> Optional[FileStat]:
+        """Get file information from the underlying storage."""
+        return self.storage.stat(file_path)
 
-        return BytesIO(content)
+    def open_write(self, file_path: str) -> StreamWriter:
+        """Open file for streaming writes, invalidating any cached copy."""
+        self.cache.invalidate(file_path)
+        return self.storage.open_write(file_path)
 
     def save(self, file_obj: BinaryIO, file_path: str) -> str:
         """Save file and update cache."""
-        # Read content for caching
-        content = file_obj.read()
+        self.cache.invalidate(file_path)
+        epoch = self.cache.epoch
 
-        # Save to storage
-        result = self.storage.save(BytesIO(content), file_path)
+        # Stream to storage, keeping a copy of small files for the cache
+        collected = []
+        reader = CachingReader(file_obj, collected.append, self.max_object_size)
+        result = self.storage.save(reader, file_path)
 
         # Update cache
-        if len(self.cache) < self.cache_size:
-            self.cache[file_path] = content
+        if collected:
+            self.cache.put(file_path, collected[0], epoch=epoch)
 
         return result
 
     def delete(self, file_path: str) -> bool:
         """Delete file and remove from cache."""
         # Remove from cache
-        if file_path in self.cache:
-            del self.cache[file_path]
+        self.cache.invalidate(file_path)
 
         # Delete from storage
-        return self.storage.delete(file_path)
\ No newline at end of file
+        return self.storage.delete(file_path)
+
+    def delete_many(self, file_paths: Iterable[str],
+                    max_workers: int = DEFAULT_BATCH_WORKERS) -> List[BatchResult]:
+        """Delete files and remove them from cache using the storage's bulk delete."""
+        file_paths = list(file_paths)
+        for file_path in file_paths:
+            self.cache.invalidate(file_path)
+        return self.storage.delete_many(file_paths, max_workers=max_workers)
+
+    def exists(self, file_path: str) -> bool:
+        """Check whether a file exists, answering from cache when possible."""
+        return file_path in self.cache or self.storage.exists(file_path)
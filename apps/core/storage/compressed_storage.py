@@ -0,0 +1,349 @@
+# apps/core/storage/compressed_storage.py
+import io
+import struct
+import zlib
+from typing import BinaryIO, Optional, Iterable, List, Dict, Any, Callable
+
+try:
+    import zstandard
+except ImportError:
+    zstandard = None
+
+try:
+    import lz4.frame
+except ImportError:
+    lz4 = None
+
+from .base import StorageInterface, StreamWriter, FileStat, BatchResult, iter_file_obj, DEFAULT_BATCH_WORKERS
+from .file_types import SNIFF_SIZE, is_compressed_format
+
+# Compressed file layout:
+#   MAGIC | codec id (1 byte) | compressed frame | uncompressed size (uint64)
+# Files that are not compressed are stored as they are, without header,
+# except when their content happens to start with MAGIC: they are then
+# stored as MAGIC | CODEC_NONE | content.
+MAGIC = b'DPZ1'
+HEADER_SIZE = len(MAGIC) + 1
+TRAILER = struct.Struct('>Q')
+CODEC_NONE = 0
+
+
+class _LZ4Compressor:
+    """Adapts LZ4FrameCompressor to the compressobj() interface."""
+
+    def __init__(self, level: int):
+        self._compressor = lz4.frame.LZ4FrameCompressor(compression_level=level)
+        self._started = False
+
+    def compress(self, data: bytes) -> bytes:
+        prefix = b''
+        if not self._started:
+            prefix = self._compressor.begin()
+            self._started = True
+        return prefix + self._compressor.compress(data)
+
+    def flush(self) -> bytes:
+        prefix = b'' if self._started else self._compressor.begin()
+        return prefix + self._compressor.flush()
+
+
+class Codec:
+    """A streaming compression codec."""
+
+    def __init__(self, name: str, codec_id: int, default_level: int,
+                 compressor: Callable[[int], Any], decompressor: Callable[[], Any]):
+        """
+        Args:
+            name: Codec name used in configuration
+            codec_id: Byte identifying the codec in file headers
+            default_level: Compression level used when none is configured
+            compressor: Factory of objects with compress(data) and flush()
+            decompressor: Factory of objects with decompress(data), eof and unused_data
+        """
+        self.name = name
+        self.codec_id = codec_id
+        self.default_level = default_level
+        self.compressor = compressor
+        self.decompressor = decompressor
+
+
+CODECS: Dict[str, Codec] = {
+    'zlib': Codec('zlib', 1, 6, lambda level: zlib.compressobj(level), zlib.decompressobj),
+}
+if zstandard is not None:
+    CODECS['zstd'] = Codec(
+        'zstd', 2, 3,
+        lambda level: zstandard.ZstdCompressor(level=level).compressobj(),
+        lambda: zstandard.ZstdDecompressor().decompressobj()
+    )
+if lz4 is not None:
+    CODECS['lz4'] = Codec('lz4', 3, 0, _LZ4Compressor, lz4.frame.LZ4FrameDecompressor)
+
+CODECS_BY_ID = {codec.codec_id: codec for codec in CODECS.values()}
+
+# Best codec available in this environment
+DEFAULT_CODEC = 'zstd' if 'zstd' in CODECS else 'zlib'
+
+
+class CompressingWriter(StreamWriter):
+    """
+    Compresses a stream into an underlying writer.
+
+    The first bytes are buffered to decide, from their magic bytes and
+    the file size, whether the file is worth compressing.
+    """
+
+    def __init__(self, writer: StreamWriter, codec: Codec, level: int, min_size: int):
+        super().__init__()
+        self._writer = writer
+        self._codec = codec
+        self._level = level
+        self._decide_at = max(SNIFF_SIZE, min_size)
+        self._head = bytearray()
+        self._decided = False
+        self._compressor = None
+        self.compressed = False
+
+    def _decide(self, final: bool) -> None:
+        self._decided = True
+        head = bytes(self._head)
+        self._head = bytearray()
+
+        too_small = final and len(head) < self._decide_at
+        if not too_small and not is_compressed_format(head):
+            self._compressor = self._codec.compressor(self._level)
+            self.compressed = True
+            self._writer.write(MAGIC + bytes([self._codec.codec_id]))
+        elif head.startswith(MAGIC):
+            self._writer.write(MAGIC + bytes([CODEC_NONE]))
+        self._emit(head)
+
+    def _emit(self, data: bytes) -> None:
+        if self._compressor is not None:
+            data = self._compressor.compress(data)
+        if data:
+            self._writer.write(data)
+
+    def _write(self, data: bytes) -> Optional[int]:
+        if self._decided:
+            self._emit(data)
+        else:
+            self._head += data
+            if len(self._head) >= self._decide_at:
+                self._decide(final=False)
+        return len(data)
+
+    def _commit(self) -> None:
+        if not self._decided:
+            self._decide(final=True)
+        if self._compressor is not None:
+            self._writer.write(self._compressor.flush() + TRAILER.pack(self.bytes_written))
+        self._writer.close()
+        self.result = self._writer.result
+
+    def _discard(self) -> None:
+        self._writer.abort()
+
+
+class DecompressingReader(io.RawIOBase):
+    """Streaming decompression of a compressed file body."""
+
+    def __init__(self, stream: BinaryIO, codec: Codec, chunk_size: int):
+        super().__init__()
+        self._stream = stream
+        self._decompressor = codec.decompressor()
+        self._chunk_size = chunk_size
+        self._buffer = b''
+        self._size = 0
+        self._done = False
+
+    def readable(self) -> bool:
+        return True
+
+    def _finish(self) -> None:
+        """Check the trailer once the compressed frame has ended."""
+        trailer = self._decompressor.unused_data
+        while len(trailer) < TRAILER.size:
+            data = self._stream.read(TRAILER.size - len(trailer))
+            if not data:
+                break
+            trailer += data
+        if len(trailer) != TRAILER.size or TRAILER.unpack(trailer)[0] != self._size:
+            raise ValueError("Compressed file is corrupted: size mismatch")
+        self._done = True
+
+    def readinto(self, buffer) -> int:
+        while not self._buffer and not self._done:
+            data = self._stream.read(self._chunk_size)
+            if not data:
+                raise ValueError("Compressed file is truncated")
+            self._buffer = self._decompressor.decompress(data)
+            self._size += len(self._buffer)
+            if self._decompressor.eof:
+                self._finish()
+
+        count = min(len(buffer), len(self._buffer))
+        buffer[:count] = self._buffer[:count]
+        self._buffer = self._buffer[count:]
+        return count
+
+    def close(self) -> None:
+        if not self.closed:
+            self._stream.close()
+        super().close()
+
+
+class PrefixedReader(io.RawIOBase):
+    """Replays bytes already read from a stream before the rest of it."""
+
+    def __init__(self, prefix: bytes, stream: BinaryIO):
+        super().__init__()
+        self._prefix = prefix
+        self._stream = stream
+
+    def readable(self) -> bool:
+        return True
+
+    def readinto(self, buffer) -> int:
+        if self._prefix:
+            count = min(len(buffer), len(self._prefix))
+            buffer[:count] = self._prefix[:count]
+            self._prefix = self._prefix[count:]
+            return count
+        data = self._stream.read(len(buffer))
+        buffer[:len(data)] = data
+        return len(data)
+
+    def close(self) -> None:
+        if not self.closed:
+            self._stream.close()
+        super().close()
+
+
+class CompressedStorage(StorageInterface):
+    """
+    Storage decorator that transparently compresses files.
+
+    Files are compressed as they are streamed to the wrapped storage with
+    a configurable codec (zstd, lz4 or zlib) and level. Formats that are
+    already compressed (xlsx and other zip containers, parquet, pdf,
+    images, archives) are recognized by their magic bytes and stored as
+    they are, as are files smaller than min_size. A small header records
+    the codec, so reads are transparent whatever the configuration was
+    when a file was written, and files stored before compression was
+    enabled are read unchanged.
+    """
+
+    def __init__(self, storage: StorageInterface, codec: str = DEFAULT_CODEC,
+                 level: Optional[int] = None, min_size: int = 512):
+        """
+        Initialize compressed storage.
+
+        Args:
+            storage: Base storage implementation
+            codec: Codec of new files ('zstd', 'lz4' or 'zlib')
+            level: Compression level (defaults to the codec's default)
+            min_size: Files smaller than this are stored uncompressed
+
+        Raises:
+            ValueError: If the codec is unknown or its package is not installed
+        """
+        if codec not in CODECS:
+            raise ValueError(f"Codec {codec} is not available (available: {', '.join(sorted(CODECS))})")
+        self.storage = storage
+        self.chunk_size = storage.chunk_size
+        self.codec = CODECS[codec]
+        self.level = level if level is not None else self.codec.default_level
+        self.min_size = min_size
+
+    def _read_header(self, file_path: str) -> Optional[bytes]:
+        return self.storage.read_range(file_path, 0, HEADER_SIZE)
+
+    def get(self, file_path: str) -> Optional[BinaryIO]:
+        """Get and decompress file."""
+        return self.open_read(file_path)
+
+    def open_read(self, file_path: str) -> Optional[BinaryIO]:
+        """Open file for streaming reads, decompressing it if needed."""
+        stream = self.storage.open_read(file_path)
+        if stream is None:
+            return None
+
+        try:
+            header = b''
+            while len(header) < HEADER_SIZE:
+                data = stream.read(HEADER_SIZE - len(header))
+                if not data:
+                    break
+                header += data
+        except BaseException:
+            stream.close()
+            raise
+
+        if not header.startswith(MAGIC) or len(header) < HEADER_SIZE:
+            # Stored uncompressed
+            return io.BufferedReader(PrefixedReader(header, stream), buffer_size=self.chunk_size)
+        if header[-1] == CODEC_NONE:
+            return io.BufferedReader(PrefixedReader(b'', stream), buffer_size=self.chunk_size)
+
+        codec = CODECS_BY_ID.get(header[-1])
+        if codec is None:
+            stream.close()
+            raise ValueError(f"File {file_path} uses codec {header[-1]}, which is not available")
+        return io.BufferedReader(DecompressingReader(stream, codec, self.chunk_size), buffer_size=self.chunk_size)
+
+    def read_range(self, file_path: str, offset: int, length: int) -> Optional[bytes]:
+        """
+        Read a byte range of a file.
+
+        Ranges of uncompressed files are read directly from the wrapped
+        storage. Compressed files are decompressed from the start.
+        """
+        header = self._read_header(file_path)
+        if header is None:
+            return None
+        if not header.startswith(MAGIC) or len(header) < HEADER_SIZE:
+            return self.storage.read_range(file_path, offset, length)
+        if header[-1] == CODEC_NONE:
+            return self.storage.read_range(file_path, HEADER_SIZE + offset, length)
+        return super().read_range(file_path, offset, length)
+
+    def open_write(self, file_path: str) -> StreamWriter:
+        """Open file for streaming compression."""
+        return CompressingWriter(self.storage.open_write(file_path), self.codec, self.level, self.min_size)
+
+    def save(self, file_obj: BinaryIO, file_path: str) -> str:
+        """Compress (if worthwhile) and save file."""
+        with self.open_write(file_path) as writer:
+            for chunk in iter_file_obj(file_obj, self.chunk_size):
+                writer.write(chunk)
+        return writer.result or file_path
+
+    def stat(self, file_path: str) -> Optional[FileStat]:
+        """Get file information with the uncompressed size."""
+        stored = self.storage.stat(file_path)
+        if stored is None:
+            return None
+
+        header = self._read_header(file_path) or b''
+        if not header.startswith(MAGIC) or len(header) < HEADER_SIZE:
+            return stored
+        if header[-1] == CODEC_NONE:
+            size = stored.size - HEADER_SIZE
+        else:
+            trailer = self.storage.read_range(file_path, stored.size - TRAILER.size, TRAILER.size)
+            size = TRAILER.unpack(trailer)[0]
+        return FileStat(path=file_path, size=size, modified=stored.modified, etag=stored.etag)
+
+    def delete(self, file_path: str) -> bool:
+        """Delete file."""
+        return self.storage.delete(file_path)
+
+    def delete_many(self, file_paths: Iterable[str],
+                    max_workers: int = DEFAULT_BATCH_WORKERS) -> List[BatchResult]:
+        """Delete files using the storage's bulk delete."""
+        return self.storage.delete_many(file_paths, max_workers=max_workers)
+
+    def exists(self, file_path: str) -> bool:
+        """Check whether a file exists."""
+        return self.storage.exists(file_path)
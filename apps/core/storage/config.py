@@ -1,17 +1,75 @@
 # apps/core/storage/config.py
-from dataclasses import dataclass
+from dataclasses import dataclass, field
 from typing import Dict, Any, Optional
 
+# Separator of the layers of a stack description, outermost first
+STACK_SEPARATOR = '->'
+
+# Storage types that wrap another storage passed as their 'storage' argument
+DECORATOR_TYPES = frozenset({
+    'cached', 'tiered', 'content_addressed', 'versioned', 'encrypted', 'compressed', 'media',
+})
+
 
 @dataclass
 class StorageConfig:
-    """Configuration for storage backends."""
+    """
+    Configuration for storage backends.
+
+    Decorator storages (cached, encrypted, ...) hold the configuration of
+    the storage they wrap in 'storage', so a whole stack is one config.
+    """
     storage_type: str
-    settings: Dict[str, Any]
+    settings: Dict[str, Any] = field(default_factory=dict)
+    storage: Optional['StorageConfig'] = None
 
     @classmethod
     def from_dict(cls, config_dict: Dict) -> 'StorageConfig':
+        """
+        Build a config from a dictionary.
+
+        Example:
+            {'type': 'cached', 'settings': {'max_bytes': 1024},
+             'storage': {'type': 's3', 'settings': {'bucket': 'data'}}}
+        """
+        wrapped = config_dict.get('storage')
         return cls(
             storage_type=config_dict.get('type', 'local'),
-            settings=config_dict.get('settings', {})
-        )
\ No newline at end of file
+            settings=config_dict.get('settings', {}),
+            storage=cls.from_dict(wrapped) if wrapped is not None else None
+        )
+
+    @classmethod
+    def parse(cls, stack: str, options: Optional[Dict[str, Dict[str, Any]]] = None) -> 'StorageConfig':
+        """
+        Build a config from a stack description like 'encrypted -> cached -> s3'.
+
+        Args:
+            stack: Storage types separated by '->', outermost first
+            options: Settings of each layer, by storage type
+
+        Returns:
+            Config of the outermost layer
+
+        Raises:
+            ValueError: If the stack is empty or decorators are misplaced
+        """
+        options = options or {}
+        layers = [layer.strip().lower() for layer in stack.split(STACK_SEPARATOR)]
+        if not all(layers):
+            raise ValueError(f"Invalid storage stack: {stack!r}")
+
+        config = None
+        for layer in reversed(layers):
+            if config is None and layer in DECORATOR_TYPES:
+                raise ValueError(f"Storage stack {stack!r} must end with a backend, not {layer}")
+            if config is not None and layer not in DECORATOR_TYPES:
+                raise ValueError(f"Storage {layer} cannot wrap another storage in {stack!r}")
+            config = cls(storage_type=layer, settings=dict(options.get(layer, {})), storage=config)
+        return config
+
+    def describe(self) -> str:
+        """Return the stack description of this config."""
+        if self.storage is None:
+            return self.storage_type
+        return f"{self.storage_type} {STACK_SEPARATOR} {self.storage.describe()}"
@@ -0,0 +1,284 @@
+# apps/core/storage/content_addressed.py
+import os
+import sqlite3
+import tempfile
+import threading
+from typing import BinaryIO, Optional, Dict, Any, Iterable, List, Tuple
+
+from .base import StorageInterface, FileStat, BatchResult, iter_file_obj, DEFAULT_SPOOL_SIZE, DEFAULT_BATCH_WORKERS
+from .hashing import HashingReader
+
+
+class ContentIndex:
+    """
+    SQLite index mapping storage paths to content digests.
+
+    Keeps one row per stored blob with its reference count and one row
+    per path pointing at a blob.
+    """
+
+    def __init__(self, db_path: str):
+        """
+        Open (and create if needed) the index.
+
+        Args:
+            db_path: Path to the SQLite database file
+        """
+        if os.path.dirname(db_path):
+            os.makedirs(os.path.dirname(db_path), exist_ok=True)
+        self._conn = sqlite3.connect(db_path, check_same_thread=False, isolation_level=None)
+        self._conn.execute('PRAGMA journal_mode=WAL')
+        self._conn.execute(
+            'CREATE TABLE IF NOT EXISTS blobs '
+            '(digest TEXT PRIMARY KEY, size INTEGER NOT NULL, refcount INTEGER NOT NULL)'
+        )
+        self._conn.execute('CREATE TABLE IF NOT EXISTS refs (path TEXT PRIMARY KEY, digest TEXT NOT NULL)')
+        self._lock = threading.Lock()
+
+    def lookup(self, path: str) -> Optional[Tuple[str, int]]:
+        """Return (digest, size) of the blob a path points to."""
+        with self._lock:
+            return self._conn.execute(
+                'SELECT refs.digest, blobs.size FROM refs JOIN blobs ON blobs.digest = refs.digest '
+                'WHERE refs.path = ?', (path,)
+            ).fetchone()
+
+    def has_blob(self, digest: str) -> bool:
+        with self._lock:
+            return self._conn.execute('SELECT 1 FROM blobs WHERE digest = ?', (digest,)).fetchone() is not None
+
+    def add_ref(self, path: str, digest: str, size: int) -> Optional[str]:
+        """
+        Point a path at a blob, incrementing the blob's reference count.
+
+        Returns:
+            Digest of the blob the path pointed to before if it is no
+            longer referenced, None otherwise
+        """
+        with self._lock:
+            self._conn.execute('BEGIN IMMEDIATE')
+            try:
+                previous = self._conn.execute('SELECT digest FROM refs WHERE path = ?', (path,)).fetchone()
+                if previous is not None and previous[0] == digest:
+                    self._conn.execute('COMMIT')
+                    return None
+
+                self._conn.execute(
+                    'INSERT INTO blobs (digest, size, refcount) VALUES (?, ?, 1) '
+                    'ON CONFLICT(digest) DO UPDATE SET refcount = refcount + 1', (digest, size)
+                )
+                self._conn.execute('INSERT OR REPLACE INTO refs (path, digest) VALUES (?, ?)', (path, digest))
+                orphan = self._release(previous[0]) if previous is not None else None
+                self._conn.execute('COMMIT')
+                return orphan
+            except BaseException:
+                self._conn.execute('ROLLBACK')
+                raise
+
+    def remove_ref(self, path: str) -> Tuple[bool, Optional[str]]:
+        """
+        Remove a path.
+
+        Returns:
+            (whether the path existed, digest of the blob if it is no longer referenced)
+        """
+        with self._lock:
+            self._conn.execute('BEGIN IMMEDIATE')
+            try:
+                row = self._conn.execute('SELECT digest FROM refs WHERE path = ?', (path,)).fetchone()
+                if row is None:
+                    self._conn.execute('COMMIT')
+                    return False, None
+                self._conn.execute('DELETE FROM refs WHERE path = ?', (path,))
+                orphan = self._release(row[0])
+                self._conn.execute('COMMIT')
+                return True, orphan
+            except BaseException:
+                self._conn.execute('ROLLBACK')
+                raise
+
+    def _release(self, digest: str) -> Optional[str]:
+        """Decrement a blob's reference count inside a transaction."""
+        self._conn.execute('UPDATE blobs SET refcount = refcount - 1 WHERE digest = ?', (digest,))
+        refcount = self._conn.execute('SELECT refcount FROM blobs WHERE digest = ?', (digest,)).fetchone()
+        if refcount is not None and refcount[0] <= 0:
+            self._conn.execute('DELETE FROM blobs WHERE digest = ?', (digest,))
+            return digest
+        return None
+
+    def stats(self) -> Dict[str, int]:
+        """Return path and blob counts and the logical and stored byte totals."""
+        with self._lock:
+            paths, logical = self._conn.execute(
+                'SELECT COUNT(*), COALESCE(SUM(blobs.size), 0) FROM refs JOIN blobs ON blobs.digest = refs.digest'
+            ).fetchone()
+            blobs, stored = self._conn.execute('SELECT COUNT(*), COALESCE(SUM(size), 0) FROM blobs').fetchone()
+        return {'paths': paths, 'blobs': blobs, 'logical_bytes': logical, 'stored_bytes': stored}
+
+    def close(self) -> None:
+        self._conn.close()
+
+
+class ContentAddressedStorage(StorageInterface):
+    """
+    Storage decorator that stores every distinct content once.
+
+    Files are hashed while they are streamed into a local spool, then
+    stored under their digest (cas/<ab>/<digest>) unless a blob with the
+    same digest already exists. Paths are mapped to digests in a
+    ContentIndex that keeps a reference count per blob, and a blob is
+    deleted when the last path pointing at it is deleted or overwritten.
+    Saving a duplicate costs a hash and an index row instead of a copy of
+    the bytes.
+    """
+
+    def __init__(self, storage: StorageInterface, index_path: str, algorithm: str = 'sha256',
+                 prefix: str = 'cas', spool_size: int = DEFAULT_SPOOL_SIZE):
+        """
+        Initialize content-addressed storage.
+
+        Args:
+            storage: Storage holding the blobs
+            index_path: Path to the SQLite index file
+            algorithm: hashlib algorithm naming the blobs
+            prefix: Storage prefix of the blobs
+            spool_size: Files smaller than this are hashed in memory,
+                larger ones are spooled to a temporary file
+        """
+        self.storage = storage
+        self.chunk_size = storage.chunk_size
+        self.algorithm = algorithm
+        self.prefix = prefix
+        self.spool_size = spool_size
+        self.index = ContentIndex(index_path)
+        self.deduplicated = 0
+        # Serializes "is the blob known" checks with blob deletion
+        self._lock = threading.Lock()
+        # Blob deletions so far, to detect those that race with an upload
+        self._deletions = 0
+
+    def blob_path(self, digest: str) -> str:
+        """Storage path of the blob with the given digest."""
+        return f"{self.prefix}/{digest[:2]}/{digest}"
+
+    def digest(self, file_path: str) -> Optional[str]:
+        """
+        Get the content digest of a stored file.
+
+        Args:
+            file_path: Path to the file
+
+        Returns:
+            Hex digest or None if file doesn't exist
+        """
+        entry = self.index.lookup(file_path)
+        return entry[0] if entry is not None else None
+
+    def _delete_blob(self, digest: Optional[str]) -> None:
+        if digest is not None:
+            self._deletions += 1
+            self.storage.delete(self.blob_path(digest))
+
+    def stats(self) -> Dict[str, Any]:
+        """Return index counts and the number of deduplicated saves."""
+        stats = self.index.stats()
+        stats['deduplicated'] = self.deduplicated
+        return stats
+
+    def get(self, file_path: str) -> Optional[BinaryIO]:
+        """Get file by resolving its path to a blob."""
+        return self.open_read(file_path)
+
+    def open_read(self, file_path: str) -> Optional[BinaryIO]:
+        """Open the blob a path points to for streaming reads."""
+        digest = self.digest(file_path)
+        if digest is None:
+            return None
+        return self.storage.open_read(self.blob_path(digest))
+
+    def read_range(self, file_path: str, offset: int, length: int) -> Optional[bytes]:
+        """Read a byte range of the blob a path points to."""
+        digest = self.digest(file_path)
+        if digest is None:
+            return None
+        return self.storage.read_range(self.blob_path(digest), offset, length)
+
+    def stat(self, file_path: str) -> Optional[FileStat]:
+        """Get file information from the index; the digest doubles as ETag."""
+        entry = self.index.lookup(file_path)
+        if entry is None:
+            return None
+        digest, size = entry
+        return FileStat(path=file_path, size=size, etag=digest)
+
+    def save(self, file_obj: BinaryIO, file_path: str) -> str:
+        """
+        Hash and save file, storing its content only if it is new.
+
+        A new blob is uploaded outside the lock and referenced afterwards.
+        If a blob was deleted in between (possibly this one, orphaned by a
+        concurrent save and delete of the same content), its existence is
+        checked again under the lock, holding the new reference, and it is
+        uploaded again if it is gone.
+
+        Args:
+            file_obj: File-like object to save
+            file_path: Path where to save the file
+
+        Returns:
+            Path to the saved file
+        """
+        with tempfile.SpooledTemporaryFile(max_size=self.spool_size) as spool:
+            reader = HashingReader(file_obj, (self.algorithm,))
+            for chunk in iter_file_obj(reader, self.chunk_size):
+                spool.write(chunk)
+            digest = reader.hexdigest(self.algorithm)
+
+            with self._lock:
+                known = self.index.has_blob(digest)
+                if known:
+                    orphan = self.index.add_ref(file_path, digest, reader.size)
+                    self.deduplicated += 1
+                    self._delete_blob(orphan)
+                deletions = self._deletions
+            if known:
+                return file_path
+
+            blob_path = self.blob_path(digest)
+            spool.seek(0)
+            self.storage.save(spool, blob_path)
+
+            with self._lock:
+                self._delete_blob(self.index.add_ref(file_path, digest, reader.size))
+                if self._deletions != deletions and not self.storage.exists(blob_path):
+                    spool.seek(0)
+                    self.storage.save(spool, blob_path)
+        return file_path
+
+    def delete(self, file_path: str) -> bool:
+        """Delete a path, and its blob if no other path references it."""
+        with self._lock:
+            found, orphan = self.index.remove_ref(file_path)
+            self._delete_blob(orphan)
+        return found
+
+    def delete_many(self, file_paths: Iterable[str],
+                    max_workers: int = DEFAULT_BATCH_WORKERS) -> List[BatchResult]:
+        """Delete paths, removing unreferenced blobs with the storage's bulk delete."""
+        file_paths = list(file_paths)
+        orphans = []
+        results = []
+        with self._lock:
+            for file_path in file_paths:
+                found, orphan = self.index.remove_ref(file_path)
+                results.append(BatchResult(path=file_path, success=found, value=found))
+                if orphan is not None:
+                    orphans.append(self.blob_path(orphan))
+            if orphans:
+                self._deletions += len(orphans)
+                self.storage.delete_many(orphans, max_workers=max_workers)
+        return results
+
+    def exists(self, file_path: str) -> bool:
+        """Check whether a path exists in the index."""
+        return self.index.lookup(file_path) is not None
@@ -1,53 +1,340 @@
 # apps/core/storage/encrypted_storage.py
+import base64
+import json
 import os
-from cryptography.fernet import Fernet
-from typing import BinaryIO, Optional
-from io import BytesIO
-from .base import StorageInterface
+from cryptography.fernet import Fernet, InvalidToken
+from typing import BinaryIO, Optional, Iterable, List, Tuple, Union
+from io import BytesIO, BufferedReader
+from .base import StorageInterface, StreamWriter, FileStat, BatchResult, iter_file_obj, run_batch, DEFAULT_BATCH_WORKERS
+from .keyring import Keyring
+from .segmented_encryption import (
+    SegmentHeader, SegmentCipher, SegmentedEncryptWriter, SegmentedDecryptReader,
+    decrypt_range, derive_file_key, is_segmented, HEADER_SIZE, DEFAULT_SEGMENT_SIZE
+)
+
+# Suffix of the small object holding the wrapped data key of a file
+KEY_SUFFIX = '.key'
+
+DATA_KEY_SIZE = 32
+
+
+def _is_fernet_token(prefix: bytes) -> bool:
+    """Check whether stored bytes start like a Fernet token (version byte 0x80)."""
+    try:
+        return base64.urlsafe_b64decode(prefix[:4])[:1] == b'\x80'
+    except (ValueError, TypeError):
+        return False
 
 
 class EncryptedStorage(StorageInterface):
-    """Storage decorator that adds encryption."""
+    """
+    Storage decorator that adds envelope encryption.
 
-    def __init__(self, storage: StorageInterface, key: Optional[str] = None):
+    Every file is encrypted with its own random data key, wrapped by the
+    active master key of a keyring and stored next to the file in a small
+    key object named after the file's header salt. Rotating a master key
+    only re-wraps those data keys (see rewrap and KeyRotationJob), never
+    the file contents.
+
+    Files are written in a segmented AES-GCM format: the plaintext is cut
+    into fixed-size segments that are encrypted and authenticated one at a
+    time, so files are encrypted and decrypted as streams and a byte range
+    can be decrypted by fetching only the segments that cover it. Files
+    written before envelope encryption (segmented files and single Fernet
+    tokens without a key object) are read with the keyring's legacy key.
+    """
+
+    def __init__(self, storage: StorageInterface, keyring: Union[Keyring, str, None] = None,
+                 key: Optional[str] = None, segment_size: int = DEFAULT_SEGMENT_SIZE):
         """
         Initialize encrypted storage.
 
         Args:
             storage: Base storage implementation
-            key: Encryption key (will be generated if None)
+            keyring: Keyring or path to a keyring file
+            key: Single master key, used as a one-key keyring when no keyring is given
+            segment_size: Plaintext size of the encrypted segments
+
+        Raises:
+            ValueError: If neither a keyring nor a key is given
         """
         self.storage = storage
+        self.chunk_size = storage.chunk_size
+        self.segment_size = segment_size
 
-        if key is None:
-            self.key = Fernet.generate_key()
-        else:
-            self.key = key.encode() if isinstance(key, str) else key
+        if isinstance(keyring, str):
+            keyring = Keyring.load(keyring)
+        elif keyring is None:
+            if key is None:
+                # Never fall back to a random key: the data would be unreadable after a restart
+                raise ValueError("EncryptedStorage requires a keyring or a key")
+            keyring = Keyring.from_key(key)
+        self.keyring = keyring
+
+    @staticmethod
+    def key_path(file_path: str, salt: Optional[bytes] = None) -> str:
+        """
+        Path of the key object of a file.
+
+        Segmented files have one key object per version, named after the
+        salt in their header, so writing a new version never touches the
+        key of the version readers currently see. Legacy Fernet tokens
+        (and files written before keys were versioned) use the unversioned
+        path.
+        """
+        if salt is None:
+            return file_path + KEY_SUFFIX
+        return f"{file_path}.{salt.hex()}{KEY_SUFFIX}"
+
+    def _read_key_object(self, key_path: str) -> Optional[dict]:
+        stream = self.storage.open_read(key_path)
+        if stream is None:
+            return None
+        try:
+            return json.loads(stream.read())
+        finally:
+            stream.close()
+
+    def _write_key_object(self, key_path: str, data_key: bytes) -> None:
+        key_id, wrapped = self.keyring.wrap(data_key)
+        content = json.dumps({
+            'key_id': key_id,
+            'wrapped_key': base64.b64encode(wrapped).decode(),
+        }).encode()
+        self.storage.save(BytesIO(content), key_path)
 
-        self.cipher = Fernet(self.key)
+    def _find_key_object(self, file_path: str, salt: Optional[bytes]) -> Tuple[Optional[dict], str]:
+        """Return the key object of a file version and its path (None if it has none)."""
+        if salt is not None:
+            key_path = self.key_path(file_path, salt)
+            key_object = self._read_key_object(key_path)
+            if key_object is not None:
+                return key_object, key_path
+        key_path = self.key_path(file_path)
+        return self._read_key_object(key_path), key_path
+
+    def _data_key(self, file_path: str, salt: Optional[bytes] = None) -> bytes:
+        """Unwrap the data key of a file version, or return the legacy key if it has none."""
+        key_object, _ = self._find_key_object(file_path, salt)
+        if key_object is None:
+            return self.keyring.keys[self.keyring.legacy]
+        return self.keyring.unwrap(key_object['key_id'], base64.b64decode(key_object['wrapped_key']))
+
+    def _salt(self, file_path: str) -> Optional[bytes]:
+        """Salt of the stored version of a segmented file (None for other files)."""
+        prefix = self._read_header(file_path) or b''
+        return SegmentHeader.parse(prefix).salt if is_segmented(prefix) else None
+
+    def _key_paths(self, file_path: str) -> List[str]:
+        """Paths of the key objects the stored version of a file may use."""
+        salt = self._salt(file_path)
+        if salt is None:
+            return [self.key_path(file_path)]
+        return [self.key_path(file_path, salt), self.key_path(file_path)]
+
+    def _delete_keys(self, key_paths: Iterable[str]) -> None:
+        for key_path in key_paths:
+            self.storage.delete(key_path)
+
+    def _read_header(self, file_path: str) -> Optional[bytes]:
+        """Read the bytes where the segmented header of a file would be."""
+        return self.storage.read_range(file_path, 0, HEADER_SIZE)
 
     def get(self, file_path: str) -> Optional[BinaryIO]:
         """Get and decrypt file."""
-        encrypted_data = self.storage.get(file_path)
+        return self.open_read(file_path)
+
+    def open_read(self, file_path: str) -> Optional[BinaryIO]:
+        """
+        Open file for streaming decryption.
+
+        Segmented files are decrypted one segment at a time as they are
+        read. Legacy Fernet tokens can only be authenticated as a whole, so
+        they are read in one piece and served from memory.
+        """
+        encrypted_data = self.storage.open_read(file_path)
         if encrypted_data is None:
             return None
 
-        # Decrypt data
-        encrypted_content = encrypted_data.read()
         try:
-            decrypted_content = self.cipher.decrypt(encrypted_content)
-            return BytesIO(decrypted_content)
-        except:
+            prefix = self._read_prefix(encrypted_data)
+            header = SegmentHeader.parse(prefix) if is_segmented(prefix) else None
+            data_key = self._data_key(file_path, header.salt if header is not None else None)
+        except BaseException:
+            encrypted_data.close()
+            raise
+
+        if header is not None:
+            reader = SegmentedDecryptReader(encrypted_data, header, derive_file_key(data_key, header.salt))
+            return BufferedReader(reader, buffer_size=header.segment_size)
+
+        # Legacy Fernet token
+        try:
+            encrypted_content = prefix + encrypted_data.read()
+        finally:
+            encrypted_data.close()
+        try:
+            return BytesIO(Fernet(base64.urlsafe_b64encode(data_key)).decrypt(encrypted_content))
+        except InvalidToken:
             # If decryption fails, return None
             return None
 
+    @staticmethod
+    def _read_prefix(stream: BinaryIO) -> bytes:
+        """Read up to HEADER_SIZE bytes from the start of a stream."""
+        prefix = b''
+        while len(prefix) < HEADER_SIZE:
+            data = stream.read(HEADER_SIZE - len(prefix))
+            if not data:
+                break
+            prefix += data
+        return prefix
+
+    def read_range(self, file_path: str, offset: int, length: int) -> Optional[bytes]:
+        """
+        Decrypt a byte range of a file.
+
+        Only the header and the segments covering the range are fetched
+        from the wrapped storage, so reading a Parquet footer does not
+        decrypt the whole file.
+        """
+        prefix = self._read_header(file_path)
+        if prefix is None:
+            return None
+
+        if not is_segmented(prefix):
+            return super().read_range(file_path, offset, length)
+
+        header = SegmentHeader.parse(prefix)
+        return decrypt_range(
+            lambda start, size: self.storage.read_range(file_path, start, size),
+            header, derive_file_key(self._data_key(file_path, header.salt), header.salt), offset, length
+        )
+
+    def open_write(self, file_path: str) -> StreamWriter:
+        """
+        Open file for streaming encryption under a new data key.
+
+        The wrapped data key is stored first, in the key object of the new
+        version, so a committed file is never left without its key. The
+        key objects of the replaced version are only removed once the new
+        data is committed: readers keep decrypting the previous version
+        while the write is in progress, and an aborted write only removes
+        its own key.
+        """
+        previous_keys = self._key_paths(file_path)
+        data_key = os.urandom(DATA_KEY_SIZE)
+        header = SegmentHeader.new(self.segment_size)
+        key_path = self.key_path(file_path, header.salt)
+        self._write_key_object(key_path, data_key)
+
+        cipher = SegmentCipher(derive_file_key(data_key, header.salt), header)
+        try:
+            writer = self.storage.open_write(file_path)
+        except BaseException:
+            self.storage.delete(key_path)
+            raise
+        return SegmentedEncryptWriter(writer, cipher,
+                                      on_commit=lambda: self._delete_keys(previous_keys),
+                                      on_discard=lambda: self.storage.delete(key_path))
+
     def save(self, file_obj: BinaryIO, file_path: str) -> str:
-        """Encrypt and save file."""
-        content = file_obj.read()
-        encrypted_content = self.cipher.encrypt(content)
+        """Encrypt and save file segment by segment."""
+        with self.open_write(file_path) as writer:
+            for chunk in iter_file_obj(file_obj, self.chunk_size):
+                writer.write(chunk)
+        return writer.result or file_path
+
+    def stat(self, file_path: str) -> Optional[FileStat]:
+        """Get the plaintext size of a file without decrypting it."""
+        encrypted_stat = self.storage.stat(file_path)
+        if encrypted_stat is None:
+            return None
+
+        prefix = self._read_header(file_path) or b''
+        if not is_segmented(prefix):
+            return super().stat(file_path)
 
-        return self.storage.save(BytesIO(encrypted_content), file_path)
+        header = SegmentHeader.parse(prefix)
+        return FileStat(
+            path=file_path,
+            size=header.plaintext_size(encrypted_stat.size),
+            modified=encrypted_stat.modified,
+            etag=encrypted_stat.etag
+        )
+
+    def rewrap(self, file_path: str) -> bool:
+        """
+        Re-wrap the data key of a file with the active master key.
+
+        Only the small key object is rewritten. Files written before
+        envelope encryption get a key object wrapping the legacy key, after
+        which the legacy key can be retired like any other. Stored files
+        that are not encrypted are left alone.
+
+        The key object is versioned by the header salt, so a concurrent
+        write of a new version is never overwritten; if the file changed
+        while its key was being re-wrapped, the key written for the
+        replaced version is removed again.
+
+        Args:
+            file_path: Path to the file
+
+        Returns:
+            True if the key object was rewritten, False if it already used
+            the active key or the file is not encrypted
+
+        Raises:
+            FileNotFoundError: If the file doesn't exist
+            KeyringError: If the data key cannot be unwrapped
+        """
+        prefix = self._read_header(file_path)
+        if prefix is None:
+            raise FileNotFoundError(file_path)
+        if is_segmented(prefix):
+            salt = SegmentHeader.parse(prefix).salt
+        elif _is_fernet_token(prefix):
+            salt = None
+        else:
+            return False
+
+        key_object, found_path = self._find_key_object(file_path, salt)
+        target_path = self.key_path(file_path, salt)
+        if key_object is None:
+            data_key = self.keyring.keys[self.keyring.legacy]
+        elif key_object['key_id'] == self.keyring.active and found_path == target_path:
+            return False
+        else:
+            data_key = self.keyring.unwrap(key_object['key_id'], base64.b64decode(key_object['wrapped_key']))
+
+        self._write_key_object(target_path, data_key)
+        if salt is not None and self._salt(file_path) != salt:
+            # A new version was committed meanwhile: this key belongs to no stored data
+            self.storage.delete(target_path)
+            return False
+        if found_path != target_path and key_object is not None:
+            self.storage.delete(found_path)
+        return True
 
     def delete(self, file_path: str) -> bool:
-        """Delete encrypted file."""
-        return self.storage.delete(file_path)
\ No newline at end of file
+        """Delete encrypted file and its key."""
+        key_paths = self._key_paths(file_path)
+        deleted = self.storage.delete(file_path)
+        self._delete_keys(key_paths)
+        return deleted
+
+    def delete_many(self, file_paths: Iterable[str],
+                    max_workers: int = DEFAULT_BATCH_WORKERS) -> List[BatchResult]:
+        """Delete encrypted files and their keys using the storage's bulk delete."""
+        file_paths = list(file_paths)
+        # The versioned key paths come from the file headers, read concurrently
+        key_paths = run_batch(self._key_paths, [(path,) for path in file_paths], file_paths, max_workers)
+        results = self.storage.delete_many(
+            file_paths + [key_path for result in key_paths for key_path in (result.value or [])],
+            max_workers=max_workers
+        )
+        return results[:len(file_paths)]
+
+    def exists(self, file_path: str) -> bool:
+        """Check whether an encrypted file exists."""
+        return self.storage.exists(file_path)
@@ -1,9 +1,22 @@
 # apps/core/storage/factory.py
-from typing import Dict, Any
+import os
+import threading
+from typing import TYPE_CHECKING, Dict, Tuple
+
+from django.conf import settings
+
 from .base import StorageInterface
+from .config import StorageConfig
 from .local import LocalStorage
 from .s3 import S3Storage
 
+if TYPE_CHECKING:
+    from .async_storage import AsyncStorage
+
+# Process-wide storages, see StorageFactory.get_shared_storage
+_shared: Dict[Tuple[str, int], StorageInterface] = {}
+_shared_lock = threading.Lock()
+
 
 class StorageFactory:
     """Factory for creating storage instances."""
@@ -30,14 +43,106 @@ class StorageFactory:
         elif storage_type.lower() == 'cached':
             from .cached_storage import CachedStorage
             return CachedStorage(**storage_opts)
+        elif storage_type.lower() == 'tiered':
+            from .tiered_storage import TieredCachedStorage
+            return TieredCachedStorage(**storage_opts)
+        elif storage_type.lower() == 'content_addressed':
+            from .content_addressed import ContentAddressedStorage
+            return ContentAddressedStorage(**storage_opts)
+        elif storage_type.lower() == 'versioned':
+            from .versioned_storage import VersionedStorage
+            return VersionedStorage(**storage_opts)
+        elif storage_type.lower() == 'compressed':
+            from .compressed_storage import CompressedStorage
+            return CompressedStorage(**storage_opts)
         elif storage_type.lower() == 'encrypted':
             from .encrypted_storage import EncryptedStorage
             return EncryptedStorage(**storage_opts)
-        elif storage_type.lower() == 'async':
-            from .async_storage import AsyncStorage
-            return AsyncStorage(**storage_opts)
         elif storage_type.lower() == 'media':
             from .media_storage import MediaStorage
             return MediaStorage(**storage_opts)
         else:
-            raise ValueError(f"Unsupported storage type: {storage_type}")
\ No newline at end of file
+            raise ValueError(f"Unsupported storage type: {storage_type}")
+
+    @staticmethod
+    def build(config: StorageConfig) -> StorageInterface:
+        """
+        Create a storage stack from its configuration.
+
+        Args:
+            config: Configuration of the outermost storage
+
+        Returns:
+            The outermost storage, wrapping the rest of the stack
+        """
+        storage_opts = dict(config.settings)
+        if config.storage is not None:
+            storage_opts['storage'] = StorageFactory.build(config.storage)
+        return StorageFactory.get_storage(config.storage_type, **storage_opts)
+
+    @staticmethod
+    def get_config(name: str) -> StorageConfig:
+        """
+        Return the configuration of a named stack.
+
+        Names are looked up in settings.STORAGE_STACKS; any other name is
+        parsed as a stack description such as 'cached -> s3' or 'local'.
+        """
+        stacks = getattr(settings, 'STORAGE_STACKS', {}) if settings.configured else {}
+        stack = stacks.get(name)
+        if stack is None:
+            return StorageConfig.parse(name)
+        if isinstance(stack, str):
+            return StorageConfig.parse(stack)
+        return StorageConfig.parse(stack['stack'], stack.get('options'))
+
+    @staticmethod
+    def get_shared_storage(name: str = 'default') -> StorageInterface:
+        """
+        Return the process-wide storage stack with the given name.
+
+        The stack is built on first use and reused afterwards, so
+        connection pools, executors and caches live as long as the process
+        instead of one request or task. Stacks are not shared with forked
+        children, which build their own.
+
+        Args:
+            name: Stack name in settings.STORAGE_STACKS or a stack description
+
+        Returns:
+            Shared StorageInterface instance
+        """
+        key = (name, os.getpid())
+        storage = _shared.get(key)
+        if storage is None:
+            with _shared_lock:
+                storage = _shared.get(key)
+                if storage is None:
+                    storage = StorageFactory.build(StorageFactory.get_config(name))
+                    _shared[key] = storage
+        return storage
+
+    @staticmethod
+    def get_async_storage(name: str = 'default', **async_opts) -> 'AsyncStorage':
+        """
+        Return an asyncio front end to the process-wide storage stack with the given name.
+
+        AsyncStorage is not a StorageInterface (its methods are coroutines),
+        so it can't be a layer of a stack; it wraps the whole stack instead.
+        Callers keep the instance, whose semaphore bounds their transfers.
+
+        Args:
+            name: Stack name in settings.STORAGE_STACKS or a stack description
+            **async_opts: AsyncStorage options (max_concurrency, ...)
+
+        Returns:
+            AsyncStorage over the shared stack
+        """
+        from .async_storage import AsyncStorage
+        return AsyncStorage(StorageFactory.get_shared_storage(name), **async_opts)
+
+    @staticmethod
+    def reset_shared_storages() -> None:
+        """Forget the shared storages so that they are rebuilt on next use."""
+        with _shared_lock:
+            _shared.clear()
@@ -1,28 +1,43 @@
 # apps/core/file_management.py
+import os
 from typing import Dict, List, Any, Optional, BinaryIO
+from django.conf import settings
+from apps.core.storage.base import StorageInterface
 from apps.core.storage.factory import StorageFactory
 from apps.core.converters.factory import ConverterFactory
 from apps.core.processors.factory import ProcessorFactory
-from .utils.file_info import get_file_info
+from apps.core.storage.hashing import InspectingReader
+
+# DataFile.file_type of the formats recognized from magic bytes
+FORMAT_FILE_TYPES = {'pdf': 'pdf', 'parquet': 'parquet'}
 
 
 class FileManager:
     """Comprehensive file management system."""
 
-    def __init__(self, storage_type: str = 'local', **storage_opts):
+    def __init__(self, storage_type: Optional[str] = None, **storage_opts):
         """
         Initialize file manager.
 
         Args:
-            storage_type: Type of storage to use ('local', 's3', etc.)
+            storage_type: Type of storage to use ('local', 's3', etc.), by
+                default the configured 'default' stack, rooted where DataFile
+                paths are resolved (MEDIA_ROOT)
             **storage_opts: Options for storage initialization
         """
-        self.storage = StorageFactory.get_storage(storage_type, **storage_opts)
+        if storage_type is None:
+            self.storage = StorageFactory.get_shared_storage('default')
+        else:
+            self.storage = StorageFactory.get_storage(storage_type, **storage_opts)
 
     def upload(self, file_obj: BinaryIO, file_path: str) -> Dict[str, Any]:
         """
         Upload a file.
 
+        The size, MD5, a fast non-cryptographic hash and the format found
+        in the magic bytes are computed while the content streams to
+        storage, so every byte is read once.
+
         Args:
             file_obj: File object to upload
             file_path: Path to save the file
@@ -31,18 +46,116 @@ class FileManager:
             Dict with upload result
         """
         try:
-            saved_path = self.storage.save(file_obj, file_path)
-
-            # Get file metadata
-            file_info = get_file_info(saved_path)
+            reader = InspectingReader(file_obj)
+            saved_path = self.storage.save(reader, file_path)
 
             return {
                 "success": True,
                 "path": saved_path,
-                "metadata": file_info
+                "metadata": reader.info()
             }
         except Exception as e:
             return {
                 "success": False,
                 "error": str(e)
-            }
\ No newline at end of file
+            }
+
+    def create_data_file(self, dataset, file_obj: BinaryIO, file_name: str):
+        """
+        Upload a file and create its DataFile in one pass over the content.
+
+        Args:
+            dataset: Dataset the file belongs to
+            file_obj: File object to upload
+            file_name: Original file name
+
+        Returns:
+            The created DataFile with size_bytes, md5_hash and file_type set
+
+        Raises:
+            IOError: If the upload failed
+            ValueError: If the storage doesn't keep DataFile uploads as
+                plain files under MEDIA_ROOT (see check_data_file_storage)
+        """
+        check_data_file_storage(self.storage)
+        file_path = data_file_path(dataset, file_name)
+        result = self.upload(file_obj, file_path)
+        if not result["success"]:
+            raise IOError(f"Upload of {file_name} failed: {result['error']}")
+        return save_data_file(dataset, file_name, file_path, result["metadata"])
+
+
+def check_data_file_storage(storage: StorageInterface) -> None:
+    """
+    Refuse a storage stack that doesn't keep uploads at MEDIA_ROOT/<path>.
+
+    Processors open DataFile.file.path, the plain file under MEDIA_ROOT,
+    so a DataFile upload must land there byte for byte and at once. Only
+    caching, media and async layers over an unsharded LocalStorage
+    rooted at MEDIA_ROOT, without write-behind, do that: S3, sharded,
+    encrypted, compressed, content-addressed and versioned layouts don't.
+
+    Args:
+        storage: Storage the uploads are saved to
+
+    Raises:
+        ValueError: If the stack stores the files anywhere or anyhow else
+    """
+    from apps.core.storage.async_storage import AsyncStorage
+    from apps.core.storage.cached_storage import CachedStorage
+    from apps.core.storage.local import LocalStorage
+    from apps.core.storage.media_storage import MediaStorage
+    from apps.core.storage.tiered_storage import TieredCachedStorage
+
+    layer = storage
+    while isinstance(layer, (AsyncStorage, CachedStorage, MediaStorage, TieredCachedStorage)):
+        layer = layer.storage
+    if not isinstance(layer, LocalStorage):
+        raise ValueError(f"DataFile uploads need a local storage, not {type(layer).__name__}")
+    if layer.shard_depth or layer.write_behind is not None:
+        raise ValueError("DataFile uploads need a local storage without sharding or write-behind")
+    if os.path.realpath(layer.base_dir) != os.path.realpath(settings.MEDIA_ROOT):
+        raise ValueError(f"DataFile uploads need a local storage rooted at MEDIA_ROOT, not {layer.base_dir}")
+
+
+def data_file_path(dataset, file_name: str) -> str:
+    """Storage path of a new upload to a dataset (see file_upload_path)."""
+    from apps.core.models import DataFile
+    from apps.core.models.data_file import file_upload_path
+
+    return file_upload_path(DataFile(dataset=dataset), file_name)
+
+
+def save_data_file(dataset, file_name: str, file_path: str, info: Dict[str, Any]):
+    """
+    Create the DataFile of an uploaded file from what InspectingReader gathered.
+
+    The size comes from the upload, so saving the DataFile doesn't stat the
+    stored file, and md5_hash lets processors skip re-hashing it.
+
+    Args:
+        dataset: Dataset the file belongs to
+        file_name: Original file name
+        file_path: Path the upload was saved to, relative to the storage
+            root (the requested key, not the location save() returns,
+            which is a URL for S3)
+        info: InspectingReader.info() of the uploaded content
+
+    Returns:
+        The created DataFile
+    """
+    from apps.core.models import DataFile
+
+    extension = file_name.rsplit('.', 1)[-1].lower() if '.' in file_name else ''
+    file_types = dict(DataFile.FILE_TYPE_CHOICES)
+    data_file = DataFile(
+        dataset=dataset,
+        file_name=file_name,
+        file_type=extension if extension in file_types else FORMAT_FILE_TYPES.get(info['format'], 'other'),
+        size_bytes=info['size'],
+        md5_hash=info['md5'],
+        metadata={'upload': info},
+    )
+    data_file.file.name = file_path
+    data_file.save()
+    return data_file
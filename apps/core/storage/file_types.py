@@ -0,0 +1,54 @@
+# apps/core/storage/file_types.py
+from typing import Optional
+
+# Number of leading bytes needed to recognize every format below
+SNIFF_SIZE = 16
+
+# (format, offset, signature), checked in order
+SIGNATURES = (
+    ('parquet', 0, b'PAR1'),
+    ('pdf', 0, b'%PDF'),
+    ('zip', 0, b'PK\x03\x04'),  # also xlsx, docx, ods, jar
+    ('zip', 0, b'PK\x05\x06'),  # empty zip
+    ('gzip', 0, b'\x1f\x8b'),
+    ('zstd', 0, b'\x28\xb5\x2f\xfd'),
+    ('lz4', 0, b'\x04\x22\x4d\x18'),
+    ('bzip2', 0, b'BZh'),
+    ('xz', 0, b'\xfd7zXZ\x00'),
+    ('7z', 0, b"7z\xbc\xaf\x27\x1c"),
+    ('png', 0, b'\x89PNG\r\n\x1a\n'),
+    ('jpeg', 0, b'\xff\xd8\xff'),
+    ('gif', 0, b'GIF8'),
+    ('webp', 8, b'WEBP'),
+    ('tiff', 0, b'II*\x00'),
+    ('tiff', 0, b'MM\x00*'),
+    ('xls', 0, b'\xd0\xcf\x11\xe0\xa1\xb1\x1a\xe1'),
+)
+
+# Formats whose content is already compressed
+COMPRESSED_FORMATS = frozenset({
+    'parquet', 'pdf', 'zip', 'gzip', 'zstd', 'lz4', 'bzip2', 'xz', '7z',
+    'png', 'jpeg', 'gif', 'webp',
+})
+
+
+def detect_format(prefix: bytes) -> Optional[str]:
+    """
+    Detect a file format from its first bytes.
+
+    Args:
+        prefix: At least the first SNIFF_SIZE bytes of the file (or the
+            whole file if it is shorter)
+
+    Returns:
+        Format name or None if the format is not recognized
+    """
+    for name, offset, signature in SIGNATURES:
+        if prefix[offset:offset + len(signature)] == signature:
+            return name
+    return None
+
+
+def is_compressed_format(prefix: bytes) -> bool:
+    """Check whether a file's first bytes identify an already compressed format."""
+    return detect_format(prefix) in COMPRESSED_FORMATS
@@ -0,0 +1,115 @@
+# apps/core/storage/hashing.py
+import hashlib
+import zlib
+from typing import BinaryIO, Dict, Iterable, Any, Optional
+
+try:
+    import xxhash
+except ImportError:
+    xxhash = None
+
+from .file_types import SNIFF_SIZE, detect_format
+
+
+class HashingReader:
+    """
+    File-like wrapper that hashes everything read through it.
+
+    Lets a file be hashed in the same pass that copies it somewhere else,
+    instead of reading it once to hash and once to store.
+    """
+
+    def __init__(self, stream: BinaryIO, algorithms: Iterable[str] = ('sha256',)):
+        """
+        Initialize the reader.
+
+        Args:
+            stream: Stream to read from
+            algorithms: Names of the hashlib algorithms to compute
+        """
+        self._stream = stream
+        self._hashes = {name: hashlib.new(name) for name in algorithms}
+        self.size = 0
+
+    def read(self, size: int = -1) -> bytes:
+        data = self._stream.read(size)
+        if data:
+            for digest in self._hashes.values():
+                digest.update(data)
+            self.size += len(data)
+        return data
+
+    def readable(self) -> bool:
+        return True
+
+    def close(self) -> None:
+        self._stream.close()
+
+    def hexdigest(self, algorithm: str = 'sha256') -> str:
+        """Digest of the bytes read so far."""
+        return self._hashes[algorithm].hexdigest()
+
+    def hexdigests(self) -> Dict[str, str]:
+        """Digests of the bytes read so far, by algorithm."""
+        return {name: digest.hexdigest() for name, digest in self._hashes.items()}
+
+
+class _Crc32:
+    """hashlib-style wrapper of zlib.crc32."""
+
+    def __init__(self):
+        self._value = 0
+
+    def update(self, data: bytes) -> None:
+        self._value = zlib.crc32(data, self._value)
+
+    def hexdigest(self) -> str:
+        return f"{self._value:08x}"
+
+
+def new_fast_hash():
+    """
+    Return a fast non-cryptographic hash object and its name.
+
+    xxh3_64 is used when the xxhash package is installed, crc32 otherwise.
+    """
+    if xxhash is not None:
+        return 'xxh3_64', xxhash.xxh3_64()
+    return 'crc32', _Crc32()
+
+
+class InspectingReader(HashingReader):
+    """
+    HashingReader that also gathers upload metadata in the same pass.
+
+    Besides the hashlib digests it computes a fast non-cryptographic hash,
+    counts the bytes and keeps the first bytes to detect the file format
+    from its magic bytes.
+    """
+
+    def __init__(self, stream: BinaryIO, algorithms: Iterable[str] = ('md5',)):
+        super().__init__(stream, algorithms)
+        self.fast_hash_name, self._fast_hash = new_fast_hash()
+        self._head = b''
+
+    def read(self, size: int = -1) -> bytes:
+        data = super().read(size)
+        if data:
+            self._fast_hash.update(data)
+            if len(self._head) < SNIFF_SIZE:
+                self._head += data[:SNIFF_SIZE - len(self._head)]
+        return data
+
+    @property
+    def format(self) -> Optional[str]:
+        """Format detected from the magic bytes, None if unknown."""
+        return detect_format(self._head)
+
+    def info(self) -> Dict[str, Any]:
+        """Size, digests and detected format of the bytes read so far."""
+        return {
+            'size': self.size,
+            **self.hexdigests(),
+            self.fast_hash_name: self._fast_hash.hexdigest(),
+            'format': self.format,
+        }
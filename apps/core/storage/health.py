@@ -1,8 +1,18 @@
 # apps/core/storage/health.py
+import os
+import platform
+import random
+import statistics
+import time
+import uuid
+from concurrent.futures import ThreadPoolExecutor
 from io import BytesIO
-from typing import Dict, Any
+from typing import Dict, Any, List, Optional, Sequence, Callable
 from .base import StorageInterface
 
+# Object sizes probed by the benchmark by default (4 KB to 256 MB)
+DEFAULT_BENCHMARK_SIZES = (4 * 1024, 64 * 1024, 1024 * 1024, 16 * 1024 * 1024, 256 * 1024 * 1024)
+
 
 class StorageHealthCheck:
     """Health check for storage backends."""
@@ -10,6 +20,18 @@ class StorageHealthCheck:
     def __init__(self, storage: StorageInterface):
         self.storage = storage
 
+    def benchmark(self, **options) -> Dict[str, Any]:
+        """
+        Measure throughput and latency instead of a single round trip.
+
+        Args:
+            **options: Arguments of StorageBenchmark
+
+        Returns:
+            Machine-readable report (see StorageBenchmark.run)
+        """
+        return StorageBenchmark(self.storage, **options).run()
+
     def check_health(self) -> Dict[str, Any]:
         """
         Check if storage is healthy.
@@ -27,7 +49,12 @@ class StorageHealthCheck:
 
             # Try to get
             retrieved = self.storage.get(test_path)
-            read_content = retrieved.read() if retrieved else None
+            read_content = None
+            if retrieved:
+                try:
+                    read_content = retrieved.read()
+                finally:
+                    retrieved.close()
 
             # Clean up
             self.storage.delete(test_path)
@@ -52,4 +79,221 @@ class StorageHealthCheck:
                     'error': str(e),
                     'error_type': type(e).__name__,
                 }
-            }
\ No newline at end of file
+            }
+
+
+class PayloadReader:
+    """
+    Readable stream of a given size of fresh random bytes.
+
+    Large payloads are produced on the fly so a 256 MB object does not
+    have to be held in memory. No two payloads share content, so
+    deduplicating and compressing layers get no more out of them than out
+    of real incompressible data; a seed makes a payload reproducible.
+    """
+
+    def __init__(self, size: int, seed: Optional[int] = None):
+        self.remaining = size
+        self._random = random.Random(seed)
+
+    def read(self, size: int = -1) -> bytes:
+        if size is None or size < 0 or size > self.remaining:
+            size = self.remaining
+        self.remaining -= size
+        return self._random.randbytes(size)
+
+
+def _latency_summary(samples: List[float]) -> Dict[str, Optional[float]]:
+    """Exact percentiles of latency samples, in seconds."""
+    if not samples:
+        return {'p50': None, 'p95': None, 'p99': None, 'mean': None, 'max': None}
+    ordered = sorted(samples)
+
+    def percentile(q: float) -> float:
+        return ordered[min(len(ordered) - 1, max(0, round(q / 100 * len(ordered)) - 1))]
+
+    return {
+        'p50': percentile(50),
+        'p95': percentile(95),
+        'p99': percentile(99),
+        'mean': statistics.fmean(ordered),
+        'max': ordered[-1],
+    }
+
+
+def describe_storage(storage: Any) -> str:
+    """Describe a storage stack, e.g. 'EncryptedStorage -> CachedStorage -> LocalStorage'."""
+    layers = []
+    while storage is not None:
+        layers.append(type(storage).__name__)
+        storage = getattr(storage, 'storage', None)
+    return ' -> '.join(layers)
+
+
+class StorageBenchmark:
+    """
+    Throughput and tail-latency probe for any StorageInterface stack.
+
+    For every object size, objects are written then read back, first one
+    at a time and then from concurrent threads, recording the latency of
+    every operation. Metadata (stat and, where supported, list) and
+    delete rates are measured on the objects written. Everything is
+    written under a unique prefix that is removed afterwards.
+    """
+
+    def __init__(self, storage: StorageInterface, sizes: Sequence[int] = DEFAULT_BENCHMARK_SIZES,
+                 concurrency: int = 8, bytes_per_size: int = 512 * 1024 * 1024,
+                 min_objects: int = 4, max_objects: int = 200, prefix: str = '.benchmark'):
+        """
+        Initialize the benchmark.
+
+        Args:
+            storage: Storage stack to measure
+            sizes: Object sizes in bytes
+            concurrency: Number of threads of the concurrent runs
+            bytes_per_size: Approximate bytes written per size and mode,
+                which bounds the number of objects of large sizes
+            min_objects: Minimum number of objects per size and mode
+            max_objects: Maximum number of objects per size and mode
+            prefix: Storage prefix of the benchmark objects
+        """
+        self.storage = storage
+        self.sizes = list(sizes)
+        self.concurrency = concurrency
+        self.bytes_per_size = bytes_per_size
+        self.min_objects = min_objects
+        self.max_objects = max_objects
+        self.prefix = f"{prefix}/{uuid.uuid4().hex}"
+        self._written: List[str] = []
+
+    def _object_count(self, size: int) -> int:
+        return max(self.min_objects, min(self.max_objects, self.bytes_per_size // size))
+
+    def _write(self, path: str, size: int) -> float:
+        start = time.perf_counter()
+        self.storage.save(PayloadReader(size), path)
+        return time.perf_counter() - start
+
+    def _read(self, path: str) -> float:
+        start = time.perf_counter()
+        stream = self.storage.open_read(path)
+        if stream is None:
+            raise FileNotFoundError(path)
+        try:
+            while stream.read(self.storage.chunk_size):
+                pass
+        finally:
+            stream.close()
+        return time.perf_counter() - start
+
+    def _run(self, func: Callable[..., float], calls: List[tuple], concurrent: bool) -> Dict[str, Any]:
+        """Run calls sequentially or on a thread pool and summarize their latencies."""
+        start = time.perf_counter()
+        if concurrent:
+            with ThreadPoolExecutor(max_workers=self.concurrency) as executor:
+                latencies = list(executor.map(lambda args: func(*args), calls))
+        else:
+            latencies = [func(*args) for args in calls]
+        elapsed = time.perf_counter() - start
+        return {
+            'count': len(calls),
+            'seconds': elapsed,
+            'ops_per_second': len(calls) / elapsed if elapsed else None,
+            'latency': _latency_summary(latencies),
+        }
+
+    def _transfer(self, size: int, concurrent: bool) -> List[Dict[str, Any]]:
+        mode = 'concurrent' if concurrent else 'sequential'
+        paths = [f"{self.prefix}/{size}/{mode}/{i}" for i in range(self._object_count(size))]
+        self._written.extend(paths)
+
+        results = []
+        for operation, func, calls in (
+            ('write', self._write, [(path, size) for path in paths]),
+            ('read', self._read, [(path,) for path in paths]),
+        ):
+            result = self._run(func, calls, concurrent)
+            throughput = size * result['count'] / result['seconds'] if result['seconds'] else None
+            results.append({
+                'operation': operation,
+                'mode': mode,
+                'size': size,
+                'concurrency': self.concurrency if concurrent else 1,
+                'bytes': size * result['count'],
+                'throughput_mb_per_second': throughput / (1024 * 1024) if throughput else None,
+                **result,
+            })
+        return results
+
+    def _timed(self, func: Callable, *args) -> float:
+        start = time.perf_counter()
+        func(*args)
+        return time.perf_counter() - start
+
+    def _metadata(self) -> Dict[str, Any]:
+        paths = list(self._written)
+        report = {'stat': self._run(lambda path: self._timed(self.storage.stat, path),
+                                    [(path,) for path in paths], concurrent=True)}
+
+        list_files = getattr(self.storage, 'list', None)
+        if callable(list_files):
+            report['list'] = self._run(lambda: self._timed(list_files, self.prefix), [()] * 5, concurrent=False)
+            report['list']['entries'] = len(paths)
+        else:
+            report['list'] = {'skipped': f"{type(self.storage).__name__} does not support listing"}
+
+        # Half of the objects one by one, the rest in one batch
+        single, batch = paths[:len(paths) // 2], paths[len(paths) // 2:]
+        report['delete'] = self._run(lambda path: self._timed(self.storage.delete, path),
+                                     [(path,) for path in single], concurrent=True)
+        start = time.perf_counter()
+        self.storage.delete_many(batch, max_workers=self.concurrency)
+        elapsed = time.perf_counter() - start
+        report['delete_many'] = {
+            'count': len(batch),
+            'seconds': elapsed,
+            'ops_per_second': len(batch) / elapsed if elapsed else None,
+        }
+        self._written.clear()
+        return report
+
+    def run(self) -> Dict[str, Any]:
+        """
+        Run the benchmark.
+
+        Returns:
+            Report with the environment, the configuration, one entry per
+            size/mode/operation in 'transfers' and the metadata and delete
+            rates in 'metadata'
+        """
+        started_at = time.time()
+        transfers = []
+        try:
+            for size in self.sizes:
+                for concurrent in (False, True):
+                    transfers.extend(self._transfer(size, concurrent))
+            metadata = self._metadata()
+        finally:
+            if self._written:
+                self.storage.delete_many(self._written)
+
+        return {
+            'started_at': started_at,
+            'duration': time.time() - started_at,
+            'storage': describe_storage(self.storage),
+            'host': {
+                'node': platform.node(),
+                'platform': platform.platform(),
+                'python': platform.python_version(),
+                'cpus': os.cpu_count(),
+            },
+            'config': {
+                'sizes': self.sizes,
+                'concurrency': self.concurrency,
+                'bytes_per_size': self.bytes_per_size,
+                'min_objects': self.min_objects,
+                'max_objects': self.max_objects,
+            },
+            'transfers': transfers,
+            'metadata': metadata,
+        }
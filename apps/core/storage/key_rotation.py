@@ -0,0 +1,180 @@
+# apps/core/storage/key_rotation.py
+import json
+import logging
+import os
+import time
+from dataclasses import dataclass, field, asdict
+from itertools import islice
+from typing import Any, Iterable, Iterator, List, Optional, Callable, Tuple, Union
+
+from .base import run_batch, DEFAULT_BATCH_WORKERS
+from .encrypted_storage import EncryptedStorage
+
+logger = logging.getLogger(__name__)
+
+
+@dataclass
+class RotationProgress:
+    """Progress of a key rotation run."""
+    key_id: str
+    processed: int = 0
+    rewrapped: int = 0
+    skipped: int = 0
+    failed: int = 0
+    # The first errors only (see KeyRotationJob.max_errors), failed counts them all
+    errors: List[str] = field(default_factory=list)
+    # Key of the last file of the last completed batch
+    last_key: Any = None
+    # (key, path) of the files whose rewrap failed, retried by the next run
+    failed_items: List[Tuple[Any, str]] = field(default_factory=list)
+    started_at: float = field(default_factory=time.time)
+    total: Optional[int] = None
+
+    @property
+    def rate(self) -> float:
+        """Files processed per second."""
+        elapsed = time.time() - self.started_at
+        return self.processed / elapsed if elapsed > 0 else 0.0
+
+
+class KeyRotationJob:
+    """
+    Re-wraps the data keys of encrypted files with the keyring's active key.
+
+    Files are processed in batches of concurrent rewraps. Only the small
+    key objects are read and rewritten, so the cost grows with the number
+    of files, not with their size. After every batch the key of its last
+    file is written to a checkpoint file; a job started again with the
+    same checkpoint resumes after that key, so files added or removed in
+    between do not shift the files that are skipped. The files whose
+    rewrap failed are recorded in the checkpoint too, and a resumed run
+    retries them before going on.
+    """
+
+    # Number of error messages kept in the progress (and so in the checkpoint)
+    max_errors = 100
+
+    def __init__(self, storage: EncryptedStorage, checkpoint_path: Optional[str] = None,
+                 batch_size: int = 500, max_workers: int = DEFAULT_BATCH_WORKERS,
+                 progress_callback: Optional[Callable[[RotationProgress], None]] = None):
+        """
+        Initialize a key rotation job.
+
+        Args:
+            storage: Encrypted storage whose files are rotated
+            checkpoint_path: File recording the progress of the job
+            batch_size: Number of files per batch
+            max_workers: Maximum number of concurrent rewraps
+            progress_callback: Called with the progress after every batch
+        """
+        self.storage = storage
+        self.checkpoint_path = checkpoint_path
+        self.batch_size = batch_size
+        self.max_workers = max_workers
+        self.progress_callback = progress_callback
+
+    def _load_checkpoint(self) -> Optional[RotationProgress]:
+        if not self.checkpoint_path or not os.path.exists(self.checkpoint_path):
+            return None
+        with open(self.checkpoint_path, 'r', encoding='utf-8') as f:
+            data = json.load(f)
+        if data.get('key_id') != self.storage.keyring.active:
+            # Checkpoint of a rotation to another key: start over
+            return None
+        data['failed_items'] = [tuple(item) for item in data.get('failed_items', [])]
+        return RotationProgress(**data)
+
+    def _save_checkpoint(self, progress: RotationProgress) -> None:
+        if not self.checkpoint_path:
+            return
+        tmp_path = f"{self.checkpoint_path}.tmp"
+        with open(tmp_path, 'w', encoding='utf-8') as f:
+            json.dump(asdict(progress), f)
+        os.replace(tmp_path, self.checkpoint_path)
+
+    @staticmethod
+    def _batches(items: Iterator[Tuple[Any, str]], size: int) -> Iterator[List[Tuple[Any, str]]]:
+        while True:
+            batch = list(islice(items, size))
+            if not batch:
+                return
+            yield batch
+
+    def resume_after(self) -> Any:
+        """
+        Key of the last file handled by a previous run of this job.
+
+        Callers listing files from a database can use it to query only the
+        remaining ones. Returns None when there is nothing to resume.
+        """
+        progress = self._load_checkpoint()
+        return progress.last_key if progress is not None else None
+
+    def run(self, file_paths: Iterable[Union[str, Tuple[Any, str]]],
+            total: Optional[int] = None) -> RotationProgress:
+        """
+        Rotate the data keys of the given files.
+
+        Args:
+            file_paths: Paths of the encrypted files, or (key, path) pairs
+                such as database ids and paths, in increasing key order
+                (a plain path is its own key)
+            total: Number of paths, if known, for progress reporting
+
+        Returns:
+            Final progress of the run
+        """
+        progress = self._load_checkpoint()
+        if progress is None:
+            progress = RotationProgress(key_id=self.storage.keyring.active)
+        else:
+            logger.info(f"Resuming key rotation after {progress.last_key!r} ({progress.processed} files done, "
+                        f"{len(progress.failed_items)} failed files to retry)")
+        progress.total = total
+
+        items = (item if isinstance(item, tuple) else (item, item) for item in file_paths)
+        if progress.last_key is not None:
+            # Skip the files already handled by a previous run
+            items = (item for item in items if item[0] > progress.last_key)
+
+        # Retry the failures of a previous run first. They stay at the head of
+        # failed_items until retried, and are counted again by their retry.
+        for batch in self._batches(iter(list(progress.failed_items)), self.batch_size):
+            del progress.failed_items[:len(batch)]
+            progress.processed -= len(batch)
+            progress.failed -= len(batch)
+            self._run_batch(batch, progress)
+            self._checkpoint(progress)
+
+        for batch in self._batches(items, self.batch_size):
+            self._run_batch(batch, progress)
+            progress.last_key = batch[-1][0]
+            self._checkpoint(progress)
+
+        return progress
+
+    def _run_batch(self, batch: List[Tuple[Any, str]], progress: RotationProgress) -> None:
+        """Rewrap the files of a batch and count the results."""
+        paths = [path for _, path in batch]
+        results = run_batch(self.storage.rewrap, [(path,) for path in paths], paths, self.max_workers)
+        for item, result in zip(batch, results):
+            if not result.success:
+                progress.failed += 1
+                progress.failed_items.append(item)
+                if len(progress.errors) < self.max_errors:
+                    progress.errors.append(f"{result.path}: {result.error}")
+            elif result.value:
+                progress.rewrapped += 1
+            else:
+                progress.skipped += 1
+        progress.processed += len(batch)
+
+    def _checkpoint(self, progress: RotationProgress) -> None:
+        """Record and report the progress after a batch."""
+        self._save_checkpoint(progress)
+        if self.progress_callback is not None:
+            self.progress_callback(progress)
+        logger.info(
+            f"Key rotation: {progress.processed} files processed "
+            f"({progress.rewrapped} rewrapped, {progress.failed} failed, {progress.rate:.0f} files/s)"
+        )
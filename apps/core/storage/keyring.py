@@ -0,0 +1,150 @@
+# apps/core/storage/keyring.py
+import base64
+import json
+import os
+import threading
+from typing import Dict, Optional, Tuple
+
+from cryptography.exceptions import InvalidTag
+from cryptography.hazmat.primitives.ciphers.aead import AESGCM
+
+WRAP_NONCE_SIZE = 12
+
+
+class KeyringError(ValueError):
+    """Raised when a keyring is invalid or a data key cannot be unwrapped."""
+
+
+def _decode_key(key) -> bytes:
+    """Decode a 32-byte master key given as raw bytes or urlsafe base64 (e.g. a Fernet key)."""
+    if isinstance(key, str):
+        key = key.encode()
+    if len(key) == 32:
+        return key
+    try:
+        decoded = base64.urlsafe_b64decode(key)
+    except (ValueError, TypeError):
+        raise KeyringError("Master keys must be 32 bytes or their urlsafe base64 encoding")
+    if len(decoded) != 32:
+        raise KeyringError("Master keys must be 32 bytes or their urlsafe base64 encoding")
+    return decoded
+
+
+class Keyring:
+    """
+    Set of master keys used to wrap per-file data keys.
+
+    The keyring file is a JSON document:
+
+        {
+            "active": "2024-06",
+            "legacy": "2023-01",
+            "keys": {"2023-01": "<base64 key>", "2024-06": "<base64 key>"}
+        }
+
+    New data keys are wrapped with the active key. Old keys stay in the
+    file until a rotation job has re-wrapped every data key that uses
+    them. The optional legacy key is the key that encrypted files written
+    before envelope encryption (it defaults to the active key).
+    """
+
+    def __init__(self, keys: Dict[str, bytes], active: str, legacy: Optional[str] = None):
+        """
+        Initialize a keyring.
+
+        Args:
+            keys: Master keys by key id
+            active: Id of the key wrapping new data keys
+            legacy: Id of the key of files written before envelope encryption
+
+        Raises:
+            KeyringError: If a key is malformed or an id is unknown
+        """
+        self.keys = {key_id: _decode_key(key) for key_id, key in keys.items()}
+        for key_id in (active, legacy):
+            if key_id is not None and key_id not in self.keys:
+                raise KeyringError(f"Unknown key id: {key_id}")
+        self.active = active
+        self.legacy = legacy or active
+        self._ciphers: Dict[str, AESGCM] = {}
+        self._lock = threading.Lock()
+
+    @classmethod
+    def load(cls, path: str) -> 'Keyring':
+        """
+        Load a keyring file.
+
+        Args:
+            path: Path to the JSON keyring file
+
+        Returns:
+            Keyring
+
+        Raises:
+            KeyringError: If the file is missing or malformed
+        """
+        try:
+            with open(path, 'r', encoding='utf-8') as f:
+                data = json.load(f)
+        except (OSError, ValueError) as e:
+            raise KeyringError(f"Cannot read keyring {path}: {e}")
+
+        if not isinstance(data.get('keys'), dict) or 'active' not in data:
+            raise KeyringError(f"Keyring {path} must define 'active' and 'keys'")
+        return cls(data['keys'], data['active'], data.get('legacy'))
+
+    @classmethod
+    def from_key(cls, key, key_id: str = 'default') -> 'Keyring':
+        """Build a keyring holding a single master key."""
+        return cls({key_id: key}, key_id)
+
+    @staticmethod
+    def generate_key() -> str:
+        """Generate a new master key in the keyring file encoding."""
+        return base64.urlsafe_b64encode(os.urandom(32)).decode()
+
+    def save(self, path: str) -> None:
+        """Write the keyring to a file readable by its owner only."""
+        data = {
+            'active': self.active,
+            'legacy': self.legacy,
+            'keys': {key_id: base64.urlsafe_b64encode(key).decode() for key_id, key in self.keys.items()},
+        }
+        tmp_path = f"{path}.tmp"
+        fd = os.open(tmp_path, os.O_WRONLY | os.O_CREAT | os.O_TRUNC, 0o600)
+        with os.fdopen(fd, 'w', encoding='utf-8') as f:
+            json.dump(data, f, indent=2)
+        os.replace(tmp_path, path)
+
+    def _cipher(self, key_id: str) -> AESGCM:
+        with self._lock:
+            cipher = self._ciphers.get(key_id)
+            if cipher is None:
+                if key_id not in self.keys:
+                    raise KeyringError(f"Unknown key id: {key_id}")
+                cipher = self._ciphers[key_id] = AESGCM(self.keys[key_id])
+            return cipher
+
+    def wrap(self, data_key: bytes) -> Tuple[str, bytes]:
+        """
+        Wrap a data key with the active master key.
+
+        Returns:
+            (key id, wrapped key)
+        """
+        nonce = os.urandom(WRAP_NONCE_SIZE)
+        wrapped = self._cipher(self.active).encrypt(nonce, data_key, self.active.encode())
+        return self.active, nonce + wrapped
+
+    def unwrap(self, key_id: str, wrapped: bytes) -> bytes:
+        """
+        Unwrap a data key.
+
+        Raises:
+            KeyringError: If the key id is unknown or the wrapped key was tampered with
+        """
+        nonce, ciphertext = wrapped[:WRAP_NONCE_SIZE], wrapped[WRAP_NONCE_SIZE:]
+        try:
+            return self._cipher(key_id).decrypt(nonce, ciphertext, key_id.encode())
+        except InvalidTag:
+            raise KeyringError(f"Data key wrapped with {key_id} failed authentication")
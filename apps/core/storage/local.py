@@ -1,25 +1,493 @@
+import atexit
+import hashlib
+import io
+import itertools
+import logging
 import os
-from io import BytesIO
-from typing import BinaryIO, Optional
-from .base import StorageInterface
+import sqlite3
+import threading
+import time
+import uuid
+import weakref
+from collections import deque
+from typing import BinaryIO, Optional, Callable, Dict, Iterable, Iterator, List, Tuple
+from .base import StorageInterface, StreamWriter, FileStat, iter_file_obj, DEFAULT_CHUNK_SIZE
+
+logger = logging.getLogger(__name__)
+
+# Number of hex characters of the path hash used per shard directory level
+SHARD_WIDTH = 2
+
+# Files are written as .<name>.<random>.tmp next to their target and renamed into place
+TEMP_SUFFIX = '.tmp'
+
+
+def _temp_path(full_path: str) -> str:
+    directory, name = os.path.split(full_path)
+    return os.path.join(directory, f".{name}.{uuid.uuid4().hex[:12]}{TEMP_SUFFIX}")
+
+
+def _is_temp_file(name: str) -> bool:
+    return name.startswith('.') and name.endswith(TEMP_SUFFIX)
+
+
+def fsync_directory(path: str) -> None:
+    """Make renames and new entries in a directory durable (no-op where unsupported)."""
+    try:
+        fd = os.open(path, os.O_RDONLY)
+    except OSError:
+        return
+    try:
+        os.fsync(fd)
+    except OSError:
+        pass
+    finally:
+        os.close(fd)
+
+
+class FileIndex:
+    """
+    SQLite index of the files of a LocalStorage.
+
+    Keeps one row per file with its size, modification time and MD5, keyed
+    by storage path, so stat/exists are B-tree lookups and prefix listings
+    are range scans instead of filesystem walks.
+    """
+
+    def __init__(self, db_path: str):
+        """
+        Open (and create if needed) the index.
+
+        Args:
+            db_path: Path to the SQLite database file
+        """
+        if os.path.dirname(db_path):
+            os.makedirs(os.path.dirname(db_path), exist_ok=True)
+        self._conn = sqlite3.connect(db_path, check_same_thread=False, isolation_level=None)
+        self._conn.execute('PRAGMA journal_mode=WAL')
+        self._conn.execute('PRAGMA synchronous=NORMAL')
+        self._conn.execute(
+            'CREATE TABLE IF NOT EXISTS files '
+            '(path TEXT PRIMARY KEY, size INTEGER NOT NULL, mtime REAL NOT NULL, hash TEXT) WITHOUT ROWID'
+        )
+        self._lock = threading.Lock()
+
+    def put(self, path: str, size: int, mtime: float, digest: Optional[str]) -> None:
+        with self._lock:
+            self._conn.execute(
+                'INSERT OR REPLACE INTO files (path, size, mtime, hash) VALUES (?, ?, ?, ?)',
+                (path, size, mtime, digest)
+            )
+
+    def put_many(self, rows: Iterable[Tuple[str, int, float, Optional[str]]]) -> None:
+        with self._lock:
+            self._conn.execute('BEGIN IMMEDIATE')
+            try:
+                self._conn.executemany(
+                    'INSERT OR REPLACE INTO files (path, size, mtime, hash) VALUES (?, ?, ?, ?)', rows
+                )
+                self._conn.execute('COMMIT')
+            except BaseException:
+                self._conn.execute('ROLLBACK')
+                raise
+
+    def get(self, path: str) -> Optional[FileStat]:
+        with self._lock:
+            row = self._conn.execute('SELECT path, size, mtime, hash FROM files WHERE path = ?', (path,)).fetchone()
+        return FileStat(*row) if row is not None else None
+
+    def remove(self, path: str) -> bool:
+        with self._lock:
+            return self._conn.execute('DELETE FROM files WHERE path = ?', (path,)).rowcount > 0
+
+    def list(self, prefix: str = '') -> List[FileStat]:
+        """Return the files whose path starts with prefix, sorted by path."""
+        with self._lock:
+            if not prefix:
+                rows = self._conn.execute('SELECT path, size, mtime, hash FROM files ORDER BY path').fetchall()
+            else:
+                # Range scan on the primary key: prefix <= path < prefix with its last character incremented
+                upper = prefix[:-1] + chr(ord(prefix[-1]) + 1)
+                rows = self._conn.execute(
+                    'SELECT path, size, mtime, hash FROM files WHERE path >= ? AND path < ? ORDER BY path',
+                    (prefix, upper)
+                ).fetchall()
+        return [FileStat(*row) for row in rows]
+
+    def clear(self) -> None:
+        with self._lock:
+            self._conn.execute('DELETE FROM files')
+
+    def count(self) -> int:
+        with self._lock:
+            return self._conn.execute('SELECT COUNT(*) FROM files').fetchone()[0]
+
+    def close(self) -> None:
+        self._conn.close()
+
+
+class LocalFileWriter(StreamWriter):
+    """
+    Atomic streaming writer for a file on the local filesystem.
+
+    Data goes to a temporary file in the target directory that is renamed
+    over the target on close, so readers and crashes never see a partial
+    file. With durable=True the file and the directory entry are fsynced.
+    """
+
+    def __init__(self, full_path: str, on_commit: Optional[Callable[[int, str], None]] = None,
+                 durable: bool = False):
+        """
+        Args:
+            full_path: Filesystem path of the file
+            on_commit: Called with the size and MD5 hex digest once the file is complete
+            durable: fsync the file and its directory before close() returns
+        """
+        super().__init__()
+        self.full_path = full_path
+        self._on_commit = on_commit
+        self._durable = durable
+        self._md5 = hashlib.md5() if on_commit is not None else None
+        os.makedirs(os.path.dirname(full_path), exist_ok=True)
+        self._temp_path = _temp_path(full_path)
+        self._file = open(self._temp_path, 'wb')
+
+    def _write(self, data: bytes) -> Optional[int]:
+        if self._md5 is not None:
+            self._md5.update(data)
+        return self._file.write(data)
+
+    def _commit(self) -> None:
+        try:
+            if self._durable:
+                self._file.flush()
+                os.fsync(self._file.fileno())
+            self._file.close()
+            os.replace(self._temp_path, self.full_path)
+        except BaseException:
+            self._discard()
+            raise
+        if self._durable:
+            fsync_directory(os.path.dirname(self.full_path))
+        if self._on_commit is not None:
+            self._on_commit(self.bytes_written, self._md5.hexdigest())
+
+    def _discard(self) -> None:
+        self._file.close()
+        try:
+            os.remove(self._temp_path)
+        except OSError:
+            pass
+
+
+def _close_at_exit(queue_ref: 'weakref.ref') -> None:
+    """Write what is still queued before the interpreter exits."""
+    queue = queue_ref()
+    if queue is None or queue._closed:
+        return
+    try:
+        queue.close()
+    except Exception as e:
+        logger.error(f"Write-behind objects lost at exit: {str(e)}")
+
+
+class WriteBehindQueue:
+    """
+    Background writer of small objects for LocalStorage.
+
+    Queued objects are written by one thread in batches: every file of a
+    batch is written to a temporary file, the batch is fsynced as a group,
+    the files are renamed into place and each directory is fsynced once.
+    Until then, reads of a queued path are served from memory. flush() is
+    the durability barrier: it returns once everything queued before it is
+    on disk, and raises the error of a failed batch. The objects of a
+    failed batch are not retried: reads of their paths raise that error
+    until the path is written again or deleted. The queue is closed, and
+    so flushed, at interpreter exit; a crash or kill loses what is queued.
+    """
+
+    def __init__(self, storage: 'LocalStorage', max_object_size: int = 256 * 1024,
+                 max_batch: int = 256, max_pending_bytes: int = 64 * 1024 * 1024):
+        """
+        Args:
+            storage: Storage whose files are written
+            max_object_size: Larger objects are written synchronously by the storage
+            max_batch: Maximum number of objects written (and fsynced) together
+            max_pending_bytes: save() blocks while this many bytes are queued
+        """
+        self.storage = storage
+        self.max_object_size = max_object_size
+        self.max_batch = max_batch
+        self.max_pending_bytes = max_pending_bytes
+        self._queue: deque = deque()
+        # Latest queued (sequence number, data, queue time) of every pending path
+        self._pending: Dict[str, Tuple[int, bytes, float]] = {}
+        self._pending_bytes = 0
+        self._enqueued = 0
+        self._completed = 0
+        self._error: Optional[BaseException] = None
+        # Error of every path whose latest queued object failed to be written
+        self._failed: Dict[str, BaseException] = {}
+        self._closed = False
+        self._cond = threading.Condition()
+        self._thread = threading.Thread(target=self._run, name='local-write-behind', daemon=True)
+        self._thread.start()
+        atexit.register(_close_at_exit, weakref.ref(self))
+
+    def put(self, file_path: str, data: bytes) -> None:
+        """Queue an object, waiting while too many bytes are pending."""
+        with self._cond:
+            if self._closed:
+                raise ValueError("Write-behind queue is closed")
+            while self._queue and self._pending_bytes + len(data) > self.max_pending_bytes:
+                self._cond.wait()
+            self._enqueued += 1
+            self._failed.pop(file_path, None)
+            self._queue.append((self._enqueued, file_path, data))
+            self._pending[file_path] = (self._enqueued, data, time.time())
+            self._pending_bytes += len(data)
+            self._cond.notify_all()
+
+    def get(self, file_path: str) -> Optional[Tuple[bytes, float]]:
+        """
+        Return (data, queue time) of a path that is not written yet.
+
+        Raises:
+            OSError: If the latest object queued for the path failed to be written
+        """
+        with self._cond:
+            pending = self._pending.get(file_path)
+            error = self._failed.get(file_path)
+        if error is not None:
+            raise OSError(f"Write-behind write of {file_path} failed: {str(error)}") from error
+        return pending[1:] if pending is not None else None
+
+    def forget(self, file_path: str) -> None:
+        """Clear the failure of a path that is about to be overwritten or deleted."""
+        with self._cond:
+            self._failed.pop(file_path, None)
+
+    def pending_paths(self) -> List[str]:
+        with self._cond:
+            return list(self._pending)
+
+    def flush(self) -> None:
+        """Wait until everything queued so far is durable."""
+        with self._cond:
+            target = self._enqueued
+            while self._completed < target and self._error is None:
+                self._cond.wait()
+            if self._error is not None:
+                error, self._error = self._error, None
+                raise error
+
+    def close(self) -> None:
+        """Flush the queue and stop the background thread."""
+        try:
+            self.flush()
+        finally:
+            with self._cond:
+                self._closed = True
+                self._cond.notify_all()
+            self._thread.join()
+
+    def _run(self) -> None:
+        while True:
+            with self._cond:
+                while not self._queue and not self._closed:
+                    self._cond.wait()
+                if not self._queue:
+                    return
+                batch = [self._queue.popleft() for _ in range(min(self.max_batch, len(self._queue)))]
+
+            error = None
+            try:
+                self._write_batch(batch)
+            except Exception as e:
+                logger.error(f"Write-behind batch of {len(batch)} files failed: {str(e)}")
+                error = e
+
+            with self._cond:
+                if error is not None:
+                    self._error = error
+                self._completed = batch[-1][0]
+                for seq, file_path, data in batch:
+                    self._pending_bytes -= len(data)
+                    if self._pending.get(file_path, (None,))[0] == seq:
+                        del self._pending[file_path]
+                        if error is not None:
+                            self._failed[file_path] = error
+                self._cond.notify_all()
+
+    def _write_batch(self, batch: List[Tuple[int, str, bytes]]) -> None:
+        # Only the latest version of a path queued several times is written
+        latest: Dict[str, bytes] = {}
+        for _, file_path, data in batch:
+            latest[file_path] = data
+
+        written = []
+        try:
+            for file_path, data in latest.items():
+                full_path = self.storage._full_path(file_path)
+                os.makedirs(os.path.dirname(full_path), exist_ok=True)
+                temp_path = _temp_path(full_path)
+                with open(temp_path, 'wb') as f:
+                    f.write(data)
+                written.append((file_path, full_path, temp_path, data))
+
+            # Group fsync: the filesystem can commit the whole batch in few journal flushes
+            for _, _, temp_path, _ in written:
+                fd = os.open(temp_path, os.O_RDONLY)
+                try:
+                    os.fsync(fd)
+                finally:
+                    os.close(fd)
+            for _, full_path, temp_path, _ in written:
+                os.replace(temp_path, full_path)
+        except BaseException:
+            for _, _, temp_path, _ in written:
+                try:
+                    os.remove(temp_path)
+                except OSError:
+                    pass
+            raise
+
+        for directory in {os.path.dirname(full_path) for _, full_path, _, _ in written}:
+            fsync_directory(directory)
+
+        if self.storage.index is not None:
+            self.storage.index.put_many(
+                (file_path, len(data), os.stat(full_path).st_mtime, hashlib.md5(data).hexdigest())
+                for file_path, full_path, _, data in written
+            )
 
 
 class LocalStorage(StorageInterface):
-    """Storage implementation for local filesystem."""
+    """
+    Storage implementation for local filesystem.
+
+    With shard_depth > 0 files are spread over hash-prefix directories
+    (base_dir/<ab>/<cd>/<path> for a depth of 2) so that no directory
+    grows to millions of entries; storage paths are unchanged. With an
+    index_path, a FileIndex answers stat, exists and list without touching
+    the filesystem. The index is filled from base_dir only when it is
+    created and then kept up to date by this storage's own writes and
+    deletes: files added to or removed from base_dir by other means are
+    not seen by stat, exists and list until rebuild_index() is called.
+    The shard layout of an existing base_dir must not be changed.
+
+    Writes are atomic (temporary file renamed into place). Write-behind
+    is strictly opt-in (write_behind=True): small objects saved with save()
+    are then written by a WriteBehindQueue in the background, save()
+    returns before they are on disk and a crash loses them. Use it only
+    for data that can be lost, and call flush() where durability matters.
+    """
 
-    def __init__(self, base_dir: str = 'storage/'):
+    def __init__(self, base_dir: str = 'storage/', chunk_size: int = DEFAULT_CHUNK_SIZE,
+                 shard_depth: int = 0, index_path: Optional[str] = None,
+                 durable: bool = False, write_behind: bool = False,
+                 write_behind_max_size: int = 256 * 1024):
         """
         Initialize local storage with base directory.
 
         Args:
             base_dir: Base directory for file storage
+            chunk_size: Size of the chunks used for streaming reads and writes
+            shard_depth: Number of hash-prefix directory levels above every file
+            index_path: SQLite file of the metadata index (no index if None). A
+                new index is filled from the files already in base_dir.
+            durable: fsync every synchronously written file before returning
+            write_behind: Queue small objects for batched background writes
+                (always fsynced as a group, but only after save() returns)
+            write_behind_max_size: Largest object written behind
         """
         # Convert base_dir to string if it's bytes
         if isinstance(base_dir, bytes):
             base_dir = base_dir.decode('utf-8')
         self.base_dir = base_dir
+        self.chunk_size = chunk_size
+        self.shard_depth = shard_depth
         os.makedirs(base_dir, exist_ok=True)
 
+        self.index_path = os.path.abspath(index_path) if index_path is not None else None
+        self.index: Optional[FileIndex] = None
+        if index_path is not None:
+            is_new = not os.path.exists(index_path)
+            self.index = FileIndex(index_path)
+            if is_new:
+                self.rebuild_index()
+
+        self.durable = durable
+        self.write_behind: Optional[WriteBehindQueue] = None
+        if write_behind:
+            self.write_behind = WriteBehindQueue(self, max_object_size=write_behind_max_size)
+
+    def _shard(self, file_path: str) -> List[str]:
+        """Return the shard directories of a storage path."""
+        digest = hashlib.md5(file_path.encode('utf-8')).hexdigest()
+        return [digest[i * SHARD_WIDTH:(i + 1) * SHARD_WIDTH] for i in range(self.shard_depth)]
+
+    def _full_path(self, file_path: str) -> str:
+        """Resolve a storage path relative to base_dir."""
+        # Convert file_path to string if it's bytes
+        if isinstance(file_path, bytes):
+            file_path = file_path.decode('utf-8')
+        if self.shard_depth:
+            return os.path.join(self.base_dir, *self._shard(file_path), file_path)
+        return os.path.join(self.base_dir, file_path)
+
+    def _walk(self) -> Iterator[Tuple[str, str]]:
+        """Yield (storage path, filesystem path) of every file in base_dir."""
+        for root, _, files in os.walk(self.base_dir):
+            for name in files:
+                if _is_temp_file(name):
+                    continue
+                full_path = os.path.join(root, name)
+                # The index database (and its -wal/-shm files) may live in base_dir
+                if self.index_path is not None and os.path.abspath(full_path).startswith(self.index_path):
+                    continue
+                parts = os.path.relpath(full_path, self.base_dir).split(os.sep)
+                if len(parts) <= self.shard_depth:
+                    continue
+                yield '/'.join(parts[self.shard_depth:]), full_path
+
+    def rebuild_index(self, compute_hashes: bool = False) -> int:
+        """
+        Refill the index from the files in base_dir.
+
+        Args:
+            compute_hashes: Read every file to record its MD5
+
+        Returns:
+            Number of indexed files
+        """
+        if self.index is None:
+            raise ValueError("LocalStorage has no index")
+
+        def rows():
+            for file_path, full_path in self._walk():
+                st = os.stat(full_path)
+                digest = None
+                if compute_hashes:
+                    md5 = hashlib.md5()
+                    with open(full_path, 'rb') as f:
+                        for chunk in iter_file_obj(f, self.chunk_size):
+                            md5.update(chunk)
+                    digest = md5.hexdigest()
+                yield file_path, st.st_size, st.st_mtime, digest
+
+        self.index.clear()
+        self.index.put_many(rows())
+        return self.index.count()
+
+    def _index_writer(self, file_path: str, full_path: str) -> Optional[Callable[[int, str], None]]:
+        if self.index is None:
+            return None
+
+        def on_commit(size: int, digest: str) -> None:
+            self.index.put(file_path, size, os.stat(full_path).st_mtime, digest)
+        return on_commit
+
     def get(self, file_path: str) -> Optional[BinaryIO]:
         """
         Retrieve a file from local storage.
@@ -28,24 +496,127 @@ class LocalStorage(StorageInterface):
             file_path: Path to the file relative to base_dir
 
         Returns:
-            BytesIO object containing file content or None if file doesn't exist
+            Open file object positioned at the start of the file or None if
+            file doesn't exist. The content is read lazily, the caller is
+            responsible for closing it.
+        """
+        return self.open_read(file_path)
+
+    def open_read(self, file_path: str) -> Optional[BinaryIO]:
+        """
+        Open a file from local storage for streaming reads.
+
+        Args:
+            file_path: Path to the file relative to base_dir
+
+        Returns:
+            Open binary file object or None if file doesn't exist
+        """
+        pending = self._pending(file_path)
+        if pending is not None:
+            return io.BytesIO(pending[0])
+
+        full_path = self._full_path(file_path)
+        if not os.path.isfile(full_path):
+            return None
+
+        return open(full_path, 'rb', buffering=self.chunk_size)
+
+    def open_write(self, file_path: str) -> LocalFileWriter:
+        """
+        Open a file in local storage for streaming writes.
+
+        Args:
+            file_path: Path where to save the file relative to base_dir
+
+        Returns:
+            LocalFileWriter writing to a temporary file renamed over the target on close
         """
-        # Convert file_path to string if it's bytes
         if isinstance(file_path, bytes):
             file_path = file_path.decode('utf-8')
-        full_path = os.path.join(self.base_dir, file_path)
-        if not os.path.exists(full_path):
+        if self.write_behind is not None:
+            self.write_behind.forget(file_path)
+        # A queued older version must not land after this one
+        if self._pending(file_path) is not None:
+            self.flush()
+        full_path = self._full_path(file_path)
+        return LocalFileWriter(full_path, on_commit=self._index_writer(file_path, full_path), durable=self.durable)
+
+    def stat(self, file_path: str) -> Optional[FileStat]:
+        """
+        Get size and modification time of a file in local storage.
+
+        Args:
+            file_path: Path to the file relative to base_dir
+
+        Returns:
+            FileStat or None if file doesn't exist
+        """
+        pending = self._pending(file_path)
+        if pending is not None:
+            return FileStat(path=file_path, size=len(pending[0]), modified=pending[1])
+        if self.index is not None:
+            return self.index.get(file_path)
+        try:
+            st = os.stat(self._full_path(file_path))
+        except FileNotFoundError:
             return None
+        return FileStat(path=file_path, size=st.st_size, modified=st.st_mtime)
+
+    def exists(self, file_path: str) -> bool:
+        """
+        Check whether a file exists in local storage.
+
+        Args:
+            file_path: Path to the file relative to base_dir
 
-        with open(full_path, 'rb') as f:
-            content = f.read()
+        Returns:
+            True if the file exists
+        """
+        if self._pending(file_path) is not None:
+            return True
+        if self.index is not None:
+            return self.index.get(file_path) is not None
+        return os.path.isfile(self._full_path(file_path))
 
-        return BytesIO(content)
+    def list(self, prefix: str = '') -> List[FileStat]:
+        """
+        List the files whose storage path starts with prefix.
+
+        Served by the index when there is one, otherwise base_dir is walked.
+
+        Args:
+            prefix: Storage path prefix ('' lists every file)
+
+        Returns:
+            FileStat of every matching file, sorted by path
+        """
+        if self.index is not None:
+            stats = {stat.path: stat for stat in self.index.list(prefix)}
+        else:
+            stats = {}
+            for file_path, full_path in self._walk():
+                if file_path.startswith(prefix):
+                    st = os.stat(full_path)
+                    stats[file_path] = FileStat(path=file_path, size=st.st_size, modified=st.st_mtime)
+
+        if self.write_behind is not None:
+            for file_path in self.write_behind.pending_paths():
+                if file_path.startswith(prefix):
+                    stat = self.stat(file_path)
+                    if stat is not None:
+                        stats[file_path] = stat
+        return sorted(stats.values(), key=lambda stat: stat.path)
 
     def save(self, file_obj: BinaryIO, file_path: str) -> str:
         """
         Save a file to local storage.
 
+        The content is copied in chunk_size pieces, so the file is never
+        held in memory as a whole. In write-behind mode, objects up to
+        write_behind_max_size are queued and the call returns before they
+        are on disk.
+
         Args:
             file_obj: File-like object to save
             file_path: Path where to save the file relative to base_dir
@@ -53,17 +624,26 @@ class LocalStorage(StorageInterface):
         Returns:
             Path to the saved file
         """
-        # Convert file_path to string if it's bytes
         if isinstance(file_path, bytes):
             file_path = file_path.decode('utf-8')
-        full_path = os.path.join(self.base_dir, file_path)
-        os.makedirs(os.path.dirname(full_path), exist_ok=True)
 
-        with open(full_path, 'wb') as f:
-            for chunk in file_obj.chunks() if hasattr(file_obj, 'chunks') else [file_obj.read()]:
-                f.write(chunk)
+        chunks = iter_file_obj(file_obj, self.chunk_size)
+        if self.write_behind is not None:
+            head = bytearray()
+            for chunk in chunks:
+                head += chunk
+                if len(head) > self.write_behind.max_object_size:
+                    break
+            else:
+                self.write_behind.put(file_path, bytes(head))
+                return file_path
+            chunks = itertools.chain([bytes(head)], chunks)
+
+        with self.open_write(file_path) as writer:
+            for chunk in chunks:
+                writer.write(chunk)
 
-        return file_path  # Moved outside the with block
+        return file_path
 
     def delete(self, file_path: str) -> bool:
         """
@@ -75,15 +655,47 @@ class LocalStorage(StorageInterface):
         Returns:
             True if deletion was successful, False otherwise
         """
-        # Convert file_path to string if it's bytes
-        if isinstance(file_path, bytes):
-            file_path = file_path.decode('utf-8')
-        full_path = os.path.join(self.base_dir, file_path)
-        if not os.path.exists(full_path):
-            return False
-
+        if self.write_behind is not None:
+            self.write_behind.forget(file_path)
+        # Let a queued write land first so that it can't recreate the file
+        if self._pending(file_path) is not None:
+            self.flush()
+        full_path = self._full_path(file_path)
         try:
             os.remove(full_path)
-            return True
+        except FileNotFoundError:
+            # Drop the row of a file removed behind the storage's back
+            if self.index is not None:
+                self.index.remove(file_path)
+            return False
         except OSError:
-            return False
\ No newline at end of file
+            return False
+
+        # Only once the file is gone, so that a failed delete stays indexed
+        if self.index is not None:
+            self.index.remove(file_path)
+        return True
+
+    def _pending(self, file_path: str) -> Optional[Tuple[bytes, float]]:
+        """Return (data, queue time) of a queued write-behind object."""
+        if self.write_behind is None:
+            return None
+        return self.write_behind.get(file_path)
+
+    def flush(self) -> None:
+        """
+        Durability barrier of write-behind mode.
+
+        Returns once every object saved before the call is fsynced and in
+        place (no-op without write-behind).
+
+        Raises:
+            OSError: If a queued batch could not be written
+        """
+        if self.write_behind is not None:
+            self.write_behind.flush()
+
+    def close(self) -> None:
+        """Flush and stop the write-behind thread."""
+        if self.write_behind is not None:
+            self.write_behind.close()
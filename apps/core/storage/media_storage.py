@@ -1,25 +1,65 @@
 # apps/core/storage/media_storage.py
+import logging
 import os
 import mimetypes
-from typing import BinaryIO, Optional, Tuple
+import threading
+from concurrent.futures import ThreadPoolExecutor, Future
+from typing import BinaryIO, Optional, Tuple, List, Iterable, Dict
 from PIL import Image
 from io import BytesIO
-from .base import StorageInterface
+from .base import StorageInterface, StreamWriter, FileStat, BatchResult, DEFAULT_BATCH_WORKERS
+
+logger = logging.getLogger(__name__)
+
+THUMBNAIL_MODES = ('sync', 'background', 'lazy')
 
 
 class MediaStorage(StorageInterface):
-    """Specialized storage for media files with thumbnail generation."""
+    """
+    Specialized storage for media files with thumbnail generation.
+
+    Thumbnails are generated in one of three modes:
+        sync: inside save(), before it returns
+        background: on a worker pool after save() returns
+        lazy: on the first get_thumbnail() call for the image
 
-    def __init__(self, storage: StorageInterface, thumbnail_sizes: List[Tuple[int, int]] = [(100, 100), (200, 200)]):
+    In every mode the image is decoded once, at the smallest draft scale
+    that still covers the largest thumbnail, and the sizes are produced
+    largest to smallest, each one reduced from the previous one. Generated
+    thumbnails are stored next to the image and served from storage
+    afterwards.
+    """
+
+    def __init__(self, storage: StorageInterface, thumbnail_sizes: List[Tuple[int, int]] = [(100, 100), (200, 200)],
+                 thumbnail_mode: str = 'background', max_workers: int = 2):
         """
         Initialize media storage.
 
         Args:
             storage: Base storage implementation
             thumbnail_sizes: List of thumbnail sizes to generate
+            thumbnail_mode: When thumbnails are generated ('sync', 'background' or 'lazy')
+            max_workers: Size of the background thumbnail pool
         """
+        if thumbnail_mode not in THUMBNAIL_MODES:
+            raise ValueError(f"thumbnail_mode must be one of {', '.join(THUMBNAIL_MODES)}")
         self.storage = storage
         self.thumbnail_sizes = thumbnail_sizes
+        self.thumbnail_mode = thumbnail_mode
+        self.max_workers = max_workers
+        self.chunk_size = storage.chunk_size
+
+        self._executor: Optional[ThreadPoolExecutor] = None
+        self._pending: Dict[str, Future] = {}
+        self._lock = threading.Lock()
+
+    @property
+    def executor(self) -> ThreadPoolExecutor:
+        """Thread pool generating thumbnails, created on first use."""
+        with self._lock:
+            if self._executor is None:
+                self._executor = ThreadPoolExecutor(max_workers=self.max_workers, thread_name_prefix='thumbnails')
+            return self._executor
 
     def _get_media_type(self, file_path: str) -> str:
         """Get media type from file path."""
@@ -38,48 +78,192 @@ class MediaStorage(StorageInterface):
         base_name, ext = os.path.splitext(file_path)
         return f"{base_name}_thumb_{size[0]}x{size[1]}{ext}"
 
-    def _generate_thumbnails(self, image_data: bytes, file_path: str) -> None:
-        """Generate thumbnails for an image."""
+    @staticmethod
+    def _fit(image_size: Tuple[int, int], box: Tuple[int, int]) -> Tuple[int, int]:
+        """Size of an image scaled down to fit in box, keeping its aspect ratio."""
+        width, height = image_size
+        scale = min(box[0] / width, box[1] / height, 1.0)
+        return max(1, round(width * scale)), max(1, round(height * scale))
+
+    def _generate_thumbnails(self, file_path: str) -> None:
+        """
+        Generate all thumbnails of an image already saved to storage.
+
+        The image is decoded once. For JPEGs draft() lets the decoder
+        downscale by up to 8x while decoding; every thumbnail is then
+        reduced from the previous, larger one instead of from the full
+        image.
+        """
+        source = self.storage.open_read(file_path)
+        if source is None:
+            return
+        with source, Image.open(source) as img:
+            image_format = img.format
+            sizes = sorted(self.thumbnail_sizes, key=lambda size: size[0] * size[1], reverse=True)
+            img.draft(img.mode, self._fit(img.size, sizes[0]))
+
+            current = img
+            for size in sizes:
+                target = self._fit(current.size, size)
+                if target != current.size:
+                    current = current.resize(target, Image.Resampling.LANCZOS, reducing_gap=3.0)
+
+                thumb_io = BytesIO()
+                current.save(thumb_io, format=image_format)
+                thumb_io.seek(0)
+                self.storage.save(thumb_io, self._generate_thumbnail_path(file_path, size))
+
+    def _generate_logged(self, file_path: str) -> None:
         try:
-            with Image.open(BytesIO(image_data)) as img:
-                for size in self.thumbnail_sizes:
-                    thumb = img.copy()
-                    thumb.thumbnail(size)
-                    thumb_io = BytesIO()
-                    thumb.save(thumb_io, format=img.format)
-                    thumb_io.seek(0)
-
-                    thumb_path = self._generate_thumbnail_path(file_path, size)
-                    self.storage.save(thumb_io, thumb_path)
-        except Exception as e:
-            # Log error but continue
-            print(f"Error generating thumbnails: {str(e)}")
+            self._generate_thumbnails(file_path)
+        except Exception:
+            # Thumbnails are best effort, the original file is already stored
+            logger.exception(f"Error generating thumbnails for {file_path}")
+
+    def _schedule_thumbnails(self, file_path: str) -> Future:
+        """Generate the thumbnails of an image on the worker pool."""
+        future = self.executor.submit(self._generate_logged, file_path)
+        with self._lock:
+            self._pending[file_path] = future
+
+        def done(_: Future) -> None:
+            with self._lock:
+                if self._pending.get(file_path) is future:
+                    del self._pending[file_path]
+
+        future.add_done_callback(done)
+        return future
+
+    def get_thumbnail(self, file_path: str, size: Tuple[int, int]) -> Optional[BinaryIO]:
+        """
+        Get a thumbnail of an image, generating the thumbnails if needed.
+
+        Waits for a background generation in progress; otherwise the
+        thumbnails are generated on this first request and served from
+        storage afterwards.
+
+        Args:
+            file_path: Path to the image
+            size: One of thumbnail_sizes
+
+        Returns:
+            File-like object or None if the image doesn't exist or the
+            thumbnail can't be generated
+        """
+        if tuple(size) not in {tuple(s) for s in self.thumbnail_sizes} or not self._is_image(file_path):
+            return None
+        thumb_path = self._generate_thumbnail_path(file_path, size)
+
+        with self._lock:
+            pending = self._pending.get(file_path)
+        if pending is not None:
+            pending.result()
+
+        thumb = self.storage.open_read(thumb_path)
+        if thumb is not None:
+            return thumb
+
+        # Concurrent first requests share a single generation
+        with self._lock:
+            pending = self._pending.get(file_path)
+            if pending is None:
+                pending = Future()
+                self._pending[file_path] = pending
+                owner = True
+            else:
+                owner = False
+
+        if owner:
+            try:
+                self._generate_logged(file_path)
+            finally:
+                with self._lock:
+                    self._pending.pop(file_path, None)
+                pending.set_result(None)
+        else:
+            pending.result()
+        return self.storage.open_read(thumb_path)
+
+    def wait_for_thumbnails(self) -> None:
+        """Block until all background thumbnail generation has finished."""
+        with self._lock:
+            pending = list(self._pending.values())
+        for future in pending:
+            future.result()
+
+    def close(self) -> None:
+        """Finish pending thumbnails and shut down the worker pool."""
+        with self._lock:
+            executor, self._executor = self._executor, None
+        if executor is not None:
+            executor.shutdown(wait=True)
 
     def get(self, file_path: str) -> Optional[BinaryIO]:
         """Get media file."""
         return self.storage.get(file_path)
 
-    def save(self, file_obj: BinaryIO, file_path: str) -> str:
-        """Save media file and generate thumbnails if it's an image."""
-        # Read the content first
-        content = file_obj.read()
+    def open_read(self, file_path: str) -> Optional[BinaryIO]:
+        """Open media file for streaming reads."""
+        return self.storage.open_read(file_path)
 
-        # Save the original file
-        result = self.storage.save(BytesIO(content), file_path)
+    def stat(self, file_path: str) -> Optional[FileStat]:
+        """Get media file information."""
+        return self.storage.stat(file_path)
+
+    def open_write(self, file_path: str) -> StreamWriter:
+        """
+        Open media file for streaming writes.
+
+        Thumbnails of a previous version are removed; new ones are
+        generated on the first get_thumbnail() call.
+        """
+        self._delete_thumbnails(file_path)
+        return self.storage.open_write(file_path)
+
+    def save(self, file_obj: BinaryIO, file_path: str) -> str:
+        """Save media file and generate its thumbnails according to thumbnail_mode."""
+        # Stream the original file to storage
+        result = self.storage.save(file_obj, file_path)
 
-        # Generate thumbnails if it's an image
         if self._is_image(file_path):
-            self._generate_thumbnails(content, file_path)
+            if self.thumbnail_mode == 'sync':
+                self._generate_logged(file_path)
+            elif self.thumbnail_mode == 'background':
+                self._schedule_thumbnails(file_path)
+            else:
+                self._delete_thumbnails(file_path)
 
         return result
 
+    def _delete_thumbnails(self, file_path: str) -> None:
+        """Remove stale thumbnails so they are regenerated from the new content."""
+        thumbnails = self._thumbnail_paths(file_path)
+        if thumbnails:
+            self.storage.delete_many(thumbnails)
+
+    def _thumbnail_paths(self, file_path: str) -> List[str]:
+        """Paths of all thumbnails of a media file."""
+        if not self._is_image(file_path):
+            return []
+        return [self._generate_thumbnail_path(file_path, size) for size in self.thumbnail_sizes]
+
     def delete(self, file_path: str) -> bool:
-        """Delete media file and its thumbnails."""
-        # Delete thumbnails
-        if self._is_image(file_path):
-            for size in self.thumbnail_sizes:
-                thumb_path = self._generate_thumbnail_path(file_path, size)
-                self.storage.delete(thumb_path)
+        """Delete media file and its thumbnails in a single batch."""
+        results = self.storage.delete_many([file_path] + self._thumbnail_paths(file_path))
+
+        # Report the outcome for the original file
+        return results[0].success
+
+    def delete_many(self, file_paths: Iterable[str],
+                    max_workers: int = DEFAULT_BATCH_WORKERS) -> List[BatchResult]:
+        """Delete media files and all their thumbnails in a single batch."""
+        file_paths = list(file_paths)
+        thumbnails = [thumb for file_path in file_paths for thumb in self._thumbnail_paths(file_path)]
+        results = self.storage.delete_many(file_paths + thumbnails, max_workers=max_workers)
+
+        # Report the outcome for the original files
+        return results[:len(file_paths)]
 
-        # Delete original file
-        return self.storage.delete(file_path)
\ No newline at end of file
+    def exists(self, file_path: str) -> bool:
+        """Check whether a media file exists."""
+        return self.storage.exists(file_path)
\ No newline at end of file
@@ -0,0 +1,178 @@
+# apps/core/storage/metrics.py
+import bisect
+import itertools
+import threading
+import weakref
+from collections import defaultdict
+from typing import Dict, Any, List, Optional, Tuple
+
+# Upper bounds (seconds) of the latency histogram buckets
+LATENCY_BUCKETS = (
+    0.0005, 0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1,
+    0.25, 0.5, 1.0, 2.5, 5.0, 10.0, 30.0, 60.0, float('inf')
+)
+
+
+class Histogram:
+    """Fixed-bucket latency histogram."""
+
+    def __init__(self, buckets: Tuple[float, ...] = LATENCY_BUCKETS):
+        self.buckets = buckets
+        self.counts = [0] * len(buckets)
+        self.count = 0
+        self.sum = 0.0
+
+    def observe(self, value: float) -> None:
+        self.counts[bisect.bisect_left(self.buckets, value)] += 1
+        self.count += 1
+        self.sum += value
+
+    def percentile(self, q: float) -> Optional[float]:
+        """Estimate a percentile (0-100) by interpolating inside its bucket."""
+        if not self.count:
+            return None
+        rank = q / 100 * self.count
+        seen = 0
+        for i, bucket_count in enumerate(self.counts):
+            if seen + bucket_count >= rank and bucket_count:
+                lower = self.buckets[i - 1] if i else 0.0
+                upper = self.buckets[i] if self.buckets[i] != float('inf') else lower
+                return lower + (upper - lower) * (rank - seen) / bucket_count
+            seen += bucket_count
+        return self.buckets[-2]
+
+
+class OperationMetrics:
+    """Counters of one operation of one backend."""
+
+    def __init__(self):
+        self.latency = Histogram()
+        self.errors: Dict[str, int] = defaultdict(int)
+        self.bytes_read = 0
+        self.bytes_written = 0
+
+    def snapshot(self) -> Dict[str, Any]:
+        return {
+            'calls': self.latency.count,
+            'errors': dict(self.errors),
+            'latency': {
+                'total': self.latency.sum,
+                'mean': self.latency.sum / self.latency.count if self.latency.count else None,
+                'p50': self.latency.percentile(50),
+                'p95': self.latency.percentile(95),
+                'p99': self.latency.percentile(99),
+                'buckets': dict(zip(map(str, self.latency.buckets), self.latency.counts)),
+            },
+            'bytes_read': self.bytes_read,
+            'bytes_written': self.bytes_written,
+        }
+
+
+class MetricsRegistry:
+    """
+    In-process registry of storage metrics.
+
+    Operations are labelled by backend (the storage class) and operation
+    name, so the time and bytes of every layer of a stacked storage chain
+    show up separately. Caches register themselves to have their stats()
+    included in snapshots.
+    """
+
+    def __init__(self):
+        self._operations: Dict[Tuple[str, str], OperationMetrics] = {}
+        self._caches: 'weakref.WeakValueDictionary[str, Any]' = weakref.WeakValueDictionary()
+        self._cache_ids = itertools.count(1)
+        self._lock = threading.Lock()
+
+    def _get(self, backend: str, operation: str) -> OperationMetrics:
+        key = (backend, operation)
+        metrics = self._operations.get(key)
+        if metrics is None:
+            metrics = self._operations.setdefault(key, OperationMetrics())
+        return metrics
+
+    def record(self, backend: str, operation: str, seconds: float, error: Optional[BaseException] = None) -> None:
+        """Record one call of an operation."""
+        with self._lock:
+            metrics = self._get(backend, operation)
+            metrics.latency.observe(seconds)
+            if error is not None:
+                metrics.errors[type(error).__name__] += 1
+
+    def add_bytes(self, backend: str, operation: str, read: int = 0, written: int = 0) -> None:
+        """Add transferred bytes to an operation."""
+        with self._lock:
+            metrics = self._get(backend, operation)
+            metrics.bytes_read += read
+            metrics.bytes_written += written
+
+    def register_cache(self, cache: Any) -> str:
+        """
+        Include a cache's stats() in snapshots for as long as it lives.
+
+        Returns:
+            Label of the cache in snapshots
+        """
+        label = f"{type(cache).__name__}#{next(self._cache_ids)}"
+        self._caches[label] = cache
+        return label
+
+    def snapshot(self) -> Dict[str, Any]:
+        """Return all metrics as nested dictionaries: backends -> operations -> metrics."""
+        with self._lock:
+            backends: Dict[str, Dict[str, Any]] = defaultdict(dict)
+            for (backend, operation), metrics in sorted(self._operations.items()):
+                backends[backend][operation] = metrics.snapshot()
+        caches = {label: cache.stats() for label, cache in list(self._caches.items())}
+        return {'backends': dict(backends), 'caches': caches}
+
+    def prometheus(self) -> str:
+        """
+        Render the metrics in the Prometheus text exposition format.
+
+        The samples of each metric family are grouped after its own
+        # TYPE line, as the format requires.
+        """
+        lines: List[str] = []
+        with self._lock:
+            items = [(f'backend="{backend}",operation="{operation}"', metrics)
+                     for (backend, operation), metrics in sorted(self._operations.items())]
+
+            lines.append('# TYPE storage_operation_seconds histogram')
+            for labels, metrics in items:
+                cumulative = 0
+                for bound, count in zip(metrics.latency.buckets, metrics.latency.counts):
+                    cumulative += count
+                    le = '+Inf' if bound == float('inf') else repr(bound)
+                    lines.append(f'storage_operation_seconds_bucket{{{labels},le="{le}"}} {cumulative}')
+                lines.append(f'storage_operation_seconds_sum{{{labels}}} {metrics.latency.sum}')
+                lines.append(f'storage_operation_seconds_count{{{labels}}} {metrics.latency.count}')
+
+            lines.append('# TYPE storage_operation_errors_total counter')
+            for labels, metrics in items:
+                for error_type, count in sorted(metrics.errors.items()):
+                    lines.append(f'storage_operation_errors_total{{{labels},error="{error_type}"}} {count}')
+
+            lines.append('# TYPE storage_bytes_read_total counter')
+            for labels, metrics in items:
+                lines.append(f'storage_bytes_read_total{{{labels}}} {metrics.bytes_read}')
+
+            lines.append('# TYPE storage_bytes_written_total counter')
+            for labels, metrics in items:
+                lines.append(f'storage_bytes_written_total{{{labels}}} {metrics.bytes_written}')
+
+        lines.append('# TYPE storage_cache_hit_ratio gauge')
+        for label, cache in sorted(self._caches.items()):
+            stats = cache.stats()
+            if 'hit_ratio' in stats:
+                lines.append(f'storage_cache_hit_ratio{{cache="{label}"}} {stats["hit_ratio"]}')
+        return '\n'.join(lines) + '\n'
+
+    def reset(self) -> None:
+        """Forget all recorded operations."""
+        with self._lock:
+            self._operations.clear()
+
+
+# Process-wide registry used by the storage_operation decorator
+registry = MetricsRegistry()
@@ -1,26 +1,393 @@
 # apps/core/storage/s3.py
-from apps.core.storage.base import StorageInterface
+import logging
+import os
+import tempfile
+import threading
+from concurrent.futures import ThreadPoolExecutor, wait
+from typing import BinaryIO, Optional, Iterator, Dict, List, Callable, Any, Iterable
+
 import boto3
+from botocore.config import Config
+from botocore.exceptions import ClientError
 from django.conf import settings
 
+from apps.core.storage.base import StorageInterface, FileStat, BatchResult, DEFAULT_CHUNK_SIZE, DEFAULT_BATCH_WORKERS
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_PART_SIZE = 8 * 1024 * 1024
+DEFAULT_MAX_CONCURRENCY = 8
+DEFAULT_MAX_POOL_CONNECTIONS = 32
+
+# Maximum number of keys accepted by a single DeleteObjects request
+DELETE_BATCH_SIZE = 1000
+
+_clients: Dict[tuple, Any] = {}
+_clients_lock = threading.Lock()
+
+
+def get_s3_client(access_key: Optional[str] = None, secret_key: Optional[str] = None,
+                  region: Optional[str] = None, endpoint_url: Optional[str] = None,
+                  max_pool_connections: int = DEFAULT_MAX_POOL_CONNECTIONS):
+    """
+    Return a process-wide S3 client for the given credentials.
+
+    boto3 clients are thread-safe, so one client (and its HTTP connection
+    pool) is shared by every S3Storage using the same configuration
+    instead of being rebuilt per instance.
+    """
+    key = (access_key, secret_key, region, endpoint_url, max_pool_connections)
+    with _clients_lock:
+        client = _clients.get(key)
+        if client is None:
+            client = boto3.client(
+                's3',
+                aws_access_key_id=access_key,
+                aws_secret_access_key=secret_key,
+                region_name=region,
+                endpoint_url=endpoint_url,
+                config=Config(
+                    max_pool_connections=max_pool_connections,
+                    retries={'max_attempts': 5, 'mode': 'adaptive'}
+                )
+            )
+            _clients[key] = client
+    return client
+
+
+def _read_exact(file_obj: BinaryIO, size: int) -> bytes:
+    """Read size bytes from file_obj, or fewer only at end of file."""
+    parts = []
+    remaining = size
+    while remaining > 0:
+        data = file_obj.read(remaining)
+        if not data:
+            break
+        parts.append(data)
+        remaining -= len(data)
+    return b''.join(parts)
+
 
 class S3Storage(StorageInterface):
-    def __init__(self):
-        s3_config = settings.STORAGE_OPTIONS.get('s3', {})
-        self.bucket = s3_config.get('BUCKET')
-        self.client = boto3.client(
-            's3',
-            aws_access_key_id=s3_config.get('ACCESS_KEY'),
-            aws_secret_access_key=s3_config.get('SECRET_KEY'),
-            region_name=s3_config.get('REGION')
+    """
+    Storage implementation for S3 and S3-compatible object stores.
+
+    Files larger than part_size are uploaded as parallel multipart uploads
+    and downloaded with parallel byte-range GETs, max_concurrency parts at
+    a time.
+    """
+
+    def __init__(self, bucket: Optional[str] = None, client=None,
+                 part_size: Optional[int] = None,
+                 max_concurrency: Optional[int] = None,
+                 max_pool_connections: Optional[int] = None,
+                 chunk_size: int = DEFAULT_CHUNK_SIZE):
+        """
+        Initialize S3 storage.
+
+        Args:
+            bucket: Bucket name (defaults to STORAGE_OPTIONS['s3']['BUCKET'])
+            client: Preconfigured boto3 S3 client (shared client built from settings if None)
+            part_size: Size of multipart upload parts and download ranges (min 5 MB)
+            max_concurrency: Number of parts transferred in parallel
+            max_pool_connections: HTTP connection pool size of the shared client
+            chunk_size: Size of the chunks used for streaming reads
+        """
+        s3_config = settings.STORAGE_OPTIONS.get('s3', {}) if bucket is None or client is None else {}
+        self.bucket = bucket or s3_config.get('BUCKET')
+        self.part_size = part_size or s3_config.get('PART_SIZE', DEFAULT_PART_SIZE)
+        self.max_concurrency = max_concurrency or s3_config.get('MAX_CONCURRENCY', DEFAULT_MAX_CONCURRENCY)
+        self.chunk_size = chunk_size
+        self.client = client or get_s3_client(
+            access_key=s3_config.get('ACCESS_KEY'),
+            secret_key=s3_config.get('SECRET_KEY'),
+            region=s3_config.get('REGION'),
+            endpoint_url=s3_config.get('ENDPOINT_URL'),
+            max_pool_connections=max_pool_connections or s3_config.get(
+                'MAX_POOL_CONNECTIONS', max(DEFAULT_MAX_POOL_CONNECTIONS, self.max_concurrency)
+            )
+        )
+        self._executor: Optional[ThreadPoolExecutor] = None
+        self._executor_lock = threading.Lock()
+
+    @property
+    def executor(self) -> ThreadPoolExecutor:
+        """Thread pool used for part uploads and range downloads."""
+        if self._executor is None:
+            with self._executor_lock:
+                if self._executor is None:
+                    self._executor = ThreadPoolExecutor(
+                        max_workers=self.max_concurrency,
+                        thread_name_prefix='s3-transfer'
+                    )
+        return self._executor
+
+    def stat(self, file_path: str) -> Optional[FileStat]:
+        """Get object size, modification time and ETag with a HEAD request."""
+        try:
+            response = self.client.head_object(Bucket=self.bucket, Key=file_path)
+        except ClientError as e:
+            if e.response.get('Error', {}).get('Code') in ('404', 'NoSuchKey', 'NotFound'):
+                return None
+            raise
+        return FileStat(
+            path=file_path,
+            size=response['ContentLength'],
+            modified=response['LastModified'].timestamp(),
+            etag=response['ETag'].strip('"')
         )
 
+    def exists(self, file_path: str) -> bool:
+        """Check whether an object exists with a HEAD request."""
+        return self.stat(file_path) is not None
+
+    def get(self, file_path: str) -> Optional[BinaryIO]:
+        """
+        Get an object.
+
+        Objects up to part_size are returned as a streaming body. Larger
+        objects are fetched with parallel range requests into a
+        preallocated temporary file, returned positioned at the start.
+        """
+        info = self.stat(file_path)
+        if info is None:
+            return None
+        if info.size <= self.part_size:
+            return self.open_read(file_path)
+
+        target = tempfile.TemporaryFile()
+        try:
+            self._download(info, target)
+        except BaseException:
+            target.close()
+            raise
+        target.seek(0)
+        return target
+
+    def open_read(self, file_path: str) -> Optional[BinaryIO]:
+        """
+        Open an object for streaming reads.
+
+        Returns the botocore StreamingBody, which pulls the object from the
+        network as it is read, or None if the object doesn't exist.
+        """
+        try:
+            response = self.client.get_object(Bucket=self.bucket, Key=file_path)
+        except self.client.exceptions.NoSuchKey:
+            return None
+        return response['Body']
+
+    def iter_chunks(self, file_path: str, chunk_size: Optional[int] = None) -> Iterator[bytes]:
+        """Iterate over an object in chunks straight from the response body."""
+        body = self.open_read(file_path)
+        if body is None:
+            raise FileNotFoundError(file_path)
+
+        try:
+            yield from body.iter_chunks(chunk_size or self.chunk_size)
+        finally:
+            body.close()
+
+    def read_range(self, file_path: str, offset: int, length: int) -> Optional[bytes]:
+        """Read a byte range of an object with a single ranged GET."""
+        if length <= 0:
+            return b''
+        try:
+            response = self.client.get_object(
+                Bucket=self.bucket, Key=file_path,
+                Range=f"bytes={offset}-{offset + length - 1}"
+            )
+        except self.client.exceptions.NoSuchKey:
+            return None
+        except ClientError as e:
+            if e.response.get('Error', {}).get('Code') == 'InvalidRange':
+                return b''
+            raise
+        return response['Body'].read()
+
+    def download_to_file(self, file_path: str, local_path: str) -> bool:
+        """
+        Download an object to a local file with parallel range requests.
+
+        The local file is preallocated to the object size and every range
+        is written at its offset as soon as it arrives.
+
+        Args:
+            file_path: Object key
+            local_path: Destination path on the local filesystem
+
+        Returns:
+            True if the object was downloaded, False if it doesn't exist
+        """
+        info = self.stat(file_path)
+        if info is None:
+            return False
+
+        with open(local_path, 'wb') as f:
+            self._download(info, f)
+        return True
+
+    def download_to_buffer(self, file_path: str) -> Optional[bytearray]:
+        """
+        Download an object into a preallocated in-memory buffer.
+
+        Args:
+            file_path: Object key
+
+        Returns:
+            Buffer holding the object or None if it doesn't exist
+        """
+        info = self.stat(file_path)
+        if info is None:
+            return None
+
+        buffer = bytearray(info.size)
+        view = memoryview(buffer)
+
+        def write_at(offset: int, data: bytes) -> None:
+            view[offset:offset + len(data)] = data
+
+        self._fetch_ranges(info, write_at)
+        return buffer
+
+    def _download(self, info: FileStat, target: BinaryIO) -> None:
+        """Download an object into an open, writable binary file."""
+        target.truncate(info.size)
+        fd = target.fileno()
+
+        def write_at(offset: int, data: bytes) -> None:
+            view = memoryview(data)
+            while view:
+                written = os.pwrite(fd, view, offset)
+                view = view[written:]
+                offset += written
+
+        self._fetch_ranges(info, write_at)
+
+    def _fetch_ranges(self, info: FileStat, write_at: Callable[[int, bytes], None]) -> None:
+        """Fetch all part_size ranges of an object in parallel."""
+
+        def fetch(offset: int) -> None:
+            end = min(offset + self.part_size, info.size) - 1
+            request = {'Bucket': self.bucket, 'Key': info.path, 'Range': f"bytes={offset}-{end}"}
+            if info.etag:
+                # Fail instead of mixing ranges of two versions of the object
+                request['IfMatch'] = info.etag
+            response = self.client.get_object(**request)
+            write_at(offset, response['Body'].read())
+
+        futures = [self.executor.submit(fetch, offset) for offset in range(0, info.size, self.part_size)]
+        try:
+            for future in futures:
+                future.result()
+        except BaseException:
+            for future in futures:
+                future.cancel()
+            wait(futures)
+            raise
+
     def save(self, file_obj, file_path):
+        """
+        Save a file to S3.
+
+        Files smaller than part_size are sent with a single PUT. Larger
+        files are sent as a multipart upload with up to max_concurrency
+        parts in flight, so memory use is bounded by
+        part_size * (max_concurrency + 1) whatever the file size.
+        """
         try:
-            self.client.upload_fileobj(file_obj, self.bucket, file_path)
+            first_part = _read_exact(file_obj, self.part_size)
+            if len(first_part) < self.part_size:
+                self.client.put_object(Bucket=self.bucket, Key=file_path, Body=first_part)
+            else:
+                self._multipart_upload(file_obj, file_path, first_part)
             return f"s3://{self.bucket}/{file_path}"
         except Exception as e:
-            import logging
-            logger = logging.getLogger(__name__)
             logger.error(f"Error saving to S3: {str(e)}")
-            raise
\ No newline at end of file
+            raise
+
+    def _multipart_upload(self, file_obj: BinaryIO, file_path: str, first_part: bytes) -> None:
+        """Upload a file as parallel multipart upload parts."""
+        upload_id = self.client.create_multipart_upload(Bucket=self.bucket, Key=file_path)['UploadId']
+        slots = threading.BoundedSemaphore(self.max_concurrency)
+        failed = threading.Event()
+
+        def upload_part(part_number: int, data: bytes) -> Dict[str, Any]:
+            try:
+                response = self.client.upload_part(
+                    Bucket=self.bucket, Key=file_path, UploadId=upload_id,
+                    PartNumber=part_number, Body=data
+                )
+                return {'PartNumber': part_number, 'ETag': response['ETag']}
+            except BaseException:
+                failed.set()
+                raise
+            finally:
+                slots.release()
+
+        futures = []
+        try:
+            part_number = 1
+            data = first_part
+            while data and not failed.is_set():
+                slots.acquire()
+                futures.append(self.executor.submit(upload_part, part_number, data))
+                part_number += 1
+                data = _read_exact(file_obj, self.part_size)
+
+            parts = [future.result() for future in futures]
+            self.client.complete_multipart_upload(
+                Bucket=self.bucket, Key=file_path, UploadId=upload_id,
+                MultipartUpload={'Parts': parts}
+            )
+        except BaseException:
+            for future in futures:
+                future.cancel()
+            wait(futures)
+            self.client.abort_multipart_upload(Bucket=self.bucket, Key=file_path, UploadId=upload_id)
+            raise
+
+    def delete(self, file_path: str) -> bool:
+        """Delete an object."""
+        try:
+            self.client.delete_object(Bucket=self.bucket, Key=file_path)
+            return True
+        except ClientError:
+            return False
+
+    def delete_many(self, file_paths: Iterable[str],
+                    max_workers: int = DEFAULT_BATCH_WORKERS) -> List[BatchResult]:
+        """
+        Delete objects with DeleteObjects, up to 1000 keys per request.
+
+        Args:
+            file_paths: Object keys to delete
+            max_workers: Maximum number of DeleteObjects requests in flight
+
+        Returns:
+            One BatchResult per key, unsuccessful if S3 reported an error for it
+        """
+        file_paths = list(file_paths)
+        batches = [file_paths[start:start + DELETE_BATCH_SIZE]
+                   for start in range(0, len(file_paths), DELETE_BATCH_SIZE)]
+
+        def delete_batch(batch: List[str]) -> List[BatchResult]:
+            try:
+                response = self.client.delete_objects(
+                    Bucket=self.bucket,
+                    Delete={'Objects': [{'Key': key} for key in batch], 'Quiet': True}
+                )
+            except ClientError as e:
+                return [BatchResult(path=key, success=False, error=str(e)) for key in batch]
+
+            errors = {error['Key']: error.get('Message', error.get('Code')) for error in response.get('Errors', [])}
+            return [
+                BatchResult(path=key, success=key not in errors, value=key not in errors, error=errors.get(key))
+                for key in batch
+            ]
+
+        if len(batches) <= 1:
+            return [result for batch in batches for result in delete_batch(batch)]
+
+        with ThreadPoolExecutor(max_workers=min(max_workers, len(batches))) as executor:
+            return [result for results in executor.map(delete_batch, batches) for result in results]
@@ -0,0 +1,289 @@
+# apps/core/storage/segmented_encryption.py
+import io
+import os
+import struct
+from dataclasses import dataclass
+from typing import BinaryIO, Optional, Callable
+
+from cryptography.exceptions import InvalidTag
+from cryptography.hazmat.primitives import hashes
+from cryptography.hazmat.primitives.ciphers.aead import AESGCM
+from cryptography.hazmat.primitives.kdf.hkdf import HKDF
+
+from .base import StreamWriter
+
+# Segmented format:
+#   header  = MAGIC | segment_size (uint32) | salt (16) | nonce_prefix (7)
+#   body    = segment_0 | segment_1 | ... | segment_n
+#   segment = AES-256-GCM(plaintext[i * segment_size:(i + 1) * segment_size]) | tag (16)
+#
+# Every segment uses the nonce nonce_prefix | i (uint32) | last flag (1 byte)
+# and the header as associated data, so segments cannot be reordered,
+# moved between files or truncated away. Every segment but the last one
+# holds exactly segment_size bytes of plaintext; the last one is always
+# shorter (possibly empty), which makes it identifiable from its length
+# alone when decrypting a byte range.
+MAGIC = b'DPSEG\x01'
+SALT_SIZE = 16
+NONCE_PREFIX_SIZE = 7
+TAG_SIZE = 16
+HEADER_STRUCT = struct.Struct(f'>{len(MAGIC)}sI{SALT_SIZE}s{NONCE_PREFIX_SIZE}s')
+HEADER_SIZE = HEADER_STRUCT.size
+DEFAULT_SEGMENT_SIZE = 64 * 1024
+
+
+class SegmentIntegrityError(ValueError):
+    """Raised when an encrypted segment fails authentication."""
+
+
+@dataclass
+class SegmentHeader:
+    """Parsed header of a segmented encrypted file."""
+    segment_size: int
+    salt: bytes
+    nonce_prefix: bytes
+    raw: bytes
+
+    @classmethod
+    def new(cls, segment_size: int = DEFAULT_SEGMENT_SIZE) -> 'SegmentHeader':
+        salt = os.urandom(SALT_SIZE)
+        nonce_prefix = os.urandom(NONCE_PREFIX_SIZE)
+        raw = HEADER_STRUCT.pack(MAGIC, segment_size, salt, nonce_prefix)
+        return cls(segment_size, salt, nonce_prefix, raw)
+
+    @classmethod
+    def parse(cls, raw: bytes) -> 'SegmentHeader':
+        if len(raw) < HEADER_SIZE or not raw.startswith(MAGIC):
+            raise ValueError("Not a segmented encrypted file")
+        _, segment_size, salt, nonce_prefix = HEADER_STRUCT.unpack(raw[:HEADER_SIZE])
+        return cls(segment_size, salt, nonce_prefix, raw[:HEADER_SIZE])
+
+    @property
+    def encrypted_segment_size(self) -> int:
+        return self.segment_size + TAG_SIZE
+
+    def plaintext_size(self, ciphertext_size: int) -> int:
+        """Plaintext size of a file of ciphertext_size bytes (header included)."""
+        body = ciphertext_size - HEADER_SIZE
+        segments = -(-body // self.encrypted_segment_size)
+        return body - segments * TAG_SIZE
+
+
+def is_segmented(prefix: bytes) -> bool:
+    """Check whether stored bytes start with the segmented format header."""
+    return prefix.startswith(MAGIC)
+
+
+class SegmentCipher:
+    """Encrypts and decrypts the segments of one file."""
+
+    def __init__(self, file_key: bytes, header: SegmentHeader):
+        self.header = header
+        self._aead = AESGCM(file_key)
+
+    def _nonce(self, index: int, last: bool) -> bytes:
+        return self.header.nonce_prefix + struct.pack('>I?', index, last)
+
+    def encrypt(self, index: int, plaintext: bytes, last: bool) -> bytes:
+        return self._aead.encrypt(self._nonce(index, last), plaintext, self.header.raw)
+
+    def decrypt(self, index: int, ciphertext: bytes) -> bytes:
+        last = len(ciphertext) < self.header.encrypted_segment_size
+        try:
+            return self._aead.decrypt(self._nonce(index, last), ciphertext, self.header.raw)
+        except InvalidTag:
+            raise SegmentIntegrityError(f"Segment {index} failed authentication")
+
+
+def derive_file_key(master_key: bytes, salt: bytes) -> bytes:
+    """Derive the AES-256 key of one file from the master key and its salt."""
+    return HKDF(
+        algorithm=hashes.SHA256(),
+        length=32,
+        salt=salt,
+        info=b'data-platform segmented storage',
+    ).derive(master_key)
+
+
+class SegmentedEncryptWriter(StreamWriter):
+    """Encrypts a stream segment by segment into an underlying writer."""
+
+    def __init__(self, writer: StreamWriter, cipher: SegmentCipher,
+                 on_commit: Optional[Callable[[], None]] = None,
+                 on_discard: Optional[Callable[[], None]] = None):
+        super().__init__()
+        self._writer = writer
+        self._cipher = cipher
+        self._on_commit = on_commit
+        self._on_discard = on_discard
+        self._segment_size = cipher.header.segment_size
+        self._buffer = bytearray()
+        self._index = 0
+        self._writer.write(cipher.header.raw)
+
+    def _write(self, data: bytes) -> Optional[int]:
+        self._buffer += data
+        # A full segment is only known not to be the last one once more data follows
+        while len(self._buffer) > self._segment_size:
+            self._emit(bytes(self._buffer[:self._segment_size]), last=False)
+            del self._buffer[:self._segment_size]
+        return len(data)
+
+    def _emit(self, plaintext: bytes, last: bool) -> None:
+        self._writer.write(self._cipher.encrypt(self._index, plaintext, last))
+        self._index += 1
+
+    def _commit(self) -> None:
+        if len(self._buffer) == self._segment_size:
+            self._emit(bytes(self._buffer), last=False)
+            self._buffer.clear()
+        self._emit(bytes(self._buffer), last=True)
+        self._writer.close()
+        self.result = self._writer.result
+        if self._on_commit is not None:
+            self._on_commit()
+
+    def _discard(self) -> None:
+        self._writer.abort()
+        if self._on_discard is not None:
+            self._on_discard()
+
+
+class SegmentedDecryptReader(io.RawIOBase):
+    """
+    Decrypting reader over a segmented encrypted stream.
+
+    Segments are decrypted one at a time as they are read. When the
+    underlying stream is seekable the reader is seekable too: a seek only
+    moves to the segment holding the target offset, so reading a Parquet
+    footer decrypts the last segments instead of the whole file.
+    """
+
+    def __init__(self, stream: BinaryIO, header: SegmentHeader, file_key: bytes):
+        super().__init__()
+        self._stream = stream
+        self._cipher = SegmentCipher(file_key, header)
+        self._header = header
+        self._position = 0
+        self._segment_index = -1
+        self._segment = b''
+        self._size: Optional[int] = None
+
+    def readable(self) -> bool:
+        return True
+
+    def seekable(self) -> bool:
+        return getattr(self._stream, 'seekable', lambda: False)()
+
+    def _load_segment(self, index: int) -> bytes:
+        if index != self._segment_index:
+            encrypted_size = self._header.encrypted_segment_size
+            if self.seekable():
+                self._stream.seek(HEADER_SIZE + index * encrypted_size)
+            elif index != self._segment_index + 1:
+                raise io.UnsupportedOperation("non-sequential read on an unseekable stream")
+
+            ciphertext = bytearray()
+            while len(ciphertext) < encrypted_size:
+                data = self._stream.read(encrypted_size - len(ciphertext))
+                if not data:
+                    break
+                ciphertext += data
+            if not ciphertext:
+                if index == self._segment_index + 1:
+                    # Reading sequentially must end with the final (short) segment
+                    raise SegmentIntegrityError(f"Encrypted file is truncated before segment {index}")
+                # Seeked past the end of the file
+                return b''
+
+            self._segment = self._cipher.decrypt(index, bytes(ciphertext))
+            self._segment_index = index
+        return self._segment
+
+    def readinto(self, buffer) -> int:
+        segment_size = self._header.segment_size
+        index, offset = divmod(self._position, segment_size)
+        if self._size is not None and self._position >= self._size:
+            return 0
+
+        segment = self._load_segment(index)
+        if len(segment) < segment_size and offset >= len(segment):
+            # Past the end of the last segment
+            return 0
+
+        count = min(len(buffer), len(segment) - offset)
+        buffer[:count] = segment[offset:offset + count]
+        self._position += count
+        return count
+
+    def _total_size(self) -> int:
+        if self._size is None:
+            current = self._stream.tell()
+            ciphertext_size = self._stream.seek(0, io.SEEK_END)
+            self._stream.seek(current)
+            self._size = self._header.plaintext_size(ciphertext_size)
+        return self._size
+
+    def seek(self, offset: int, whence: int = io.SEEK_SET) -> int:
+        if not self.seekable():
+            raise io.UnsupportedOperation("underlying stream is not seekable")
+        if whence == io.SEEK_CUR:
+            offset += self._position
+        elif whence == io.SEEK_END:
+            offset += self._total_size()
+        if offset < 0:
+            raise ValueError("negative seek position")
+        self._position = offset
+        return self._position
+
+    def tell(self) -> int:
+        return self._position
+
+    def close(self) -> None:
+        if not self.closed:
+            self._stream.close()
+        super().close()
+
+
+def decrypt_range(read_range: Callable[[int, int], Optional[bytes]], header: SegmentHeader,
+                  file_key: bytes, offset: int, length: int) -> bytes:
+    """
+    Decrypt a plaintext byte range, fetching only the segments covering it.
+
+    Args:
+        read_range: Function reading (offset, length) bytes of the ciphertext
+        header: Header of the encrypted file
+        file_key: Key of the file
+        offset: First plaintext byte to return
+        length: Maximum number of plaintext bytes to return
+
+    Returns:
+        The decrypted bytes (shorter than length at the end of the file)
+    """
+    if length <= 0:
+        return b''
+
+    segment_size = header.segment_size
+    encrypted_size = header.encrypted_segment_size
+    first = offset // segment_size
+    last = (offset + length - 1) // segment_size
+
+    requested = (last - first + 1) * encrypted_size
+    ciphertext = read_range(HEADER_SIZE + first * encrypted_size, requested) or b''
+    cipher = SegmentCipher(file_key, header)
+
+    plaintext = bytearray()
+    reached_end = False
+    for i, start in enumerate(range(0, len(ciphertext), encrypted_size)):
+        segment = cipher.decrypt(first + i, ciphertext[start:start + encrypted_size])
+        plaintext += segment
+        if len(segment) < segment_size:
+            reached_end = True
+            break
+
+    if ciphertext and len(ciphertext) < requested and not reached_end:
+        # The file ended without its final (short) segment
+        raise SegmentIntegrityError("Encrypted file is truncated")
+
+    skip = offset - first * segment_size
+    return bytes(plaintext[skip:skip + length])
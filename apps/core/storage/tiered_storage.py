@@ -0,0 +1,360 @@
+# apps/core/storage/tiered_storage.py
+import hashlib
+import json
+import os
+import tempfile
+import threading
+import time
+from collections import OrderedDict
+from dataclasses import dataclass
+from io import BytesIO
+from typing import BinaryIO, Optional, Dict, Any, Iterable, List
+
+from .base import StorageInterface, StreamWriter, FileStat, BatchResult, iter_file_obj, DEFAULT_BATCH_WORKERS
+from .cached_storage import LRUCache
+from .metrics import registry
+
+# Temp files older than this (seconds) are left over from an interrupted fill;
+# younger ones may belong to a fill in progress in another process
+STALE_TEMP_AGE = 60 * 60
+
+
+@dataclass
+class DiskCacheEntry:
+    """A file cached on local disk."""
+    path: str
+    local_path: str
+    size: int
+    etag: Optional[str] = None
+    # time.monotonic() of the last check against the wrapped storage
+    validated_at: Optional[float] = None
+
+
+class TieredCachedStorage(StorageInterface):
+    """
+    Storage decorator with a memory tier and a local-disk tier.
+
+    Reads are served from memory, then from a size-capped cache directory,
+    and only go to the wrapped (usually remote) storage on a miss. Disk
+    entries are placed atomically (temp file + rename), evicted least
+    recently used first by total bytes, and validated against the remote
+    object's ETag, or its size when no ETag is available.
+
+    A validated entry is trusted for revalidate_after seconds, so a change
+    made to the wrapped storage by another writer is seen at most that
+    long after the entry was last validated (or filled). Writes and
+    deletes through this storage drop the cached copy at once, and entries
+    found on disk at startup are validated on their first read.
+    """
+
+    def __init__(self, storage: StorageInterface, cache_dir: str,
+                 max_disk_bytes: int = 10 * 1024 * 1024 * 1024,
+                 max_object_size: Optional[int] = None,
+                 memory_cache_bytes: int = 64 * 1024 * 1024,
+                 max_memory_object_size: int = 4 * 1024 * 1024,
+                 revalidate_after: float = 30.0):
+        """
+        Initialize tiered cached storage.
+
+        Args:
+            storage: Base storage implementation
+            cache_dir: Local directory for the disk tier
+            max_disk_bytes: Byte budget of the disk tier
+            max_object_size: Files larger than this bypass the disk tier
+            memory_cache_bytes: Byte budget of the memory tier (0 disables it)
+            max_memory_object_size: Files larger than this are only cached on disk
+            revalidate_after: Seconds during which a validated entry is trusted
+                without asking the wrapped storage again, the bound on the
+                staleness of reads (0 = validate every read)
+        """
+        self.storage = storage
+        self.cache_dir = cache_dir
+        self.max_disk_bytes = max_disk_bytes
+        self.max_object_size = max_object_size
+        self.revalidate_after = revalidate_after
+        self.chunk_size = storage.chunk_size
+        self.memory = LRUCache(memory_cache_bytes, max_memory_object_size) if memory_cache_bytes else None
+
+        self.disk_bytes = 0
+        self.memory_hits = 0
+        self.disk_hits = 0
+        self.misses = 0
+        self.stale = 0
+        self.evictions = 0
+
+        self._entries: 'OrderedDict[str, DiskCacheEntry]' = OrderedDict()
+        self._lock = threading.Lock()
+        self._fill_locks: Dict[str, threading.Lock] = {}
+        # Bumped by every _drop() so that fills started before it are discarded
+        self._epoch = 0
+
+        os.makedirs(cache_dir, exist_ok=True)
+        self._load_index()
+        self.metrics_label = registry.register_cache(self)
+
+    def _local_path(self, file_path: str) -> str:
+        """Map a storage path to its file in the cache directory."""
+        digest = hashlib.sha256(file_path.encode('utf-8')).hexdigest()
+        return os.path.join(self.cache_dir, digest[:2], digest)
+
+    def _load_index(self) -> None:
+        """Rebuild the in-memory index from a previous process' cache directory."""
+        found = []
+        for root, _, files in os.walk(self.cache_dir):
+            for name in files:
+                full_path = os.path.join(root, name)
+                if name.endswith('.tmp'):
+                    try:
+                        if time.time() - os.stat(full_path).st_mtime > STALE_TEMP_AGE:
+                            os.remove(full_path)
+                    except OSError:
+                        pass
+                    continue
+                if not name.endswith('.json'):
+                    continue
+
+                local_path = full_path[:-len('.json')]
+                try:
+                    with open(full_path, 'r', encoding='utf-8') as f:
+                        meta = json.load(f)
+                    st = os.stat(local_path)
+                except (OSError, ValueError):
+                    self._remove_files(local_path)
+                    continue
+
+                if st.st_size != meta.get('size'):
+                    self._remove_files(local_path)
+                    continue
+
+                entry = DiskCacheEntry(meta['path'], local_path, meta['size'], meta.get('etag'))
+                found.append((st.st_atime, entry))
+
+        for _, entry in sorted(found, key=lambda item: item[0]):
+            self._entries[entry.path] = entry
+            self.disk_bytes += entry.size
+
+        with self._lock:
+            self._evict_to_budget()
+
+    @staticmethod
+    def _remove_files(local_path: str) -> None:
+        for path in (local_path, local_path + '.json'):
+            try:
+                os.remove(path)
+            except OSError:
+                pass
+
+    def _evict_to_budget(self) -> None:
+        """Evict least recently used disk entries. Must hold self._lock."""
+        while self._entries and self.disk_bytes > self.max_disk_bytes:
+            _, entry = self._entries.popitem(last=False)
+            self.disk_bytes -= entry.size
+            self.evictions += 1
+            self._remove_files(entry.local_path)
+            if self.memory is not None:
+                self.memory.invalidate(entry.path)
+
+    def _drop(self, file_path: str) -> None:
+        """Forget a cached file in both tiers and discard the fills in flight."""
+        with self._lock:
+            self._epoch += 1
+            entry = self._entries.pop(file_path, None)
+            if entry is not None:
+                self.disk_bytes -= entry.size
+                self._remove_files(entry.local_path)
+        if self.memory is not None:
+            self.memory.invalidate(file_path)
+
+    def _is_valid(self, entry: DiskCacheEntry) -> bool:
+        """Check a cached entry against the wrapped storage."""
+        now = time.monotonic()
+        if entry.validated_at is not None and now - entry.validated_at < self.revalidate_after:
+            return True
+
+        remote = self.storage.stat(entry.path)
+        if remote is None:
+            return False
+        if entry.etag and remote.etag:
+            valid = entry.etag == remote.etag
+        else:
+            valid = entry.size == remote.size
+
+        if valid:
+            entry.validated_at = now
+        return valid
+
+    def _serve(self, entry: DiskCacheEntry, memory_epoch: Optional[int]) -> Optional[BinaryIO]:
+        """
+        Open a cached entry, promoting small files to the memory tier.
+
+        Args:
+            entry: Disk entry to serve
+            memory_epoch: Memory tier epoch observed before the entry was
+                looked up, so that a file dropped since isn't promoted
+        """
+        try:
+            f = open(entry.local_path, 'rb')
+        except FileNotFoundError:
+            return None
+
+        if self.memory is not None and entry.size <= self.memory.max_object_size:
+            with f:
+                content = f.read()
+            self.memory.put(entry.path, content, epoch=memory_epoch)
+            return BytesIO(content)
+        return f
+
+    def _fill(self, file_path: str) -> Optional[BinaryIO]:
+        """Download a file from the wrapped storage into the disk tier."""
+        with self._lock:
+            fill_lock = self._fill_locks.setdefault(file_path, threading.Lock())
+
+        with fill_lock:
+            try:
+                # Another thread may have filled the entry while we waited
+                memory_epoch = self.memory.epoch if self.memory is not None else None
+                with self._lock:
+                    entry = self._entries.get(file_path)
+                    epoch = self._epoch
+                if entry is not None:
+                    stream = self._serve(entry, memory_epoch)
+                    if stream is not None:
+                        return stream
+
+                remote = self.storage.stat(file_path)
+                if remote is None:
+                    return None
+                if self.max_object_size is not None and remote.size > self.max_object_size:
+                    return self.storage.open_read(file_path)
+
+                source = self.storage.open_read(file_path)
+                if source is None:
+                    return None
+
+                local_path = self._local_path(file_path)
+                os.makedirs(os.path.dirname(local_path), exist_ok=True)
+                fd, tmp_path = tempfile.mkstemp(dir=os.path.dirname(local_path), suffix='.tmp')
+                size = 0
+                try:
+                    with os.fdopen(fd, 'wb') as tmp:
+                        for chunk in iter_file_obj(source, self.chunk_size):
+                            tmp.write(chunk)
+                            size += len(chunk)
+
+                    meta_fd, meta_tmp = tempfile.mkstemp(dir=os.path.dirname(local_path), suffix='.tmp')
+                    with os.fdopen(meta_fd, 'w', encoding='utf-8') as meta:
+                        json.dump({'path': file_path, 'size': size, 'etag': remote.etag}, meta)
+
+                    entry = DiskCacheEntry(file_path, local_path, size, remote.etag, time.monotonic())
+                    with self._lock:
+                        # A save, open_write or delete since the download
+                        # started: the downloaded bytes may be the old ones
+                        current = epoch == self._epoch
+                        if current:
+                            os.replace(meta_tmp, local_path + '.json')
+                            os.replace(tmp_path, local_path)
+                            previous = self._entries.pop(file_path, None)
+                            if previous is not None:
+                                self.disk_bytes -= previous.size
+                            self._entries[file_path] = entry
+                            self.disk_bytes += size
+                            self._evict_to_budget()
+                    if not current:
+                        os.remove(meta_tmp)
+                except BaseException:
+                    if os.path.exists(tmp_path):
+                        os.remove(tmp_path)
+                    raise
+                finally:
+                    source.close()
+
+                if not current:
+                    os.remove(tmp_path)
+                    return self.storage.open_read(file_path)
+                return self._serve(entry, memory_epoch)
+            finally:
+                with self._lock:
+                    self._fill_locks.pop(file_path, None)
+
+    def stats(self) -> Dict[str, Any]:
+        """Return per-tier hit counters and occupancy."""
+        with self._lock:
+            lookups = self.memory_hits + self.disk_hits + self.misses
+            stats = {
+                'memory_hits': self.memory_hits,
+                'disk_hits': self.disk_hits,
+                'misses': self.misses,
+                'stale': self.stale,
+                'hit_ratio': (self.memory_hits + self.disk_hits) / lookups if lookups else 0.0,
+                'evictions': self.evictions,
+                'disk_entries': len(self._entries),
+                'disk_bytes': self.disk_bytes,
+                'max_disk_bytes': self.max_disk_bytes,
+            }
+        stats['memory'] = self.memory.stats() if self.memory is not None else None
+        return stats
+
+    def get(self, file_path: str) -> Optional[BinaryIO]:
+        """Get file through the memory and disk tiers."""
+        return self.open_read(file_path)
+
+    def open_read(self, file_path: str) -> Optional[BinaryIO]:
+        """Open file for streaming reads, served from the fastest valid tier."""
+        memory_epoch = self.memory.epoch if self.memory is not None else None
+        with self._lock:
+            entry = self._entries.get(file_path)
+            if entry is not None:
+                self._entries.move_to_end(file_path)
+
+        if entry is not None:
+            if self._is_valid(entry):
+                content = self.memory.get(file_path) if self.memory is not None else None
+                if content is not None:
+                    with self._lock:
+                        self.memory_hits += 1
+                    return BytesIO(content)
+
+                stream = self._serve(entry, memory_epoch)
+                if stream is not None:
+                    with self._lock:
+                        self.disk_hits += 1
+                    return stream
+            else:
+                with self._lock:
+                    self.stale += 1
+            self._drop(file_path)
+
+        with self._lock:
+            self.misses += 1
+        return self._fill(file_path)
+
+    def stat(self, file_path: str) -> Optional[FileStat]:
+        """Get file information from the wrapped storage."""
+        return self.storage.stat(file_path)
+
+    def open_write(self, file_path: str) -> StreamWriter:
+        """Open file for streaming writes, dropping any cached copy."""
+        self._drop(file_path)
+        return self.storage.open_write(file_path)
+
+    def save(self, file_obj: BinaryIO, file_path: str) -> str:
+        """Save file to the wrapped storage, dropping any cached copy."""
+        self._drop(file_path)
+        return self.storage.save(file_obj, file_path)
+
+    def delete(self, file_path: str) -> bool:
+        """Delete file from the wrapped storage and both cache tiers."""
+        self._drop(file_path)
+        return self.storage.delete(file_path)
+
+    def delete_many(self, file_paths: Iterable[str],
+                    max_workers: int = DEFAULT_BATCH_WORKERS) -> List[BatchResult]:
+        """Delete files from both cache tiers and, in bulk, from the wrapped storage."""
+        file_paths = list(file_paths)
+        for file_path in file_paths:
+            self._drop(file_path)
+        return self.storage.delete_many(file_paths, max_workers=max_workers)
+
+    def exists(self, file_path: str) -> bool:
+        """Check whether a file exists in the wrapped storage."""
+        return self.storage.exists(file_path)
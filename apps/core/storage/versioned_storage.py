@@ -1,32 +1,546 @@
-# apps/core/storage/validators.py
-from typing import BinaryIO, Optional
+# apps/core/storage/versioned_storage.py
+import bisect
+import hashlib
+import io
+import json
 import os
+import sqlite3
+import threading
+import time
+from collections import Counter, deque
+from concurrent.futures import ThreadPoolExecutor, Future, wait
+from dataclasses import dataclass
+from io import BytesIO
+from typing import BinaryIO, Optional, Dict, Any, Iterator, List, Tuple
 
+import numpy as np
 
-class StorageValidator:
-    """Validator for storage operations."""
+from .base import StorageInterface, FileStat, iter_file_obj
+
+# Bytes hashed by the rolling hash: every byte of the window contributes
+# to the top bits of the hash that decide the chunk boundaries
+WINDOW_SIZE = 32
+
+# Fixed gear table so that boundaries are stable across processes and releases
+GEAR = np.array(
+    [int.from_bytes(hashlib.sha256(bytes([i])).digest()[:8], 'big') for i in range(256)],
+    dtype=np.uint64
+)
+
+
+class ContentDefinedChunker:
+    """
+    Splits streams into content-defined chunks with a gear rolling hash.
+
+    A boundary is placed after every byte where the top bits of the hash
+    of the preceding WINDOW_SIZE bytes are zero, so boundaries move with
+    the content: an edit only changes the chunks around it and the rest of
+    the file splits into the same chunks as before. The hash is computed
+    for a whole block at once with numpy instead of byte by byte.
+    """
+
+    def __init__(self, min_size: int = 2 * 1024, avg_size: int = 8 * 1024,
+                 max_size: int = 64 * 1024, block_size: int = 1024 * 1024):
+        """
+        Initialize the chunker.
+
+        Args:
+            min_size: Minimum chunk size (at least WINDOW_SIZE)
+            avg_size: Target average chunk size, rounded to a power of two
+            max_size: Maximum chunk size
+            block_size: Number of bytes read and hashed at once
+        """
+        if not WINDOW_SIZE <= min_size <= avg_size <= max_size:
+            raise ValueError("Chunk sizes must satisfy WINDOW_SIZE <= min_size <= avg_size <= max_size")
+        self.min_size = min_size
+        self.max_size = max_size
+        self.block_size = block_size
+        bits = max(1, int(avg_size).bit_length() - 1)
+        self.mask = np.uint64(((1 << bits) - 1) << (64 - bits))
+
+    def _candidates(self, data: bytes) -> np.ndarray:
+        """Positions after which the rolling hash allows a boundary."""
+        # hash[i] = sum(GEAR[data[i - k]] << k for k < WINDOW_SIZE), built by
+        # doubling the window: hash_2w[i] = hash_w[i] + (hash_w[i - w] << w)
+        hashes = GEAR[np.frombuffer(data, dtype=np.uint8)]
+        width = 1
+        while width < WINDOW_SIZE:
+            doubled = hashes.copy()
+            doubled[width:] += hashes[:-width] << np.uint64(width)
+            hashes = doubled
+            width *= 2
+        return np.flatnonzero((hashes & self.mask) == 0) + 1
+
+    def _cut(self, data: bytes, final: bool) -> Tuple[List[int], int]:
+        """
+        Find chunk boundaries in data.
+
+        Returns:
+            (chunk end offsets, offset where the undecided tail starts)
+        """
+        candidates = self._candidates(data)
+        cuts = []
+        start = 0
+        while len(data) - start > 0:
+            i = bisect.bisect_left(candidates, start + self.min_size)
+            if i < len(candidates) and candidates[i] - start <= self.max_size:
+                end = int(candidates[i])
+            elif len(data) - start >= self.max_size:
+                end = start + self.max_size
+            elif final:
+                end = len(data)
+            else:
+                break
+            cuts.append(end)
+            start = end
+        return cuts, start
+
+    def chunks(self, stream: BinaryIO) -> Iterator[bytes]:
+        """
+        Split a stream into chunks.
+
+        Args:
+            stream: Stream to read
+
+        Yields:
+            Consecutive chunks covering the whole stream
+        """
+        pending = b''
+        blocks = iter_file_obj(stream, self.block_size)
+        while True:
+            block = next(blocks, None)
+            final = block is None
+            data = pending + (block or b'')
+            cuts, tail = self._cut(data, final)
+            start = 0
+            for end in cuts:
+                yield data[start:end]
+                start = end
+            pending = data[tail:]
+            if final:
+                return
+
+
+@dataclass
+class VersionInfo:
+    """A stored version of a file."""
+    path: str
+    version: int
+    size: int
+    digest: str
+    created_at: float
+    chunk_count: int
+
+
+class VersionIndex:
+    """
+    SQLite index of versions and chunks.
+
+    Every version row holds its manifest (the ordered list of chunk
+    digests and sizes). Every chunk row counts the manifest entries
+    referencing it.
+    """
+
+    def __init__(self, db_path: str):
+        if os.path.dirname(db_path):
+            os.makedirs(os.path.dirname(db_path), exist_ok=True)
+        self._conn = sqlite3.connect(db_path, check_same_thread=False, isolation_level=None)
+        self._conn.execute('PRAGMA journal_mode=WAL')
+        self._conn.execute(
+            'CREATE TABLE IF NOT EXISTS chunks '
+            '(digest TEXT PRIMARY KEY, size INTEGER NOT NULL, refcount INTEGER NOT NULL)'
+        )
+        self._conn.execute(
+            'CREATE TABLE IF NOT EXISTS versions '
+            '(path TEXT NOT NULL, version INTEGER NOT NULL, size INTEGER NOT NULL, digest TEXT NOT NULL, '
+            'created_at REAL NOT NULL, manifest TEXT NOT NULL, PRIMARY KEY (path, version))'
+        )
+        self._lock = threading.Lock()
+
+    def has_chunk(self, digest: str) -> bool:
+        with self._lock:
+            return self._conn.execute('SELECT 1 FROM chunks WHERE digest = ?', (digest,)).fetchone() is not None
 
     @staticmethod
-    def validate_file_obj(file_obj: BinaryIO) -> bool:
-        """Validate file object."""
-        if file_obj is None:
-            return False
+    def _info(row) -> VersionInfo:
+        path, version, size, digest, created_at, manifest = row
+        return VersionInfo(path, version, size, digest, created_at, len(json.loads(manifest)))
+
+    def add_version(self, path: str, size: int, digest: str,
+                    manifest: List[Tuple[str, int]]) -> Tuple[VersionInfo, bool]:
+        """
+        Record a new version unless it is identical to the latest one.
+
+        Returns:
+            (version, whether it was created)
+        """
+        with self._lock:
+            self._conn.execute('BEGIN IMMEDIATE')
+            try:
+                latest = self._conn.execute(
+                    'SELECT path, version, size, digest, created_at, manifest FROM versions '
+                    'WHERE path = ? ORDER BY version DESC LIMIT 1', (path,)
+                ).fetchone()
+                if latest is not None and latest[3] == digest:
+                    self._conn.execute('COMMIT')
+                    return self._info(latest), False
+
+                version = latest[1] + 1 if latest is not None else 1
+                created_at = time.time()
+                self._conn.executemany(
+                    'INSERT INTO chunks (digest, size, refcount) VALUES (?, ?, 1) '
+                    'ON CONFLICT(digest) DO UPDATE SET refcount = refcount + 1', manifest
+                )
+                self._conn.execute(
+                    'INSERT INTO versions (path, version, size, digest, created_at, manifest) VALUES (?, ?, ?, ?, ?, ?)',
+                    (path, version, size, digest, created_at, json.dumps(manifest))
+                )
+                self._conn.execute('COMMIT')
+                return VersionInfo(path, version, size, digest, created_at, len(manifest)), True
+            except BaseException:
+                self._conn.execute('ROLLBACK')
+                raise
+
+    def manifest(self, path: str, version: Optional[int] = None) -> Optional[Tuple[VersionInfo, List[Tuple[str, int]]]]:
+        """Return a version (the latest by default) and its manifest."""
+        query = 'SELECT path, version, size, digest, created_at, manifest FROM versions WHERE path = ?'
+        if version is None:
+            row = self._fetch(query + ' ORDER BY version DESC LIMIT 1', (path,))
+        else:
+            row = self._fetch(query + ' AND version = ?', (path, version))
+        if row is None:
+            return None
+        return self._info(row), [tuple(entry) for entry in json.loads(row[5])]
+
+    def _fetch(self, query: str, params: tuple):
+        with self._lock:
+            return self._conn.execute(query, params).fetchone()
+
+    def list_versions(self, path: str) -> List[VersionInfo]:
+        with self._lock:
+            rows = self._conn.execute(
+                'SELECT path, version, size, digest, created_at, manifest FROM versions '
+                'WHERE path = ? ORDER BY version', (path,)
+            ).fetchall()
+        return [self._info(row) for row in rows]
 
-        # Check if file_obj has required methods
-        for method in ['read', 'seek']:
-            if not hasattr(file_obj, method):
-                return False
+    def remove(self, path: str) -> Tuple[bool, List[str]]:
+        """
+        Remove all versions of a path.
 
+        Returns:
+            (whether the path existed, digests of the chunks no longer referenced)
+        """
+        with self._lock:
+            self._conn.execute('BEGIN IMMEDIATE')
+            try:
+                rows = self._conn.execute('SELECT manifest FROM versions WHERE path = ?', (path,)).fetchall()
+                released = Counter(digest for (manifest,) in rows for digest, _ in json.loads(manifest))
+                self._conn.execute('DELETE FROM versions WHERE path = ?', (path,))
+                self._conn.executemany(
+                    'UPDATE chunks SET refcount = refcount - ? WHERE digest = ?',
+                    [(count, digest) for digest, count in released.items()]
+                )
+                orphans = [
+                    digest for (digest,) in self._conn.execute('SELECT digest FROM chunks WHERE refcount <= 0')
+                ]
+                self._conn.execute('DELETE FROM chunks WHERE refcount <= 0')
+                self._conn.execute('COMMIT')
+                return bool(rows), orphans
+            except BaseException:
+                self._conn.execute('ROLLBACK')
+                raise
+
+    def stats(self) -> Dict[str, int]:
+        with self._lock:
+            versions, logical = self._conn.execute('SELECT COUNT(*), COALESCE(SUM(size), 0) FROM versions').fetchone()
+            chunks, stored = self._conn.execute('SELECT COUNT(*), COALESCE(SUM(size), 0) FROM chunks').fetchone()
+        return {'versions': versions, 'chunks': chunks, 'logical_bytes': logical, 'stored_bytes': stored}
+
+    def close(self) -> None:
+        self._conn.close()
+
+
+class ChunkedVersionReader(io.RawIOBase):
+    """
+    Seekable reader over the chunks of a version.
+
+    The next chunks are fetched in the background while the current one
+    is consumed, so reading any version costs the same number of round
+    trips whatever its age.
+    """
+
+    def __init__(self, storage: 'VersionedStorage', manifest: List[Tuple[str, int]]):
+        super().__init__()
+        self._storage = storage
+        self._manifest = manifest
+        self._offsets = [0]
+        for _, size in manifest:
+            self._offsets.append(self._offsets[-1] + size)
+        self._position = 0
+        self._index = -1
+        self._chunk = b''
+        self._futures: Dict[int, Future] = {}
+
+    def readable(self) -> bool:
         return True
 
-    @staticmethod
-    def validate_file_path(file_path: str) -> bool:
-        """Validate file path."""
-        if not isinstance(file_path, str) or not file_path:
-            return False
+    def seekable(self) -> bool:
+        return True
+
+    def _load(self, index: int) -> bytes:
+        if index != self._index:
+            # Schedule the chunks after this one and drop prefetches that are no longer ahead
+            for ahead in range(index, min(index + self._storage.prefetch + 1, len(self._manifest))):
+                if ahead not in self._futures:
+                    self._futures[ahead] = self._storage.executor.submit(
+                        self._storage.read_chunk, self._manifest[ahead][0]
+                    )
+            for stale in [i for i in self._futures if i < index]:
+                self._futures.pop(stale).cancel()
+            self._chunk = self._futures.pop(index).result()
+            self._index = index
+        return self._chunk
+
+    def readinto(self, buffer) -> int:
+        if self._position >= self._offsets[-1]:
+            return 0
+        index = bisect.bisect_right(self._offsets, self._position) - 1
+        chunk = self._load(index)
+        offset = self._position - self._offsets[index]
+        count = min(len(buffer), len(chunk) - offset)
+        buffer[:count] = chunk[offset:offset + count]
+        self._position += count
+        return count
+
+    def seek(self, offset: int, whence: int = io.SEEK_SET) -> int:
+        if whence == io.SEEK_CUR:
+            offset += self._position
+        elif whence == io.SEEK_END:
+            offset += self._offsets[-1]
+        if offset < 0:
+            raise ValueError("negative seek position")
+        self._position = offset
+        return offset
+
+    def tell(self) -> int:
+        return self._position
+
+    def close(self) -> None:
+        for future in self._futures.values():
+            future.cancel()
+        self._futures.clear()
+        super().close()
+
+
+class VersionedStorage(StorageInterface):
+    """
+    Storage keeping every version of every file with chunk-level dedup.
+
+    Saved files are split into content-defined chunks stored once under
+    their SHA-256 digest in the wrapped storage (chunks/<ab>/<digest>),
+    and every version is recorded as a manifest of chunk digests in a
+    VersionIndex. A revision that only changes part of a file adds the
+    few chunks around the change plus a manifest, so many revisions of a
+    slowly changing dataset cost little more than one copy.
+    """
+
+    def __init__(self, storage: StorageInterface, index_path: str, prefix: str = 'chunks',
+                 min_chunk_size: int = 2 * 1024, avg_chunk_size: int = 8 * 1024,
+                 max_chunk_size: int = 64 * 1024, max_workers: int = 8, prefetch: int = 8,
+                 max_pending_uploads: Optional[int] = None):
+        """
+        Initialize versioned storage.
+
+        Args:
+            storage: Storage holding the chunks
+            index_path: Path to the SQLite version index
+            prefix: Storage prefix of the chunks
+            min_chunk_size: Minimum chunk size
+            avg_chunk_size: Target average chunk size
+            max_chunk_size: Maximum chunk size
+            max_workers: Threads uploading and prefetching chunks
+            prefetch: Number of chunks read ahead of the consumer
+            max_pending_uploads: Chunks of one save queued or uploading at a
+                time (default: twice max_workers); reading the file waits
+                for the oldest upload beyond that, which bounds the memory
+                held by chunks not yet stored
+        """
+        self.storage = storage
+        self.chunk_size = storage.chunk_size
+        self.prefix = prefix
+        self.prefetch = prefetch
+        self.max_pending_uploads = max_pending_uploads or 2 * max_workers
+        self.chunker = ContentDefinedChunker(min_chunk_size, avg_chunk_size, max_chunk_size)
+        self.index = VersionIndex(index_path)
+        self.executor = ThreadPoolExecutor(max_workers=max_workers, thread_name_prefix='versioned-storage')
+        # Chunks referenced by saves in progress are never deleted; those
+        # orphaned meanwhile are re-checked when the last save unpins them
+        self._lock = threading.RLock()
+        self._pinned: Counter = Counter()
+        self._orphaned: set = set()
+        self._uploading: Dict[str, Future] = {}
+
+    def chunk_path(self, digest: str) -> str:
+        """Storage path of the chunk with the given digest."""
+        return f"{self.prefix}/{digest[:2]}/{digest}"
+
+    def _upload_done(self, digest: str) -> None:
+        with self._lock:
+            self._uploading.pop(digest, None)
+
+    def read_chunk(self, digest: str) -> bytes:
+        """Read a whole chunk from the wrapped storage."""
+        stream = self.storage.open_read(self.chunk_path(digest))
+        if stream is None:
+            raise FileNotFoundError(self.chunk_path(digest))
+        try:
+            return stream.read()
+        finally:
+            stream.close()
+
+    def save_version(self, file_obj: BinaryIO, file_path: str) -> VersionInfo:
+        """
+        Save a new version of a file.
+
+        Only chunks that are not in the chunk store yet are uploaded. A
+        file identical to the latest version does not create a new one.
+        If the save fails, the chunks it uploaded are removed again unless
+        another version references them.
+
+        Args:
+            file_obj: File-like object to save
+            file_path: Path of the file
+
+        Returns:
+            The stored version
+        """
+        file_digest = hashlib.sha256()
+        manifest = []
+        uploads = []
+        # Uploads submitted by this save, each holding its chunk until stored
+        pending = deque()
+        size = 0
+        saved = False
+        try:
+            for chunk in self.chunker.chunks(file_obj):
+                digest = hashlib.sha256(chunk).hexdigest()
+                file_digest.update(chunk)
+                size += len(chunk)
+                manifest.append((digest, len(chunk)))
+
+                with self._lock:
+                    self._pinned[digest] += 1
+                    upload = self._uploading.get(digest)
+                    if upload is None and not self.index.has_chunk(digest):
+                        upload = self.executor.submit(self.storage.save, BytesIO(chunk), self.chunk_path(digest))
+                        self._uploading[digest] = upload
+                        upload.add_done_callback(lambda _, digest=digest: self._upload_done(digest))
+                        pending.append(upload)
+                if upload is not None:
+                    # Also waits for uploads of the same chunk started by concurrent saves
+                    uploads.append(upload)
+
+                while len(pending) > self.max_pending_uploads:
+                    pending.popleft().result()
+
+            for upload in uploads:
+                upload.result()
+            info, _ = self.index.add_version(file_path, size, file_digest.hexdigest(), manifest)
+            saved = True
+            return info
+        finally:
+            if not saved:
+                # Nothing may land after the cleanup below
+                wait(uploads)
+            self._unpin([digest for digest, _ in manifest], saved)
+
+    def _unpin(self, digests: List[str], saved: bool) -> None:
+        """
+        Release the chunks of a finished save.
+
+        Chunks no save holds any more are deleted if no version references
+        them: those orphaned by a delete() during the save and, if the save
+        failed, those it uploaded.
+        """
+        with self._lock:
+            self._pinned.subtract(digests)
+            released = {digest for digest in digests if self._pinned[digest] <= 0}
+            self._pinned += Counter()
+            candidates = released if not saved else released & self._orphaned
+            self._orphaned -= released
+            orphans = [self.chunk_path(digest) for digest in candidates if not self.index.has_chunk(digest)]
+            if orphans:
+                self.storage.delete_many(orphans)
+
+    def save(self, file_obj: BinaryIO, file_path: str) -> str:
+        """Save file as a new version."""
+        self.save_version(file_obj, file_path)
+        return file_path
+
+    def list_versions(self, file_path: str) -> List[VersionInfo]:
+        """
+        List the versions of a file.
+
+        Args:
+            file_path: Path of the file
+
+        Returns:
+            Versions, oldest first
+        """
+        return self.index.list_versions(file_path)
+
+    def get(self, file_path: str, version: Optional[int] = None) -> Optional[BinaryIO]:
+        """Get a version of a file (the latest by default)."""
+        return self.open_read(file_path, version)
+
+    def open_read(self, file_path: str, version: Optional[int] = None) -> Optional[BinaryIO]:
+        """
+        Open a version of a file for streaming reads.
+
+        Args:
+            file_path: Path of the file
+            version: Version number (defaults to the latest)
+
+        Returns:
+            Seekable stream or None if the file or version doesn't exist
+        """
+        entry = self.index.manifest(file_path, version)
+        if entry is None:
+            return None
+        _, manifest = entry
+        return io.BufferedReader(ChunkedVersionReader(self, manifest), buffer_size=self.chunk_size)
+
+    def stat(self, file_path: str) -> Optional[FileStat]:
+        """Get information about the latest version; the content digest doubles as ETag."""
+        entry = self.index.manifest(file_path)
+        if entry is None:
+            return None
+        info, _ = entry
+        return FileStat(path=file_path, size=info.size, modified=info.created_at, etag=info.digest)
+
+    def exists(self, file_path: str) -> bool:
+        """Check whether a file has at least one version."""
+        return self.index.manifest(file_path) is not None
+
+    def delete(self, file_path: str) -> bool:
+        """Delete all versions of a file and the chunks only they referenced."""
+        with self._lock:
+            found, orphans = self.index.remove(file_path)
+            # Kept for the saves using them, which re-check them when done
+            self._orphaned.update(digest for digest in orphans if self._pinned[digest] > 0)
+            orphans = [self.chunk_path(digest) for digest in orphans if self._pinned[digest] <= 0]
+            if orphans:
+                self.storage.delete_many(orphans)
+        return found
 
-        # Check for directory traversal attempts
-        if '..' in file_path:
-            return False
+    def stats(self) -> Dict[str, Any]:
+        """Return version and chunk counts with logical and stored byte totals."""
+        stats = self.index.stats()
+        stats['dedup_ratio'] = stats['logical_bytes'] / stats['stored_bytes'] if stats['stored_bytes'] else 0.0
+        return stats
 
-        return True
\ No newline at end of file
+    def close(self) -> None:
+        """Shut down the executor and close the index."""
+        self.executor.shutdown(wait=True)
+        self.index.close()
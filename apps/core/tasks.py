@@ -0,0 +1,50 @@
+# apps/core/tasks.py
+import logging
+from dataclasses import asdict
+from typing import Optional
+
+from celery import shared_task
+
+from apps.core.models import DataFile
+
+logger = logging.getLogger(__name__)
+
+
+@shared_task(bind=True)
+def rotate_encryption_keys(self, stack: str = 'default',
+                           checkpoint_path: Optional[str] = None, batch_size: int = 500):
+    """
+    Re-wrap the data keys of all stored data files with the active master key.
+
+    The files are read through the configured storage stack (the one data
+    files are stored in), whose encrypted layer does the re-wrapping;
+    stored files that are not encrypted are skipped. Progress is reported
+    as the PROGRESS task state after every batch and the job resumes after
+    the last completed data file id, retrying the files that failed, when
+    it is retried with the same checkpoint_path.
+
+    Raises:
+        ValueError: If the stack has no encrypted layer
+    """
+    from apps.core.storage.factory import StorageFactory
+    from apps.core.storage.key_rotation import KeyRotationJob
+
+    storage = StorageFactory.get_shared_storage(stack)
+    while storage is not None and not hasattr(storage, 'rewrap'):
+        storage = getattr(storage, 'storage', None)
+    if storage is None:
+        raise ValueError(f"Storage stack '{stack}' has no encrypted layer, no keys to rotate")
+
+    job = KeyRotationJob(
+        storage,
+        checkpoint_path=checkpoint_path,
+        batch_size=batch_size,
+        progress_callback=lambda progress: self.update_state(state='PROGRESS', meta=asdict(progress))
+    )
+    data_files = DataFile.objects.exclude(file='')
+    last_id = job.resume_after()
+    remaining = data_files.filter(id__gt=last_id) if last_id is not None else data_files
+    file_paths = remaining.order_by('id').values_list('id', 'file')
+
+    progress = job.run(file_paths.iterator(), total=data_files.count())
+    return asdict(progress)
@@ -1,6 +1,8 @@
 from django.urls import path
-from .views import HealthCheckView
+from .views import HealthCheckView, StorageMetricsView
 
 urlpatterns = [
     path('health/', HealthCheckView.as_view(), name='health_check'),
+    path('metrics/storage/', StorageMetricsView.as_view(), name='storage_metrics'),
+    path('metrics/storage/prometheus/', StorageMetricsView.as_view(prometheus=True), name='storage_metrics_prometheus'),
 ]
\ No newline at end of file
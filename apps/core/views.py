@@ -4,7 +4,9 @@ from django.contrib.auth.models import User
 from django.db import connections
 from django.db.utils import OperationalError
 from django.core.cache import cache
+from django.http import HttpResponse
 from .serializers import UserSerializer
+from .storage.metrics import registry as storage_metrics
 
 
 class UserViewSet(viewsets.ModelViewSet):
@@ -47,4 +49,24 @@ class HealthCheckView(views.APIView):
             'status': 'healthy' if is_healthy else 'unhealthy',
             'database': 'connected' if db_healthy else 'disconnected',
             'cache': 'connected' if cache_healthy else 'disconnected',
-        }, status=status.HTTP_200_OK if is_healthy else status.HTTP_503_SERVICE_UNAVAILABLE)
\ No newline at end of file
+        }, status=status.HTTP_200_OK if is_healthy else status.HTTP_503_SERVICE_UNAVAILABLE)
+
+
+class StorageMetricsView(views.APIView):
+    """
+    API endpoint exposing storage latency, throughput, error and cache metrics.
+
+    Returns JSON by default and the Prometheus text format on the
+    /prometheus/ sub-path. The metrics name the storage backends and caches
+    and their error rates, so only staff may read them: scrape with the basic
+    auth credentials of a staff account. Staff requests aren't throttled, as a
+    scraper polls far more often than the user rate allows.
+    """
+    permission_classes = [permissions.IsAdminUser]
+    throttle_classes = []
+    prometheus = False
+
+    def get(self, request, *args, **kwargs):
+        if self.prometheus:
+            return HttpResponse(storage_metrics.prometheus(), content_type='text/plain; version=0.0.4')
+        return Response(storage_metrics.snapshot())
@@ -53,15 +53,59 @@ STORAGE_BACKEND = os.environ.get('STORAGE_BACKEND', 'local')
 STORAGE_OPTIONS = {
     'local': {
         'ROOT_DIR': os.path.join(BASE_DIR, 'media'),
+        # Hash-prefix directory levels above every file (do not change for existing data)
+        'SHARD_DEPTH': int(os.environ.get('STORAGE_LOCAL_SHARD_DEPTH', 0)),
+        # SQLite metadata index serving stat/exists/list (disabled if unset)
+        'INDEX_PATH': os.environ.get('STORAGE_LOCAL_INDEX_PATH'),
     },
     's3': {
         'BUCKET': os.environ.get('S3_BUCKET'),
         'ACCESS_KEY': os.environ.get('S3_ACCESS_KEY'),
         'SECRET_KEY': os.environ.get('S3_SECRET_KEY'),
         'REGION': os.environ.get('S3_REGION', 'us-east-1'),
+        'ENDPOINT_URL': os.environ.get('S3_ENDPOINT_URL'),
+        'PART_SIZE': int(os.environ.get('S3_PART_SIZE', 8 * 1024 * 1024)),
+        'MAX_CONCURRENCY': int(os.environ.get('S3_MAX_CONCURRENCY', 8)),
+        'MAX_POOL_CONNECTIONS': int(os.environ.get('S3_MAX_POOL_CONNECTIONS', 32)),
+    },
+    'encrypted': {
+        # JSON keyring holding the master keys that wrap per-file data keys
+        'KEYRING_PATH': os.environ.get('STORAGE_KEYRING_PATH'),
     }
 }
 
+# Named storage stacks, outermost layer first (e.g. 'encrypted -> cached -> s3').
+# Each stack is built once per process, see StorageFactory.get_shared_storage.
+# DataFile uploads go to 'default', which must keep them as plain files under
+# MEDIA_ROOT (local, unsharded, with only cached/tiered/media layers on top),
+# since processors read DataFile.file.path; see check_data_file_storage.
+STORAGE_STACKS = {
+    'default': {
+        'stack': os.environ.get('STORAGE_STACK', STORAGE_BACKEND),
+        'options': {
+            'local': {
+                'base_dir': STORAGE_OPTIONS['local']['ROOT_DIR'],
+                'shard_depth': STORAGE_OPTIONS['local']['SHARD_DEPTH'],
+                'index_path': STORAGE_OPTIONS['local']['INDEX_PATH'],
+            },
+            'encrypted': {'keyring': STORAGE_OPTIONS['encrypted']['KEYRING_PATH']},
+            'tiered': {
+                'cache_dir': os.path.join(BASE_DIR, 'media', '.storage_cache'),
+                # Seconds a validated cache entry is served without checking the backend
+                'revalidate_after': float(os.environ.get('STORAGE_TIERED_REVALIDATE_AFTER', 30)),
+            },
+        },
+    },
+}
+
+# Spread uploads over 256 subdirectories per dataset (existing files keep their paths)
+UPLOAD_FANOUT = config('UPLOAD_FANOUT', default='False', cast=bool)
+
+# SQLite cache of extracted PDF page text, keyed by file MD5 and page (disabled if unset)
+PDF_PAGE_CACHE_PATH = os.environ.get('PDF_PAGE_CACHE_PATH')
+# Seconds an entry of the PDF page cache is kept (default 30 days)
+PDF_PAGE_CACHE_MAX_AGE = float(os.environ.get('PDF_PAGE_CACHE_MAX_AGE', 30 * 24 * 60 * 60))
+
 # Validate S3 settings if STORAGE_BACKEND is 's3'
 if STORAGE_BACKEND == 's3':
     required_s3_keys = ['BUCKET', 'ACCESS_KEY', 'SECRET_KEY']
@@ -1,50 +1,69 @@
 # fastapi/routers/files.py
-from fastapi import APIRouter, UploadFile, File, Depends, HTTPException
-from typing import List
 import os
+from fastapi import APIRouter, UploadFile, File, Depends, HTTPException
+from fastapi.concurrency import run_in_threadpool
+from typing import Dict, List
 import django
 from django.conf import settings
 from fastapi.responses import JSONResponse
 
 from fastapi.schemas.models import DataFileResponse, DataFileCreate
+from apps.core.storage.async_storage import AsyncStorage
+from apps.core.storage.factory import StorageFactory
+from apps.core.storage.file_management import check_data_file_storage, data_file_path, save_data_file
+from apps.core.storage.hashing import InspectingReader
 
 router = APIRouter(prefix="/files", tags=["files"])
 
+# Upload storage of every process, see get_upload_storage
+_upload_storages: Dict[int, AsyncStorage] = {}
+
+
+def get_upload_storage() -> AsyncStorage:
+    """
+    AsyncStorage over the 'default' stack shared by the requests of this process.
+
+    Uploads are bounded by its semaphore and pool. It is built on first
+    use, so every forked worker builds its own instead of inheriting one
+    built at import time. The configured 'default' stack is rooted at
+    MEDIA_ROOT, where DataFile paths are resolved.
+    """
+    pid = os.getpid()
+    storage = _upload_storages.get(pid)
+    if storage is None:
+        storage = _upload_storages.setdefault(pid, StorageFactory.get_async_storage('default'))
+    return storage
+
 
 @router.post("/", response_model=DataFileResponse)
 async def upload_file(
         file: UploadFile = File(...),
-        dataset_id: int = None
+        dataset_id: int = None,
+        upload_storage: AsyncStorage = Depends(get_upload_storage)
 ):
     try:
-        # Save file to temp location
-        file_path = os.path.join(settings.MEDIA_ROOT, "temp", file.filename)
-        os.makedirs(os.path.dirname(file_path), exist_ok=True)
-
-        with open(file_path, "wb") as f:
-            content = await file.read()
-            f.write(content)
-
         # Use Django ORM to create record
-        from apps.core.models import DataFile, Dataset
+        from apps.core.models import Dataset
 
         # Get dataset or raise exception
         try:
-            dataset = Dataset.objects.get(id=dataset_id)
+            dataset = await run_in_threadpool(Dataset.objects.get, id=dataset_id)
         except Dataset.DoesNotExist:
             raise HTTPException(status_code=404, detail="Dataset not found")
 
+        # Stream the file to its final path chunk by chunk; size, MD5 and
+        # format are computed in the same pass
+        check_data_file_storage(upload_storage)
+        reader = InspectingReader(file.file)
+        file_path = data_file_path(dataset, file.filename)
+        await upload_storage.save(reader, file_path)
+
         # Create DataFile
-        file_type = file.filename.split(".")[-1].lower()
-        data_file = DataFile.objects.create(
-            name=file.filename,
-            file_type=file_type,
-            status="pending",
-            dataset=dataset,
-            file_path=file_path
-        )
+        data_file = await run_in_threadpool(save_data_file, dataset, file.filename, file_path, reader.info())
 
         # Return response
         return DataFileResponse.from_orm(data_file)
+    except HTTPException:
+        raise
     except Exception as e:
-        raise HTTPException(status_code=500, detail=str(e))
\ No newline at end of file
+        raise HTTPException(status_code=500, detail=str(e))
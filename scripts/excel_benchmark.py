@@ -0,0 +1,153 @@
+# scripts/excel_benchmark.py
+"""
+Measure ExcelProcessor runs (validate, extract_metadata, _process_file) on workbooks.
+
+Modes:
+    baseline    the stages each re-read the file with pd.read_excel, once
+                per stage and once per sheet for sheets_info
+    processor   ExcelProcessor.process: one workbook open per run, sheet
+                counts from dimension records, parallel parsing of the
+                other sheets, calamine when installed (--engine picks
+                the pandas engine)
+
+Every mode reports how many workbooks it processed and how many failed,
+so that a fast mode that fails on some files can't pass for a faster one.
+
+Workbooks are copied to a temporary directory first, so the CSV exports
+don't land next to the originals.
+
+Example:
+    python -m scripts.excel_benchmark scraped_data/bnb/organized/excel --repeat 3
+"""
+import argparse
+import glob
+import json
+import os
+import shutil
+import statistics
+import sys
+import tempfile
+import time
+from types import SimpleNamespace
+
+EXTENSIONS = ('.xls', '.xlsx', '.xlsm')
+
+
+class BenchmarkDataFile:
+    """Stand-in for DataFile: the processor only needs the path and save()."""
+
+    def __init__(self, path: str):
+        self.id = path
+        self.file = SimpleNamespace(path=path, name=path)
+        self.status = 'pending'
+        self.metadata = {}
+
+    def save(self, update_fields=None):
+        pass
+
+
+def run_baseline(path: str, engine=None) -> bool:
+    import pandas as pd
+
+    try:
+        # validate
+        if pd.read_excel(path, engine=engine).empty:
+            return False
+        # extract_metadata
+        sheet_names = pd.ExcelFile(path, engine=engine).sheet_names
+        pd.read_excel(path, sheet_name=sheet_names[0], engine=engine)
+        for sheet in sheet_names:
+            pd.read_excel(path, sheet_name=sheet, engine=engine)
+        # _process_file
+        df = pd.read_excel(path, engine=engine)
+        df.to_csv(f"{os.path.splitext(path)[0]}.csv", index=False)
+        df.describe()
+    except Exception:
+        return False
+    return True
+
+
+def run_processor(path: str, engine=None) -> bool:
+    from apps.core.processors.excel_processor import ExcelProcessor
+
+    processor = ExcelProcessor()
+    processor.engine = engine
+    # Workbooks with an empty first sheet fail validation, as in production
+    return processor.process(BenchmarkDataFile(path))
+
+
+MODES = {
+    'baseline': run_baseline,
+    'processor': run_processor,
+}
+
+
+def readable(path: str) -> bool:
+    """Whether pandas can open the workbook here (e.g. .xls needs xlrd or calamine)."""
+    import pandas as pd
+
+    try:
+        pd.ExcelFile(path).close()
+    except Exception:
+        return False
+    return True
+
+
+def measure(mode: str, paths, repeat: int, engine=None) -> dict:
+    timings = []
+    failed = set()
+    for _ in range(repeat):
+        start = time.perf_counter()
+        for path in paths:
+            if not MODES[mode](path, engine):
+                failed.add(path)
+        timings.append(time.perf_counter() - start)
+
+    median = statistics.median(timings)
+    return {
+        'mode': mode,
+        'engine': engine,
+        'files': len(paths),
+        'succeeded': len(paths) - len(failed),
+        'failed': sorted(os.path.basename(path) for path in failed),
+        'repeat': repeat,
+        'seconds': median,
+        'files_per_second': len(paths) / median if median else None,
+    }
+
+
+def main(argv=None) -> int:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('directory', help="Directory of workbooks")
+    parser.add_argument('--repeat', type=int, default=3, help="Runs per mode (the median is reported)")
+    parser.add_argument('--modes', default=','.join(MODES), help="Comma-separated modes")
+    parser.add_argument('--engine', help="pandas engine (default: the processor's, calamine when available)")
+    parser.add_argument('--output', help="Report file (default: stdout)")
+    args = parser.parse_args(argv)
+
+    sources = sorted(path for path in glob.glob(os.path.join(args.directory, '*'))
+                     if path.lower().endswith(EXTENSIONS))
+    work_dir = tempfile.mkdtemp(prefix='excel-benchmark-')
+    try:
+        paths, skipped = [], []
+        for source in sources:
+            path = os.path.join(work_dir, os.path.basename(source))
+            shutil.copyfile(source, path)
+            (paths if readable(path) else skipped).append(path)
+        results = [measure(mode, paths, args.repeat, args.engine) for mode in args.modes.split(',')]
+        if skipped:
+            results.append({'skipped': [os.path.basename(path) for path in skipped]})
+    finally:
+        shutil.rmtree(work_dir)
+
+    output = json.dumps(results, indent=2)
+    if args.output:
+        with open(args.output, 'w', encoding='utf-8') as f:
+            f.write(output)
+    else:
+        print(output)
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
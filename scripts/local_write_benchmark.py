@@ -0,0 +1,82 @@
+# scripts/local_write_benchmark.py
+"""
+Measure small-object write throughput of LocalStorage write modes.
+
+Modes:
+    atomic        temporary file + rename, no fsync
+    durable       temporary file + rename, fsync of every file
+    write_behind  queued writes, batched and fsynced as a group; the
+                  timing includes the final flush() barrier
+
+Example:
+    python -m scripts.local_write_benchmark --sizes 256,1K,4K,16K --count 2000
+"""
+import argparse
+import json
+import os
+import shutil
+import sys
+import tempfile
+import time
+from io import BytesIO
+
+from scripts.storage_benchmark import parse_size
+
+MODES = {
+    'atomic': {},
+    'durable': {'durable': True},
+    'write_behind': {'write_behind': True},
+}
+
+
+def run(mode: str, size: int, count: int, base_dir: str) -> dict:
+    from apps.core.storage.local import LocalStorage
+
+    directory = tempfile.mkdtemp(prefix=f'{mode}-', dir=base_dir)
+    storage = LocalStorage(base_dir=directory, write_behind_max_size=max(size, 1), **MODES[mode])
+    payload = os.urandom(size)
+    try:
+        start = time.perf_counter()
+        for i in range(count):
+            storage.save(BytesIO(payload), f"objects/{i % 100}/{i}.json")
+        storage.flush()
+        elapsed = time.perf_counter() - start
+    finally:
+        storage.close()
+        shutil.rmtree(directory)
+
+    return {
+        'mode': mode,
+        'size': size,
+        'count': count,
+        'seconds': elapsed,
+        'objects_per_second': count / elapsed if elapsed else None,
+    }
+
+
+def main(argv=None) -> int:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--base-dir', help="Directory on the filesystem to measure (default: system temp)")
+    parser.add_argument('--sizes', default='256,1K,4K,16K', help="Comma-separated object sizes")
+    parser.add_argument('--count', type=int, default=2000, help="Objects written per mode and size")
+    parser.add_argument('--modes', default=','.join(MODES), help="Comma-separated modes")
+    parser.add_argument('--output', help="Report file (default: stdout)")
+    args = parser.parse_args(argv)
+
+    results = [
+        run(mode, parse_size(size), args.count, args.base_dir)
+        for size in args.sizes.split(',')
+        for mode in args.modes.split(',')
+    ]
+
+    output = json.dumps(results, indent=2)
+    if args.output:
+        with open(args.output, 'w', encoding='utf-8') as f:
+            f.write(output)
+    else:
+        print(output)
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,98 @@
+# scripts/pdf_table_benchmark.py
+"""
+Measure PDF table extraction throughput in pages per second.
+
+Modes:
+    text     PyPDF2 extract_text of every page (reference, no tables)
+    tables   apps.core.processors.pdf_tables.extract_tables, with the
+             worker counts given by --workers
+
+Example:
+    python -m scripts.pdf_table_benchmark scraped_data/bnb/organized/pdf --workers 1,4
+"""
+import argparse
+import glob
+import json
+import os
+import statistics
+import sys
+import time
+
+
+def run_text(path: str, workers: int) -> int:
+    import PyPDF2
+
+    with open(path, 'rb') as f:
+        for page in PyPDF2.PdfReader(f).pages:
+            page.extract_text()
+    return 0
+
+
+def run_tables(path: str, workers: int) -> int:
+    from apps.core.processors.pdf_tables import extract_tables
+
+    return len(extract_tables(path, max_workers=workers))
+
+
+MODES = {
+    'text': run_text,
+    'tables': run_tables,
+}
+
+
+def page_count(path: str) -> int:
+    import PyPDF2
+
+    with open(path, 'rb') as f:
+        return len(PyPDF2.PdfReader(f).pages)
+
+
+def measure(mode: str, paths, pages: int, workers: int, repeat: int) -> dict:
+    timings = []
+    tables = 0
+    for _ in range(repeat):
+        start = time.perf_counter()
+        tables = sum(MODES[mode](path, workers) for path in paths)
+        timings.append(time.perf_counter() - start)
+
+    median = statistics.median(timings)
+    return {
+        'mode': mode,
+        'workers': workers if mode == 'tables' else 1,
+        'files': len(paths),
+        'pages': pages,
+        'tables': tables,
+        'seconds': median,
+        'pages_per_second': pages / median if median else None,
+    }
+
+
+def main(argv=None) -> int:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('directory', help="Directory of PDF files")
+    parser.add_argument('--workers', default=f"1,{os.cpu_count() or 1}", help="Comma-separated worker counts")
+    parser.add_argument('--repeat', type=int, default=3, help="Runs per mode (the median is reported)")
+    parser.add_argument('--modes', default=','.join(MODES), help="Comma-separated modes")
+    parser.add_argument('--output', help="Report file (default: stdout)")
+    args = parser.parse_args(argv)
+
+    paths = sorted(glob.glob(os.path.join(args.directory, '*.pdf')))
+    pages = sum(page_count(path) for path in paths)
+
+    results = []
+    for mode in args.modes.split(','):
+        worker_counts = sorted({int(workers) for workers in args.workers.split(',')}) if mode == 'tables' else [1]
+        for workers in worker_counts:
+            results.append(measure(mode, paths, pages, workers, args.repeat))
+
+    output = json.dumps(results, indent=2)
+    if args.output:
+        with open(args.output, 'w', encoding='utf-8') as f:
+            f.write(output)
+    else:
+        print(output)
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
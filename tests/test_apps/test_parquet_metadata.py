@@ -0,0 +1,132 @@
+# tests/test_apps/test_parquet_metadata.py
+import io
+import unittest
+import tempfile
+import shutil
+import os
+from unittest import mock
+
+import pandas as pd
+import pyarrow.parquet as pq
+
+from apps.core.processors.parquet_metadata import footer_metadata, sample_rows
+from apps.core.processors.parquet_processor import ParquetProcessor
+from tests.test_apps.test_processors import FakeDataFile
+
+
+class TestParquetFooterMetadata(unittest.TestCase):
+
+    def setUp(self):
+        self.temp_dir = tempfile.mkdtemp()
+        self.path = os.path.join(self.temp_dir, 'data.parquet')
+        self.frame = pd.DataFrame({
+            'id': range(1000),
+            'value': [None if i % 10 == 0 else i * 0.5 for i in range(1000)],
+            'day': pd.date_range('2024-01-01', periods=1000, freq='h'),
+            'name': [f"n{i % 7}" for i in range(1000)],
+        })
+        self.frame.to_parquet(self.path, row_group_size=300)
+
+    def tearDown(self):
+        shutil.rmtree(self.temp_dir)
+
+    def test_footer_metadata(self):
+        with pq.ParquetFile(self.path) as parquet_file:
+            metadata = footer_metadata(parquet_file)
+
+        self.assertEqual(metadata['row_count'], 1000)
+        self.assertEqual(metadata['columns'], ['id', 'value', 'day', 'name'])
+        self.assertEqual(metadata['dtypes'], {col: str(dtype) for col, dtype in self.frame.dtypes.items()})
+        self.assertEqual([rg['num_rows'] for rg in metadata['row_groups']], [300, 300, 300, 100])
+        self.assertEqual(metadata['compressed_size'], sum(rg['compressed_size'] for rg in metadata['row_groups']))
+
+        statistics = metadata['column_statistics']
+        self.assertEqual((statistics['id']['min'], statistics['id']['max']), (0, 999))
+        self.assertEqual(statistics['value']['null_count'], 100)
+        self.assertEqual(statistics['name']['max'], 'n6')
+        self.assertTrue(statistics['day']['min'].startswith('2024-01-01'))
+
+    def test_sample_reads_first_row_group_only(self):
+        with pq.ParquetFile(self.path) as parquet_file:
+            with mock.patch.object(parquet_file, 'iter_batches', wraps=parquet_file.iter_batches) as iter_batches:
+                sample = sample_rows(parquet_file, 5)
+
+        self.assertEqual([row['id'] for row in sample], [0, 1, 2, 3, 4])
+        self.assertEqual(iter_batches.call_args.kwargs['row_groups'], [0])
+
+    def test_processor_does_not_read_row_data(self):
+        processor = ParquetProcessor()
+        datafile = FakeDataFile(self.path)
+
+        with mock.patch.object(pd, 'read_parquet') as read_parquet:
+            self.assertTrue(processor.validate(datafile)['is_valid'])
+            metadata = processor.extract_metadata(datafile)
+
+        read_parquet.assert_not_called()
+        self.assertEqual(metadata['row_count'], 1000)
+        self.assertEqual(len(metadata['sample']), 5)
+
+
+
+class TestParquetProcessorRowGroups(unittest.TestCase):
+
+    def setUp(self):
+        self.temp_dir = tempfile.mkdtemp()
+        self.path = os.path.join(self.temp_dir, 'wide.parquet')
+        self.frame = pd.DataFrame({
+            'a': range(150),
+            'b': [i * 1.5 for i in range(150)],
+            'label': [f"row{i}" for i in range(150)],
+        })
+        self.frame.to_parquet(self.path, row_group_size=40)
+
+    def tearDown(self):
+        shutil.rmtree(self.temp_dir)
+
+    def _process(self, **attributes):
+        processor = ParquetProcessor()
+        processor.skip_duplicates = False
+        for name, value in attributes.items():
+            setattr(processor, name, value)
+        datafile = FakeDataFile(self.path)
+        self.assertTrue(processor.process(datafile))
+        return datafile
+
+    def test_statistics_merged_across_row_groups(self):
+        datafile = self._process(max_workers=2)
+
+        expected = self.frame.describe().to_dict()
+        self.assertEqual(set(datafile.statistics), {'a', 'b'})
+        for column in expected:
+            for key, value in expected[column].items():
+                self.assertAlmostEqual(datafile.statistics[column][key], value, msg=f"{column} {key}")
+
+    def test_statistics_as_describe_for_small_files(self):
+        frame = pd.DataFrame({
+            'value': range(1000),
+            'day': pd.date_range('2024-01-01', periods=1000, freq='h'),
+            'name': [f"n{i % 7}" for i in range(1000)],
+        })
+        frame.to_parquet(self.path, row_group_size=300)
+
+        datafile = self._process(max_workers=1)
+
+        # Datetime columns kept, and quantiles exact beyond the sketch capacity
+        pd.testing.assert_frame_equal(pd.DataFrame(datafile.statistics), pd.DataFrame(frame.describe().to_dict()),
+                                      check_like=True)
+
+    def test_csv_export_streamed_and_optional(self):
+        datafile = self._process(max_workers=1)
+        csv_path = os.path.join(self.temp_dir, 'wide.csv')
+        self.assertEqual(datafile.processed_file, csv_path)
+        expected = pd.read_csv(io.StringIO(self.frame.to_csv(index=False)))
+        pd.testing.assert_frame_equal(pd.read_csv(csv_path), expected)
+
+        os.remove(csv_path)
+        datafile = self._process(max_workers=1, export_csv=False)
+        self.assertFalse(os.path.exists(csv_path))
+        self.assertFalse(hasattr(datafile, 'processed_file'))
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,148 @@
+# tests/test_apps/test_pdf_processor.py
+import unittest
+import tempfile
+import shutil
+import os
+from unittest import mock
+
+from apps.core.processors import pdf_processor
+from apps.core.processors.page_cache import PageTextCache, file_md5
+from apps.core.processors.pdf_processor import PDFProcessor, _segments
+from tests.test_apps.test_processors import FakeDataFile
+
+
+def write_pdf(path, texts):
+    """Write a minimal PDF with one line of Helvetica text per page."""
+    write_pdf_pages(path, [f'BT /F1 12 Tf 72 720 Td ({text}) Tj ET' for text in texts])
+
+
+def write_pdf_pages(path, contents, font=b'<< /Type /Font /Subtype /Type1 /BaseFont /Helvetica >>',
+                    extra_objects=()):
+    """
+    Write a minimal PDF with one page per content stream, font /F1 being Helvetica.
+
+    Another font dictionary can be given, whose references point at
+    extra_objects, numbered from 4.
+    """
+    objects = [
+        b'<< /Type /Catalog /Pages 2 0 R >>',
+        None,  # page tree, written once the page objects are numbered
+        font,
+        *extra_objects,
+    ]
+    kids = []
+    for content in contents:
+        stream = content.encode('latin-1')
+        objects.append(b'<< /Length %d >>\nstream\n%s\nendstream' % (len(stream), stream))
+        objects.append(b'<< /Type /Page /Parent 2 0 R /MediaBox [0 0 612 792] '
+                       b'/Resources << /Font << /F1 3 0 R >> >> /Contents %d 0 R >>' % len(objects))
+        kids.append(b'%d 0 R' % len(objects))
+    objects[1] = b'<< /Type /Pages /Kids [%s] /Count %d >>' % (b' '.join(kids), len(kids))
+
+    content = b'%PDF-1.4\n'
+    offsets = []
+    for number, body in enumerate(objects, 1):
+        offsets.append(len(content))
+        content += b'%d 0 obj\n%s\nendobj\n' % (number, body)
+    xref = len(content)
+    content += b'xref\n0 %d\n0000000000 65535 f \n' % (len(objects) + 1)
+    content += b''.join(b'%010d 00000 n \n' % offset for offset in offsets)
+    content += b'trailer\n<< /Size %d /Root 1 0 R >>\nstartxref\n%d\n%%%%EOF\n' % (len(objects) + 1, xref)
+    with open(path, 'wb') as f:
+        f.write(content)
+
+
+class TestPDFProcessor(unittest.TestCase):
+
+    def setUp(self):
+        self.temp_dir = tempfile.mkdtemp()
+        self.path = os.path.join(self.temp_dir, 'document.pdf')
+        self.texts = [f'Page {i}' for i in range(7)]
+        write_pdf(self.path, self.texts)
+        self.cache = PageTextCache(os.path.join(self.temp_dir, 'pages.sqlite3'))
+        self.processor = PDFProcessor()
+        self.processor.skip_duplicates = False
+        self.processor.page_cache = self.cache
+        self.processor.pages_per_task = 2
+        self.processor.max_workers = 2
+
+    def tearDown(self):
+        self.cache.close()
+        shutil.rmtree(self.temp_dir)
+
+    def test_segments(self):
+        self.assertEqual(_segments(5, set(), 2), [(0, 2, False), (2, 4, False), (4, 5, False)])
+        self.assertEqual(_segments(5, {1, 2}, 4), [(0, 1, False), (1, 3, True), (3, 5, False)])
+        self.assertEqual(_segments(0, set(), 2), [])
+
+    def test_text_written_in_page_order(self):
+        datafile = FakeDataFile(self.path)
+
+        self.assertTrue(self.processor.process(datafile))
+
+        with open(datafile.processed_file, encoding='utf-8') as f:
+            self.assertEqual(f.read().split('\n'), self.texts)
+        self.assertEqual(datafile.metadata['sample_text'], 'Page 0')
+        file_hash = file_md5(self.path)
+        self.assertEqual(self.cache.page_count(file_hash), 7)
+        self.assertEqual(self.cache.get_range(file_hash, 0, 7), dict(enumerate(self.texts)))
+
+    def test_cached_pages_not_extracted_again(self):
+        self.assertTrue(self.processor.process(FakeDataFile(self.path)))
+        datafile = FakeDataFile(self.path)
+
+        with mock.patch.object(pdf_processor, '_extract_pages') as extract_pages, \
+                mock.patch.object(pdf_processor.PyPDF2, 'PdfReader', wraps=pdf_processor.PyPDF2.PdfReader) as reader:
+            self.assertTrue(self.processor.process(datafile))
+
+        extract_pages.assert_not_called()
+        # Only extract_metadata opens the file, for the document info
+        self.assertEqual(reader.call_count, 1)
+        with open(datafile.processed_file, encoding='utf-8') as f:
+            self.assertEqual(f.read().split('\n'), self.texts)
+
+    def test_recorded_hash_does_not_stand_for_the_file(self):
+        file_hash = file_md5(self.path)
+        self.cache.set_page_count(file_hash, 7)
+        # The stored file is no longer the PDF its recorded md5_hash was computed from
+        with open(self.path, 'wb') as f:
+            f.write(b'not a pdf')
+        datafile = FakeDataFile(self.path)
+        datafile.md5_hash = file_hash
+
+        self.assertFalse(self.processor.validate(datafile)['is_valid'])
+
+
+class TestPageTextCache(unittest.TestCase):
+
+    def setUp(self):
+        self.temp_dir = tempfile.mkdtemp()
+        self.cache = PageTextCache(os.path.join(self.temp_dir, 'pages.sqlite3'), max_age=60)
+
+    def tearDown(self):
+        self.cache.close()
+        shutil.rmtree(self.temp_dir)
+
+    def test_expired_entries_pruned(self):
+        with mock.patch('apps.core.processors.page_cache.time.time', return_value=10_000.0):
+            self.cache.put_many('old', 0, ['a', 'b'])
+            self.cache.set_page_count('old', 2)
+        with mock.patch('apps.core.processors.page_cache.time.time', return_value=20_000.0):
+            self.cache.put('new', 0, 'c')
+
+        self.assertEqual(self.cache.cached_pages('old'), set())
+        self.assertIsNone(self.cache.page_count('old'))
+        self.assertEqual(self.cache.get('new', 0), 'c')
+
+    def test_forked_process_opens_its_own_connection(self):
+        self.cache.put('a', 0, 'text')
+        connection = self.cache._conn
+
+        with mock.patch('apps.core.processors.page_cache.os.getpid', return_value=os.getpid() + 1):
+            self.assertEqual(self.cache.get('a', 0), 'text')
+            self.assertIsNot(self.cache._conn, connection)
+        connection.close()
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,134 @@
+# tests/test_apps/test_pdf_tables.py
+import unittest
+import tempfile
+import shutil
+import os
+
+import pandas as pd
+import PyPDF2
+
+from apps.core.processors.pdf_tables import extract_tables, layout_tables, text_runs, typed_table
+from tests.test_apps.test_pdf_processor import write_pdf_pages
+
+ROWS = [
+    ('', '2020', '2021'),
+    ('Exports (million BGN)', '68 323', '86 303'),
+    ('Imports (million BGN)', '65 267', '- 1.5'),
+    ('Terms of trade (%)', '2.0', '.'),
+]
+
+
+def table_page(rows, top=700):
+    """Content stream of a table, each cell placed at its column's left edge."""
+    lines = []
+    for i, row in enumerate(rows):
+        for x, cell in zip((72, 250, 330), row):
+            if cell:
+                lines.append(f'BT /F1 10 Tf 1 0 0 1 {x} {top - 12 * i} Tm ({cell}) Tj ET')
+    return '\n'.join(lines)
+
+
+class TestPDFTables(unittest.TestCase):
+
+    def setUp(self):
+        self.temp_dir = tempfile.mkdtemp()
+        self.path = os.path.join(self.temp_dir, 'tables.pdf')
+        title = 'BT /F1 10 Tf 72 760 Td (Balance of payments) Tj ET'
+        write_pdf_pages(self.path, [title + '\n' + table_page(ROWS), table_page(ROWS[:3])])
+
+    def tearDown(self):
+        shutil.rmtree(self.temp_dir)
+
+    def test_runs_split_at_cell_gaps(self):
+        path = os.path.join(self.temp_dir, 'line.pdf')
+        # Cells of one TJ separated by 4 em, words by a space and a small kerning
+        write_pdf_pages(path, ['BT /F1 10 Tf 72 700 Td [(Gross) -20 ( value) -4000 (105 114) -4000 (8.1)] TJ ET',
+                               'BT /F1 10 Tf 72 600 Td (Second) Tj ET'])
+
+        with open(path, 'rb') as f:
+            runs = text_runs(PyPDF2.PdfReader(f).pages[0])
+
+        self.assertEqual(runs['text'].tolist(), ['Gross value', '105 114', '8.1'])
+        # Helvetica has no width table here: 500/1000 em per glyph, plus the adjustments
+        self.assertEqual(runs['left'].tolist(), [72.0, 72 + 11 * 5 + 0.2 + 40, 72 + 18 * 5 + 0.2 + 80])
+        self.assertTrue((runs['top'] == -700).all())
+
+    def test_fonts_decoded_from_encoding_and_to_unicode(self):
+        cmap = (b'begincmap 1 begincodespacerange <00> <FF> endcodespacerange '
+                b'2 beginbfchar <41> <0416> <42> <00450301> endbfchar '
+                b'1 beginbfrange <30> <32> <0661> endbfrange endcmap')
+        fonts = {
+            'differences': (b'<< /Type /Font /Subtype /Type1 /BaseFont /Helvetica /Encoding '
+                            b'<< /BaseEncoding /WinAnsiEncoding /Differences [65 /uni0416 /minus] >> >>', ()),
+            'to_unicode': (b'<< /Type /Font /Subtype /Type1 /BaseFont /Helvetica /ToUnicode 4 0 R >>',
+                           (b'<< /Length %d >>\nstream\n%s\nendstream' % (len(cmap), cmap),)),
+        }
+        decoded = {}
+        for name, (font, extra_objects) in fonts.items():
+            path = os.path.join(self.temp_dir, f'{name}.pdf')
+            write_pdf_pages(path, ['BT /F1 10 Tf 72 700 Td (AB012\x80) Tj ET'], font=font, extra_objects=extra_objects)
+            with open(path, 'rb') as f:
+                decoded[name] = text_runs(PyPDF2.PdfReader(f).pages[0])['text'].tolist()
+
+        self.assertEqual(decoded['differences'], ['Ж−012€'])
+        self.assertEqual(decoded['to_unicode'], ['ЖE\u0301\u0661\u0662\u0663\x80'])
+
+    def test_repeated_pages_read_once(self):
+        tables = extract_tables(self.path, pages=[1, 1, 0], max_workers=1)
+
+        self.assertEqual([table.attrs['page'] for table in tables], [1, 2])
+
+    def test_layout_grid(self):
+        with open(self.path, 'rb') as f:
+            tables = layout_tables(text_runs(PyPDF2.PdfReader(f).pages[0]))
+
+        self.assertEqual(len(tables), 1)
+        expected = pd.DataFrame([[cell or None for cell in row] for row in ROWS])
+        pd.testing.assert_frame_equal(tables[0].astype(object), expected.astype(object), check_dtype=False)
+
+    def test_layout_tight_cells_and_offset_placeholders(self):
+        # Layout of the BNB macro indicators tables: right-aligned cells of one
+        # TJ less than one em apart, and placeholders set right of their column
+        path = os.path.join(self.temp_dir, 'tight.pdf')
+        write_pdf_pages(path, ['\n'.join([
+            'BT /F1 10 Tf 1 0 0 1 250 700 Tm (2023) Tj 1 0 0 1 300 700 Tm (2024) Tj ET',
+            'BT /F1 10 Tf 1 0 0 1 72 688 Tm (Revenue and grants) Tj 1 0 0 1 245 688 Tm (36.2) Tj '
+            '1 0 0 1 334 688 Tm (.) Tj ET',
+            'BT /F1 10 Tf 1 0 0 1 72 676 Tm (Total) Tj 1 0 0 1 240 676 Tm [(106 185.3) -955 (110 534.4)] TJ ET',
+            'BT /F1 10 Tf 1 0 0 1 72 664 Tm (Tax revenue) Tj 1 0 0 1 245 664 Tm (29.6) Tj '
+            '1 0 0 1 345 664 Tm (.) Tj ET',
+        ])])
+
+        with open(path, 'rb') as f:
+            tables = layout_tables(text_runs(PyPDF2.PdfReader(f).pages[0]))
+
+        self.assertEqual(len(tables), 1)
+        self.assertEqual(tables[0].fillna('').values.tolist(), [
+            ['', '2023', '2024'],
+            ['Revenue and grants', '36.2', '.'],
+            ['Total', '106 185.3', '110 534.4'],
+            ['Tax revenue', '29.6', '.'],
+        ])
+        table = typed_table(tables[0])
+        self.assertEqual(list(table.columns), ['Unnamed: 0', '2023', '2024'])
+        self.assertEqual(table['2023'].tolist(), [36.2, 106185.3, 29.6])
+
+    def test_typed_table(self):
+        grid = pd.DataFrame([[cell or None for cell in row] for row in ROWS])
+
+        table = typed_table(grid)
+
+        self.assertEqual(list(table.columns), ['Unnamed: 0', '2020', '2021'])
+        self.assertEqual(table['2020'].tolist(), [68323.0, 65267.0, 2.0])
+        self.assertEqual(table['2021'].tolist()[:2], [86303.0, -1.5])
+        self.assertTrue(pd.isna(table['2021'].iloc[2]))
+
+    def test_extract_tables_in_page_order(self):
+        tables = extract_tables(self.path, max_workers=2, pages_per_task=1)
+
+        self.assertEqual([table.attrs['page'] for table in tables], [1, 2])
+        self.assertEqual([table.shape for table in tables], [(3, 3), (2, 3)])
+
+
+if __name__ == '__main__':
+    unittest.main()
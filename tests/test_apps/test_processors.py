@@ -0,0 +1,239 @@
+# tests/test_apps/test_processors.py
+import unittest
+import tempfile
+import shutil
+import os
+import re
+import zipfile
+from types import SimpleNamespace
+from unittest import mock
+
+import openpyxl
+import pandas as pd
+
+from apps.core.processors.context import ProcessingContext
+from apps.core.processors.csv_processor import CSVProcessor
+from apps.core.processors.excel_processor import ExcelProcessor
+
+
+class FakeDataFile:
+    """Minimal stand-in for DataFile that records the saved fields."""
+
+    def __init__(self, path):
+        self.id = 1
+        self.file = SimpleNamespace(path=path, name=path)
+        self.status = 'pending'
+        self.metadata = {}
+        self.saved_fields = []
+
+    def save(self, update_fields=None):
+        self.saved_fields.extend(update_fields or [])
+
+
+class TestProcessingContext(unittest.TestCase):
+
+    def test_items_loaded_once_and_closed_on_release(self):
+        closable = mock.Mock()
+        loader = mock.Mock(return_value=closable)
+
+        with ProcessingContext(FakeDataFile('x')) as context:
+            self.assertIs(context.get('item', loader), closable)
+            self.assertIs(context.get('item', loader), closable)
+            self.assertIn('item', context)
+
+        loader.assert_called_once_with()
+        closable.close.assert_called_once_with()
+        self.assertNotIn('item', context)
+
+
+class TestProcessorsParseOnce(unittest.TestCase):
+
+    def setUp(self):
+        self.temp_dir = tempfile.mkdtemp()
+        self.frame = pd.DataFrame({'a': range(10), 'b': [x * 0.5 for x in range(10)]})
+
+    def tearDown(self):
+        shutil.rmtree(self.temp_dir)
+
+    def test_csv_read_once_per_run(self):
+        path = os.path.join(self.temp_dir, 'data.csv')
+        self.frame.to_csv(path, index=False)
+        processor = CSVProcessor()
+        processor.skip_duplicates = False
+        datafile = FakeDataFile(path)
+
+        with mock.patch.object(pd, 'read_csv', wraps=pd.read_csv) as read_csv:
+            self.assertTrue(processor.process(datafile))
+
+        self.assertEqual(read_csv.call_count, 1)
+        self.assertEqual(datafile.status, 'processed')
+        self.assertEqual(datafile.metadata['row_count'], 10)
+
+    def test_excel_sheets_parsed_once_per_run(self):
+        path = os.path.join(self.temp_dir, 'book.xlsx')
+        with pd.ExcelWriter(path) as writer:
+            self.frame.to_excel(writer, sheet_name='first', index=False)
+            self.frame.head(3).to_excel(writer, sheet_name='second', index=False)
+        processor = ExcelProcessor()
+        processor.skip_duplicates = False
+        datafile = FakeDataFile(path)
+
+        with mock.patch.object(pd.ExcelFile, 'parse', autospec=True, side_effect=pd.ExcelFile.parse) as parse:
+            self.assertTrue(processor.process(datafile))
+
+        # The second sheet is counted from its dimension record, not parsed
+        self.assertEqual([call.args[1] for call in parse.call_args_list], ['first'])
+        self.assertEqual(datafile.metadata['sheets_info']['second'], {'row_count': 3, 'column_count': 2})
+
+    def test_excel_sheets_without_dimensions_parsed(self):
+        path = os.path.join(self.temp_dir, 'book.xlsx')
+        with pd.ExcelWriter(path) as writer:
+            for i in range(3):
+                self.frame.head(i + 2).to_excel(writer, sheet_name=f'sheet{i}', index=False)
+        processor = ExcelProcessor()
+        processor.use_dimensions = False
+        processor.max_workers = 1
+
+        metadata = processor.extract_metadata(FakeDataFile(path))
+
+        self.assertEqual({sheet: info['row_count'] for sheet, info in metadata['sheets_info'].items()},
+                         {'sheet0': 2, 'sheet1': 3, 'sheet2': 4})
+
+    def test_excel_large_sheet_streamed(self):
+        path = os.path.join(self.temp_dir, 'book.xlsx')
+        self.frame.to_excel(path, sheet_name='data', index=False)
+        processor = ExcelProcessor()
+        processor.skip_duplicates = False
+        processor.streaming_cells = 1
+        processor.chunk_rows = 3
+        datafile = FakeDataFile(path)
+
+        with mock.patch.object(pd.ExcelFile, 'parse') as parse:
+            self.assertTrue(processor.process(datafile))
+
+        parse.assert_not_called()
+        self.assertEqual(datafile.status, 'processed')
+        self.assertEqual(datafile.metadata['row_count'], 10)
+        self.assertEqual(datafile.metadata['columns'], ['a', 'b'])
+        self.assertEqual(datafile.statistics['b']['mean'], self.frame['b'].mean())
+        pd.testing.assert_frame_equal(pd.read_csv(datafile.processed_file), self.frame)
+
+    def test_excel_streamed_validation_writes_nothing(self):
+        path = os.path.join(self.temp_dir, 'book.xlsx')
+        self.frame.to_excel(path, sheet_name='data', index=False)
+        processor = ExcelProcessor()
+        processor.streaming_cells = 1
+
+        self.assertTrue(processor.validate(FakeDataFile(path))['is_valid'])
+        self.assertEqual(processor.extract_metadata(FakeDataFile(path))['row_count'], 10)
+
+        self.assertEqual(os.listdir(self.temp_dir), ['book.xlsx'])
+
+    def test_excel_streamed_columns_as_read_excel(self):
+        path = os.path.join(self.temp_dir, 'book.xlsx')
+        workbook = openpyxl.Workbook()
+        for row in [['a', 'a', None, 'a.1'], [1, 2, 3, 4], [], [5, 6, 7, 8, 9]]:
+            workbook.active.append(row)
+        workbook.save(path)
+        processor = ExcelProcessor()
+        processor.streaming_cells = 1
+        processor.chunk_rows = 2
+
+        metadata = processor.extract_metadata(FakeDataFile(path))
+
+        expected = pd.read_excel(path)
+        self.assertEqual(metadata['columns'], list(expected.columns))
+        self.assertEqual(metadata['row_count'], len(expected))
+
+    def test_excel_a1_dimension_record_ignored(self):
+        path = os.path.join(self.temp_dir, 'book.xlsx')
+        with pd.ExcelWriter(path) as writer:
+            self.frame.to_excel(writer, sheet_name='first', index=False)
+            self.frame.to_excel(writer, sheet_name='second', index=False)
+        # Some writers record "A1" whatever the sheet holds
+        with zipfile.ZipFile(path) as source:
+            entries = {name: source.read(name) for name in source.namelist()}
+        entries['xl/worksheets/sheet2.xml'] = re.sub(rb'<dimension ref="[^"]*"', b'<dimension ref="A1"',
+                                                     entries['xl/worksheets/sheet2.xml'])
+        with zipfile.ZipFile(path, 'w') as target:
+            for name, data in entries.items():
+                target.writestr(name, data)
+
+        metadata = ExcelProcessor().extract_metadata(FakeDataFile(path))
+
+        self.assertEqual(metadata['sheets_info']['second'], {'row_count': 10, 'column_count': 2})
+
+    def test_stage_called_on_its_own(self):
+        path = os.path.join(self.temp_dir, 'data.csv')
+        self.frame.to_csv(path, index=False)
+
+        result = CSVProcessor().validate(FakeDataFile(path))
+        self.assertTrue(result['is_valid'])
+
+
+class TestDuplicateReuse(unittest.TestCase):
+
+    def setUp(self):
+        self.temp_dir = tempfile.mkdtemp()
+        self.path = os.path.join(self.temp_dir, 'data.csv')
+        pd.DataFrame({'a': range(10)}).to_csv(self.path, index=False)
+        self.objects = mock.MagicMock()
+        self.candidates = self.objects.filter.return_value.exclude.return_value
+        self.duplicate = SimpleNamespace(pk=7, id=7, metadata={'row_count': 10})
+        self.candidates.filter.return_value.order_by.return_value.first.return_value = self.duplicate
+
+    def tearDown(self):
+        shutil.rmtree(self.temp_dir)
+
+    def _datafile(self, md5_hash='abc'):
+        datafile_class = type('DataFile', (FakeDataFile,), {'objects': self.objects})
+        datafile = datafile_class(self.path)
+        datafile.pk, datafile.file_type, datafile.size_bytes, datafile.md5_hash = 1, 'csv', 20, md5_hash
+        return datafile
+
+    def _processor(self):
+        processor = CSVProcessor()
+        processor.skip_duplicates = True
+        return processor
+
+    def test_duplicates_processed_by_default(self):
+        datafile = self._datafile()
+
+        self.assertTrue(CSVProcessor().process(datafile))
+
+        self.objects.filter.assert_not_called()
+        self.assertNotIn('duplicate_of', datafile.metadata)
+
+    def test_duplicate_of_same_processor_version_reused(self):
+        datafile = self._datafile()
+
+        with mock.patch.object(CSVProcessor, 'extract_metadata') as extract_metadata:
+            self.assertTrue(self._processor().process(datafile))
+
+        extract_metadata.assert_not_called()
+        self.assertEqual(datafile.metadata, {'row_count': 10, 'duplicate_of': 7})
+        self.assertEqual(self.objects.filter.call_args.kwargs['metadata__processor__version'],
+                         CSVProcessor.processor_version)
+
+    def test_not_hashed_without_candidate_of_same_size(self):
+        self.candidates.exists.return_value = False
+        # The fake file can't be opened: hashing it would fail the run
+        datafile = self._datafile(md5_hash=None)
+
+        self.assertTrue(self._processor().process(datafile))
+
+        self.assertIsNone(datafile.md5_hash)
+        self.assertEqual(datafile.metadata['processor'], {'name': 'CSVProcessor', 'version': 1})
+
+    def test_forced_run_processes_duplicate(self):
+        datafile = self._datafile()
+
+        self.assertTrue(self._processor().process(datafile, force=True))
+
+        self.objects.filter.assert_not_called()
+        self.assertEqual(datafile.metadata['row_count'], 10)
+        self.assertNotIn('duplicate_of', datafile.metadata)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,113 @@
+# tests/test_apps/test_streaming_stats.py
+import unittest
+import tempfile
+import shutil
+import os
+from unittest import mock
+
+import numpy as np
+import pandas as pd
+
+from apps.core.processors.csv_processor import CSVProcessor
+from apps.core.processors.streaming_stats import KLLSketch, StreamingStatistics
+from tests.test_apps.test_processors import FakeDataFile
+
+
+class TestStreamingStatistics(unittest.TestCase):
+
+    def setUp(self):
+        rng = np.random.default_rng(7)
+        self.frame = pd.DataFrame({
+            'value': rng.normal(100, 15, 150),
+            'count': rng.integers(0, 50, 150),
+            'label': ['x'] * 150,
+        })
+        self.frame.loc[::10, 'value'] = np.nan
+
+    def _streamed(self, frame, chunk_rows=13):
+        statistics = StreamingStatistics()
+        for start in range(0, len(frame), chunk_rows):
+            statistics.update(frame.iloc[start:start + chunk_rows])
+        return statistics
+
+    def assertDescribeEqual(self, actual, expected):
+        self.assertEqual(set(actual), set(expected))
+        for column in expected:
+            for key, value in expected[column].items():
+                self.assertAlmostEqual(actual[column][key], value, places=6, msg=f"{column} {key}")
+
+    def test_matches_describe(self):
+        statistics = self._streamed(self.frame)
+
+        self.assertDescribeEqual(statistics.describe(), self.frame.describe().to_dict())
+        metadata = statistics.metadata()
+        self.assertEqual(metadata['null_counts'], {'value': 15, 'count': 0, 'label': 0})
+        self.assertEqual(metadata['row_count'], 150)
+        self.assertEqual(metadata['columns'], ['value', 'count', 'label'])
+        self.assertEqual(len(metadata['sample']), 5)
+
+    def test_merge_of_parts(self):
+        merged = self._streamed(self.frame.iloc[:70])
+        merged.merge(self._streamed(self.frame.iloc[70:]))
+
+        self.assertDescribeEqual(merged.describe(), self.frame.describe().to_dict())
+        self.assertEqual(merged.row_count, 150)
+
+    def test_column_turning_non_numeric(self):
+        statistics = StreamingStatistics()
+        statistics.update(pd.DataFrame({'a': [1, 2]}))
+        statistics.update(pd.DataFrame({'a': ['x', 'y']}))
+        self.assertEqual(statistics.describe(), {})
+
+    def test_null_counts_of_all_columns(self):
+        statistics = StreamingStatistics()
+        statistics.update(pd.DataFrame({'a': [1, None], 'b': ['x', None]}))
+        statistics.update(pd.DataFrame({'a': ['y', None], 'b': ['z', 'w'], 'c': [None, 3]}))
+        later = StreamingStatistics()
+        later.update(pd.DataFrame({'a': [None]}))
+        statistics.merge(later)
+
+        # Columns missing from a chunk count as null in its rows
+        self.assertEqual(statistics.null_counts(), {'a': 3, 'b': 2, 'c': 4})
+
+    def test_sketch_rank_error(self):
+        values = np.random.default_rng(3).random(200_000)
+        sketch = KLLSketch(k=200)
+        for start in range(0, len(values), 10_000):
+            sketch.update(values[start:start + 10_000])
+
+        self.assertLess(sum(len(level) for level in sketch.levels), 2000)
+        for q in (0.25, 0.5, 0.75):
+            self.assertAlmostEqual(sketch.quantile(q), q, delta=0.02)
+
+
+class TestCSVProcessorStreaming(unittest.TestCase):
+
+    def setUp(self):
+        self.temp_dir = tempfile.mkdtemp()
+        self.path = os.path.join(self.temp_dir, 'large.csv')
+        self.frame = pd.DataFrame({'a': range(100), 'b': [x / 3 for x in range(100)]})
+        self.frame.to_csv(self.path, index=False)
+
+    def tearDown(self):
+        shutil.rmtree(self.temp_dir)
+
+    def test_streaming_mode_above_threshold(self):
+        processor = CSVProcessor()
+        processor.skip_duplicates = False
+        processor.streaming_threshold = 0
+        processor.chunk_rows = 7
+        datafile = FakeDataFile(self.path)
+
+        with mock.patch.object(pd, 'read_csv', wraps=pd.read_csv) as read_csv:
+            self.assertTrue(processor.process(datafile))
+
+        self.assertEqual(read_csv.call_count, 1)
+        self.assertEqual(read_csv.call_args.kwargs['chunksize'], 7)
+        self.assertEqual(datafile.metadata['row_count'], 100)
+        self.assertAlmostEqual(datafile.statistics['b']['std'], self.frame['b'].std())
+        self.assertAlmostEqual(datafile.statistics['a']['50%'], self.frame['a'].median())
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,62 @@
+# tests/test_storage/test_async_storage.py
+import asyncio
+import os
+import shutil
+import tempfile
+import unittest
+from io import BytesIO
+
+from apps.core.storage.local import LocalStorage
+from apps.core.storage.async_storage import AsyncStorage
+
+
+class TestAsyncStorage(unittest.IsolatedAsyncioTestCase):
+
+    def setUp(self):
+        self.temp_dir = tempfile.mkdtemp()
+        self.storage = AsyncStorage(LocalStorage(base_dir=self.temp_dir, chunk_size=4), prefetch=2)
+
+    def tearDown(self):
+        self.storage.close()
+        shutil.rmtree(self.temp_dir)
+
+    async def test_save_and_iter_chunks(self):
+        async def upload():
+            for part in (b"0123", b"4567", b"89"):
+                yield part
+
+        await self.storage.save(upload(), "upload.bin")
+        chunks = [chunk async for chunk in self.storage.iter_chunks("upload.bin")]
+        self.assertEqual(chunks, [b"0123", b"4567", b"89"])
+
+        await self.storage.save(BytesIO(b"from a file"), "sync.bin")
+        self.assertEqual(await self.storage.read("sync.bin"), b"from a file")
+
+    async def test_missing_file(self):
+        self.assertIsNone(await self.storage.read("missing.bin"))
+        with self.assertRaises(FileNotFoundError):
+            async for _ in self.storage.iter_chunks("missing.bin"):
+                pass
+
+    async def test_cancelled_upload_removes_partial_file(self):
+        started = asyncio.Event()
+
+        async def slow_upload():
+            yield b"first chunk"
+            started.set()
+            await asyncio.sleep(10)
+            yield b"never written"
+
+        task = asyncio.create_task(self.storage.save(slow_upload(), "partial.bin"))
+        await started.wait()
+        task.cancel()
+        with self.assertRaises(asyncio.CancelledError):
+            await task
+
+        self.assertFalse(os.path.exists(os.path.join(self.temp_dir, "partial.bin")))
+
+    async def test_concurrent_transfers(self):
+        paths = [f"concurrent/{i}.bin" for i in range(20)]
+        await asyncio.gather(*(self.storage.save(path.encode(), path) for path in paths))
+        contents = await asyncio.gather(*(self.storage.read(path) for path in paths))
+        self.assertEqual(contents, [path.encode() for path in paths])
@@ -0,0 +1,66 @@
+# tests/test_storage/test_batch_operations.py
+import unittest
+import tempfile
+import shutil
+from io import BytesIO
+
+import boto3
+from moto import mock_aws
+
+from apps.core.storage.local import LocalStorage
+from apps.core.storage.cached_storage import CachedStorage
+from apps.core.storage.s3 import S3Storage
+
+
+class TestLocalBatchOperations(unittest.TestCase):
+
+    def setUp(self):
+        self.temp_dir = tempfile.mkdtemp()
+        self.storage = CachedStorage(LocalStorage(base_dir=self.temp_dir))
+        self.paths = [f"dataset/{i}.csv" for i in range(20)]
+
+    def tearDown(self):
+        shutil.rmtree(self.temp_dir)
+
+    def test_save_get_delete_many(self):
+        results = self.storage.save_many((BytesIO(path.encode()), path) for path in self.paths)
+        self.assertTrue(all(result.success for result in results))
+        self.assertEqual([result.path for result in results], self.paths)
+
+        results = self.storage.get_many(self.paths + ["dataset/missing.csv"])
+        self.assertEqual([result.value.read() for result in results[:-1]], [path.encode() for path in self.paths])
+        self.assertFalse(results[-1].success)
+
+        results = self.storage.delete_many(self.paths[:10])
+        self.assertTrue(all(result.success for result in results))
+
+        results = self.storage.exists_many(self.paths)
+        self.assertEqual([result.value for result in results], [False] * 10 + [True] * 10)
+
+    def test_errors_are_reported_per_item(self):
+        class Unreadable:
+            def read(self, size=-1):
+                raise IOError("broken upload")
+
+        results = self.storage.save_many([(BytesIO(b"ok"), "ok.txt"), (Unreadable(), "broken.txt")])
+        self.assertTrue(results[0].success)
+        self.assertFalse(results[1].success)
+        self.assertIn("broken upload", results[1].error)
+
+
+@mock_aws
+class TestS3BatchOperations(unittest.TestCase):
+
+    def test_delete_many_uses_bulk_requests(self):
+        client = boto3.client('s3', region_name='us-east-1')
+        client.create_bucket(Bucket='test-bucket')
+        storage = S3Storage(bucket='test-bucket', client=client)
+
+        keys = [f"dataset/{i}.csv" for i in range(1500)]
+        for key in keys:
+            client.put_object(Bucket='test-bucket', Key=key, Body=b"x")
+
+        results = storage.delete_many(keys)
+        self.assertEqual(len(results), 1500)
+        self.assertTrue(all(result.success for result in results))
+        self.assertFalse(any(result.value for result in storage.exists_many(keys[:10])))
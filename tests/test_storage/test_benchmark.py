@@ -0,0 +1,62 @@
+# tests/test_storage/test_benchmark.py
+import unittest
+import zlib
+import tempfile
+import shutil
+import os
+import json
+from apps.core.storage.local import LocalStorage
+from apps.core.storage.cached_storage import CachedStorage
+from apps.core.storage.health import StorageHealthCheck, PayloadReader
+
+
+class TestStorageBenchmark(unittest.TestCase):
+
+    def setUp(self):
+        self.temp_dir = tempfile.mkdtemp()
+        self.storage = CachedStorage(LocalStorage(base_dir=self.temp_dir))
+
+    def tearDown(self):
+        shutil.rmtree(self.temp_dir)
+
+    def test_report(self):
+        report = StorageHealthCheck(self.storage).benchmark(
+            sizes=[4096, 100000], concurrency=4, bytes_per_size=400000, min_objects=3
+        )
+
+        self.assertEqual(report['storage'], 'CachedStorage -> LocalStorage')
+        self.assertEqual(len(report['transfers']), 8)
+        write = report['transfers'][0]
+        self.assertEqual((write['operation'], write['mode'], write['size'], write['count']),
+                         ('write', 'sequential', 4096, 97))
+        for transfer in report['transfers']:
+            self.assertGreater(transfer['throughput_mb_per_second'], 0)
+            self.assertLessEqual(transfer['latency']['p50'], transfer['latency']['p99'])
+
+        metadata = report['metadata']
+        self.assertEqual(metadata['stat']['count'], 2 * 97 + 2 * 4)
+        self.assertIn('skipped', metadata['list'])
+        self.assertEqual(metadata['delete']['count'] + metadata['delete_many']['count'], 2 * 97 + 2 * 4)
+
+        # Machine-readable and nothing left behind
+        json.dumps(report)
+        self.assertEqual([name for _, _, files in os.walk(self.temp_dir) for name in files], [])
+
+    def test_payload_reader(self):
+        payload = PayloadReader(10 * 1024 * 1024 + 3, seed=1)
+        data = b''.join(iter(lambda: payload.read(1024 * 1024), b''))
+
+        self.assertEqual(len(data), 10 * 1024 * 1024 + 3)
+        self.assertNotEqual(PayloadReader(64, seed=1).read(), PayloadReader(64, seed=2).read())
+        self.assertEqual(PayloadReader(64, seed=1).read(), PayloadReader(64, seed=1).read())
+
+    def test_payloads_share_no_content(self):
+        first, second = PayloadReader(1024 * 1024).read(), PayloadReader(2 * 1024 * 1024).read()
+
+        # Neither repeated across objects nor compressible
+        self.assertNotIn(first[:4096], second)
+        self.assertGreater(len(zlib.compress(first + second)), len(first + second))
+
+
+if __name__ == '__main__':
+    unittest.main()
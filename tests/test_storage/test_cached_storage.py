@@ -0,0 +1,66 @@
+# tests/test_storage/test_cached_storage.py
+import unittest
+import tempfile
+import shutil
+import time
+from io import BytesIO
+from apps.core.storage.local import LocalStorage
+from apps.core.storage.cached_storage import CachedStorage, LRUCache
+
+
+class TestLRUCache(unittest.TestCase):
+
+    def test_evicts_least_recently_used_by_bytes(self):
+        cache = LRUCache(max_bytes=10)
+        cache.put("a", b"aaaa")
+        cache.put("b", b"bbbb")
+        self.assertEqual(cache.get("a"), b"aaaa")
+
+        # "b" is now the least recently used entry
+        cache.put("c", b"cccc")
+        self.assertIsNone(cache.peek("b"))
+        self.assertEqual(cache.peek("a"), b"aaaa")
+        self.assertEqual(cache.current_bytes, 8)
+        self.assertEqual(cache.stats()['evictions'], 1)
+
+    def test_rejects_objects_over_max_object_size(self):
+        cache = LRUCache(max_bytes=100, max_object_size=4)
+        self.assertFalse(cache.put("big", b"12345"))
+        self.assertEqual(len(cache), 0)
+
+    def test_ttl_expiry(self):
+        cache = LRUCache(max_bytes=100, ttl=0.01)
+        cache.put("a", b"data")
+        time.sleep(0.02)
+        self.assertIsNone(cache.get("a"))
+        self.assertEqual(cache.stats()['expirations'], 1)
+        self.assertEqual(cache.current_bytes, 0)
+
+    def test_stale_fill_is_dropped(self):
+        cache = LRUCache(max_bytes=100)
+        epoch = cache.epoch
+        cache.invalidate("a")
+        self.assertFalse(cache.put("a", b"stale", epoch=epoch))
+
+
+class TestCachedStorage(unittest.TestCase):
+
+    def setUp(self):
+        self.temp_dir = tempfile.mkdtemp()
+        self.storage = CachedStorage(LocalStorage(base_dir=self.temp_dir), max_bytes=1024)
+
+    def tearDown(self):
+        shutil.rmtree(self.temp_dir)
+
+    def test_hit_and_miss_counters(self):
+        self.storage.save(BytesIO(b"content"), "file.txt")
+        self.storage.delete("file.txt")
+        self.assertIsNone(self.storage.get("file.txt"))
+
+        self.storage.save(BytesIO(b"content"), "file.txt")
+        self.assertEqual(self.storage.get("file.txt").read(), b"content")
+
+        stats = self.storage.stats()
+        self.assertEqual(stats['hits'], 1)
+        self.assertEqual(stats['misses'], 1)
+        self.assertEqual(stats['bytes'], len(b"content"))
@@ -0,0 +1,96 @@
+# tests/test_storage/test_compressed_storage.py
+import unittest
+import tempfile
+import shutil
+import os
+from io import BytesIO
+from apps.core.storage.local import LocalStorage
+from apps.core.storage.compressed_storage import CompressedStorage, CODECS, MAGIC, HEADER_SIZE
+from apps.core.storage.file_types import detect_format
+
+
+class TestCompressedStorage(unittest.TestCase):
+
+    def setUp(self):
+        self.temp_dir = tempfile.mkdtemp()
+        self.base = LocalStorage(base_dir=self.temp_dir, chunk_size=100)
+        self.storage = CompressedStorage(self.base, codec='zlib', min_size=64)
+        self.content = b"date,value\n" + b"".join(b"2023-01-%02d,%d\n" % (i % 28 + 1, i) for i in range(2000))
+
+    def tearDown(self):
+        shutil.rmtree(self.temp_dir)
+
+    def _raw(self, path):
+        with open(os.path.join(self.temp_dir, path), 'rb') as f:
+            return f.read()
+
+    def test_roundtrip_all_codecs(self):
+        for name in CODECS:
+            storage = CompressedStorage(self.base, codec=name)
+            path = f"data_{name}.csv"
+            storage.save(BytesIO(self.content), path)
+
+            raw = self._raw(path)
+            self.assertTrue(raw.startswith(MAGIC))
+            self.assertLess(len(raw), len(self.content) // 2)
+            # Reads do not depend on the reader's configured codec
+            self.assertEqual(self.storage.get(path).read(), self.content)
+            self.assertEqual(self.storage.stat(path).size, len(self.content))
+
+    def test_open_write_streams(self):
+        with self.storage.open_write("streamed.csv") as writer:
+            for start in range(0, len(self.content), 7):
+                writer.write(self.content[start:start + 7])
+
+        self.assertTrue(writer.compressed)
+        self.assertEqual(self.storage.get("streamed.csv").read(), self.content)
+
+    def test_skips_compressed_formats(self):
+        for prefix in (b'PK\x03\x04', b'PAR1', b'%PDF-1.7', b'\x89PNG\r\n\x1a\n'):
+            content = prefix + self.content
+            path = f"{detect_format(prefix)}.bin"
+            self.storage.save(BytesIO(content), path)
+
+            self.assertEqual(self._raw(path), content)
+            self.assertEqual(self.storage.get(path).read(), content)
+            self.assertEqual(self.storage.read_range(path, 100, 50), content[100:150])
+
+    def test_small_files_stored_raw(self):
+        self.storage.save(BytesIO(b"tiny"), "tiny.txt")
+        self.assertEqual(self._raw("tiny.txt"), b"tiny")
+        self.assertEqual(self.storage.get("tiny.txt").read(), b"tiny")
+        self.assertEqual(self.storage.stat("tiny.txt").size, 4)
+
+    def test_raw_file_starting_with_magic(self):
+        content = MAGIC + b"\x01not compressed"
+        self.storage.save(BytesIO(content), "magic.bin")
+
+        self.assertEqual(self._raw("magic.bin")[HEADER_SIZE:], content)
+        self.assertEqual(self.storage.get("magic.bin").read(), content)
+        self.assertEqual(self.storage.read_range("magic.bin", 2, 5), content[2:7])
+        self.assertEqual(self.storage.stat("magic.bin").size, len(content))
+
+    def test_reads_files_stored_before_compression(self):
+        self.base.save(BytesIO(self.content), "legacy.csv")
+        self.assertEqual(self.storage.get("legacy.csv").read(), self.content)
+
+    def test_read_range_compressed(self):
+        self.storage.save(BytesIO(self.content), "data.csv")
+        self.assertEqual(self.storage.read_range("data.csv", 1000, 300), self.content[1000:1300])
+
+    def test_truncation_detected(self):
+        self.storage.save(BytesIO(self.content), "data.csv")
+        raw = self._raw("data.csv")
+        with open(os.path.join(self.temp_dir, "data.csv"), 'wb') as f:
+            f.write(raw[:len(raw) // 2])
+
+        with self.assertRaises(ValueError):
+            self.storage.get("data.csv").read()
+
+    def test_unknown_codec(self):
+        with self.assertRaises(ValueError):
+            CompressedStorage(self.base, codec='brotli')
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,108 @@
+# tests/test_storage/test_content_addressed.py
+import unittest
+import tempfile
+import shutil
+import os
+import hashlib
+from io import BytesIO
+from apps.core.storage.local import LocalStorage
+from apps.core.storage.content_addressed import ContentAddressedStorage
+
+
+class CountingStorage(LocalStorage):
+    """LocalStorage that counts the files saved to it."""
+
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        self.saves = 0
+
+    def save(self, file_obj, file_path):
+        self.saves += 1
+        return super().save(file_obj, file_path)
+
+
+class TestContentAddressedStorage(unittest.TestCase):
+
+    def setUp(self):
+        self.temp_dir = tempfile.mkdtemp()
+        self.base = CountingStorage(base_dir=os.path.join(self.temp_dir, 'blobs'), chunk_size=5)
+        self.storage = ContentAddressedStorage(self.base, os.path.join(self.temp_dir, 'index.db'), spool_size=8)
+        self.content = b"workbook content " * 10
+        self.digest = hashlib.sha256(self.content).hexdigest()
+
+    def tearDown(self):
+        self.storage.index.close()
+        shutil.rmtree(self.temp_dir)
+
+    def test_duplicates_are_stored_once(self):
+        self.storage.save(BytesIO(self.content), "uploads/1/a.xlsx")
+        self.storage.save(BytesIO(self.content), "uploads/2/b.xlsx")
+
+        self.assertEqual(self.base.saves, 1)
+        self.assertTrue(self.base.exists(f"cas/{self.digest[:2]}/{self.digest}"))
+        self.assertEqual(self.storage.digest("uploads/2/b.xlsx"), self.digest)
+        with self.storage.open_read("uploads/2/b.xlsx") as stream:
+            self.assertEqual(stream.read(), self.content)
+
+        stats = self.storage.stats()
+        self.assertEqual((stats['paths'], stats['blobs'], stats['deduplicated']), (2, 1, 1))
+        self.assertEqual(stats['logical_bytes'], 2 * stats['stored_bytes'])
+
+    def test_blob_deleted_with_last_reference(self):
+        blob = f"cas/{self.digest[:2]}/{self.digest}"
+        self.storage.save(BytesIO(self.content), "a.xlsx")
+        self.storage.save(BytesIO(self.content), "b.xlsx")
+
+        self.assertTrue(self.storage.delete("a.xlsx"))
+        self.assertFalse(self.storage.exists("a.xlsx"))
+        self.assertTrue(self.base.exists(blob))
+
+        results = self.storage.delete_many(["b.xlsx", "missing.xlsx"])
+        self.assertEqual([r.success for r in results], [True, False])
+        self.assertFalse(self.base.exists(blob))
+        self.assertFalse(self.storage.delete("b.xlsx"))
+
+    def test_blob_orphaned_during_upload_is_restored(self):
+        blob = f"cas/{self.digest[:2]}/{self.digest}"
+        save = self.base.save
+
+        def racing_save(file_obj, file_path):
+            saved = save(file_obj, file_path)
+            if self.base.saves == 1:
+                # Another writer stores and deletes the same content before the upload is referenced
+                self.storage.save(BytesIO(self.content), "b.xlsx")
+                self.storage.delete("b.xlsx")
+            return saved
+
+        self.base.save = racing_save
+        self.storage.save(BytesIO(self.content), "a.xlsx")
+
+        self.assertTrue(self.base.exists(blob))
+        with self.storage.open_read("a.xlsx") as stream:
+            self.assertEqual(stream.read(), self.content)
+
+    def test_overwrite_releases_previous_blob(self):
+        self.storage.save(BytesIO(self.content), "a.xlsx")
+        self.storage.save(BytesIO(b"new content"), "a.xlsx")
+
+        self.assertFalse(self.base.exists(f"cas/{self.digest[:2]}/{self.digest}"))
+        self.assertEqual(self.storage.get("a.xlsx").read(), b"new content")
+        self.assertEqual(self.storage.stat("a.xlsx").size, len(b"new content"))
+
+    def test_index_survives_restart(self):
+        self.storage.save(BytesIO(self.content), "a.xlsx")
+        self.storage.index.close()
+
+        self.storage = ContentAddressedStorage(self.base, os.path.join(self.temp_dir, 'index.db'))
+        self.assertEqual(self.storage.read_range("a.xlsx", 0, 8), self.content[:8])
+        self.storage.save(BytesIO(self.content), "b.xlsx")
+        self.assertEqual(self.base.saves, 1)
+
+    def test_missing_file(self):
+        self.assertIsNone(self.storage.get("missing.xlsx"))
+        self.assertIsNone(self.storage.stat("missing.xlsx"))
+        self.assertFalse(self.storage.exists("missing.xlsx"))
+
+
+if __name__ == '__main__':
+    unittest.main()
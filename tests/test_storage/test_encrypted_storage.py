@@ -0,0 +1,298 @@
+# tests/test_storage/test_encrypted_storage.py
+import unittest
+import tempfile
+import shutil
+import os
+from io import BytesIO
+from cryptography.fernet import Fernet
+from apps.core.storage.local import LocalStorage
+from apps.core.storage.encrypted_storage import EncryptedStorage
+from apps.core.storage.keyring import Keyring, KeyringError
+from apps.core.storage.key_rotation import KeyRotationJob
+from apps.core.storage.segmented_encryption import SegmentIntegrityError, HEADER_SIZE, TAG_SIZE
+
+
+class RangeRecordingStorage(LocalStorage):
+    """LocalStorage that records the byte ranges requested from it."""
+
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        self.ranges = []
+
+    def read_range(self, file_path, offset, length):
+        self.ranges.append((offset, length))
+        return super().read_range(file_path, offset, length)
+
+
+class TestEncryptedStorage(unittest.TestCase):
+
+    def setUp(self):
+        self.temp_dir = tempfile.mkdtemp()
+        self.base = RangeRecordingStorage(base_dir=self.temp_dir, chunk_size=7)
+        self.key = Fernet.generate_key()
+        self.storage = EncryptedStorage(self.base, key=self.key, segment_size=16)
+        self.content = bytes(range(256)) * 2
+
+    def tearDown(self):
+        shutil.rmtree(self.temp_dir)
+
+    def _raw(self, path):
+        with open(os.path.join(self.temp_dir, path), 'rb') as f:
+            return f.read()
+
+    def test_roundtrip(self):
+        for size in (0, 1, 15, 16, 17, 32, len(self.content)):
+            path = f"file_{size}.bin"
+            self.storage.save(BytesIO(self.content[:size]), path)
+
+            with self.storage.open_read(path) as stream:
+                self.assertEqual(stream.read(), self.content[:size])
+            self.assertEqual(self.storage.stat(path).size, size)
+            if size >= 16:
+                self.assertNotIn(self.content[:size], self._raw(path))
+
+    def test_open_write_streams_segments(self):
+        with self.storage.open_write("streamed.bin") as writer:
+            for start in range(0, len(self.content), 5):
+                writer.write(self.content[start:start + 5])
+
+        self.assertEqual(self.storage.get("streamed.bin").read(), self.content)
+        # 32 full segments plus an empty final segment
+        self.assertEqual(len(self._raw("streamed.bin")), HEADER_SIZE + 32 * (16 + TAG_SIZE) + TAG_SIZE)
+
+    def test_read_range_fetches_only_needed_segments(self):
+        self.storage.save(BytesIO(self.content), "ranged.bin")
+        self.base.ranges.clear()
+
+        self.assertEqual(self.storage.read_range("ranged.bin", 100, 20), self.content[100:120])
+        # Header, then segments 6 and 7 only
+        self.assertEqual(self.base.ranges, [(0, HEADER_SIZE), (HEADER_SIZE + 6 * 32, 2 * 32)])
+
+        self.assertEqual(self.storage.read_range("ranged.bin", len(self.content) - 5, 100), self.content[-5:])
+        self.assertEqual(self.storage.read_range("ranged.bin", len(self.content) + 10, 5), b'')
+
+    def test_seek_decrypts_from_target_segment(self):
+        self.storage.save(BytesIO(self.content), "seek.bin")
+
+        with self.storage.open_read("seek.bin") as stream:
+            stream.seek(-8, os.SEEK_END)
+            self.assertEqual(stream.read(), self.content[-8:])
+            stream.seek(3)
+            self.assertEqual(stream.read(10), self.content[3:13])
+
+    def test_reads_legacy_fernet_files(self):
+        token = Fernet(self.key).encrypt(self.content)
+        self.base.save(BytesIO(token), "legacy.bin")
+
+        self.assertEqual(self.storage.get("legacy.bin").read(), self.content)
+        self.assertEqual(self.storage.read_range("legacy.bin", 10, 5), self.content[10:15])
+        self.assertEqual(self.storage.stat("legacy.bin").size, len(self.content))
+
+    def test_tampered_segment_is_rejected(self):
+        self.storage.save(BytesIO(self.content), "tampered.bin")
+        raw = bytearray(self._raw("tampered.bin"))
+        raw[HEADER_SIZE + 40] ^= 1
+        self.base.save(BytesIO(bytes(raw)), "tampered.bin")
+
+        with self.assertRaises(SegmentIntegrityError):
+            self.storage.get("tampered.bin").read()
+        with self.assertRaises(SegmentIntegrityError):
+            self.storage.read_range("tampered.bin", 16, 4)
+
+    def test_truncated_file_is_rejected(self):
+        self.storage.save(BytesIO(self.content[:64]), "truncated.bin")
+        raw = self._raw("truncated.bin")
+        # Drop the final segment, leaving only full segments
+        self.base.save(BytesIO(raw[:-TAG_SIZE]), "truncated.bin")
+
+        with self.assertRaises(SegmentIntegrityError):
+            self.storage.get("truncated.bin").read()
+        with self.assertRaises(SegmentIntegrityError):
+            self.storage.read_range("truncated.bin", 40, 100)
+
+    def test_wrong_key_cannot_decrypt(self):
+        self.storage.save(BytesIO(self.content), "secret.bin")
+        other = EncryptedStorage(self.base, key=Fernet.generate_key(), segment_size=16)
+
+        with self.assertRaises(KeyringError):
+            other.get("secret.bin")
+
+    def test_requires_a_key(self):
+        with self.assertRaises(ValueError):
+            EncryptedStorage(self.base)
+
+    def _key_path(self, path):
+        return self.storage.key_path(path, self.storage._salt(path))
+
+    def test_every_file_gets_its_own_data_key(self):
+        self.storage.save(BytesIO(self.content), "a.bin")
+        self.storage.save(BytesIO(self.content), "b.bin")
+        a_key, b_key = self._key_path("a.bin"), self._key_path("b.bin")
+
+        self.assertTrue(self.base.exists(a_key))
+        self.assertNotEqual(self._raw(a_key), self._raw(b_key))
+
+        self.assertTrue(self.storage.delete("a.bin"))
+        self.assertFalse(self.base.exists(a_key))
+        results = self.storage.delete_many(["b.bin"])
+        self.assertEqual([r.path for r in results], ["b.bin"])
+        self.assertFalse(self.base.exists(b_key))
+
+    def test_aborted_write_removes_key(self):
+        with self.assertRaises(RuntimeError):
+            with self.storage.open_write("aborted.bin") as writer:
+                writer.write(self.content)
+                raise RuntimeError("upload failed")
+
+        self.assertFalse(self.base.exists("aborted.bin"))
+        self.assertEqual(os.listdir(self.temp_dir), [])
+
+    def test_overwrite_keeps_previous_version_readable(self):
+        self.storage.save(BytesIO(b"first version"), "file.bin")
+        first_key = self._key_path("file.bin")
+
+        with self.assertRaises(RuntimeError):
+            with self.storage.open_write("file.bin") as writer:
+                writer.write(self.content)
+                # Readers see the previous version during the write
+                self.assertEqual(self.storage.get("file.bin").read(), b"first version")
+                raise RuntimeError("upload failed")
+        self.assertEqual(self.storage.get("file.bin").read(), b"first version")
+
+        self.storage.save(BytesIO(b"second version"), "file.bin")
+        self.assertEqual(self.storage.get("file.bin").read(), b"second version")
+        # The key of the replaced version is removed once the new one is committed
+        self.assertFalse(self.base.exists(first_key))
+        self.assertEqual(sorted(os.listdir(self.temp_dir)), sorted(["file.bin", self._key_path("file.bin")]))
+
+
+class TestKeyRotation(unittest.TestCase):
+
+    def setUp(self):
+        self.temp_dir = tempfile.mkdtemp()
+        self.base = LocalStorage(base_dir=os.path.join(self.temp_dir, 'data'))
+        self.old_key = Keyring.generate_key()
+        self.new_key = Keyring.generate_key()
+        self.paths = [f"file_{i}.bin" for i in range(10)]
+
+        storage = EncryptedStorage(self.base, keyring=Keyring({'old': self.old_key}, 'old'))
+        for path in self.paths:
+            storage.save(BytesIO(path.encode() * 1000), path)
+        self.data = {path: self.base.get(path).read() for path in self.paths}
+
+        self.keyring_path = os.path.join(self.temp_dir, 'keyring.json')
+        Keyring({'old': self.old_key, 'new': self.new_key}, 'new').save(self.keyring_path)
+        self.storage = EncryptedStorage(self.base, keyring=self.keyring_path)
+
+    def tearDown(self):
+        shutil.rmtree(self.temp_dir)
+
+    def test_rotation_rewraps_keys_only(self):
+        reports = []
+        job = KeyRotationJob(self.storage, batch_size=4, progress_callback=lambda p: reports.append(p.processed))
+        progress = job.run(self.paths, total=len(self.paths))
+
+        self.assertEqual((progress.rewrapped, progress.skipped, progress.failed), (10, 0, 0))
+        self.assertEqual(reports, [4, 8, 10])
+        for path in self.paths:
+            # File contents are untouched and still decrypt once the old key is retired
+            self.assertEqual(self.base.get(path).read(), self.data[path])
+        retired = EncryptedStorage(self.base, keyring=Keyring({'new': self.new_key}, 'new'))
+        self.assertEqual(retired.get("file_3.bin").read(), b"file_3.bin" * 1000)
+
+        # A second run has nothing left to do
+        progress = KeyRotationJob(self.storage).run(self.paths)
+        self.assertEqual((progress.rewrapped, progress.skipped), (0, 10))
+
+    def test_rotation_resumes_from_checkpoint(self):
+        checkpoint = os.path.join(self.temp_dir, 'rotation.json')
+
+        def fail_after_first_batch(progress):
+            if progress.processed == 4:
+                raise KeyboardInterrupt
+
+        with self.assertRaises(KeyboardInterrupt):
+            KeyRotationJob(self.storage, checkpoint, batch_size=4,
+                           progress_callback=fail_after_first_batch).run(self.paths)
+
+        rewrapped = []
+        self.storage.rewrap = lambda path: rewrapped.append(path) or True
+        job = KeyRotationJob(self.storage, checkpoint, batch_size=4)
+        self.assertEqual(job.resume_after(), self.paths[3])
+        # A file of the completed batch was deleted in between: nothing is skipped
+        progress = job.run([path for path in self.paths if path != self.paths[1]])
+
+        self.assertEqual(rewrapped, self.paths[4:])
+        self.assertEqual((progress.processed, progress.rewrapped), (10, 10))
+
+    def test_rotation_retries_failed_files_on_resume(self):
+        checkpoint = os.path.join(self.temp_dir, 'rotation.json')
+        rewrap = self.storage.rewrap
+
+        def fail_file_2(path):
+            if path == self.paths[2]:
+                raise OSError("busy")
+            return rewrap(path)
+
+        self.storage.rewrap = fail_file_2
+        progress = KeyRotationJob(self.storage, checkpoint, batch_size=4).run(enumerate(self.paths))
+        self.assertEqual((progress.failed, progress.failed_items), (1, [(2, self.paths[2])]))
+
+        self.storage.rewrap = rewrap
+        progress = KeyRotationJob(self.storage, checkpoint, batch_size=4).run(enumerate(self.paths))
+
+        self.assertEqual((progress.processed, progress.rewrapped, progress.failed), (10, 10, 0))
+        self.assertEqual(progress.failed_items, [])
+
+    def test_rotation_keeps_first_errors_only(self):
+        def fail(path):
+            raise OSError(f"cannot read {path}")
+
+        self.storage.rewrap = fail
+        job = KeyRotationJob(self.storage, batch_size=4)
+        job.max_errors = 3
+        progress = job.run(enumerate(self.paths))
+
+        self.assertEqual(progress.failed, 10)
+        self.assertEqual(progress.errors, [f"{path}: cannot read {path}" for path in self.paths[:3]])
+        self.assertEqual(progress.last_key, 9)
+
+    def test_rotation_migrates_legacy_files(self):
+        token = Fernet(self.old_key).encrypt(b"legacy content")
+        self.base.save(BytesIO(token), "legacy.bin")
+        legacy = EncryptedStorage(self.base, keyring=Keyring({'old': self.old_key, 'new': self.new_key}, 'new', 'old'))
+
+        self.assertTrue(legacy.rewrap("legacy.bin"))
+        retired = EncryptedStorage(self.base, keyring=Keyring({'new': self.new_key}, 'new'))
+        self.assertEqual(retired.get("legacy.bin").read(), b"legacy content")
+
+        with self.assertRaises(FileNotFoundError):
+            legacy.rewrap("missing.bin")
+
+    def test_rotation_skips_unencrypted_files(self):
+        self.base.save(BytesIO(b"plain,csv\n1,2\n"), "plain.csv")
+
+        self.assertFalse(self.storage.rewrap("plain.csv"))
+        self.assertFalse(self.base.exists("plain.csv.key"))
+
+    def test_rewrap_does_not_clobber_concurrent_write(self):
+        save = self.base.save
+
+        def save_then_overwrite(file_obj, file_path):
+            # A new version of the file is committed while its old key is re-wrapped
+            result = save(file_obj, file_path)
+            self.base.save = save
+            self.storage.save(BytesIO(b"new version"), "file_0.bin")
+            return result
+
+        self.base.save = save_then_overwrite
+        self.assertFalse(self.storage.rewrap("file_0.bin"))
+
+        self.assertEqual(self.storage.get("file_0.bin").read(), b"new version")
+        key_objects = [name for name in os.listdir(os.path.join(self.temp_dir, 'data'))
+                       if name.startswith("file_0.bin.")]
+        self.assertEqual(key_objects, [self.storage.key_path("file_0.bin", self.storage._salt("file_0.bin"))])
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,185 @@
+# tests/test_storage/test_local_storage.py
+import unittest
+import tempfile
+import shutil
+import hashlib
+import os
+import weakref
+from io import BytesIO
+from unittest import mock
+from apps.core.storage.local import LocalStorage, _close_at_exit
+
+
+class TestShardedLocalStorage(unittest.TestCase):
+
+    def setUp(self):
+        self.temp_dir = tempfile.mkdtemp()
+        self.base_dir = os.path.join(self.temp_dir, 'files')
+        self.index_path = os.path.join(self.temp_dir, 'index.sqlite3')
+        self.storage = LocalStorage(base_dir=self.base_dir, shard_depth=2, index_path=self.index_path)
+
+    def tearDown(self):
+        shutil.rmtree(self.temp_dir)
+
+    def test_files_are_sharded(self):
+        self.storage.save(BytesIO(b"content"), "uploads/1/data.csv")
+
+        digest = hashlib.md5(b"uploads/1/data.csv").hexdigest()
+        full_path = os.path.join(self.base_dir, digest[:2], digest[2:4], 'uploads', '1', 'data.csv')
+        self.assertTrue(os.path.isfile(full_path))
+        self.assertEqual(self.storage.get("uploads/1/data.csv").read(), b"content")
+
+    def test_stat_and_exists_from_index(self):
+        self.storage.save(BytesIO(b"content"), "a.txt")
+
+        stat = self.storage.stat("a.txt")
+        self.assertEqual(stat.size, 7)
+        self.assertEqual(stat.etag, hashlib.md5(b"content").hexdigest())
+        self.assertTrue(self.storage.exists("a.txt"))
+        self.assertFalse(self.storage.exists("b.txt"))
+        self.assertIsNone(self.storage.stat("b.txt"))
+
+        self.assertTrue(self.storage.delete("a.txt"))
+        self.assertFalse(self.storage.exists("a.txt"))
+
+    def test_failed_delete_stays_indexed(self):
+        self.storage.save(BytesIO(b"content"), "a.txt")
+
+        with mock.patch('apps.core.storage.local.os.remove', side_effect=PermissionError):
+            self.assertFalse(self.storage.delete("a.txt"))
+
+        self.assertTrue(self.storage.exists("a.txt"))
+
+    def test_prefix_listing(self):
+        for path in ("uploads/1/a.csv", "uploads/1/b.csv", "uploads/10/c.csv", "uploads/2/d.csv"):
+            self.storage.save(BytesIO(path.encode()), path)
+
+        self.assertEqual([stat.path for stat in self.storage.list("uploads/1/")],
+                         ["uploads/1/a.csv", "uploads/1/b.csv"])
+        self.assertEqual(len(self.storage.list("uploads/1")), 3)
+        self.assertEqual(len(self.storage.list()), 4)
+
+    def test_new_index_picks_up_existing_files(self):
+        self.storage.save(BytesIO(b"one"), "x/one.txt")
+        self.storage.save(BytesIO(b"two"), "x/two.txt")
+
+        reopened = LocalStorage(base_dir=self.base_dir, shard_depth=2,
+                                index_path=os.path.join(self.temp_dir, 'new-index.sqlite3'))
+        self.assertEqual([stat.path for stat in reopened.list("x/")], ["x/one.txt", "x/two.txt"])
+        self.assertEqual(reopened.stat("x/two.txt").size, 3)
+
+        self.assertEqual(reopened.rebuild_index(compute_hashes=True), 2)
+        self.assertEqual(reopened.stat("x/one.txt").etag, hashlib.md5(b"one").hexdigest())
+
+    def test_listing_without_index(self):
+        storage = LocalStorage(base_dir=self.base_dir, shard_depth=1)
+        storage.save(BytesIO(b"1"), "p/a")
+        storage.save(BytesIO(b"2"), "q/b")
+
+        self.assertEqual([stat.path for stat in storage.list("p/")], ["p/a"])
+        self.assertTrue(storage.exists("q/b"))
+
+
+class TestAtomicWrites(unittest.TestCase):
+
+    def setUp(self):
+        self.temp_dir = tempfile.mkdtemp()
+        self.storage = LocalStorage(base_dir=self.temp_dir, durable=True)
+
+    def tearDown(self):
+        shutil.rmtree(self.temp_dir)
+
+    def test_target_untouched_until_commit(self):
+        self.storage.save(BytesIO(b"old"), "data.json")
+
+        writer = self.storage.open_write("data.json")
+        writer.write(b"new content")
+        self.assertEqual(self.storage.get("data.json").read(), b"old")
+        writer.close()
+        self.assertEqual(self.storage.get("data.json").read(), b"new content")
+
+    def test_abort_leaves_no_temp_file(self):
+        self.storage.save(BytesIO(b"old"), "data.json")
+        with self.assertRaises(RuntimeError):
+            with self.storage.open_write("data.json") as writer:
+                writer.write(b"partial")
+                raise RuntimeError("interrupted")
+
+        self.assertEqual(self.storage.get("data.json").read(), b"old")
+        self.assertEqual(os.listdir(self.temp_dir), ["data.json"])
+
+
+class TestWriteBehind(unittest.TestCase):
+
+    def setUp(self):
+        self.temp_dir = tempfile.mkdtemp()
+        self.storage = LocalStorage(base_dir=self.temp_dir, write_behind=True, write_behind_max_size=1024,
+                                    index_path=os.path.join(self.temp_dir, 'index.sqlite3'))
+
+    def tearDown(self):
+        self.storage.close()
+        shutil.rmtree(self.temp_dir)
+
+    def test_flush_makes_objects_durable(self):
+        for i in range(50):
+            self.storage.save(BytesIO(b'{"i": %d}' % i), f"meta/{i}.json")
+        self.storage.flush()
+
+        for i in range(50):
+            with open(os.path.join(self.temp_dir, 'meta', f'{i}.json'), 'rb') as f:
+                self.assertEqual(f.read(), b'{"i": %d}' % i)
+        self.assertEqual(len(self.storage.list("meta/")), 50)
+        self.assertEqual(self.storage.stat("meta/7.json").etag, hashlib.md5(b'{"i": 7}').hexdigest())
+
+    def test_reads_see_queued_writes(self):
+        self.storage.save(BytesIO(b"queued"), "a.json")
+
+        self.assertTrue(self.storage.exists("a.json"))
+        self.assertEqual(self.storage.get("a.json").read(), b"queued")
+        self.assertEqual(self.storage.stat("a.json").size, 6)
+        self.assertEqual([stat.path for stat in self.storage.list()], ["a.json"])
+
+    def test_large_objects_written_synchronously(self):
+        content = os.urandom(4096)
+        self.storage.save(BytesIO(content), "large.bin")
+
+        self.assertIsNone(self.storage.write_behind.get("large.bin"))
+        with open(os.path.join(self.temp_dir, 'large.bin'), 'rb') as f:
+            self.assertEqual(f.read(), content)
+
+    def test_order_preserved_for_overwrites_and_deletes(self):
+        self.storage.save(BytesIO(b"v1"), "a.json")
+        self.storage.save(BytesIO(b"v2"), "a.json")
+        self.storage.flush()
+        self.assertEqual(self.storage.get("a.json").read(), b"v2")
+
+        self.storage.save(BytesIO(b"v3"), "a.json")
+        self.assertTrue(self.storage.delete("a.json"))
+        self.storage.flush()
+        self.assertFalse(self.storage.exists("a.json"))
+        self.assertFalse(os.path.exists(os.path.join(self.temp_dir, 'a.json')))
+
+    def test_failed_write_raises_on_read_until_rewritten(self):
+        with mock.patch.object(self.storage.write_behind, '_write_batch', side_effect=OSError("disk full")):
+            self.storage.save(BytesIO(b"lost"), "a.json")
+            with self.assertRaises(OSError):
+                self.storage.flush()
+
+        with self.assertRaises(OSError):
+            self.storage.get("a.json")
+        self.storage.save(BytesIO(b"again"), "a.json")
+        self.storage.flush()
+        self.assertEqual(self.storage.get("a.json").read(), b"again")
+
+    def test_queue_written_at_exit(self):
+        self.storage.save(BytesIO(b"queued"), "a.json")
+
+        _close_at_exit(weakref.ref(self.storage.write_behind))
+
+        self.assertFalse(self.storage.write_behind._thread.is_alive())
+        with open(os.path.join(self.temp_dir, 'a.json'), 'rb') as f:
+            self.assertEqual(f.read(), b"queued")
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,80 @@
+# tests/test_storage/test_media_storage.py
+import unittest
+import tempfile
+import shutil
+from io import BytesIO
+from PIL import Image
+from apps.core.storage.local import LocalStorage
+from apps.core.storage.media_storage import MediaStorage
+
+
+def make_jpeg(size=(1600, 1200)) -> bytes:
+    image = Image.new('RGB', size, (200, 30, 30))
+    buffer = BytesIO()
+    image.save(buffer, format='JPEG')
+    return buffer.getvalue()
+
+
+class TestMediaStorage(unittest.TestCase):
+
+    def setUp(self):
+        self.temp_dir = tempfile.mkdtemp()
+        self.base = LocalStorage(base_dir=self.temp_dir)
+        self.sizes = [(100, 100), (400, 400), (200, 200)]
+        self.image = make_jpeg()
+
+    def tearDown(self):
+        shutil.rmtree(self.temp_dir)
+
+    def _storage(self, mode):
+        storage = MediaStorage(self.base, thumbnail_sizes=self.sizes, thumbnail_mode=mode)
+        self.addCleanup(storage.close)
+        return storage
+
+    def _thumbnail_size(self, stream):
+        with stream, Image.open(stream) as thumb:
+            return thumb.size
+
+    def test_sync_generates_all_sizes(self):
+        storage = self._storage('sync')
+        storage.save(BytesIO(self.image), "scans/page.jpg")
+
+        self.assertEqual(self._thumbnail_size(self.base.get("scans/page_thumb_400x400.jpg")), (400, 300))
+        self.assertEqual(self._thumbnail_size(self.base.get("scans/page_thumb_200x200.jpg")), (200, 150))
+        self.assertEqual(self._thumbnail_size(self.base.get("scans/page_thumb_100x100.jpg")), (100, 75))
+
+    def test_background_generation(self):
+        storage = self._storage('background')
+        storage.save(BytesIO(self.image), "page.jpg")
+
+        # get_thumbnail waits for the pending job
+        self.assertEqual(self._thumbnail_size(storage.get_thumbnail("page.jpg", (200, 200))), (200, 150))
+        storage.wait_for_thumbnails()
+        self.assertTrue(self.base.exists("page_thumb_100x100.jpg"))
+
+    def test_lazy_generation_on_first_request(self):
+        storage = self._storage('lazy')
+        storage.save(BytesIO(self.image), "page.jpg")
+        self.assertFalse(self.base.exists("page_thumb_100x100.jpg"))
+
+        self.assertEqual(self._thumbnail_size(storage.get_thumbnail("page.jpg", (100, 100))), (100, 75))
+        self.assertTrue(self.base.exists("page_thumb_400x400.jpg"))
+
+        # Overwriting the image drops the cached thumbnails
+        storage.save(BytesIO(make_jpeg((300, 600))), "page.jpg")
+        self.assertFalse(self.base.exists("page_thumb_400x400.jpg"))
+        self.assertEqual(self._thumbnail_size(storage.get_thumbnail("page.jpg", (400, 400))), (200, 400))
+
+    def test_get_thumbnail_unknown(self):
+        storage = self._storage('lazy')
+        self.assertIsNone(storage.get_thumbnail("missing.jpg", (100, 100)))
+        storage.save(BytesIO(self.image), "page.jpg")
+        self.assertIsNone(storage.get_thumbnail("page.jpg", (50, 50)))
+
+    def test_invalid_mode(self):
+        with self.assertRaises(ValueError):
+            MediaStorage(self.base, thumbnail_mode='eager')
+
+
+if __name__ == '__main__':
+    unittest.main()
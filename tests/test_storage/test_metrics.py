@@ -0,0 +1,97 @@
+# tests/test_storage/test_metrics.py
+import unittest
+import tempfile
+import shutil
+from io import BytesIO
+from apps.core.storage.local import LocalStorage
+from apps.core.storage.cached_storage import CachedStorage
+from apps.core.storage.metrics import registry, Histogram
+
+
+class FailingStorage(LocalStorage):
+    def delete(self, file_path):
+        raise PermissionError(file_path)
+
+
+class TestStorageMetrics(unittest.TestCase):
+
+    def setUp(self):
+        self.temp_dir = tempfile.mkdtemp()
+        registry.reset()
+
+    def tearDown(self):
+        shutil.rmtree(self.temp_dir)
+
+    def test_operations_are_recorded_per_layer(self):
+        storage = CachedStorage(LocalStorage(base_dir=self.temp_dir))
+        storage.save(BytesIO(b"x" * 1000), "a.bin")
+        storage.cache.clear()
+        for _ in range(3):
+            with storage.get("a.bin") as stream:
+                stream.read()
+
+        backends = registry.snapshot()['backends']
+        self.assertEqual(backends['CachedStorage']['save']['calls'], 1)
+        self.assertEqual(backends['CachedStorage']['save']['bytes_written'], 1000)
+        self.assertEqual(backends['LocalStorage']['save']['bytes_written'], 1000)
+        self.assertEqual(backends['CachedStorage']['get']['calls'], 3)
+        # get() returns the stream of open_read(), whose bytes are counted once
+        self.assertEqual(backends['CachedStorage']['open_read']['bytes_read'], 3000)
+        # The first read was a cache miss, the next two were hits
+        self.assertEqual(backends['LocalStorage']['open_read']['calls'], 1)
+        self.assertEqual(backends['LocalStorage']['open_read']['bytes_read'], 1000)
+
+        caches = registry.snapshot()['caches']
+        self.assertEqual(caches[storage.metrics_label]['hits'], 2)
+        self.assertIn(f'storage_cache_hit_ratio{{cache="{storage.metrics_label}"}}', registry.prometheus())
+
+    def test_errors_are_counted_by_type(self):
+        storage = FailingStorage(base_dir=self.temp_dir)
+        with self.assertRaises(PermissionError):
+            storage.delete("a.bin")
+
+        metrics = registry.snapshot()['backends']['FailingStorage']['delete']
+        self.assertEqual(metrics['errors'], {'PermissionError': 1})
+        self.assertIn(
+            'storage_operation_errors_total{backend="FailingStorage",operation="delete",error="PermissionError"} 1',
+            registry.prometheus()
+        )
+
+    def test_prometheus_families_are_grouped(self):
+        storage = FailingStorage(base_dir=self.temp_dir)
+        storage.save(BytesIO(b"abc"), "a.bin")
+        with self.assertRaises(PermissionError):
+            storage.delete("a.bin")
+
+        families = []
+        for line in registry.prometheus().splitlines():
+            if line.startswith('# TYPE '):
+                families.append(line.split()[2])
+            else:
+                # Every sample follows the TYPE line of its own family
+                self.assertTrue(line.startswith(families[-1]), line)
+        self.assertEqual(len(families), len(set(families)))
+
+    def test_streaming_writes_and_ranges_count_bytes(self):
+        storage = LocalStorage(base_dir=self.temp_dir)
+        with storage.open_write("w.bin") as writer:
+            writer.write(b"abc")
+            writer.write(b"defg")
+        self.assertEqual(storage.read_range("w.bin", 2, 3), b"cde")
+
+        backends = registry.snapshot()['backends']['LocalStorage']
+        self.assertEqual(backends['open_write']['bytes_written'], 7)
+        self.assertEqual(backends['read_range']['bytes_read'], 3)
+
+    def test_histogram_percentiles(self):
+        histogram = Histogram()
+        for value in [0.001] * 90 + [2.0] * 10:
+            histogram.observe(value)
+
+        self.assertLessEqual(histogram.percentile(50), 0.001)
+        self.assertGreater(histogram.percentile(99), 1.0)
+        self.assertIsNone(Histogram().percentile(50))
+
+
+if __name__ == '__main__':
+    unittest.main()
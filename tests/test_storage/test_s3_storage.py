@@ -0,0 +1,66 @@
+# tests/test_storage/test_s3_storage.py
+import os
+import unittest
+import tempfile
+from io import BytesIO
+
+import boto3
+from moto import mock_aws
+
+from apps.core.storage.s3 import S3Storage
+
+PART_SIZE = 5 * 1024 * 1024
+
+
+@mock_aws
+class TestS3Storage(unittest.TestCase):
+
+    def setUp(self):
+        self.client = boto3.client('s3', region_name='us-east-1')
+        self.client.create_bucket(Bucket='test-bucket')
+        self.storage = S3Storage(bucket='test-bucket', client=self.client,
+                                 part_size=PART_SIZE, max_concurrency=4)
+        # Three full parts and a short last part
+        self.large_content = os.urandom(3 * PART_SIZE + 1234)
+
+    def test_small_file_roundtrip(self):
+        self.storage.save(BytesIO(b"small content"), "small.txt")
+        self.assertEqual(self.storage.get("small.txt").read(), b"small content")
+        self.assertEqual(self.storage.stat("small.txt").size, 13)
+
+    def test_multipart_upload_and_ranged_download(self):
+        self.storage.save(BytesIO(self.large_content), "large.bin")
+
+        head = self.client.head_object(Bucket='test-bucket', Key='large.bin')
+        self.assertTrue(head['ETag'].strip('"').endswith('-4'))
+
+        retrieved = self.storage.get("large.bin")
+        self.assertEqual(retrieved.read(), self.large_content)
+        retrieved.close()
+
+        self.assertEqual(bytes(self.storage.download_to_buffer("large.bin")), self.large_content)
+
+        with tempfile.TemporaryDirectory() as temp_dir:
+            local_path = os.path.join(temp_dir, "large.bin")
+            self.assertTrue(self.storage.download_to_file("large.bin", local_path))
+            with open(local_path, 'rb') as f:
+                self.assertEqual(f.read(), self.large_content)
+
+    def test_read_range(self):
+        self.storage.save(BytesIO(b"0123456789"), "digits.txt")
+        self.assertEqual(self.storage.read_range("digits.txt", 3, 4), b"3456")
+        self.assertIsNone(self.storage.read_range("missing.txt", 0, 4))
+
+    def test_missing_object(self):
+        self.assertIsNone(self.storage.get("missing.txt"))
+        self.assertIsNone(self.storage.stat("missing.txt"))
+        self.assertFalse(self.storage.download_to_file("missing.txt", os.devnull))
+
+    def test_delete_many(self):
+        keys = [f"batch/{i}.txt" for i in range(5)]
+        for key in keys:
+            self.storage.save(BytesIO(b"x"), key)
+
+        results = self.storage.delete_many(keys)
+        self.assertTrue(all(result.success for result in results))
+        self.assertNotIn('Contents', self.client.list_objects_v2(Bucket='test-bucket', Prefix='batch/'))
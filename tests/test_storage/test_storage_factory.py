@@ -0,0 +1,108 @@
+# tests/test_storage/test_storage_factory.py
+import unittest
+import tempfile
+import shutil
+import threading
+from types import SimpleNamespace
+from unittest import mock
+from cryptography.fernet import Fernet
+from apps.core.storage.config import StorageConfig
+from apps.core.storage.factory import StorageFactory
+from apps.core.storage.async_storage import AsyncStorage
+from apps.core.storage.cached_storage import CachedStorage
+from apps.core.storage.encrypted_storage import EncryptedStorage
+from apps.core.storage.local import LocalStorage
+
+
+class TestStorageConfig(unittest.TestCase):
+
+    def test_parse_stack(self):
+        config = StorageConfig.parse('encrypted -> cached -> local', {'cached': {'max_bytes': 1024}})
+
+        self.assertEqual(config.storage_type, 'encrypted')
+        self.assertEqual(config.storage.storage_type, 'cached')
+        self.assertEqual(config.storage.settings, {'max_bytes': 1024})
+        self.assertEqual(config.storage.storage.storage_type, 'local')
+        self.assertIsNone(config.storage.storage.storage)
+        self.assertEqual(config.describe(), 'encrypted -> cached -> local')
+
+    def test_parse_rejects_invalid_stacks(self):
+        for stack in ('cached', 'local -> s3', 'cached -> -> local', ''):
+            with self.assertRaises(ValueError):
+                StorageConfig.parse(stack)
+
+    def test_from_dict_nested(self):
+        config = StorageConfig.from_dict({
+            'type': 'cached',
+            'storage': {'type': 'local', 'settings': {'base_dir': '/tmp/x'}},
+        })
+        self.assertEqual(config.describe(), 'cached -> local')
+        self.assertEqual(config.storage.settings, {'base_dir': '/tmp/x'})
+
+
+class TestStorageFactoryStacks(unittest.TestCase):
+
+    def setUp(self):
+        self.temp_dir = tempfile.mkdtemp()
+        StorageFactory.reset_shared_storages()
+
+    def tearDown(self):
+        StorageFactory.reset_shared_storages()
+        shutil.rmtree(self.temp_dir)
+
+    def _settings(self):
+        return SimpleNamespace(configured=True, STORAGE_STACKS={
+            'default': {
+                'stack': 'encrypted -> cached -> local',
+                'options': {
+                    'encrypted': {'key': Fernet.generate_key()},
+                    'local': {'base_dir': self.temp_dir},
+                },
+            },
+        })
+
+    def test_build_composes_layers(self):
+        storage = StorageFactory.build(StorageConfig.parse(
+            'cached -> local', {'local': {'base_dir': self.temp_dir}}
+        ))
+        self.assertIsInstance(storage, CachedStorage)
+        self.assertIsInstance(storage.storage, LocalStorage)
+        self.assertEqual(storage.storage.base_dir, self.temp_dir)
+
+    def test_named_stack_from_settings(self):
+        with mock.patch('apps.core.storage.factory.settings', self._settings()):
+            storage = StorageFactory.get_shared_storage()
+
+        self.assertIsInstance(storage, EncryptedStorage)
+        self.assertIsInstance(storage.storage, CachedStorage)
+        self.assertIsInstance(storage.storage.storage, LocalStorage)
+
+    def test_shared_storage_built_once(self):
+        results = []
+        with mock.patch('apps.core.storage.factory.settings', self._settings()):
+            threads = [threading.Thread(target=lambda: results.append(StorageFactory.get_shared_storage()))
+                       for _ in range(8)]
+            for thread in threads:
+                thread.start()
+            for thread in threads:
+                thread.join()
+
+            self.assertEqual(len({id(storage) for storage in results}), 1)
+            StorageFactory.reset_shared_storages()
+            self.assertIsNot(StorageFactory.get_shared_storage(), results[0])
+
+    def test_async_storage_wraps_shared_stack(self):
+        with mock.patch('apps.core.storage.factory.settings', self._settings()):
+            storage = StorageFactory.get_async_storage(max_concurrency=2)
+
+            self.assertIsInstance(storage, AsyncStorage)
+            self.assertIs(storage.storage, StorageFactory.get_shared_storage())
+        # Not a StorageInterface, so not a storage type or a stack layer
+        with self.assertRaises(ValueError):
+            StorageFactory.get_storage('async')
+        with self.assertRaises(ValueError):
+            StorageConfig.parse('async -> local')
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,79 @@
+# tests/test_storage/test_streaming.py
+import unittest
+import tempfile
+import shutil
+import os
+from io import BytesIO
+from apps.core.storage.local import LocalStorage
+from apps.core.storage.cached_storage import CachedStorage
+
+
+class TestLocalStorageStreaming(unittest.TestCase):
+
+    def setUp(self):
+        self.temp_dir = tempfile.mkdtemp()
+        self.storage = LocalStorage(base_dir=self.temp_dir, chunk_size=4)
+        self.test_content = b"0123456789abcdef"
+
+    def tearDown(self):
+        shutil.rmtree(self.temp_dir)
+
+    def test_iter_chunks(self):
+        self.storage.save(BytesIO(self.test_content), "chunks.bin")
+
+        chunks = list(self.storage.iter_chunks("chunks.bin"))
+        self.assertEqual(chunks, [b"0123", b"4567", b"89ab", b"cdef"])
+
+        chunks = list(self.storage.iter_chunks("chunks.bin", chunk_size=10))
+        self.assertEqual(chunks, [b"0123456789", b"abcdef"])
+
+    def test_iter_chunks_missing_file(self):
+        with self.assertRaises(FileNotFoundError):
+            list(self.storage.iter_chunks("missing.bin"))
+
+    def test_open_write_commits_on_close(self):
+        with self.storage.open_write("nested/written.bin") as writer:
+            writer.write(b"part one, ")
+            writer.write(b"part two")
+
+        self.assertEqual(writer.bytes_written, 18)
+        with self.storage.open_read("nested/written.bin") as stream:
+            self.assertEqual(stream.read(), b"part one, part two")
+
+    def test_open_write_aborts_on_error(self):
+        with self.assertRaises(RuntimeError):
+            with self.storage.open_write("aborted.bin") as writer:
+                writer.write(b"partial")
+                raise RuntimeError("upload interrupted")
+
+        self.assertIsNone(self.storage.open_read("aborted.bin"))
+
+
+class TestCachedStorageStreaming(unittest.TestCase):
+
+    def setUp(self):
+        self.temp_dir = tempfile.mkdtemp()
+        self.backend = LocalStorage(base_dir=self.temp_dir)
+        self.storage = CachedStorage(self.backend, max_object_size=8)
+
+    def tearDown(self):
+        shutil.rmtree(self.temp_dir)
+
+    def test_small_file_cached_after_full_read(self):
+        self.backend.save(BytesIO(b"small"), "small.txt")
+
+        with self.storage.open_read("small.txt") as stream:
+            self.assertEqual(stream.read(2), b"sm")
+            self.assertIsNone(self.storage.cache.peek("small.txt"))
+            self.assertEqual(stream.read(), b"all")
+
+        self.assertEqual(self.storage.cache.peek("small.txt"), b"small")
+
+    def test_large_file_streamed_without_caching(self):
+        self.storage.save(BytesIO(b"larger than eight bytes"), "large.txt")
+        self.assertNotIn("large.txt", self.storage.cache)
+
+        with self.storage.open_read("large.txt") as stream:
+            self.assertEqual(stream.read(), b"larger than eight bytes")
+        self.assertNotIn("large.txt", self.storage.cache)
+        self.assertTrue(os.path.exists(os.path.join(self.temp_dir, "large.txt")))
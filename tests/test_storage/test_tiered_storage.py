@@ -0,0 +1,113 @@
+# tests/test_storage/test_tiered_storage.py
+import unittest
+import tempfile
+import shutil
+import os
+from io import BytesIO
+from unittest import mock
+
+import boto3
+from moto import mock_aws
+
+from apps.core.storage.s3 import S3Storage
+from apps.core.storage.tiered_storage import TieredCachedStorage
+
+
+@mock_aws
+class TestTieredCachedStorage(unittest.TestCase):
+
+    def setUp(self):
+        self.cache_dir = tempfile.mkdtemp()
+        client = boto3.client('s3', region_name='us-east-1')
+        client.create_bucket(Bucket='test-bucket')
+        self.remote = S3Storage(bucket='test-bucket', client=client)
+        self.storage = TieredCachedStorage(
+            self.remote, self.cache_dir,
+            max_disk_bytes=64, memory_cache_bytes=16, max_memory_object_size=8
+        )
+
+    def tearDown(self):
+        shutil.rmtree(self.cache_dir)
+
+    def test_disk_and_memory_hits(self):
+        self.remote.save(BytesIO(b"large object 01"), "large.bin")
+        self.remote.save(BytesIO(b"small"), "small.bin")
+
+        for _ in range(2):
+            with self.storage.open_read("large.bin") as stream:
+                self.assertEqual(stream.read(), b"large object 01")
+            with self.storage.open_read("small.bin") as stream:
+                self.assertEqual(stream.read(), b"small")
+
+        stats = self.storage.stats()
+        self.assertEqual(stats['misses'], 2)
+        self.assertEqual(stats['disk_hits'], 1)
+        self.assertEqual(stats['memory_hits'], 1)
+
+    def test_remote_change_invalidates_entry(self):
+        self.storage.revalidate_after = 0
+        self.remote.save(BytesIO(b"version one"), "data.csv")
+        self.assertEqual(self.storage.get("data.csv").read(), b"version one")
+
+        # Changed behind the cache's back
+        self.remote.save(BytesIO(b"version two"), "data.csv")
+        self.assertEqual(self.storage.get("data.csv").read(), b"version two")
+        self.assertEqual(self.storage.stats()['stale'], 1)
+
+    def test_remote_change_seen_after_revalidate_after(self):
+        self.storage.revalidate_after = 30
+        self.remote.save(BytesIO(b"version one"), "data.csv")
+        with mock.patch('apps.core.storage.tiered_storage.time.monotonic', return_value=1000.0):
+            self.assertEqual(self.storage.get("data.csv").read(), b"version one")
+
+        self.remote.save(BytesIO(b"version two"), "data.csv")
+        with mock.patch('apps.core.storage.tiered_storage.time.monotonic', return_value=1029.0):
+            self.assertEqual(self.storage.get("data.csv").read(), b"version one")
+        with mock.patch('apps.core.storage.tiered_storage.time.monotonic', return_value=1030.0):
+            self.assertEqual(self.storage.get("data.csv").read(), b"version two")
+
+    def test_evicts_by_total_bytes(self):
+        for i in range(5):
+            self.remote.save(BytesIO(b"x" * 20), f"file{i}.bin")
+            self.storage.get(f"file{i}.bin").close()
+
+        stats = self.storage.stats()
+        self.assertLessEqual(stats['disk_bytes'], 64)
+        self.assertEqual(stats['evictions'], 2)
+
+    def test_index_survives_restart(self):
+        self.remote.save(BytesIO(b"persisted"), "persisted.txt")
+        self.storage.get("persisted.txt").close()
+
+        restarted = TieredCachedStorage(self.remote, self.cache_dir, memory_cache_bytes=0)
+        with restarted.open_read("persisted.txt") as stream:
+            self.assertEqual(stream.read(), b"persisted")
+        self.assertEqual(restarted.stats()['disk_hits'], 1)
+
+    def test_fill_overtaken_by_save_not_cached(self):
+        self.remote.save(BytesIO(b"version one"), "data.csv")
+        open_read = self.remote.open_read
+
+        def overtaken(file_path):
+            # The old bytes are being downloaded when a new version is saved
+            stream = open_read(file_path)
+            self.storage.save(BytesIO(b"version two"), file_path)
+            return BytesIO(stream.read())
+
+        with mock.patch.object(self.remote, 'open_read', side_effect=overtaken):
+            self.assertEqual(self.storage.get("data.csv").read(), b"version two")
+
+        self.assertEqual(self.storage.stats()['disk_entries'], 0)
+        self.assertEqual(self.storage.get("data.csv").read(), b"version two")
+
+    def test_restart_keeps_recent_temp_files(self):
+        recent = os.path.join(self.cache_dir, 'recent.tmp')
+        stale = os.path.join(self.cache_dir, 'stale.tmp')
+        for path in (recent, stale):
+            open(path, 'wb').close()
+        os.utime(stale, (0, 0))
+
+        TieredCachedStorage(self.remote, self.cache_dir)
+
+        self.assertTrue(os.path.exists(recent))
+        self.assertFalse(os.path.exists(stale))
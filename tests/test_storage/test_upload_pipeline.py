@@ -0,0 +1,92 @@
+# tests/test_storage/test_upload_pipeline.py
+import unittest
+import tempfile
+import shutil
+import hashlib
+import zlib
+from io import BytesIO
+from types import SimpleNamespace
+from unittest import mock
+from apps.core.storage.factory import StorageFactory
+from apps.core.storage.hashing import InspectingReader
+from apps.core.storage.file_management import FileManager, check_data_file_storage
+from apps.core.storage.cached_storage import CachedStorage
+from apps.core.storage.compressed_storage import CompressedStorage
+from apps.core.storage.local import LocalStorage
+
+
+class ReadCountingStream(BytesIO):
+    """BytesIO that counts the bytes read from it."""
+
+    def __init__(self, *args):
+        super().__init__(*args)
+        self.bytes_read = 0
+
+    def read(self, size=-1):
+        data = super().read(size)
+        self.bytes_read += len(data)
+        return data
+
+
+class TestUploadPipeline(unittest.TestCase):
+
+    def setUp(self):
+        self.temp_dir = tempfile.mkdtemp()
+        self.manager = FileManager('local', base_dir=self.temp_dir, chunk_size=7)
+        self.content = b"PAR1" + bytes(range(256)) * 4
+
+    def tearDown(self):
+        shutil.rmtree(self.temp_dir)
+
+    def test_upload_inspects_content_in_one_pass(self):
+        stream = ReadCountingStream(self.content)
+        result = self.manager.upload(stream, "uploads/data.parquet")
+
+        self.assertTrue(result["success"])
+        self.assertEqual(stream.bytes_read, len(self.content))
+        metadata = result["metadata"]
+        self.assertEqual(metadata["size"], len(self.content))
+        self.assertEqual(metadata["md5"], hashlib.md5(self.content).hexdigest())
+        self.assertEqual(metadata["format"], "parquet")
+        self.assertEqual(self.manager.storage.get("uploads/data.parquet").read(), self.content)
+
+    def test_default_storage_is_the_configured_stack(self):
+        settings = SimpleNamespace(configured=True, STORAGE_STACKS={
+            'default': {'stack': 'local', 'options': {'local': {'base_dir': self.temp_dir}}},
+        })
+        StorageFactory.reset_shared_storages()
+        self.addCleanup(StorageFactory.reset_shared_storages)
+        with mock.patch('apps.core.storage.factory.settings', settings):
+            manager = FileManager()
+
+        self.assertIs(manager.storage, StorageFactory.get_shared_storage('default'))
+        self.assertEqual(manager.storage.base_dir, self.temp_dir)
+
+    def test_data_file_storage_must_keep_plain_files_at_media_root(self):
+        settings = SimpleNamespace(MEDIA_ROOT=self.temp_dir)
+        with mock.patch('apps.core.storage.file_management.settings', settings):
+            check_data_file_storage(CachedStorage(self.manager.storage))
+            for storage in [CompressedStorage(self.manager.storage),
+                            LocalStorage(base_dir=self.temp_dir, shard_depth=1),
+                            LocalStorage(base_dir=f"{self.temp_dir}/other")]:
+                with self.assertRaises(ValueError):
+                    check_data_file_storage(storage)
+
+    def test_fast_hash(self):
+        reader = InspectingReader(BytesIO(self.content))
+        while reader.read(5):
+            pass
+
+        info = reader.info()
+        if reader.fast_hash_name == 'crc32':
+            self.assertEqual(info['crc32'], f"{zlib.crc32(self.content):08x}")
+        self.assertIn(reader.fast_hash_name, info)
+
+    def test_unknown_format(self):
+        reader = InspectingReader(BytesIO(b"a,b\n1,2\n"))
+        reader.read()
+        self.assertIsNone(reader.info()["format"])
+
+
+if __name__ == '__main__':
+    unittest.main()
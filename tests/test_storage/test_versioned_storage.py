@@ -0,0 +1,169 @@
+# tests/test_storage/test_versioned_storage.py
+import unittest
+import tempfile
+import shutil
+import os
+import random
+import threading
+import time
+from io import BytesIO
+from apps.core.storage.local import LocalStorage
+from apps.core.storage.versioned_storage import VersionedStorage, ContentDefinedChunker
+
+
+class TestContentDefinedChunker(unittest.TestCase):
+
+    def setUp(self):
+        self.data = random.Random(42).randbytes(300 * 1024)
+        self.chunker = ContentDefinedChunker(min_size=512, avg_size=2048, max_size=8192, block_size=10000)
+
+    def test_chunks_cover_stream_within_bounds(self):
+        chunks = list(self.chunker.chunks(BytesIO(self.data)))
+
+        self.assertEqual(b''.join(chunks), self.data)
+        self.assertTrue(all(512 <= len(chunk) <= 8192 for chunk in chunks[:-1]))
+        self.assertEqual(list(self.chunker.chunks(BytesIO(b''))), [])
+
+    def test_boundaries_follow_content(self):
+        original = list(self.chunker.chunks(BytesIO(self.data)))
+        edited = self.data[:1000] + b'inserted bytes' + self.data[1000:]
+        changed = list(self.chunker.chunks(BytesIO(edited)))
+
+        # Only the chunks around the insertion differ
+        self.assertGreaterEqual(len(set(original) & set(changed)), len(original) - 2)
+
+    def test_independent_of_block_size(self):
+        other = ContentDefinedChunker(min_size=512, avg_size=2048, max_size=8192, block_size=4096)
+        self.assertEqual(list(other.chunks(BytesIO(self.data))), list(self.chunker.chunks(BytesIO(self.data))))
+
+
+class TestVersionedStorage(unittest.TestCase):
+
+    def setUp(self):
+        self.temp_dir = tempfile.mkdtemp()
+        self.base = LocalStorage(base_dir=os.path.join(self.temp_dir, 'store'))
+        self.storage = VersionedStorage(self.base, os.path.join(self.temp_dir, 'versions.db'),
+                                        min_chunk_size=512, avg_chunk_size=2048, max_chunk_size=8192)
+        self.data = random.Random(7).randbytes(200 * 1024)
+
+    def tearDown(self):
+        self.storage.close()
+        shutil.rmtree(self.temp_dir)
+
+    def _revisions(self, count):
+        data = self.data
+        revisions = []
+        for i in range(count):
+            position = (i * 7919) % len(data)
+            data = data[:position] + f"revision {i}".encode() + data[position + 4:]
+            revisions.append(data)
+        return revisions
+
+    def test_revisions_share_chunks(self):
+        revisions = self._revisions(20)
+        for revision in revisions:
+            self.storage.save(BytesIO(revision), "s_bop_analyt_q_en.xlsx")
+
+        versions = self.storage.list_versions("s_bop_analyt_q_en.xlsx")
+        self.assertEqual([v.version for v in versions], list(range(1, 21)))
+
+        stats = self.storage.stats()
+        self.assertLess(stats['stored_bytes'], 2 * len(self.data))
+        self.assertGreater(stats['dedup_ratio'], 10)
+
+        for version in (1, 10, 20):
+            with self.storage.open_read("s_bop_analyt_q_en.xlsx", version=version) as stream:
+                self.assertEqual(stream.read(), revisions[version - 1])
+        self.assertEqual(self.storage.get("s_bop_analyt_q_en.xlsx").read(), revisions[-1])
+
+    def test_pending_uploads_are_bounded(self):
+        storage = VersionedStorage(self.base, os.path.join(self.temp_dir, 'bounded.db'), min_chunk_size=512,
+                                   avg_chunk_size=2048, max_chunk_size=8192, max_workers=1, max_pending_uploads=2)
+        self.addCleanup(storage.close)
+        lock = threading.Lock()
+        # +1 per submitted upload, -1 per stored chunk; peak is the running sum at every submit
+        in_flight, peak = [], []
+        save = self.base.save
+
+        def slow_save(file_obj, file_path):
+            time.sleep(0.002)
+            result = save(file_obj, file_path)
+            with lock:
+                in_flight.append(-1)
+            return result
+
+        submit = storage.executor.submit
+
+        def counting_submit(*args):
+            with lock:
+                in_flight.append(1)
+                peak.append(sum(in_flight))
+            return submit(*args)
+
+        self.base.save = slow_save
+        storage.executor.submit = counting_submit
+        storage.save(BytesIO(self.data), "a.bin")
+
+        self.assertGreater(len(peak), 10)
+        self.assertLessEqual(max(peak), 3)
+        self.assertEqual(storage.get("a.bin").read(), self.data)
+
+    def test_identical_save_does_not_add_version(self):
+        first = self.storage.save_version(BytesIO(self.data), "a.bin")
+        second = self.storage.save_version(BytesIO(self.data), "a.bin")
+
+        self.assertEqual(first, second)
+        self.assertEqual(len(self.storage.list_versions("a.bin")), 1)
+
+    def test_seek_and_range_reads(self):
+        self.storage.save(BytesIO(self.data), "a.bin")
+
+        with self.storage.open_read("a.bin") as stream:
+            stream.seek(-100, os.SEEK_END)
+            self.assertEqual(stream.read(), self.data[-100:])
+            stream.seek(5000)
+            self.assertEqual(stream.read(20000), self.data[5000:25000])
+        self.assertEqual(self.storage.read_range("a.bin", 123456, 10), self.data[123456:123466])
+        self.assertEqual(self.storage.stat("a.bin").size, len(self.data))
+
+    def test_delete_removes_unshared_chunks(self):
+        self.storage.save(BytesIO(self.data), "a.bin")
+        self.storage.save(BytesIO(self.data + b'tail'), "b.bin")
+        shared_stats = self.storage.stats()
+
+        self.assertTrue(self.storage.delete("b.bin"))
+        self.assertFalse(self.storage.exists("b.bin"))
+        self.assertEqual(self.storage.get("a.bin").read(), self.data)
+        self.assertLessEqual(self.storage.stats()['chunks'], shared_stats['chunks'])
+
+        self.assertTrue(self.storage.delete("a.bin"))
+        self.assertEqual(self.storage.stats()['chunks'], 0)
+        stored = [name for _, _, files in os.walk(os.path.join(self.temp_dir, 'store')) for name in files]
+        self.assertEqual(stored, [])
+
+    def test_failed_save_leaves_no_chunks(self):
+        self.storage.save(BytesIO(self.data), "a.bin")
+        add_version = self.storage.index.add_version
+
+        def delete_then_fail(*args):
+            # The chunks b.bin shares with a.bin are orphaned while pinned
+            self.storage.delete("a.bin")
+            raise OSError("index unavailable")
+
+        self.storage.index.add_version = delete_then_fail
+        with self.assertRaises(OSError):
+            self.storage.save(BytesIO(self.data + b'tail'), "b.bin")
+        self.storage.index.add_version = add_version
+
+        self.assertEqual(self.storage.stats()['chunks'], 0)
+        stored = [name for _, _, files in os.walk(os.path.join(self.temp_dir, 'store')) for name in files]
+        self.assertEqual(stored, [])
+
+    def test_missing_version(self):
+        self.storage.save(BytesIO(self.data), "a.bin")
+        self.assertIsNone(self.storage.get("a.bin", version=2))
+        self.assertIsNone(self.storage.get("missing.bin"))
+
+
+if __name__ == '__main__':
+    unittest.main()
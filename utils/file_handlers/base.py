@@ -20,35 +20,64 @@ class PdfHandler(BaseFileHandler):
         """
         Read data from PDF file
 
+        Pages found in the page text cache are not extracted again, and
+        extracted pages are added to it.
+
         Returns:
             Dictionary with page numbers as keys and page text as values
         """
+        # Imported here: the page cache needs Django settings
+        from apps.core.processors.page_cache import file_md5, get_page_cache
+
         try:
+            cache = get_page_cache()
+            file_hash = file_md5(self.file_path) if cache else None
+            page_count = cache.page_count(file_hash) if cache else None
+            cached = cache.get_range(file_hash, 0, page_count) if page_count is not None else {}
+
+            if page_count is not None and len(cached) == page_count:
+                return {i + 1: cached[i] for i in range(page_count)}
+
             with open(self.file_path, 'rb') as file:
                 reader = PyPDF2.PdfReader(file)
                 data = {}
 
                 for i in range(len(reader.pages)):
-                    page = reader.pages[i]
-                    data[i + 1] = page.extract_text()
-
+                    if i not in cached:
+                        cached[i] = reader.pages[i].extract_text()
+                        if cache:
+                            cache.put(file_hash, i, cached[i])
+                    data[i + 1] = cached[i]
+
+                if cache:
+                    cache.set_page_count(file_hash, len(reader.pages))
                 return data
         except Exception as e:
             logger.error(f"Error reading PDF file: {str(e)}")
             raise
 
-    def extract_tables(self) -> List[pd.DataFrame]:
+    def extract_tables(self, pages: Optional[List[int]] = None, **options) -> List[pd.DataFrame]:
         """
-        Attempt to extract tables from PDF
-        Note: This is a basic implementation. For production, consider 
-        using specialized tools like Tabula or AWS Textract.
+        Extract tables from PDF by the layout of its positioned text
+
+        Text runs are clustered into rows and columns, pages being processed
+        in parallel. Works for PDFs with a text layer (not scanned pages) and
+        tables aligned in columns, such as the BNB statistical tables.
+
+        Args:
+            pages: 0-based indexes of the pages to read (default: all)
+            **options: Passed to apps.core.processors.pdf_tables.extract_tables
 
         Returns:
-            List of pandas DataFrames with extracted tables
+            List of pandas DataFrames with extracted tables (attrs['page'] is the page number)
         """
-        # This is a placeholder. For production, implement with a proper PDF table extraction tool
-        logger.info("PDF table extraction would require additional specialized libraries")
-        return []
+        from apps.core.processors.pdf_tables import extract_tables
+
+        try:
+            return extract_tables(self.file_path, pages=pages, **options)
+        except Exception as e:
+            logger.error(f"Error extracting tables from PDF: {str(e)}")
+            raise
 
     def get_metadata(self) -> Dict[str, Any]:
         """
@@ -114,7 +143,8 @@ class PdfHandler(BaseFileHandler):
 
 
 # utils/file_handlers/parquet_handler.py
-
+import pyarrow.parquet as pq
+from apps.core.processors.parquet_metadata import footer_metadata, sample_rows
 
 logger = logging.getLogger(__name__)
 
@@ -142,21 +172,18 @@ class ParquetHandler(BaseFileHandler):
 
     def get_metadata(self) -> Dict[str, Any]:
         """
-        Extract metadata from Parquet file
+        Extract metadata from Parquet file footer (no row data is read)
 
         Returns:
             Dictionary with metadata
         """
         try:
-            # Read just the metadata (not loading data into memory)
-            pq_metadata = pd.read_parquet(self.file_path, columns=[])
-
-            return {
-                "file_size": self.get_file_size(),
-                "columns": pq_metadata.columns.tolist(),
-                "row_count": len(pq_metadata),
-                "memory_usage": pq_metadata.memory_usage(deep=True).sum()
-            }
+            with pq.ParquetFile(self.file_path) as parquet_file:
+                return {
+                    "file_size": self.get_file_size(),
+                    **footer_metadata(parquet_file),
+                    "sample": sample_rows(parquet_file, 5),
+                }
         except Exception as e:
             logger.error(f"Error extracting Parquet metadata: {str(e)}")
             raise
@@ -169,20 +196,22 @@ class ParquetHandler(BaseFileHandler):
             Dictionary with validation results
         """
         try:
-            # Check if file is readable
+            # Check if file is readable (parses the footer only)
             try:
-                df = pd.read_parquet(self.file_path)
+                with pq.ParquetFile(self.file_path) as parquet_file:
+                    row_count = parquet_file.metadata.num_rows
+                    column_count = len(parquet_file.schema_arrow.empty_table().to_pandas().columns)
             except Exception as e:
                 return {"valid": False, "error": f"Cannot parse Parquet file: {str(e)}"}
 
             # Check if file has data
-            if df.empty:
+            if row_count == 0 or column_count == 0:
                 return {"valid": False, "error": "Parquet file is empty"}
 
             # Get basic statistics
             stats = {
-                "row_count": len(df),
-                "column_count": len(df.columns)
+                "row_count": row_count,
+                "column_count": column_count
             }
 
             return {"valid": True, **stats}